@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+PPEDetector.postprocess 벤치마크
+
+기존 구현(리스트 변환 + 클래스 무관 NMS + 박스별 Python 루프)과
+벡터화된 구현을 YOLOv5 출력 크기(25,200행)의 합성 텐서로 비교합니다.
+
+기존 구현은 xyxy 박스를 cv2.dnn.NMSBoxes에 그대로 넘겼는데, NMSBoxes는
+(x, y, w, h) 형식을 기대하므로 박스가 실제보다 크게 계산되어 밀집 장면에서
+서로 다른 객체까지 억제했습니다 (감지 수 열 참고). 같은 결과 기준의 비교를
+위해 박스 형식만 바로잡은 기존 구현(legacy-fixed)도 함께 측정합니다.
+
+실행:
+    python benchmarks/bench_postprocess.py
+    python benchmarks/bench_postprocess.py --objects 200 --repeats 50
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+import cv2
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import PPEDetector, Detection
+
+
+def make_yolo_output(
+    num_rows: int = 25200,
+    num_objects: int = 50,
+    boxes_per_object: int = 20,
+    num_classes: int = 9,
+    input_size: int = 640,
+    seed: int = 0
+) -> np.ndarray:
+    """
+    합성 YOLOv5 출력 생성
+
+    객체마다 위치가 조금씩 다른 고신뢰도 후보 박스를 여러 개 만들고
+    (실제 모델처럼 앵커 여러 개가 같은 객체에 반응), 나머지 행은
+    저신뢰도 노이즈로 채웁니다.
+
+    Returns:
+        (1, num_rows, 5 + num_classes) float32 배열
+    """
+    rng = np.random.default_rng(seed)
+    output = np.zeros((num_rows, 5 + num_classes), dtype=np.float32)
+
+    # 배경 노이즈
+    output[:, 0:2] = rng.uniform(0, input_size, (num_rows, 2))
+    output[:, 2:4] = rng.uniform(8, 64, (num_rows, 2))
+    output[:, 4] = rng.uniform(0, 0.3, num_rows)
+    output[:, 5:] = rng.uniform(0, 1, (num_rows, num_classes))
+
+    # 객체 후보 박스
+    num_dense = min(num_rows, num_objects * boxes_per_object)
+    rows = rng.choice(num_rows, num_dense, replace=False)
+    centers = rng.uniform(40, input_size - 40, (num_objects, 2))
+    sizes = rng.uniform(30, 120, (num_objects, 2))
+    classes = rng.integers(0, num_classes, num_objects)
+
+    obj_index = np.repeat(np.arange(num_objects), boxes_per_object)[:num_dense]
+    output[rows, 0:2] = centers[obj_index] + rng.normal(0, 3, (num_dense, 2))
+    output[rows, 2:4] = sizes[obj_index] * rng.uniform(0.9, 1.1, (num_dense, 2))
+    output[rows, 4] = rng.uniform(0.6, 0.99, num_dense)
+    output[rows, 5:] = rng.uniform(0, 0.2, (num_dense, num_classes))
+    output[rows, 5 + classes[obj_index]] = rng.uniform(0.8, 1.0, num_dense)
+
+    return output[np.newaxis]
+
+
+def legacy_postprocess(detector: PPEDetector, outputs, orig_shape, fix_rects: bool = False):
+    """
+    기존 postprocess 구현 (비교 기준)
+
+    Args:
+        fix_rects: True면 NMS에 (x, y, w, h) 형식 박스 전달
+    """
+    detections = []
+    output = np.array(outputs[0])
+    if output.ndim == 3:
+        output = output[0]
+
+    boxes = output[:, :4]
+    obj_conf = output[:, 4:5]
+    class_scores = output[:, 5:]
+
+    scores = obj_conf * class_scores
+    class_ids = np.argmax(scores, axis=1)
+    confidences = np.max(scores, axis=1)
+
+    mask = confidences > detector.conf_threshold
+    boxes = boxes[mask]
+    class_ids = class_ids[mask]
+    confidences = confidences[mask]
+
+    if len(boxes) == 0:
+        return detections
+
+    xyxy = np.zeros_like(boxes)
+    xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2
+    xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2
+    xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2
+    xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2
+
+    rects = xyxy.copy()
+    if fix_rects:
+        rects[:, 2:4] = xyxy[:, 2:4] - xyxy[:, 0:2]
+
+    indices = cv2.dnn.NMSBoxes(
+        rects.tolist(),
+        confidences.tolist(),
+        detector.conf_threshold,
+        detector.nms_threshold
+    )
+
+    h, w = orig_shape[:2]
+    scale_x = w / detector.input_size[0]
+    scale_y = h / detector.input_size[1]
+
+    for i in np.asarray(indices).flatten():
+        x1, y1, x2, y2 = xyxy[i]
+        class_id = int(class_ids[i])
+        class_name = detector.CLASSES[class_id] if class_id < len(detector.CLASSES) else 'unknown'
+        detections.append(Detection(
+            class_id=class_id,
+            class_name=class_name,
+            confidence=float(confidences[i]),
+            bbox=(int(max(0, x1 * scale_x)), int(max(0, y1 * scale_y)),
+                  int(min(w, x2 * scale_x)), int(min(h, y2 * scale_y))),
+            is_violation=class_name in detector.VIOLATION_CLASSES
+        ))
+
+    return detections
+
+
+def time_it(func, repeats: int, warmup: int = 3) -> np.ndarray:
+    """반복 실행 시간 측정 (ms)"""
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - start) * 1000)
+    return np.array(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="postprocess benchmark")
+    parser.add_argument("--repeats", type=int, default=30)
+    parser.add_argument("--objects", type=int, nargs="+", default=[5, 50, 200])
+    parser.add_argument("--boxes-per-object", type=int, default=20)
+    args = parser.parse_args()
+
+    detector = PPEDetector(model_path="", use_simulation=False)
+    orig_shape = (1080, 1920, 3)
+
+    variants = [
+        ("legacy", lambda outputs: legacy_postprocess(detector, outputs, orig_shape)),
+        ("legacy-fixed", lambda outputs: legacy_postprocess(detector, outputs, orig_shape, fix_rects=True)),
+        ("vectorized", lambda outputs: detector.postprocess(outputs, orig_shape)),
+    ]
+
+    print(f"{'objects':>8} {'candidates':>10} {'variant':>13} {'median ms':>10} {'p95 ms':>8} "
+          f"{'detections':>10} {'vs fixed':>9}")
+    for num_objects in args.objects:
+        output = make_yolo_output(num_objects=num_objects, boxes_per_object=args.boxes_per_object)
+        outputs = [output]
+        candidates = int(((output[0, :, 4:5] * output[0, :, 5:]).max(1) > detector.conf_threshold).sum())
+
+        rows = []
+        for name, func in variants:
+            samples = time_it(lambda: func(outputs), args.repeats)
+            rows.append((name, float(np.median(samples)), float(np.percentile(samples, 95)),
+                         len(func(outputs))))
+
+        baseline = dict((r[0], r[1]) for r in rows)["legacy-fixed"]
+        for name, median, p95, count in rows:
+            print(f"{num_objects:>8} {candidates:>10} {name:>13} {median:>10.2f} "
+                  f"{p95:>8.2f} {count:>10} {baseline / median:>8.1f}x")
+
+    detector.release()
+
+
+if __name__ == "__main__":
+    main()
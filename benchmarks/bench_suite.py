@@ -0,0 +1,448 @@
+#!/usr/bin/env python3
+"""
+감지 핫패스 마이크로 벤치마크 모음
+
+프레임마다 실행되는 함수들을 같은 조건(워밍업, 반복, GC 비활성화)으로
+측정하고 결과를 JSON으로 저장합니다. 저장해 둔 기준 결과와 비교하여
+느려진 항목이 있으면 종료 코드 1을 반환하므로, 배포 전 CI나 장비에서
+회귀를 잡는 데 사용할 수 있습니다.
+
+측정 항목:
+- preprocess: 해상도별 레터박스 전처리
+- postprocess: 장면 밀도별 합성 YOLOv5 출력 후처리
+- xywh_to_xyxy: 후보 박스 좌표 변환
+- nms: 클래스별 NMS
+- draw_detections: 감지 결과 그리기 (복사 / out 버퍼)
+- jpeg_encode: 위반 이미지 JPEG 인코딩 (upload_image_to_s3 경로)
+- simulated_camera: SimulatedCamera._create_frame (새 배열 / 버퍼 풀)
+
+결과 JSON 형식:
+    {
+        "version": 1,
+        "created": "...",
+        "host": {"machine": "aarch64", "python": "3.11.2", ...},
+        "settings": {"repeats": 50, "warmup": 5},
+        "results": {"preprocess/1080p": {"median_ms": 1.2, "p95_ms": ..., ...}, ...}
+    }
+
+실행:
+    python benchmarks/bench_suite.py --output baseline.json
+    python benchmarks/bench_suite.py --compare baseline.json --threshold 0.15
+    python benchmarks/bench_suite.py --filter postprocess nms --repeats 100
+    python benchmarks/bench_suite.py --list
+"""
+
+import sys
+import os
+import gc
+import json
+import time
+import platform
+import datetime
+import argparse
+import functools
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+import numpy as np
+import cv2
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ppe_detector import PPEDetector, Detection
+from rtsp_reader import SimulatedCamera
+from s3_uploader import encode_jpeg
+from bench_postprocess import make_yolo_output
+
+
+RESULT_VERSION = 1
+
+RESOLUTIONS = {
+    "720p": (1280, 720),
+    "1080p": (1920, 1080),
+    "4K": (3840, 2160),
+}
+
+
+@dataclass
+class BenchCase:
+    """
+    벤치마크 항목
+
+    Attributes:
+        name: 항목 이름 ("그룹/변형")
+        setup: 측정할 함수를 만들어 반환 (준비 비용은 측정에서 제외)
+        number: 샘플 하나당 호출 횟수 (아주 짧은 함수의 타이머 오차 감소)
+        params: 결과에 함께 기록할 파라미터
+    """
+    name: str
+    setup: Callable[[], Callable[[], object]]
+    number: int = 1
+    params: Dict[str, object] = field(default_factory=dict)
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """
+    샘플 통계 (ms)
+
+    Returns:
+        min/median/mean/p95/p99/max/stdev (ms), repeats
+    """
+    arr = np.asarray(samples, dtype=np.float64)
+    return {
+        "repeats": int(arr.size),
+        "min_ms": round(float(arr.min()), 4),
+        "median_ms": round(float(np.median(arr)), 4),
+        "mean_ms": round(float(arr.mean()), 4),
+        "p95_ms": round(float(np.percentile(arr, 95)), 4),
+        "p99_ms": round(float(np.percentile(arr, 99)), 4),
+        "max_ms": round(float(arr.max()), 4),
+        "stdev_ms": round(float(arr.std()), 4),
+    }
+
+
+def measure(func: Callable[[], object], repeats: int, warmup: int = 5, number: int = 1) -> List[float]:
+    """
+    반복 실행 시간 측정
+
+    측정 중에는 GC를 끄고 (수집 시점에 따른 튐 방지), 샘플마다
+    number번 호출한 평균을 기록합니다.
+
+    Returns:
+        샘플별 호출 1회 시간 (ms)
+    """
+    for _ in range(warmup):
+        func()
+
+    samples = []
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            for _ in range(number):
+                func()
+            samples.append((time.perf_counter() - start) * 1000 / number)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return samples
+
+
+# ---------------------------------------------------------------------------
+# 벤치마크 항목
+# ---------------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=1)
+def _detector() -> PPEDetector:
+    """항목들이 공유하는 감지기 (모델 없이 후처리/그리기만 사용)"""
+    return PPEDetector(model_path="", use_simulation=False)
+
+
+def _frame(width: int, height: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 255, (height, width, 3), dtype=np.uint8)
+
+
+def _candidates(detector: PPEDetector, num_objects: int):
+    """합성 출력에서 신뢰도 임계값을 넘은 후보 (xywh, 신뢰도, 클래스)"""
+    output = make_yolo_output(num_objects=num_objects)[0]
+    scores = output[:, 4:5] * output[:, 5:]
+    class_ids = scores.argmax(axis=1)
+    confidences = scores.max(axis=1)
+    mask = confidences > detector.conf_threshold
+    return output[mask, :4], confidences[mask], class_ids[mask]
+
+
+def _sample_detections(detector: PPEDetector, count: int, width: int, height: int) -> List[Detection]:
+    rng = np.random.default_rng(count)
+    detections = []
+    for i in range(count):
+        class_id = i % len(detector.CLASSES)
+        x1, y1 = int(rng.integers(0, width - 200)), int(rng.integers(0, height - 300))
+        class_name = detector.CLASSES[class_id]
+        detections.append(Detection(
+            class_id, class_name, 0.9, (x1, y1, x1 + 150, y1 + 280),
+            class_name in detector.VIOLATION_CLASSES, track_id=i + 1
+        ))
+    return detections
+
+
+def _preprocess_case(resolution: str) -> BenchCase:
+    def setup():
+        detector = _detector()
+        frame = _frame(*RESOLUTIONS[resolution])
+        return lambda: detector.preprocess(frame)
+    return BenchCase(f"preprocess/{resolution}", setup, params={"resolution": resolution})
+
+
+def _postprocess_case(num_objects: int) -> BenchCase:
+    def setup():
+        detector = _detector()
+        outputs = [make_yolo_output(num_objects=num_objects)]
+        return lambda: detector.postprocess(outputs, (1080, 1920, 3))
+    return BenchCase(f"postprocess/objects={num_objects}", setup, params={"objects": num_objects})
+
+
+def _postprocess_batch_case(batch: int, num_objects: int = 5) -> BenchCase:
+    def setup():
+        detector = _detector()
+        outputs = [np.concatenate([make_yolo_output(num_objects=num_objects, seed=i) for i in range(batch)])]
+        shapes = [(1080, 1920, 3)] * batch
+        return lambda: detector.postprocess_batch(outputs, shapes)
+    return BenchCase(f"postprocess_batch/batch={batch}", setup,
+                     params={"batch": batch, "objects": num_objects})
+
+
+def _xywh_case(num_objects: int) -> BenchCase:
+    def setup():
+        detector = _detector()
+        boxes, _, _ = _candidates(detector, num_objects)
+        return lambda: detector._xywh_to_xyxy(boxes)
+    return BenchCase(f"xywh_to_xyxy/objects={num_objects}", setup, number=20,
+                     params={"objects": num_objects})
+
+
+def _nms_case(num_objects: int) -> BenchCase:
+    def setup():
+        detector = _detector()
+        boxes, confidences, class_ids = _candidates(detector, num_objects)
+        boxes_xyxy = detector._xywh_to_xyxy(boxes)
+        return lambda: detector._batched_nms(boxes_xyxy, confidences, class_ids)
+    return BenchCase(f"nms/objects={num_objects}", setup, params={"objects": num_objects})
+
+
+def _draw_case(mode: str, count: int = 20) -> BenchCase:
+    def setup():
+        detector = _detector()
+        width, height = RESOLUTIONS["1080p"]
+        frame = _frame(width, height)
+        detections = _sample_detections(detector, count, width, height)
+        if mode == "out":
+            buffer = np.empty_like(frame)
+            return lambda: detector.draw_detections(frame, detections, out=buffer)
+        return lambda: detector.draw_detections(frame, detections)
+    return BenchCase(f"draw_detections/{mode}", setup, params={"detections": count, "resolution": "1080p"})
+
+
+def _jpeg_case(resolution: str, quality: int = 85) -> BenchCase:
+    def setup():
+        # 랜덤 노이즈는 실제 영상보다 압축이 훨씬 어려우므로 시뮬레이션 프레임 사용
+        camera = SimulatedCamera(*RESOLUTIONS[resolution])
+        frame = camera._create_frame()
+        return lambda: encode_jpeg(frame, quality)
+    return BenchCase(f"jpeg_encode/{resolution}", setup, params={"resolution": resolution, "quality": quality})
+
+
+def _camera_case(width: int, height: int, pool_size: int = 0) -> BenchCase:
+    def setup():
+        camera = SimulatedCamera(width, height, pool_size=pool_size)
+        return camera._create_frame
+    suffix = f"/pool{pool_size}" if pool_size else ""
+    return BenchCase(f"simulated_camera/{width}x{height}{suffix}", setup,
+                     params={"width": width, "height": height, "pool_size": pool_size})
+
+
+def build_cases() -> List[BenchCase]:
+    """전체 벤치마크 항목"""
+    cases = [_preprocess_case(r) for r in ("720p", "1080p", "4K")]
+    cases += [_postprocess_case(n) for n in (0, 5, 50, 200)]
+    cases += [_postprocess_batch_case(b) for b in (1, 4)]
+    cases += [_xywh_case(n) for n in (5, 200)]
+    cases += [_nms_case(n) for n in (5, 50, 200)]
+    cases += [_draw_case("copy"), _draw_case("out")]
+    cases += [_jpeg_case("720p"), _jpeg_case("1080p")]
+    cases += [_camera_case(640, 480), _camera_case(1920, 1080), _camera_case(3840, 2160, pool_size=4)]
+    return cases
+
+
+def select_cases(cases: List[BenchCase], filters: Optional[List[str]]) -> List[BenchCase]:
+    """이름에 필터 문자열 중 하나라도 포함된 항목"""
+    if not filters:
+        return cases
+    return [case for case in cases if any(f in case.name for f in filters)]
+
+
+# ---------------------------------------------------------------------------
+# 실행 / 저장 / 비교
+# ---------------------------------------------------------------------------
+
+def host_info() -> Dict[str, object]:
+    """측정 환경 (기준 결과와 환경이 다르면 비교 시 경고)"""
+    return {
+        "node": platform.node(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "opencv": cv2.__version__,
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def run_suite(
+    cases: List[BenchCase],
+    repeats: int = 50,
+    warmup: int = 5,
+    verbose: bool = True
+) -> Dict[str, object]:
+    """
+    벤치마크 실행
+
+    Returns:
+        결과 JSON으로 저장할 딕셔너리
+    """
+    results = {}
+    for case in cases:
+        func = case.setup()
+        stats = summarize(measure(func, repeats, warmup, case.number))
+        stats["number"] = case.number
+        stats["params"] = case.params
+        results[case.name] = stats
+        if verbose:
+            print(f"{case.name:<32} {stats['median_ms']:>10.3f} {stats['p95_ms']:>10.3f} "
+                  f"{stats['p99_ms']:>10.3f} {stats['stdev_ms']:>9.3f}")
+
+    return {
+        "version": RESULT_VERSION,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "host": host_info(),
+        "settings": {"repeats": repeats, "warmup": warmup},
+        "results": results,
+    }
+
+
+def save_results(report: Dict[str, object], path: str):
+    """결과 JSON 저장"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_results(path: str) -> Dict[str, object]:
+    """결과 JSON 로드"""
+    with open(path) as f:
+        report = json.load(f)
+    if report.get("version") != RESULT_VERSION:
+        raise ValueError(f"Unsupported benchmark result version: {report.get('version')}")
+    return report
+
+
+def compare_results(
+    current: Dict[str, object],
+    baseline: Dict[str, object],
+    threshold: float = 0.15,
+    metric: str = "median_ms",
+    min_delta_ms: float = 0.02
+) -> List[Dict[str, object]]:
+    """
+    기준 결과와 비교
+
+    현재 값이 기준보다 threshold 비율 이상, 그리고 min_delta_ms 이상
+    느려지면 회귀로 판정합니다 (수 µs 단위 항목의 잡음 무시).
+
+    Args:
+        current: 현재 결과 (run_suite 반환값)
+        baseline: 기준 결과
+        threshold: 허용 비율 (0.15 = 15%)
+        metric: 비교할 통계 (median_ms, p95_ms 등)
+        min_delta_ms: 회귀로 보는 최소 차이 (ms)
+
+    Returns:
+        항목별 비교 결과 리스트 (status: ok/regression/improvement/new/missing)
+    """
+    rows = []
+    current_results = current["results"]
+    baseline_results = baseline["results"]
+
+    for name in sorted(set(current_results) | set(baseline_results)):
+        cur = current_results.get(name)
+        base = baseline_results.get(name)
+        row = {"name": name, "baseline": None, "current": None, "change": None}
+
+        if base is None:
+            row.update(status="new", current=cur[metric])
+        elif cur is None:
+            row.update(status="missing", baseline=base[metric])
+        else:
+            row.update(baseline=base[metric], current=cur[metric])
+            delta = cur[metric] - base[metric]
+            row["change"] = delta / base[metric] if base[metric] > 0 else 0.0
+            if row["change"] > threshold and delta > min_delta_ms:
+                row["status"] = "regression"
+            elif row["change"] < -threshold and -delta > min_delta_ms:
+                row["status"] = "improvement"
+            else:
+                row["status"] = "ok"
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows: List[Dict[str, object]], metric: str):
+    """비교 결과 표 출력"""
+    print(f"\n{'benchmark':<32} {'baseline':>10} {'current':>10} {'change':>8}  status   ({metric})")
+    for row in rows:
+        base = f"{row['baseline']:.3f}" if row["baseline"] is not None else "-"
+        cur = f"{row['current']:.3f}" if row["current"] is not None else "-"
+        change = f"{row['change'] * 100:+.1f}%" if row["change"] is not None else "-"
+        print(f"{row['name']:<32} {base:>10} {cur:>10} {change:>8}  {row['status']}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="detection hot path benchmark suite")
+    parser.add_argument("--repeats", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=5)
+    parser.add_argument("--filter", nargs="+", default=None,
+                        help="run only benchmarks whose name contains one of these")
+    parser.add_argument("--output", default=None, help="write results JSON")
+    parser.add_argument("--compare", default=None, help="baseline results JSON")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="allowed slowdown ratio before flagging a regression")
+    parser.add_argument("--metric", default="median_ms",
+                        choices=["min_ms", "median_ms", "mean_ms", "p95_ms", "p99_ms"])
+    parser.add_argument("--min-delta-ms", type=float, default=0.02)
+    parser.add_argument("--list", action="store_true", help="list benchmarks and exit")
+    args = parser.parse_args(argv)
+
+    cases = select_cases(build_cases(), args.filter)
+    if args.list:
+        for case in cases:
+            print(case.name)
+        return 0
+    if not cases:
+        print(f"No benchmarks match {args.filter}")
+        return 2
+
+    print(f"{'benchmark':<32} {'median ms':>10} {'p95 ms':>10} {'p99 ms':>10} {'stdev':>9}")
+    report = run_suite(cases, args.repeats, args.warmup)
+
+    if args.output:
+        save_results(report, args.output)
+        print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        baseline = load_results(args.compare)
+        if baseline.get("host") != report["host"]:
+            print(f"\n[WARN] Baseline was recorded on a different host: {baseline.get('host')}")
+
+        rows = compare_results(report, baseline, args.threshold, args.metric, args.min_delta_ms)
+        if args.filter:
+            rows = [row for row in rows if row["status"] != "missing"]
+        print_comparison(rows, args.metric)
+
+        regressions = [row["name"] for row in rows if row["status"] == "regression"]
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) over {args.threshold * 100:.0f}%: "
+                  f"{', '.join(regressions)}")
+            return 1
+        print("\nNo regressions")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+MultiObjectTracker 프레임당 비용 벤치마크
+
+화면에 있는 사람 수별로 합성 감지 결과(등속 이동 + 위치 잡음)를
+추적기에 넣어 프레임당 update() 시간과 ID 유지율을 측정합니다.
+
+실행:
+    python benchmarks/bench_tracker.py
+    python benchmarks/bench_tracker.py --people 10 50 100 --frames 1000
+"""
+
+import sys
+import os
+import time
+import argparse
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import Detection
+from tracker import MultiObjectTracker
+
+
+def make_scene(num_people: int, num_frames: int, seed: int = 0):
+    """
+    합성 장면 생성
+
+    Returns:
+        프레임별 Detection 리스트, 프레임별 정답 ID 리스트
+    """
+    rng = np.random.default_rng(seed)
+    cols = int(np.ceil(np.sqrt(num_people)))
+    start = np.stack([
+        np.arange(num_people) % cols * (1800 / cols),
+        np.arange(num_people) // cols * (900 / cols)
+    ], axis=1) + 20
+    velocity = rng.uniform(-2, 2, (num_people, 2))
+    size = rng.uniform([40, 90], [80, 160], (num_people, 2))
+
+    frames, truths = [], []
+    for t in range(num_frames):
+        pos = start + velocity * t + rng.normal(0, 1.0, (num_people, 2))
+        order = rng.permutation(num_people)
+        frames.append([
+            Detection(2, "no_hardhat", 0.9,
+                      (int(pos[i, 0]), int(pos[i, 1]),
+                       int(pos[i, 0] + size[i, 0]), int(pos[i, 1] + size[i, 1])), True)
+            for i in order
+        ])
+        truths.append(order)
+    return frames, truths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="tracker benchmark")
+    parser.add_argument("--people", type=int, nargs="+", default=[5, 20, 50, 100])
+    parser.add_argument("--frames", type=int, default=500)
+    args = parser.parse_args()
+
+    print(f"{'people':>7} {'median ms':>10} {'p95 ms':>8} {'max ms':>8} {'tracks':>7} {'id switches':>12}")
+    for num_people in args.people:
+        frames, truths = make_scene(num_people, args.frames)
+        tracker = MultiObjectTracker()
+
+        samples = []
+        first_ids = {}
+        switches = 0
+        for dets, truth in zip(frames, truths):
+            start = time.perf_counter()
+            tracker.update(dets)
+            samples.append((time.perf_counter() - start) * 1000)
+
+            for det, person in zip(dets, truth):
+                if first_ids.setdefault(person, det.track_id) != det.track_id:
+                    switches += 1
+                    first_ids[person] = det.track_id
+
+        samples = np.array(samples)
+        print(f"{num_people:>7} {np.median(samples):>10.3f} {np.percentile(samples, 95):>8.3f} "
+              f"{samples.max():>8.3f} {tracker.get_stats()['total_tracks']:>7} {switches:>12}")
+
+
+if __name__ == "__main__":
+    main()
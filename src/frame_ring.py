@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+미리 할당된 프레임 링 버퍼
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+cap.read()는 디코딩할 때마다 새 프레임 배열을 할당합니다. 1080p/4K
+카메라 여러 대를 읽으면 초당 수백 MB를 할당/해제하게 되고, 처리되지 못해
+버려지는 프레임도 매번 할당 비용을 치릅니다.
+
+FrameRing은 고정된 수의 프레임 버퍼를 두고 cap.read(image=buf)로 같은
+버퍼에 다시 디코딩합니다. 소비자에게는 참조 카운트가 있는 FrameRef를
+넘기고, 모든 참조가 release()되면 버퍼가 링으로 돌아갑니다.
+
+슬롯 상태:
+- free: 다음 디코딩에 사용 가능
+- ready: 디코딩 완료, 소비자 대기 중 (queue_size개 초과 시 오래된 것부터 버림)
+  get()은 가장 오래된 프레임부터, get_latest()는 최신 프레임만 (메일박스)
+- held: 소비자가 참조 중 (release 전까지 재사용하지 않음)
+
+사용 예시:
+    from frame_ring import FrameRing
+
+    ring = FrameRing(size=4, queue_size=2)
+    ring.allocate((1080, 1920, 3))
+
+    # 캡처 스레드
+    slot = ring.claim()
+    ret, frame = cap.read(image=slot.buffer)
+    if ret:
+        ring.commit(slot, frame)
+    else:
+        ring.abort(slot)
+
+    # 소비자
+    ref = ring.get(timeout=1.0)
+    if ref is not None:
+        with ref:
+            process(ref.frame)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+import numpy as np
+
+
+FREE = "free"
+WRITING = "writing"
+READY = "ready"
+HELD = "held"
+
+
+class _Slot:
+    """링 버퍼 슬롯 하나"""
+
+    def __init__(self, index: int):
+        self.index = index              # -1이면 링 밖의 임시 슬롯 (모든 슬롯 사용 중)
+        self.buffer: Optional[np.ndarray] = None
+        self.state = FREE
+        self.refs = 0
+        self.seq = 0
+        self.timestamp = 0.0
+
+
+class FrameRef:
+    """
+    링 버퍼 프레임 참조
+
+    frame은 release() 전까지만 유효합니다. 다른 스레드/큐에 넘길 때는
+    acquire()로 참조를 늘리고 각자 release()합니다. 오래 보관해야 하면
+    copy()로 복사본을 만든 뒤 바로 release()하세요.
+    """
+
+    def __init__(self, ring: "FrameRing", slot: _Slot):
+        self._ring = ring
+        self._slot = slot
+        self.frame = slot.buffer
+        self.seq = slot.seq
+        self.timestamp = slot.timestamp
+        self._released = False
+
+    def acquire(self) -> "FrameRef":
+        """
+        참조 하나 추가
+
+        Returns:
+            새 참조 (각각 release 필요)
+        """
+        self._ring._acquire(self._slot)
+        return FrameRef(self._ring, self._slot)
+
+    def release(self):
+        """참조 반환 (여러 번 호출해도 한 번만 반영)"""
+        if self._released:
+            return
+        self._released = True
+        self.frame = None
+        self._ring._release(self._slot)
+
+    def copy(self) -> np.ndarray:
+        """프레임 복사본 (링과 무관하게 보관 가능)"""
+        if self.frame is None:
+            raise RuntimeError("FrameRef already released")
+        return self.frame.copy()
+
+    def __enter__(self) -> "FrameRef":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+
+class FrameRing:
+    """
+    참조 카운트 기반 프레임 링 버퍼
+
+    단일 생산자(캡처 스레드) / 다중 소비자를 가정합니다.
+    모든 슬롯이 소비자에게 잡혀 있으면 캡처를 멈추지 않도록 링 밖의
+    임시 버퍼를 할당하며 (overflows), 해제되면 버립니다.
+    """
+
+    def __init__(self, size: int = 4, queue_size: int = 2):
+        """
+        Args:
+            size: 슬롯 수 (queue_size + 디코딩 중 1 + 소비자 보유 수 이상 권장)
+            queue_size: 소비자를 기다리는 최대 프레임 수 (초과 시 오래된 프레임 버림)
+        """
+        if size < queue_size + 1:
+            raise ValueError("size must be at least queue_size + 1")
+
+        self.size = size
+        self.queue_size = queue_size
+        self._slots: List[_Slot] = [_Slot(i) for i in range(size)]
+        self._ready: Deque[_Slot] = deque()
+        self._cond = threading.Condition()
+        self._seq = 0
+
+        # 통계
+        self.allocations = 0    # 버퍼 할당 수 (해상도 변경/첫 채움)
+        self.overflows = 0      # 모든 슬롯이 잡혀 있어 임시 버퍼를 쓴 수
+        self.dropped = 0        # 소비되지 못하고 덮어쓴 프레임 수
+        self.delivered = 0
+
+    def allocate(self, shape: Tuple[int, ...], dtype=np.uint8):
+        """
+        빈 슬롯에 버퍼 미리 할당 (이미 같은 shape면 유지)
+
+        소비자가 잡고 있는 슬롯은 반환된 뒤 다음 디코딩에서 교체됩니다.
+        """
+        with self._cond:
+            for slot in self._slots:
+                if slot.state == FREE and (slot.buffer is None or slot.buffer.shape != tuple(shape)):
+                    slot.buffer = np.empty(shape, dtype=dtype)
+                    self.allocations += 1
+
+    def claim(self) -> _Slot:
+        """
+        디코딩할 슬롯 가져오기 (생산자)
+
+        빈 슬롯이 없으면 소비되지 않은 가장 오래된 프레임을 덮어쓰고,
+        그것도 없으면 링 밖의 임시 슬롯을 반환합니다.
+        """
+        with self._cond:
+            for slot in self._slots:
+                if slot.state == FREE:
+                    slot.state = WRITING
+                    return slot
+            if self._ready:
+                slot = self._ready.popleft()
+                slot.state = WRITING
+                self.dropped += 1
+                return slot
+            self.overflows += 1
+            slot = _Slot(-1)
+            slot.state = WRITING
+            return slot
+
+    def commit(self, slot: _Slot, frame: np.ndarray, timestamp: Optional[float] = None):
+        """
+        디코딩 완료 (생산자)
+
+        Args:
+            slot: claim()으로 받은 슬롯
+            frame: cap.read(image=slot.buffer)의 반환 프레임
+                   (슬롯 버퍼가 아니면 새로 할당된 것이므로 슬롯 버퍼로 채택)
+            timestamp: 캡처 시각 (None이면 현재 시각)
+        """
+        with self._cond:
+            if frame is not slot.buffer:
+                slot.buffer = frame
+                if slot.index >= 0:
+                    self.allocations += 1
+            self._seq += 1
+            slot.seq = self._seq
+            slot.timestamp = time.time() if timestamp is None else timestamp
+            slot.state = READY
+            self._ready.append(slot)
+
+            while len(self._ready) > self.queue_size:
+                self._free(self._ready.popleft())
+                self.dropped += 1
+            self._cond.notify_all()
+
+    def abort(self, slot: _Slot):
+        """디코딩 실패 (생산자)"""
+        with self._cond:
+            self._free(slot)
+
+    def get(self, timeout: Optional[float] = None) -> Optional[FrameRef]:
+        """
+        가장 오래된 대기 프레임 가져오기 (소비자)
+
+        Args:
+            timeout: 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            FrameRef (사용 후 release 필요) 또는 None
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._ready, timeout=timeout):
+                return None
+            slot = self._ready.popleft()
+            slot.state = HELD
+            slot.refs = 1
+            self.delivered += 1
+            return FrameRef(self, slot)
+
+    def get_latest(self, timeout: Optional[float] = None, after_seq: int = 0) -> Optional[FrameRef]:
+        """
+        가장 최근 프레임 가져오기 (소비자, 메일박스 방식)
+
+        더 오래된 대기 프레임은 버립니다 (dropped에 포함).
+
+        Args:
+            timeout: 대기 시간 (초, None이면 무제한)
+            after_seq: 이 시퀀스 번호보다 새 프레임이 올 때까지 대기
+
+        Returns:
+            FrameRef (사용 후 release 필요) 또는 None
+        """
+        with self._cond:
+            ready = lambda: self._ready and self._ready[-1].seq > after_seq
+            if not self._cond.wait_for(ready, timeout=timeout):
+                return None
+            slot = self._ready.pop()
+            while self._ready:
+                self._free(self._ready.popleft())
+                self.dropped += 1
+            slot.state = HELD
+            slot.refs = 1
+            self.delivered += 1
+            return FrameRef(self, slot)
+
+    @property
+    def last_seq(self) -> int:
+        """마지막으로 디코딩된 프레임의 시퀀스 번호"""
+        return self._seq
+
+    def clear(self):
+        """대기 중인 프레임 모두 버리기"""
+        with self._cond:
+            while self._ready:
+                self._free(self._ready.popleft())
+
+    def _free(self, slot: _Slot):
+        slot.state = FREE
+        slot.refs = 0
+        if slot.index < 0:
+            slot.buffer = None
+
+    def _acquire(self, slot: _Slot):
+        with self._cond:
+            if slot.state != HELD:
+                raise RuntimeError("Cannot acquire a released frame")
+            slot.refs += 1
+
+    def _release(self, slot: _Slot):
+        with self._cond:
+            slot.refs -= 1
+            if slot.refs <= 0:
+                self._free(slot)
+
+    def get_stats(self) -> dict:
+        """링 버퍼 통계 반환"""
+        with self._cond:
+            states = [slot.state for slot in self._slots]
+        return {
+            "size": self.size,
+            "free": states.count(FREE),
+            "ready": states.count(READY),
+            "held": states.count(HELD),
+            "allocations": self.allocations,
+            "overflows": self.overflows,
+            "dropped": self.dropped,
+            "delivered": self.delivered
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Frame Ring Test ===")
+
+    ring = FrameRing(size=4, queue_size=2)
+    ring.allocate((1080, 1920, 3))
+
+    for i in range(10):
+        slot = ring.claim()
+        slot.buffer[:] = i              # cap.read(image=slot.buffer) 대신
+        ring.commit(slot, slot.buffer)
+
+    ref = ring.get(timeout=0.1)
+    print(f"  Oldest waiting frame: seq={ref.seq}, value={ref.frame[0, 0, 0]}")
+    extra = ref.acquire()
+    ref.release()
+    print(f"  After one release: {ring.get_stats()}")
+    extra.release()
+    print(f"  After all releases: {ring.get_stats()}")
+    print("Test completed!")
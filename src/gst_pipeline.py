@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+GStreamer 캡처 파이프라인 빌더
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+기존 파이프라인은 H.264 전체 해상도 프레임을 CPU videoconvert로 BGR 변환한
+뒤 PPEDetector.preprocess에서 다시 축소/RGB 변환했습니다. 이 모듈은
+축소와 색 변환을 파이프라인 안에서 처리하여 appsink가 모델 입력 크기에
+맞는 프레임을 내보내도록 합니다.
+
+특징:
+- H.264 / H.265 RTSP, 로컬 파일 (decodebin), videotestsrc 소스
+- Rockchip(RK3588)에서 mppvideodec 하드웨어 디코더 (없으면 avdec_* 소프트웨어 디코더)
+- 출력 형식 (BGR / RGB) 및 크기 지정, 한쪽만 지정하면 비율 유지
+- 선택적 전체 해상도 스냅샷 분기 (tee, 위반 이미지용 BGR)
+- 스냅샷 분기를 읽는 GstCapture (PyGObject 필요, OpenCV는 appsink 하나만 읽음)
+
+사용 예시:
+    from gst_pipeline import GstPipelineConfig, build_pipeline, GstCapture
+
+    # OpenCV 캡처용 (appsink 하나)
+    pipeline = build_pipeline(GstPipelineConfig(
+        source="rtsp://192.168.1.100:554/stream",
+        codec="h265",
+        output_width=640
+    ))
+    cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+
+    # 모델 입력(RGB 640폭) + 전체 해상도 스냅샷
+    capture = GstCapture(GstPipelineConfig(
+        source="rtsp://192.168.1.100:554/stream",
+        output_format="RGB",
+        output_width=640,
+        snapshot=True
+    ))
+    capture.start()
+    frame = capture.get_frame()            # (360, 640, 3) RGB
+    snapshot = capture.get_snapshot(frame=frame)   # 같은 프레임의 (1080, 1920, 3) BGR
+    capture.stop()
+"""
+
+import functools
+import shutil
+import subprocess
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# GStreamer Python 바인딩 (선택)
+try:
+    import gi
+    gi.require_version("Gst", "1.0")
+    from gi.repository import Gst
+    Gst.init(None)
+    HAS_GST = True
+except (ImportError, ValueError):
+    HAS_GST = False
+
+
+CODECS = ("h264", "h265", "auto")
+OUTPUT_FORMATS = ("BGR", "RGB")
+
+# 소프트웨어 디코더 (gst-libav)
+SOFTWARE_DECODERS = {"h264": "avdec_h264", "h265": "avdec_h265"}
+
+# appsink 공통 설정: 최신 프레임 하나만 보관, 클럭 동기화 없음
+APPSINK_OPTIONS = "drop=true max-buffers=1 sync=false"
+
+
+@dataclass
+class GstPipelineConfig:
+    """
+    캡처 파이프라인 설정
+
+    Attributes:
+        source: RTSP URL, 로컬 영상 파일 경로 또는 "videotestsrc"
+        codec: RTSP 스트림 코덱 ("h264", "h265", "auto"면 decodebin)
+        decoder: 디코더 요소 ("auto"면 Rockchip은 mppvideodec, 그 외 avdec_*)
+        output_format: appsink 출력 색 형식 ("BGR" 또는 "RGB")
+        output_width: 출력 너비 (None이면 원본, 높이만 지정하면 비율 유지)
+        output_height: 출력 높이 (None이면 원본, 너비만 지정하면 비율 유지)
+        snapshot: 전체 해상도 BGR 스냅샷 분기 추가 (GstCapture로 읽음)
+        hw_scale: 너비/높이를 모두 지정하면 mppvideodec에서 축소/변환
+                  (스냅샷 분기가 있으면 사용하지 않음)
+        latency_ms: rtspsrc 지터 버퍼 (ms)
+        rtsp_tcp: RTSP를 TCP로 수신 (패킷 손실이 잦은 현장 네트워크)
+        test_size: videotestsrc 해상도
+        test_fps: videotestsrc 프레임 레이트
+    """
+    source: str
+    codec: str = "h264"
+    decoder: str = "auto"
+    output_format: str = "BGR"
+    output_width: Optional[int] = None
+    output_height: Optional[int] = None
+    snapshot: bool = False
+    hw_scale: bool = True
+    latency_ms: int = 0
+    rtsp_tcp: bool = False
+    test_size: Tuple[int, int] = (1280, 720)
+    test_fps: int = 30
+
+
+@functools.lru_cache(maxsize=None)
+def is_rockchip() -> bool:
+    """Rockchip SoC (RK3588 등) 여부"""
+    try:
+        with open("/proc/device-tree/compatible", "rb") as f:
+            return b"rockchip" in f.read()
+    except OSError:
+        return False
+
+
+@functools.lru_cache(maxsize=None)
+def element_available(name: str) -> bool:
+    """GStreamer 요소 설치 여부 (PyGObject 또는 gst-inspect-1.0으로 확인)"""
+    if HAS_GST:
+        return Gst.ElementFactory.find(name) is not None
+    inspect = shutil.which("gst-inspect-1.0")
+    if inspect is None:
+        return False
+    try:
+        result = subprocess.run([inspect, "--exists", name], capture_output=True, timeout=10)
+    except (OSError, subprocess.TimeoutExpired):
+        return False
+    return result.returncode == 0
+
+
+def gstreamer_available() -> bool:
+    """GStreamer로 파이프라인을 실행할 수 있는지 (PyGObject 또는 OpenCV GStreamer 빌드)"""
+    return HAS_GST or opencv_has_gstreamer()
+
+
+@functools.lru_cache(maxsize=None)
+def opencv_has_gstreamer() -> bool:
+    """OpenCV가 GStreamer 지원으로 빌드되었는지"""
+    import cv2
+    for line in cv2.getBuildInformation().splitlines():
+        if "GStreamer" in line:
+            return "YES" in line
+    return False
+
+
+def select_decoder(codec: str, decoder: str = "auto") -> str:
+    """
+    디코더 요소 선택
+
+    Args:
+        codec: "h264", "h265" 또는 "auto"
+        decoder: 명시한 디코더 ("auto"면 자동 선택)
+
+    Returns:
+        디코더 요소 이름
+    """
+    if decoder != "auto":
+        return decoder
+    if codec == "auto":
+        return "decodebin"
+    if is_rockchip():
+        # 요소 목록을 확인할 수 없으면 (gst-inspect 없음) Rockchip 이미지 기본값인 MPP 사용
+        can_inspect = HAS_GST or shutil.which("gst-inspect-1.0") is not None
+        if element_available("mppvideodec") or not can_inspect:
+            return "mppvideodec"
+    return SOFTWARE_DECODERS[codec]
+
+
+def _caps(output_format: str, width: Optional[int] = None, height: Optional[int] = None) -> str:
+    caps = f"video/x-raw,format={output_format}"
+    if width:
+        caps += f",width={width}"
+    if height:
+        caps += f",height={height}"
+    if width or height:
+        # 한쪽만 지정하면 videoscale이 화면 비율을 유지하도록 정사각 픽셀 고정
+        caps += ",pixel-aspect-ratio=1/1"
+    return caps
+
+
+def _source_chain(config: GstPipelineConfig) -> List[str]:
+    """소스부터 디코더까지"""
+    source = config.source
+    if source == "videotestsrc":
+        w, h = config.test_size
+        return [
+            "videotestsrc is-live=true pattern=ball",
+            f"video/x-raw,width={w},height={h},framerate={config.test_fps}/1"
+        ]
+
+    if not source.startswith(("rtsp://", "rtsps://")):
+        path = source[len("file://"):] if source.startswith("file://") else source
+        return [f"filesrc location=\"{path}\"", "decodebin"]
+
+    chain = [f"rtspsrc location={source} latency={config.latency_ms}"
+             + (" protocols=tcp" if config.rtsp_tcp else "")]
+    codec = config.codec
+    if codec == "auto":
+        chain.append("decodebin")
+        return chain
+
+    short = "h264" if codec == "h264" else "h265"
+    chain += [f"rtp{short}depay", f"{short}parse"]
+
+    decoder = select_decoder(codec, config.decoder)
+    hw_scale = (
+        decoder == "mppvideodec" and config.hw_scale and not config.snapshot
+        and config.output_width and config.output_height
+    )
+    if hw_scale:
+        # RGA로 디코더 안에서 축소/색 변환 (이후 videoconvert/videoscale은 통과만 함)
+        decoder += (f" width={config.output_width} height={config.output_height}"
+                    f" format={config.output_format}")
+    chain.append(decoder)
+    return chain
+
+
+def _output_chain(config: GstPipelineConfig, sink_name: str = "model") -> List[str]:
+    """축소/색 변환 후 appsink"""
+    chain = ["videoconvert"]
+    if config.output_width or config.output_height:
+        chain.append("videoscale")
+    chain.append(_caps(config.output_format, config.output_width, config.output_height))
+    chain.append(f"appsink name={sink_name} {APPSINK_OPTIONS}")
+    return chain
+
+
+def build_pipeline(config: GstPipelineConfig) -> str:
+    """
+    gst-launch 형식 파이프라인 문자열 생성
+
+    스냅샷 분기가 없으면 appsink 하나이므로 cv2.VideoCapture(..., cv2.CAP_GSTREAMER)로
+    바로 열 수 있습니다. 스냅샷 분기가 있으면 appsink가 "model", "snapshot"
+    두 개이므로 GstCapture를 사용하세요.
+
+    Args:
+        config: 파이프라인 설정
+
+    Returns:
+        파이프라인 문자열
+    """
+    if config.codec not in CODECS:
+        raise ValueError(f"Unknown codec: {config.codec} (expected one of {CODECS})")
+    if config.output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {config.output_format}")
+
+    source = _source_chain(config)
+    if not config.snapshot:
+        return " ! ".join(source + _output_chain(config))
+
+    # 디코더 뒤에서 분기: 스냅샷은 전체 해상도 BGR, 모델 분기는 축소
+    # 각 분기 큐는 최신 버퍼 하나만 (느린 소비자가 다른 분기를 막지 않음)
+    queue = "queue leaky=downstream max-size-buffers=1"
+    snapshot = [queue, "videoconvert", _caps("BGR"), f"appsink name=snapshot {APPSINK_OPTIONS}"]
+    model = [queue] + _output_chain(config)
+    return (
+        " ! ".join(source + ["tee name=t"])
+        + " t. ! " + " ! ".join(model)
+        + " t. ! " + " ! ".join(snapshot)
+    )
+
+
+class GstCapture:
+    """
+    PyGObject로 파이프라인을 직접 실행하는 캡처
+
+    OpenCV는 appsink 하나만 읽을 수 있으므로 스냅샷 분기를 함께 쓰려면
+    이 클래스를 사용합니다. 카메라 인터페이스(start/stop/get_frame/
+    resolution/fps/is_connected)를 제공합니다.
+
+    별도 읽기 스레드 없이 get_frame()을 호출한 스레드에서 읽습니다.
+    오류/EOS로 파이프라인이 멈추면 해제한 뒤 reconnect_delay초 후
+    get_frame()에서 다시 만듭니다 (RTSPReader의 재연결 루프와 같은 동작).
+
+    스냅샷은 모델 프레임과 버퍼 PTS로 짝지어, 최근 snapshot_history개의
+    스냅샷 샘플을 변환하지 않고 보관합니다. 파이프라인 모드처럼 감지가
+    캡처보다 늦게 끝나도 get_snapshot(frame=...)은 그 프레임의 스냅샷을
+    돌려줍니다.
+    """
+
+    def __init__(self, config: GstPipelineConfig, reconnect_delay: float = 5.0,
+                 snapshot_history: int = 8):
+        """
+        Args:
+            config: 파이프라인 설정
+            reconnect_delay: 연결 끊김 후 재연결 대기 시간 (초)
+            snapshot_history: 모델 프레임과 짝지을 최근 스냅샷 보관 수
+        """
+        if not HAS_GST:
+            raise RuntimeError("GstCapture requires PyGObject (python3-gi, gir1.2-gstreamer-1.0)")
+        self.config = config
+        self.reconnect_delay = reconnect_delay
+        self.pipeline_string = build_pipeline(config)
+        self.pipeline = None
+        self._model_sink = None
+        self._snapshot_sink = None
+        self.running = False
+        self._reconnect_at = 0.0
+        self._resolution: Tuple[int, int] = (0, 0)
+
+        # 스냅샷 짝짓기: (PTS, 샘플), (모델 프레임 weakref, PTS)
+        self._snapshot_lock = threading.Lock()
+        self._snapshot_samples: deque = deque(maxlen=snapshot_history)
+        self._frame_pts: deque = deque(maxlen=snapshot_history)
+
+        # 통계
+        self.frames = 0
+        self.snapshots = 0
+        self.snapshot_misses = 0    # 짝이 맞는 스냅샷이 없어 모델 프레임을 쓴 수
+        self.errors = 0
+        self.reconnects = 0         # 누적 재연결 시도 수
+
+    def start(self) -> bool:
+        """파이프라인 시작"""
+        if self.running:
+            return True
+        if not self._open():
+            return False
+        self.running = True
+        return True
+
+    def _open(self) -> bool:
+        """파이프라인 생성 후 재생"""
+        try:
+            pipeline = Gst.parse_launch(self.pipeline_string)
+        except Exception as e:
+            print(f"[GST] Failed to build pipeline: {e}")
+            return False
+
+        if pipeline.set_state(Gst.State.PLAYING) == Gst.StateChangeReturn.FAILURE:
+            print("[GST] Failed to start pipeline")
+            pipeline.set_state(Gst.State.NULL)
+            return False
+
+        self._model_sink = pipeline.get_by_name("model")
+        self._snapshot_sink = pipeline.get_by_name("snapshot")
+        self.pipeline = pipeline
+        print(f"[GST] Started: {self.pipeline_string}")
+        return True
+
+    def _close(self):
+        """파이프라인 해제"""
+        pipeline, self.pipeline = self.pipeline, None
+        self._model_sink = self._snapshot_sink = None
+        with self._snapshot_lock:
+            self._snapshot_samples.clear()
+            self._frame_pts.clear()
+        if pipeline is not None:
+            pipeline.set_state(Gst.State.NULL)
+
+    def stop(self):
+        """파이프라인 정지"""
+        self.running = False
+        self._close()
+        print("[GST] Stopped")
+
+    @staticmethod
+    def _to_array(sample) -> Optional[np.ndarray]:
+        """GstSample → (H, W, 3) uint8 배열 (행 패딩 제거, 복사본)"""
+        if sample is None:
+            return None
+        structure = sample.get_caps().get_structure(0)
+        width = structure.get_value("width")
+        height = structure.get_value("height")
+        buffer = sample.get_buffer()
+        ok, info = buffer.map(Gst.MapFlags.READ)
+        if not ok:
+            return None
+        try:
+            data = np.frombuffer(info.data, dtype=np.uint8)
+            stride = len(data) // height
+            rows = data[:stride * height].reshape(height, stride)
+            return rows[:, :width * 3].reshape(height, width, 3).copy()
+        finally:
+            buffer.unmap(info)
+
+    def _check_bus(self):
+        """오류/EOS 확인 (연결 끊김 등), 있으면 파이프라인 해제 후 재연결 예약"""
+        pipeline = self.pipeline
+        if pipeline is None:
+            return
+        message = pipeline.get_bus().pop_filtered(Gst.MessageType.ERROR | Gst.MessageType.EOS)
+        if message is None:
+            return
+        if message.type == Gst.MessageType.ERROR:
+            error, _ = message.parse_error()
+            print(f"[GST] Pipeline error: {error.message}")
+            self.errors += 1
+        else:
+            print("[GST] End of stream")
+        self._close()
+        self._reconnect_at = time.time() + self.reconnect_delay
+        print(f"[GST] Reconnecting in {self.reconnect_delay}s...")
+
+    def _reconnect(self, timeout: float) -> bool:
+        """재연결 시각이 되었으면 파이프라인 재생성 (아니면 timeout 안에서 대기)"""
+        wait = self._reconnect_at - time.time()
+        if wait > timeout:
+            time.sleep(timeout)
+            return False
+        if wait > 0:
+            time.sleep(wait)
+
+        self.reconnects += 1
+        if self._open():
+            return True
+        self._reconnect_at = time.time() + self.reconnect_delay
+        return False
+
+    def get_frame(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        모델 분기 프레임 가져오기
+
+        Returns:
+            (H, W, 3) 프레임 (output_format 색 순서) 또는 None
+        """
+        if not self.running:
+            return None
+        if self.pipeline is None and not self._reconnect(timeout):
+            return None
+        sample = self._model_sink.emit("try-pull-sample", int(timeout * Gst.SECOND))
+        frame = self._to_array(sample)
+        if frame is None:
+            self._check_bus()
+            return None
+        self._resolution = (frame.shape[1], frame.shape[0])
+        self.frames += 1
+
+        if self._snapshot_sink is not None:
+            pts = sample.get_buffer().pts
+            with self._snapshot_lock:
+                if pts != Gst.CLOCK_TIME_NONE:
+                    self._frame_pts.append((weakref.ref(frame), pts))
+                self._pull_snapshots(0.0)
+        return frame
+
+    def _pull_snapshots(self, timeout: float, until_pts: Optional[int] = None):
+        """
+        대기 중인 스냅샷 샘플을 보관 목록에 추가 (_snapshot_lock 보유 상태에서 호출)
+
+        until_pts가 있으면 그 PTS 이상의 스냅샷이 올 때까지 timeout초 대기합니다.
+        """
+        sink = self._snapshot_sink
+        deadline = time.time() + timeout
+        while sink is not None:
+            remaining = max(0.0, deadline - time.time())
+            if until_pts is None or (self._snapshot_samples and self._snapshot_samples[-1][0] >= until_pts):
+                remaining = 0.0
+            sample = sink.emit("try-pull-sample", int(remaining * Gst.SECOND))
+            if sample is None:
+                return
+            self._snapshot_samples.append((sample.get_buffer().pts, sample))
+
+    def get_snapshot(self, timeout: float = 0.5, frame: Optional[np.ndarray] = None) -> Optional[np.ndarray]:
+        """
+        전체 해상도 BGR 스냅샷
+
+        Args:
+            timeout: 스냅샷 대기 시간 (초)
+            frame: get_frame()이 반환한 모델 프레임 (None이면 가장 최근 스냅샷)
+
+        Returns:
+            스냅샷 또는 None (스냅샷 분기 없음/아직 프레임 없음/frame과 짝이 맞는 스냅샷 없음)
+        """
+        if not self.running or self._snapshot_sink is None:
+            return None
+
+        with self._snapshot_lock:
+            if frame is None:
+                # 보관된 스냅샷이 없을 때만 대기
+                self._pull_snapshots(timeout, until_pts=-1 if not self._snapshot_samples else None)
+                sample = self._snapshot_samples[-1][1] if self._snapshot_samples else None
+            else:
+                pts = next((p for ref, p in self._frame_pts if ref() is frame), None)
+                sample = None
+                if pts is not None:
+                    self._pull_snapshots(timeout, until_pts=pts)
+                    sample = next((s for p, s in self._snapshot_samples if p == pts), None)
+                if sample is None:
+                    self.snapshot_misses += 1
+
+        snapshot = self._to_array(sample)
+        if snapshot is not None:
+            self.snapshots += 1
+        return snapshot
+
+    @property
+    def output_format(self) -> str:
+        """get_frame() 프레임 색 순서 ("BGR" 또는 "RGB")"""
+        return self.config.output_format
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """모델 분기 출력 해상도 (첫 프레임 이후)"""
+        return self._resolution
+
+    @property
+    def fps(self) -> float:
+        """설정 FPS (videotestsrc) 또는 0"""
+        return float(self.config.test_fps) if self.config.source == "videotestsrc" else 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        """재생 중 여부 (재연결 대기 중이면 False)"""
+        return self.running and self.pipeline is not None
+
+    def get_stats(self) -> dict:
+        """캡처 통계 반환"""
+        return {
+            "connected": self.is_connected,
+            "frames": self.frames,
+            "snapshots": self.snapshots,
+            "snapshot_misses": self.snapshot_misses,
+            "errors": self.errors,
+            "reconnects": self.reconnects,
+            "resolution": self._resolution
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== GStreamer Pipeline Builder Test ===")
+    print(f"  Rockchip: {is_rockchip()}, PyGObject: {HAS_GST}, OpenCV GStreamer: {opencv_has_gstreamer()}")
+
+    examples = [
+        GstPipelineConfig(source="rtsp://192.168.1.100:554/stream"),
+        GstPipelineConfig(source="rtsp://192.168.1.100:554/stream", codec="h265",
+                          output_format="RGB", output_width=640),
+        GstPipelineConfig(source="videotestsrc", output_width=640, snapshot=True),
+    ]
+    for config in examples:
+        print(f"  {build_pipeline(config)}")
+
+    if HAS_GST:
+        capture = GstCapture(GstPipelineConfig(source="videotestsrc", output_format="RGB",
+                                               output_width=640, snapshot=True))
+        if capture.start():
+            frame = capture.get_frame(timeout=2.0)
+            snapshot = capture.get_snapshot(frame=frame)
+            print(f"  Model frame: {None if frame is None else frame.shape}, "
+                  f"snapshot: {None if snapshot is None else snapshot.shape}")
+            capture.stop()
+    print("Test completed!")
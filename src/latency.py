@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+단계별 지연 시간 히스토그램
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+마지막 한 프레임의 추론 시간만으로 FPS를 계산하면 느린 프레임 하나가
+구간 전체를 대표하게 되고, 캡처 대기나 알림 시간은 빠집니다. 이 모듈은
+단계마다 고정 버킷 히스토그램에 지연 시간을 누적하고 (기록 시 할당 없음,
+이진 탐색 한 번), 처리량은 실제로 완료된 프레임 수로 계산합니다.
+
+단계:
+- capture_wait: 카메라에서 프레임을 기다린 시간
+- frame_age: 추론을 시작할 때 프레임의 나이 (캡처 시각부터)
+- preprocess / infer / postprocess: 감지 단계
+- detect: 감지 전체 (풀 모드에서는 제출부터 결과까지)
+- alert: S3 업로드 요청 + MQTT 발행
+- end_to_end: 캡처 시각부터 처리 완료까지 (frame_age 포함, 순차/파이프라인 모드 동일)
+
+버킷은 0.05ms ~ 30s 구간을 2^(1/4) 배율로 나눈 로그 간격이며,
+백분위수는 버킷 안에서 선형 보간합니다 (상대 오차 약 10% 이내).
+
+사용 예시:
+    from latency import LatencyRecorder
+
+    latency = LatencyRecorder()
+    with latency.time("preprocess"):
+        preprocess(frame)
+    latency.record("infer", 0.021)
+    latency.tick()                      # 프레임 완료 (처리량)
+
+    latency.get_stats()                 # 누적 통계
+    latency.interval_stats()            # 직전 호출 이후 통계 (상태 보고용)
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence
+
+
+STAGES = ("capture_wait", "frame_age", "preprocess", "infer", "postprocess", "detect", "alert", "end_to_end")
+
+
+def default_bounds(low_ms: float = 0.05, high_ms: float = 30000.0, factor: float = 2 ** 0.25) -> List[float]:
+    """로그 간격 버킷 상한 (ms)"""
+    bounds = []
+    bound = low_ms
+    while bound < high_ms:
+        bounds.append(round(bound, 6))
+        bound *= factor
+    bounds.append(high_ms)
+    return bounds
+
+
+DEFAULT_BOUNDS = default_bounds()
+
+
+class LatencyHistogram:
+    """
+    고정 버킷 지연 시간 히스토그램
+
+    counts[i]는 bounds[i-1] < 값 <= bounds[i] (ms)인 샘플 수이며,
+    마지막 버킷은 상한 초과 값을 받습니다.
+    """
+
+    def __init__(self, bounds: Optional[Sequence[float]] = None):
+        """
+        Args:
+            bounds: 오름차순 버킷 상한 (ms, 기본 DEFAULT_BOUNDS)
+        """
+        self.bounds = list(bounds) if bounds is not None else DEFAULT_BOUNDS
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+        # interval_stats()용 직전 스냅샷
+        self._last_counts = list(self.counts)
+        self._last_count = 0
+        self._last_total = 0.0
+        self._interval_max = 0.0
+
+    def record(self, seconds: float):
+        """지연 시간 기록 (초)"""
+        ms = seconds * 1000.0
+        index = bisect.bisect_left(self.bounds, ms)
+        with self._lock:
+            self.counts[index] += 1
+            self.count += 1
+            self.total += ms
+            if ms > self.max:
+                self.max = ms
+            if ms > self._interval_max:
+                self._interval_max = ms
+
+    def _percentiles(self, counts: List[int], count: int, max_ms: float, qs: Sequence[float]) -> List[float]:
+        """버킷 안 선형 보간 백분위수 (ms)"""
+        results = []
+        for q in qs:
+            rank = q / 100.0 * count
+            cumulative = 0
+            value = max_ms
+            for i, bucket in enumerate(counts):
+                if bucket and cumulative + bucket >= rank:
+                    lower = self.bounds[i - 1] if i > 0 else 0.0
+                    upper = self.bounds[i] if i < len(self.bounds) else max_ms
+                    value = lower + (upper - lower) * (rank - cumulative) / bucket
+                    break
+                cumulative += bucket
+            results.append(min(value, max_ms))
+        return results
+
+    def percentile(self, q: float) -> float:
+        """누적 백분위수 (ms)"""
+        with self._lock:
+            counts, count, max_ms = list(self.counts), self.count, self.max
+        if not count:
+            return 0.0
+        return self._percentiles(counts, count, max_ms, [q])[0]
+
+    @staticmethod
+    def _summary(percentiles: List[float], count: int, total: float, max_ms: float) -> dict:
+        p50, p95, p99 = percentiles
+        return {
+            "count": count,
+            "mean": round(total / count, 3),
+            "p50": round(p50, 3),
+            "p95": round(p95, 3),
+            "p99": round(p99, 3),
+            "max": round(max_ms, 3),
+        }
+
+    def get_stats(self) -> dict:
+        """누적 통계 (ms)"""
+        with self._lock:
+            counts, count, total, max_ms = list(self.counts), self.count, self.total, self.max
+        if not count:
+            return {"count": 0}
+        return self._summary(self._percentiles(counts, count, max_ms, (50, 95, 99)), count, total, max_ms)
+
+    def interval_stats(self) -> dict:
+        """직전 interval_stats() 호출 이후 통계 (ms)"""
+        with self._lock:
+            counts = [c - last for c, last in zip(self.counts, self._last_counts)]
+            count = self.count - self._last_count
+            total = self.total - self._last_total
+            max_ms = self._interval_max
+
+            self._last_counts = list(self.counts)
+            self._last_count = self.count
+            self._last_total = self.total
+            self._interval_max = 0.0
+        if not count:
+            return {"count": 0}
+        return self._summary(self._percentiles(counts, count, max_ms, (50, 95, 99)), count, total, max_ms)
+
+
+class ThroughputMeter:
+    """
+    최근 window초 동안 완료된 프레임 수 기반 처리량
+
+    1초 단위 원형 카운터를 사용하므로 메모리와 기록 비용이 일정합니다.
+    """
+
+    def __init__(self, window: int = 10):
+        """
+        Args:
+            window: 처리량 계산 구간 (초)
+        """
+        self.window = window
+        self._counts = [0] * window
+        self._seconds = [-1] * window
+        self._start = time.time()
+        self.total = 0
+        self._lock = threading.Lock()
+
+    def tick(self, now: Optional[float] = None, count: int = 1):
+        """프레임 완료 기록"""
+        now = time.time() if now is None else now
+        second = int(now)
+        slot = second % self.window
+        with self._lock:
+            if self._seconds[slot] != second:
+                self._seconds[slot] = second
+                self._counts[slot] = 0
+            self._counts[slot] += count
+            self.total += count
+
+    def rate(self, now: Optional[float] = None) -> float:
+        """초당 완료 프레임 수"""
+        now = time.time() if now is None else now
+        second = int(now)
+        with self._lock:
+            events = sum(
+                c for c, s in zip(self._counts, self._seconds)
+                if second - self.window < s <= second
+            )
+        # 현재 초는 경과한 만큼만, 시작 직후에는 실제 경과 시간으로 나눔
+        elapsed = min(self.window - 1 + (now - second), max(now - self._start, 1e-6))
+        return events / elapsed
+
+
+class LatencyRecorder:
+    """
+    단계별 히스토그램 + 처리량
+
+    알 수 없는 단계 이름도 처음 기록할 때 히스토그램을 만들어 받습니다.
+    """
+
+    def __init__(self, stages: Sequence[str] = STAGES, throughput_window: int = 10):
+        """
+        Args:
+            stages: 미리 만들 단계 이름 (보고 순서)
+            throughput_window: 처리량 계산 구간 (초)
+        """
+        self.histograms: Dict[str, LatencyHistogram] = {stage: LatencyHistogram() for stage in stages}
+        self.throughput = ThroughputMeter(throughput_window)
+        self._lock = threading.Lock()
+
+    def histogram(self, stage: str) -> LatencyHistogram:
+        """단계 히스토그램 (없으면 생성)"""
+        hist = self.histograms.get(stage)
+        if hist is None:
+            with self._lock:
+                hist = self.histograms.setdefault(stage, LatencyHistogram())
+        return hist
+
+    def record(self, stage: str, seconds: float):
+        """단계 지연 시간 기록 (초)"""
+        self.histogram(stage).record(seconds)
+
+    @contextmanager
+    def time(self, stage: str):
+        """with 블록 실행 시간 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start)
+
+    def tick(self, count: int = 1):
+        """프레임 완료 (처리량 집계)"""
+        self.throughput.tick(count=count)
+
+    @property
+    def fps(self) -> float:
+        """최근 처리량 (프레임/초)"""
+        return self.throughput.rate()
+
+    def get_stats(self) -> dict:
+        """누적 단계별 통계 (기록이 있는 단계만)"""
+        stages = {}
+        for stage, hist in list(self.histograms.items()):
+            stats = hist.get_stats()
+            if stats["count"]:
+                stages[stage] = stats
+        return {
+            "throughput_fps": round(self.fps, 2),
+            "frames": self.throughput.total,
+            "stages_ms": stages
+        }
+
+    def interval_stats(self) -> dict:
+        """직전 호출 이후 단계별 통계 (기록이 있는 단계만)"""
+        stages = {}
+        for stage, hist in list(self.histograms.items()):
+            stats = hist.interval_stats()
+            if stats["count"]:
+                stages[stage] = stats
+        return {
+            "throughput_fps": round(self.fps, 2),
+            "frames": self.throughput.total,
+            "stages_ms": stages
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import random
+
+    print("=== Latency Histogram Test ===")
+    print(f"Buckets: {len(DEFAULT_BOUNDS)}")
+
+    recorder = LatencyRecorder()
+    samples = [random.lognormvariate(-3.9, 0.3) for _ in range(100000)]
+
+    start = time.perf_counter()
+    for s in samples:
+        recorder.record("infer", s)
+    elapsed = time.perf_counter() - start
+    print(f"record(): {elapsed / len(samples) * 1e9:.0f} ns/sample")
+
+    exact = sorted(s * 1000 for s in samples)
+    stats = recorder.histogram("infer").get_stats()
+    for q in (50, 95, 99):
+        print(f"p{q}: histogram {stats[f'p{q}']:.3f} ms, exact {exact[int(len(exact) * q / 100)]:.3f} ms")
+    print("Test completed!")
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+적응형 부하 조절 (load shedding)
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+장치가 처리 속도를 따라가지 못하면 RTSPReader는 프레임을 조용히 버리고
+처리 루프는 프레임마다 같은 작업을 계속하여, 알림 지연이 끝없이 늘어납니다.
+이 모듈은 종단 간 지연 시간, 큐 깊이, CPU 부하를 주기적으로 확인하여
+단계적으로 작업을 줄이고, 부하가 내려가면 역순으로 되돌립니다.
+
+부하 단계 (숫자가 클수록 더 많이 줄임, 각 단계는 이전 단계를 포함):
+    0 normal:        전체 작업
+    1 reduce_rate:   카메라별 추론 빈도 제한
+    2 small_input:   작은 입력 크기 모델로 교체
+    3 no_overlay:    결과 시각화 생략 (미리보기 전달, 위반 이미지 박스 그리기)
+    4 defer_uploads: S3 업로드 보류 (알림은 즉시 발행, 이미지는 부하가 내려간 뒤 업로드)
+
+판정:
+- 과부하: 지연 시간 p95, 큐 깊이, CPU 부하 중 하나라도 목표치 초과
+- 여유: 모두 목표치 × recover_ratio 미만 (CPU 값이 없으면 제외)
+- degrade_after번 연속 과부하면 한 단계 올리고, recover_after번 연속 여유면
+  한 단계 내림 (히스테리시스). 단계 변경 후 min_dwell초 동안은 유지.
+
+사용 예시:
+    from load_shedder import LoadShedder, LoadShedConfig, CpuMonitor
+
+    shedder = LoadShedder(LoadShedConfig(latency_target_ms=500), on_change=apply_level)
+    cpu = CpuMonitor()
+
+    shedder.observe(time.time() - capture_time)     # 프레임 완료마다
+    change = shedder.evaluate(queue_depth=3, cpu_load=cpu.sample())   # 1초마다
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, Iterable, Optional, Tuple
+
+from latency import LatencyHistogram
+
+
+LEVELS = ("normal", "reduce_rate", "small_input", "no_overlay", "defer_uploads")
+
+
+@dataclass
+class LoadShedConfig:
+    """
+    부하 조절 설정
+
+    Attributes:
+        latency_target_ms: 종단 간 지연 시간 p95 목표 (ms)
+        queue_target: 큐 깊이 목표
+        cpu_target: CPU 부하 목표 (0~1, 코어 수로 나눈 값)
+        recover_ratio: 여유로 판단할 목표 대비 비율
+        degrade_after: 단계를 올리기 전 연속 과부하 판정 수
+        recover_after: 단계를 내리기 전 연속 여유 판정 수
+        min_dwell: 단계 변경 후 최소 유지 시간 (초)
+    """
+    latency_target_ms: float = 500.0
+    queue_target: int = 4
+    cpu_target: float = 0.9
+    recover_ratio: float = 0.6
+    degrade_after: int = 3
+    recover_after: int = 10
+    min_dwell: float = 5.0
+
+
+class CpuMonitor:
+    """
+    CPU 사용률 측정
+
+    /proc/stat의 직전 sample() 이후 비유휴 시간 비율을 사용합니다.
+    /proc/stat이 없으면 1분 평균 부하(os.getloadavg)를 코어 수로 나눈
+    값을, 그것도 없으면 None을 반환합니다.
+    """
+
+    def __init__(self, stat_path: str = "/proc/stat"):
+        self.stat_path = stat_path
+        self._last: Optional[Tuple[int, int]] = self._read_stat()
+
+    def _read_stat(self) -> Optional[Tuple[int, int]]:
+        """(전체, 유휴) jiffies"""
+        try:
+            with open(self.stat_path) as f:
+                fields = f.readline().split()
+        except OSError:
+            return None
+        if not fields or fields[0] != "cpu":
+            return None
+        values = [int(v) for v in fields[1:]]
+        idle = values[3] + (values[4] if len(values) > 4 else 0)     # idle + iowait
+        return sum(values[:8]), idle
+
+    def sample(self) -> Optional[float]:
+        """직전 호출 이후 CPU 사용률 (0~1)"""
+        current = self._read_stat()
+        if current is None:
+            try:
+                return os.getloadavg()[0] / (os.cpu_count() or 1)
+            except (AttributeError, OSError):
+                return None
+
+        last, self._last = self._last, current
+        if last is None:
+            return None
+        total = current[0] - last[0]
+        if total <= 0:
+            return None
+        return max(0.0, min(1.0, 1.0 - (current[1] - last[1]) / total))
+
+
+class LoadShedder:
+    """
+    부하 단계 제어기
+
+    observe()는 처리 스레드에서 프레임마다 호출해도 되도록 히스토그램에
+    기록만 하며, 판정은 evaluate()에서 합니다. 단계가 바뀌면
+    on_change(이전 단계, 새 단계, 이유)를 evaluate()를 호출한 스레드에서
+    호출합니다.
+    """
+
+    def __init__(
+        self,
+        config: Optional[LoadShedConfig] = None,
+        on_change: Optional[Callable[[int, int, str], None]] = None,
+        skip_levels: Iterable[str] = (),
+        history: int = 20
+    ):
+        """
+        Args:
+            config: 부하 조절 설정
+            on_change: 단계 변경 콜백 (이전 단계, 새 단계, 이유)
+            skip_levels: 사용할 수 없는 단계 이름 (예: 작은 모델이 없으면 "small_input")
+            history: 보관할 최근 단계 변경 수
+        """
+        self.config = config or LoadShedConfig()
+        self.on_change = on_change
+        self.skip_levels = set(skip_levels)
+        unknown = self.skip_levels - set(LEVELS)
+        if unknown:
+            raise ValueError(f"Unknown load shed levels: {sorted(unknown)}")
+
+        self.level = 0
+        self._latency = LatencyHistogram()
+        self._over = 0
+        self._under = 0
+        self._last_change = 0.0
+        self._lock = threading.Lock()
+
+        # 마지막 판정 입력
+        self.latency_ms = 0.0
+        self.queue_depth = 0
+        self.cpu_load: Optional[float] = None
+
+        # 통계
+        self.evaluations = 0
+        self.degrades = 0
+        self.recoveries = 0
+        self.changes: Deque[dict] = deque(maxlen=history)
+        self.time_in_level = [0.0] * len(LEVELS)
+        self._level_since = time.time()
+
+    @property
+    def level_name(self) -> str:
+        return LEVELS[self.level]
+
+    def active(self, name: str) -> bool:
+        """단계 name의 조치가 적용 중인지 여부"""
+        return name not in self.skip_levels and self.level >= LEVELS.index(name)
+
+    def observe(self, latency: float):
+        """프레임 종단 간 지연 시간 기록 (초, 캡처부터 처리 완료까지)"""
+        self._latency.record(latency)
+
+    def _next_level(self, step: int) -> int:
+        """사용 가능한 다음 단계 (없으면 현재 단계)"""
+        level = self.level + step
+        while 0 < level < len(LEVELS) and LEVELS[level] in self.skip_levels:
+            level += step
+        return level if 0 <= level < len(LEVELS) else self.level
+
+    def evaluate(
+        self,
+        queue_depth: int = 0,
+        cpu_load: Optional[float] = None,
+        now: Optional[float] = None
+    ) -> Optional[dict]:
+        """
+        직전 evaluate() 이후의 지연 시간과 현재 큐 깊이/CPU 부하로 단계 판정
+
+        Args:
+            queue_depth: 처리 대기 중인 항목 수
+            cpu_load: CPU 부하 (0~1, None이면 판정에서 제외)
+            now: 현재 시각 (테스트용)
+
+        Returns:
+            단계가 바뀌었으면 변경 기록 딕셔너리, 아니면 None
+        """
+        now = time.time() if now is None else now
+        cfg = self.config
+        stats = self._latency.interval_stats()
+        latency_ms = stats.get("p95", 0.0)
+
+        with self._lock:
+            self.evaluations += 1
+            self.latency_ms, self.queue_depth, self.cpu_load = latency_ms, queue_depth, cpu_load
+
+            reasons = []
+            if latency_ms > cfg.latency_target_ms:
+                reasons.append(f"latency p95 {latency_ms:.0f}ms > {cfg.latency_target_ms:.0f}ms")
+            if queue_depth > cfg.queue_target:
+                reasons.append(f"queue {queue_depth} > {cfg.queue_target}")
+            if cpu_load is not None and cpu_load > cfg.cpu_target:
+                reasons.append(f"cpu {cpu_load:.0%} > {cfg.cpu_target:.0%}")
+
+            idle = (
+                latency_ms < cfg.latency_target_ms * cfg.recover_ratio
+                and queue_depth < cfg.queue_target * cfg.recover_ratio
+                and (cpu_load is None or cpu_load < cfg.cpu_target * cfg.recover_ratio)
+            )
+
+            if reasons:
+                self._over += 1
+                self._under = 0
+            elif idle:
+                self._under += 1
+                self._over = 0
+            else:
+                self._over = self._under = 0
+
+            if now - self._last_change < cfg.min_dwell:
+                return None
+
+            if self._over >= cfg.degrade_after:
+                step, reason = 1, ", ".join(reasons)
+            elif self._under >= cfg.recover_after:
+                step, reason = -1, "load recovered"
+            else:
+                return None
+
+            new_level = self._next_level(step)
+            if new_level == self.level:
+                return None
+            change = self._set_level(new_level, reason, now)
+
+        if self.on_change:
+            try:
+                self.on_change(change["from_level"], change["to_level"], reason)
+            except Exception as e:
+                print(f"[SHED] Change callback error: {e}")
+        return change
+
+    def _set_level(self, level: int, reason: str, now: float) -> dict:
+        """단계 변경 기록 (_lock 보유 상태에서 호출)"""
+        old = self.level
+        self.time_in_level[old] += now - self._level_since
+        self._level_since = now
+        self.level = level
+        self._last_change = now
+        self._over = self._under = 0
+        if level > old:
+            self.degrades += 1
+        else:
+            self.recoveries += 1
+
+        change = {
+            "time": now,
+            "from": LEVELS[old],
+            "to": LEVELS[level],
+            "from_level": old,
+            "to_level": level,
+            "reason": reason,
+            "latency_p95_ms": round(self.latency_ms, 1),
+            "queue_depth": self.queue_depth,
+            "cpu_load": round(self.cpu_load, 3) if self.cpu_load is not None else None
+        }
+        self.changes.append(change)
+        print(f"[SHED] {change['from']} -> {change['to']} ({reason})")
+        return change
+
+    def get_stats(self) -> dict:
+        """부하 조절 상태/통계 반환"""
+        with self._lock:
+            time_in_level = list(self.time_in_level)
+            time_in_level[self.level] += time.time() - self._level_since
+            return {
+                "level": self.level,
+                "state": self.level_name,
+                "latency_p95_ms": round(self.latency_ms, 1),
+                "queue_depth": self.queue_depth,
+                "cpu_load": round(self.cpu_load, 3) if self.cpu_load is not None else None,
+                "evaluations": self.evaluations,
+                "degrades": self.degrades,
+                "recoveries": self.recoveries,
+                "skipped_levels": sorted(self.skip_levels),
+                "time_in_level_s": {
+                    name: round(seconds, 1) for name, seconds in zip(LEVELS, time_in_level)
+                },
+                "changes": list(self.changes)
+            }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Load Shedder Test ===")
+
+    shedder = LoadShedder(LoadShedConfig(latency_target_ms=100, degrade_after=2, recover_after=3, min_dwell=0))
+    cpu = CpuMonitor()
+
+    now = 0.0
+    # 과부하 → 단계 상승
+    for _ in range(10):
+        for _ in range(20):
+            shedder.observe(0.3)
+        now += 1.0
+        shedder.evaluate(queue_depth=6, cpu_load=cpu.sample(), now=now)
+    print(f"  Overloaded: {shedder.level_name}")
+
+    # 부하 감소 → 역순 복구
+    for _ in range(20):
+        for _ in range(20):
+            shedder.observe(0.02)
+        now += 1.0
+        shedder.evaluate(queue_depth=0, now=now)
+    print(f"  Recovered: {shedder.level_name}")
+
+    stats = shedder.get_stats()
+    print(f"  Changes: {[(c['from'], c['to']) for c in stats['changes']]}")
+    print(f"  CPU: {cpu.sample()}")
+    print("Test completed!")
@@ -8,7 +8,7 @@ AWS Greengrass 컴포넌트로 실행됩니다.
 - NPU를 사용한 실시간 PPE 감지
 - MQTT를 통한 위반 알림 전송
 - S3에 위반 이미지 업로드
-- 주기적 상태 보고
+- 주기적 상태 보고 (단계별 지연 시간 백분위수, 처리량 포함)
 
 사용 예시:
     # 환경 변수 설정
@@ -21,48 +21,131 @@ AWS Greengrass 컴포넌트로 실행됩니다.
 환경 변수:
     THING_NAME: IoT Thing 이름
     RTSP_URL: RTSP 카메라 URL (없으면 시뮬레이션)
+              로컬 영상 파일, JPEG 디렉터리, file:// URL이면 녹화 영상 재생
+    RTSP_CODEC: RTSP 스트림 코덱 (h264 / h265 / auto, 기본: h264)
+    RTSP_OUTPUT_WIDTH: GStreamer 파이프라인 출력 너비 (기본: 0, 원본 해상도)
+    RTSP_OUTPUT_FORMAT: GStreamer 파이프라인 출력 색 형식 (BGR / RGB, 기본: BGR)
+                        RGB면 파이프라인 안에서 색 변환하여 전처리의 변환 생략 (PyGObject 필요)
+    RTSP_SNAPSHOT: 위반 이미지용 전체 해상도 BGR 스냅샷 분기 사용 여부 (기본: false, PyGObject 필요)
     MODEL_PATH: RKNN 모델 경로
     S3_BUCKET: S3 버킷 이름
     AWS_REGION: AWS 리전
     USE_SIMULATION: 시뮬레이션 모드 사용 여부
+    NPU_WORKERS: NPU 런타임 수 (2 이상이면 코어별 추론 풀, 기본: 1)
+    NPU_POOL_POLICY: 추론 풀 분배 정책 (round_robin / least_loaded)
+    MODEL_BATCH_SIZE: 모델 입력 배치 크기 (배치 모델일 때 2 이상, 멀티 카메라
+                      프레임을 묶어서 추론, 기본: 1)
+    PIPELINE_MODE: 단계별 파이프라인 처리 사용 여부 (기본: false)
+    PIPELINE_QUEUE_SIZE: 파이프라인 단계 간 큐 크기 (기본: 2)
+    ALERT_QUEUE_SIZE: 알림 단계 큐 크기 (기본: 32)
+    CAMERAS: 멀티 카메라 설정 JSON
+             (예: [{"id": "bay1", "url": "rtsp://...", "max_fps": 5, "zones": [...]}, ...])
+    RTSP_URLS: 멀티 카메라 RTSP URL 목록 (쉼표 구분, ID는 cam1, cam2, ...)
+    CAMERA_MAX_FPS: 카메라별 기본 최대 처리 FPS (기본: 0, 제한 없음)
+    S3_UPLOAD_WORKERS: S3 업로드 워커 수 (기본: 2)
+    S3_UPLOAD_QUEUE_SIZE: S3 업로드 대기 큐 크기 (기본: 64)
+    S3_UPLOAD_RETRIES: S3 업로드 재시도 횟수 (기본: 3)
+    MQTT_MAX_IN_FLIGHT: 동시에 진행할 MQTT publish 수 (기본: 8)
+    MQTT_QUEUE_SIZE: MQTT 발행 대기 큐 크기 (기본: 256)
+    MQTT_ALERT_BATCH: 한 페이로드로 묶을 최대 알림 수 (기본: 10)
+    MQTT_LOCAL_IPC: Greengrass 없이 로컬 IPC 대역 사용 여부 (기본: false)
+    TRACKER_ENABLED: 작업자 추적 (트랙 단위 알림 쿨다운) 사용 여부 (기본: true)
+    TRACK_IOU_THRESHOLD: 추적 매칭 최소 IoU (기본: 0.3)
+    TRACK_MAX_AGE: 감지되지 않아도 트랙을 유지할 프레임 수 (기본: 30)
+    TRACK_MIN_HITS: 알림 전에 트랙을 확정할 최소 연속 감지 수 (기본: 3)
+    TRACK_LOST_MAX_AGE: 사라진 트랙을 같은 자리에서 다시 연결할 프레임 수 (기본: 450)
+    ROI_ZONES: 단일 카메라 ROI 구역 JSON (멀티 카메라는 CAMERAS의 "zones")
+               (예: [{"name": "scaffold", "polygon": [[0.1, 0.2], [0.6, 0.2], [0.6, 0.9]]}])
+    ROI_ANCHOR: 구역 포함 판정 기준점 (center / bottom, 기본: center)
+    OVERLAY_IN_PLACE: 결과 시각화를 원본 프레임에 직접 그리기 (기본: false, 풀 버퍼 사용)
+    MOTION_GATE: 정지 장면에서 추론을 건너뛰는 움직임 게이트 사용 여부 (기본: false)
+    MOTION_THRESHOLD: 움직임으로 판단할 변화 픽셀 비율 (기본: 0.005)
+    MOTION_PIXEL_THRESHOLD: 변화 픽셀로 판단할 밝기 차이 (기본: 25)
+    MOTION_MIN_INTERVAL: 추론 최소 간격 (초, 기본: 0)
+    MOTION_MAX_INTERVAL: 정지 장면 추론 간격 (초, 기본: 2.0)
+    MOTION_HOLD_TIME: 움직임 후 전체 속도 유지 시간 (초, 기본: 1.0)
+    SPOOL_DIR: 네트워크 장애 시 알림/이미지를 보관할 디렉터리 (비우면 사용 안 함)
+    SPOOL_MAX_MB: 스풀 최대 크기 (MB, 기본: 256)
+    SPOOL_MAX_AGE_HOURS: 스풀 보관 기간 (시간, 기본: 168)
+    SPOOL_DRAIN_RATE: 연결 복구 후 초당 재전송 레코드 수 (기본: 10)
+    SIM_DETECTOR: 시뮬레이션 감지 방식 (random: 무작위 감지 결과 / tensor: 원시 YOLO 출력 생성 후
+                  실제 후처리 실행, 기본: random)
+    SIM_OBJECTS: tensor 방식의 장면 객체 수 (기본: 3)
+    SIM_INFER_MS: tensor 방식의 평균 추론 시간 (ms, 기본: 20)
+    SIM_SEED: tensor 방식의 난수 시드 (기본: 0)
+    SIM_RESOLUTION: 시뮬레이션 카메라 해상도 (기본: 640x480)
+    SIM_FPS: 시뮬레이션 카메라 FPS (기본: 15, 0이면 제한 없이 최대 속도 - 부하 테스트용)
+    REPLAY_REALTIME: 녹화 영상을 원본 속도로 재생 (false면 최대 속도, 기본: true)
+    REPLAY_LOOP: 녹화 영상 반복 재생 (기본: true)
+    REPLAY_FPS: 재생 FPS (기본: 0, 영상 FPS 사용 / 이미지 시퀀스는 15)
+    METRICS_PORT: Prometheus 형식 /metrics HTTP 포트 (기본: 0, 사용 안 함)
+    METRICS_HOST: 메트릭 서버 바인드 주소 (기본: 0.0.0.0)
+    PARALLEL_INIT: 카메라/감지기/IPC/S3를 병렬로 초기화 (기본: true)
+    WARMUP_RUNS: 시작 시 더미 입력 추론 횟수 (기본: 2, 0이면 사용 안 함)
+    MODEL_WATCH_INTERVAL: 모델 파일 변경 확인 간격 (초, 바뀌면 무중단 교체, 기본: 5, 0이면 사용 안 함)
+    LOAD_SHED: 과부하 시 단계적 부하 조절 사용 여부 (기본: false)
+               (추론 빈도 제한 → 작은 입력 모델 → 시각화 생략 → 업로드 보류, 복구는 역순)
+    LOAD_SHED_LATENCY_MS: 종단 간 지연 시간 p95 목표 (ms, 기본: 500)
+    LOAD_SHED_QUEUE: 큐 깊이 목표 (파이프라인 큐 + MQTT 대기, 기본: 4)
+    LOAD_SHED_CPU: CPU 사용률 목표 (0~1, 기본: 0.9)
+    LOAD_SHED_INTERVAL: 부하 판정 간격 (초, 기본: 1.0)
+    LOAD_SHED_MAX_FPS: 추론 빈도 제한 단계의 카메라별 최대 추론 FPS (기본: 2)
+    LOAD_SHED_MODEL_PATH: 작은 입력 단계에서 사용할 모델 (없으면 시뮬레이션에서만 사용)
+    LOAD_SHED_INPUT_SIZE: 작은 입력 단계의 모델 입력 크기 (기본: 416x416)
+
+Greengrass 컴포넌트 설정 (무중단 적용, 재시작 없음):
+    ModelPath: 모델 경로 (바뀌면 새 모델 로드/워밍업 후 교체)
+    ConfThreshold: 신뢰도 임계값
+    NmsThreshold: NMS 임계값
 """
 
+import time
+_IMPORT_START = time.perf_counter()
+
 import os
 import sys
 import json
-import time
 import datetime
+import dataclasses
+import importlib.util
 import threading
 import traceback
 import signal
-from typing import Optional, List
-import cv2
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, List, Dict
 import numpy as np
 
-# AWS SDK
-try:
-    import boto3
-    from botocore.exceptions import ClientError
-    HAS_BOTO3 = True
-except ImportError:
-    HAS_BOTO3 = False
+# AWS SDK (설치 여부만 확인, import는 S3 초기화 스레드에서)
+HAS_BOTO3 = importlib.util.find_spec("boto3") is not None
+if not HAS_BOTO3:
     print("[WARN] boto3 not installed, S3 upload disabled")
 
-# Greengrass IPC
-try:
-    import awsiot.greengrasscoreipc as ipc
-    from awsiot.greengrasscoreipc.model import (
-        PublishToIoTCoreRequest,
-        QOS
-    )
-    HAS_GREENGRASS = True
-except ImportError:
-    HAS_GREENGRASS = False
+# Greengrass IPC (설치 여부만 확인, import는 IPC 초기화 스레드에서)
+HAS_GREENGRASS = importlib.util.find_spec("awsiot") is not None
+if not HAS_GREENGRASS:
     print("[WARN] Greengrass IPC not available, running standalone")
 
 # 로컬 모듈
-from rtsp_reader import RTSPReader, SimulatedCamera, create_camera
+from rtsp_reader import create_camera
+from replay_camera import is_replay_source
 from ppe_detector import PPEDetector, Detection
+from pipeline import Pipeline, FramePacket
+from multi_camera import CameraSource, MultiCameraScheduler
+from s3_uploader import AsyncS3Uploader, encode_jpeg
+from mqtt_publisher import AsyncMQTTPublisher, LocalIPCClient
+from spool import Spool, SpoolDrainer, SpoolRecord
+from tracker import MultiObjectTracker
+from motion_gate import MotionGate
+from roi import ROIFilter
+from overlay import OverlayRenderer, AnnotatedFrame
+from latency import LatencyRecorder
+from yolo_simulator import SceneConfig, LatencyModel, simulated_runtime_factory
+from metrics_server import MetricsServer, MetricsWriter
+from startup import StartupTimer
+from model_reloader import ModelReloader, ModelWatcher, config_to_reload, subscribe_config_updates
+from load_shedder import LoadShedder, LoadShedConfig, CpuMonitor
+
+IMPORT_TIME = time.perf_counter() - _IMPORT_START
 
 
 class PPEDetectionSystem:
@@ -78,10 +161,77 @@ class PPEDetectionSystem:
         # 환경 변수에서 설정 로드
         self.thing_name = os.environ.get("THING_NAME", "orangepi5-core-001")
         self.rtsp_url = os.environ.get("RTSP_URL", "")
+        self.rtsp_codec = os.environ.get("RTSP_CODEC", "h264").lower()
+        self.rtsp_output_width = int(os.environ.get("RTSP_OUTPUT_WIDTH", "0"))
+        self.rtsp_output_format = os.environ.get("RTSP_OUTPUT_FORMAT", "BGR").upper()
+        self.rtsp_snapshot = os.environ.get("RTSP_SNAPSHOT", "false").lower() == "true"
         self.model_path = os.environ.get("MODEL_PATH", "")
         self.s3_bucket = os.environ.get("S3_BUCKET", "orangepi5-greengrass-data")
         self.aws_region = os.environ.get("AWS_REGION", "ap-northeast-2")
         self.use_simulation = os.environ.get("USE_SIMULATION", "true").lower() == "true"
+        self.npu_workers = int(os.environ.get("NPU_WORKERS", "1"))
+        self.npu_pool_policy = os.environ.get("NPU_POOL_POLICY", "round_robin")
+        self.model_batch_size = int(os.environ.get("MODEL_BATCH_SIZE", "1"))
+        self.pipeline_mode = os.environ.get("PIPELINE_MODE", "false").lower() == "true"
+        self.pipeline_queue_size = int(os.environ.get("PIPELINE_QUEUE_SIZE", "2"))
+        self.alert_queue_size = int(os.environ.get("ALERT_QUEUE_SIZE", "32"))
+        self.camera_max_fps = float(os.environ.get("CAMERA_MAX_FPS", "0"))
+        self.camera_configs = self._parse_camera_configs()
+        self.s3_upload_workers = int(os.environ.get("S3_UPLOAD_WORKERS", "2"))
+        self.s3_upload_queue_size = int(os.environ.get("S3_UPLOAD_QUEUE_SIZE", "64"))
+        self.s3_upload_retries = int(os.environ.get("S3_UPLOAD_RETRIES", "3"))
+        self.multi_camera = len(self.camera_configs) > 0
+        self.mqtt_max_in_flight = int(os.environ.get("MQTT_MAX_IN_FLIGHT", "8"))
+        self.mqtt_queue_size = int(os.environ.get("MQTT_QUEUE_SIZE", "256"))
+        self.mqtt_alert_batch = int(os.environ.get("MQTT_ALERT_BATCH", "10"))
+        self.mqtt_local_ipc = os.environ.get("MQTT_LOCAL_IPC", "false").lower() == "true"
+        self.tracker_enabled = os.environ.get("TRACKER_ENABLED", "true").lower() == "true"
+        self.track_iou_threshold = float(os.environ.get("TRACK_IOU_THRESHOLD", "0.3"))
+        self.track_max_age = int(os.environ.get("TRACK_MAX_AGE", "30"))
+        self.track_min_hits = int(os.environ.get("TRACK_MIN_HITS", "3"))
+        self.track_lost_max_age = int(os.environ.get("TRACK_LOST_MAX_AGE", "450"))
+        self.roi_anchor = os.environ.get("ROI_ANCHOR", "center")
+        self.rois = self._parse_roi_configs()
+        self.overlay_in_place = os.environ.get("OVERLAY_IN_PLACE", "false").lower() == "true"
+        self.motion_gate_enabled = os.environ.get("MOTION_GATE", "false").lower() == "true"
+        self.motion_threshold = float(os.environ.get("MOTION_THRESHOLD", "0.005"))
+        self.motion_pixel_threshold = int(os.environ.get("MOTION_PIXEL_THRESHOLD", "25"))
+        self.motion_min_interval = float(os.environ.get("MOTION_MIN_INTERVAL", "0"))
+        self.motion_max_interval = float(os.environ.get("MOTION_MAX_INTERVAL", "2.0"))
+        self.motion_hold_time = float(os.environ.get("MOTION_HOLD_TIME", "1.0"))
+        self.spool_dir = os.environ.get("SPOOL_DIR", "")
+        self.spool_max_mb = float(os.environ.get("SPOOL_MAX_MB", "256"))
+        self.spool_max_age_hours = float(os.environ.get("SPOOL_MAX_AGE_HOURS", "168"))
+        self.spool_drain_rate = float(os.environ.get("SPOOL_DRAIN_RATE", "10"))
+        self.spool_retry_interval = 30.0  # 초
+        self.sim_detector = os.environ.get("SIM_DETECTOR", "random").lower()
+        self.sim_objects = int(os.environ.get("SIM_OBJECTS", "3"))
+        self.sim_infer_ms = float(os.environ.get("SIM_INFER_MS", "20"))
+        self.sim_seed = int(os.environ.get("SIM_SEED", "0"))
+        self.sim_width, self.sim_height = self._parse_resolution(os.environ.get("SIM_RESOLUTION", "640x480"))
+        self.sim_fps = float(os.environ.get("SIM_FPS", "15"))
+        self.replay_realtime = os.environ.get("REPLAY_REALTIME", "true").lower() == "true"
+        self.replay_loop = os.environ.get("REPLAY_LOOP", "true").lower() == "true"
+        self.replay_fps = float(os.environ.get("REPLAY_FPS", "0"))
+        self.metrics_port = int(os.environ.get("METRICS_PORT", "0"))
+        self.metrics_host = os.environ.get("METRICS_HOST", "0.0.0.0")
+        self.parallel_init = os.environ.get("PARALLEL_INIT", "true").lower() == "true"
+        self.warmup_runs = int(os.environ.get("WARMUP_RUNS", "2"))
+        self.model_watch_interval = float(os.environ.get("MODEL_WATCH_INTERVAL", "5"))
+        self.load_shed_enabled = os.environ.get("LOAD_SHED", "false").lower() == "true"
+        self.load_shed_config = LoadShedConfig(
+            latency_target_ms=float(os.environ.get("LOAD_SHED_LATENCY_MS", "500")),
+            queue_target=int(os.environ.get("LOAD_SHED_QUEUE", "4")),
+            cpu_target=float(os.environ.get("LOAD_SHED_CPU", "0.9"))
+        )
+        self.load_shed_interval = float(os.environ.get("LOAD_SHED_INTERVAL", "1.0"))
+        self.load_shed_max_fps = float(os.environ.get("LOAD_SHED_MAX_FPS", "2"))
+        self.load_shed_model_path = os.environ.get("LOAD_SHED_MODEL_PATH", "")
+        self.load_shed_input_size = self._parse_resolution(os.environ.get("LOAD_SHED_INPUT_SIZE", "416x416"))
+
+        # 시작 시간 (time-to-first-frame / time-to-first-detection, 모듈 import 포함)
+        self.startup = StartupTimer(origin=time.perf_counter() - IMPORT_TIME)
+        self.startup.record("imports", IMPORT_TIME)
 
         # MQTT 토픽
         self.topic_alerts = f"{self.thing_name}/alerts/ppe"
@@ -90,8 +240,24 @@ class PPEDetectionSystem:
         # 컴포넌트
         self.camera = None
         self.detector = None
+        self.overlay: Optional[OverlayRenderer] = None
         self.ipc_client = None
+        self.publisher: Optional[AsyncMQTTPublisher] = None
         self.s3_client = None
+        self.uploader: Optional[AsyncS3Uploader] = None
+        self.spool: Optional[Spool] = None
+        self.spool_drainer: Optional[SpoolDrainer] = None
+        self.metrics_server: Optional[MetricsServer] = None
+        self.pipeline: Optional[Pipeline] = None
+        self.reloader: Optional[ModelReloader] = None
+        self.model_watcher: Optional[ModelWatcher] = None
+        self._config_subscription = None
+        self.load_shedder: Optional[LoadShedder] = None
+        self.cpu_monitor: Optional[CpuMonitor] = None
+        self.trackers: Dict[str, MultiObjectTracker] = {}  # 카메라별
+        self.camera_formats: Dict[str, str] = {}           # 카메라별 프레임 색 순서
+        self.motion_gates: Dict[str, MotionGate] = {}      # 카메라별
+        self.latency = LatencyRecorder()                   # 감지기와 공유
 
         # 상태
         self.running = False
@@ -100,6 +266,12 @@ class PPEDetectionSystem:
         self.violation_count = 0
         self.last_violation_time = None
         self.start_time = None
+        self._capture_seq = 0
+        self._last_shed_eval = 0.0
+        self._shed_last_infer: Dict[str, float] = {}    # 카메라별 마지막 추론 시각 (빈도 제한 단계)
+        self.shed_skipped_frames = 0
+        self.base_model_path = self.model_path          # 작은 입력 단계에서 복구할 모델
+        self.base_input_size = (640, 640)
 
         # 알림 쿨다운 (같은 위반에 대해 반복 알림 방지)
         self.alert_cooldown = 30  # 초
@@ -109,6 +281,73 @@ class PPEDetectionSystem:
         signal.signal(signal.SIGINT, self._signal_handler)
         signal.signal(signal.SIGTERM, self._signal_handler)
 
+    def _parse_camera_configs(self) -> List[dict]:
+        """
+        멀티 카메라 설정 파싱
+
+        CAMERAS (JSON) 또는 RTSP_URLS (쉼표 구분) 환경 변수를 읽습니다.
+        둘 다 없으면 빈 리스트 (단일 카메라 모드).
+
+        Returns:
+            [{"id": str, "url": str, "max_fps": float, "zones": list}, ...]
+        """
+        configs = []
+        cameras_json = os.environ.get("CAMERAS", "")
+        rtsp_urls = os.environ.get("RTSP_URLS", "")
+
+        if cameras_json:
+            for i, cam in enumerate(json.loads(cameras_json)):
+                configs.append({
+                    "id": str(cam.get("id", f"cam{i + 1}")),
+                    "url": cam.get("url", ""),
+                    "max_fps": float(cam.get("max_fps", self.camera_max_fps)),
+                    "zones": cam.get("zones", [])
+                })
+        elif rtsp_urls:
+            urls = [u.strip() for u in rtsp_urls.split(",") if u.strip()]
+            for i, url in enumerate(urls):
+                configs.append({
+                    "id": f"cam{i + 1}",
+                    "url": url,
+                    "max_fps": self.camera_max_fps,
+                    "zones": []
+                })
+
+        return configs
+
+    def _parse_roi_configs(self) -> Dict[str, ROIFilter]:
+        """
+        카메라별 ROI 구역 설정 파싱
+
+        단일 카메라는 ROI_ZONES, 멀티 카메라는 CAMERAS 항목의 "zones"를
+        사용합니다. 구역이 없는 카메라는 전체 프레임을 처리합니다.
+
+        Returns:
+            {camera_id: ROIFilter} (단일 카메라의 ID는 "")
+        """
+        rois = {}
+        zones_json = os.environ.get("ROI_ZONES", "")
+        if zones_json:
+            rois[""] = ROIFilter.from_config(json.loads(zones_json), anchor=self.roi_anchor)
+        for config in self.camera_configs:
+            if config["zones"]:
+                rois[config["id"]] = ROIFilter.from_config(config["zones"], anchor=self.roi_anchor)
+        return rois
+
+    @staticmethod
+    def _parse_resolution(value: str):
+        """
+        "WIDTHxHEIGHT" 해상도 문자열 파싱
+
+        Returns:
+            (width, height)
+        """
+        try:
+            width, height = (int(v) for v in value.lower().split("x"))
+        except ValueError:
+            raise ValueError(f"Invalid resolution '{value}' (expected WIDTHxHEIGHT)")
+        return width, height
+
     def _signal_handler(self, signum, frame):
         """시그널 핸들러"""
         print(f"\n[INFO] Received signal {signum}, shutting down...")
@@ -125,27 +364,38 @@ class PPEDetectionSystem:
         print("PPE Detection System v1.0.0")
         print("=" * 60)
         print(f"Thing Name: {self.thing_name}")
-        print(f"RTSP URL: {self.rtsp_url or 'Not configured (Simulation)'}")
+        if self.multi_camera:
+            print(f"Cameras: {', '.join(c['id'] for c in self.camera_configs)}")
+        else:
+            print(f"RTSP URL: {self.rtsp_url or 'Not configured (Simulation)'}")
         print(f"Model Path: {self.model_path or 'Not configured (Simulation)'}")
         print(f"S3 Bucket: {self.s3_bucket}")
         print(f"AWS Region: {self.aws_region}")
         print(f"Simulation Mode: {self.use_simulation}")
+        print(f"NPU Workers: {self.npu_workers} ({self.npu_pool_policy})")
+        print(f"Pipeline Mode: {self.pipeline_mode}")
         print("=" * 60)
 
         try:
-            # 카메라 초기화
-            self._init_camera()
+            with self.startup.phase("init"):
+                # 카메라, PPE 감지기 (+ 워밍업), Greengrass IPC, S3 클라이언트
+                self._init_components()
+                self._init_camera_formats()
 
-            # PPE 감지기 초기화
-            self._init_detector()
+                # 저장 후 전달 스풀 초기화 (IPC/S3 준비 후 재전송 시작)
+                self._init_spool()
 
-            # Greengrass IPC 초기화
-            self._init_greengrass()
+                # 메트릭 엔드포인트 (선택)
+                self._init_metrics()
 
-            # S3 클라이언트 초기화
-            self._init_s3()
+                # 무중단 모델 교체 (파일 변경 / 컴포넌트 설정 변경)
+                self._init_model_reload()
 
-            print("[INFO] System initialized successfully")
+                # 과부하 시 단계적 부하 조절 (선택)
+                self._init_load_shedder()
+
+            self.startup.mark("ready")
+            print(f"[INFO] System initialized successfully ({self.startup.summary()})")
             return True
 
         except Exception as e:
@@ -153,144 +403,726 @@ class PPEDetectionSystem:
             traceback.print_exc()
             return False
 
+    def _init_components(self):
+        """
+        서로 독립적인 구성 요소 초기화
+
+        카메라 연결, 모델 로드/워밍업, IPC 연결, boto3 import는 서로 기다릴
+        필요가 없으므로 PARALLEL_INIT이면 동시에 진행합니다.
+        하나라도 실패하면 모두 끝난 뒤 첫 예외를 다시 발생시킵니다.
+        """
+        tasks = [
+            ("camera", self._init_camera),
+            ("detector", self._init_detector),
+            ("greengrass", self._init_greengrass),
+            ("s3", self._init_s3)
+        ]
+        if not self.parallel_init:
+            for name, init in tasks:
+                with self.startup.phase(name):
+                    init()
+            return
+
+        def run(name, init):
+            with self.startup.phase(name):
+                init()
+
+        with ThreadPoolExecutor(max_workers=len(tasks), thread_name_prefix="init") as executor:
+            futures = [executor.submit(run, name, init) for name, init in tasks]
+        for future in futures:
+            future.result()
+
     def _init_camera(self):
         """카메라 초기화"""
-        if self.rtsp_url and not self.use_simulation:
-            print(f"[INFO] Initializing RTSP camera: {self.rtsp_url}")
-            self.camera = RTSPReader(
-                rtsp_url=self.rtsp_url,
-                queue_size=2,
-                reconnect_delay=5.0
-            )
+        if self.multi_camera:
+            self._init_multi_camera()
+            return
+
+        self.camera = self._create_camera(self.rtsp_url)
+
+    def _sim_runtime_factory(self):
+        """
+        SIM_DETECTOR=tensor일 때 원시 YOLO 출력을 만드는 시뮬레이션 런타임 팩토리
+
+        실제 모델을 불러오는 경우에는 사용되지 않습니다 (로드 실패 시 대체용).
+        """
+        if self.sim_detector != "tensor":
+            return None
+        if self.use_simulation:
+            print(f"[INFO] Simulated detector: raw YOLO tensors "
+                  f"({self.sim_objects} objects, {self.sim_infer_ms:.0f}ms, seed {self.sim_seed})")
+        return simulated_runtime_factory(
+            scene=SceneConfig(num_objects=self.sim_objects),
+            latency=LatencyModel(mean_ms=self.sim_infer_ms, jitter_ms=self.sim_infer_ms * 0.1),
+            seed=self.sim_seed
+        )
+
+    def _create_camera(self, url: str, camera_id: str = ""):
+        """
+        URL에 맞는 카메라 생성
+
+        로컬 파일/디렉터리는 시뮬레이션 모드에서도 녹화 영상 재생 소스를
+        사용합니다 (실제 현장 영상으로 처리 성능 재현).
+        """
+        label = f" {camera_id}" if camera_id else ""
+        if is_replay_source(url):
+            print(f"[INFO] Replaying recorded footage{label}: {url}")
+        elif url and not self.use_simulation:
+            print(f"[INFO] Initializing RTSP camera{label}: {url}")
         else:
-            print("[INFO] Using simulated camera")
-            self.camera = SimulatedCamera(width=640, height=480, fps=15)
+            print(f"[INFO] Using simulated camera{label}")
+
+        return create_camera(
+            url,
+            use_simulation=self.use_simulation,
+            width=self.sim_width,
+            height=self.sim_height,
+            fps=self.sim_fps,
+            queue_size=2,
+            reconnect_delay=5.0,
+            codec=self.rtsp_codec,
+            output_width=self.rtsp_output_width,
+            output_format=self.rtsp_output_format,
+            snapshot=self.rtsp_snapshot,
+            replay_fps=self.replay_fps or None,
+            realtime=self.replay_realtime,
+            loop=self.replay_loop
+        )
+
+    def _cameras(self) -> list:
+        """카메라 인스턴스 목록 (멀티 카메라 모드는 소스별 카메라)"""
+        if self.multi_camera:
+            return [source.camera for source in self.camera.sources]
+        return [self.camera]
+
+    def _camera_for(self, camera_id: str = ""):
+        """카메라 ID의 카메라 인스턴스 (단일 카메라 모드는 ID 무시)"""
+        if self.multi_camera:
+            source = self.camera.get_source(camera_id)
+            return source.camera if source else None
+        return self.camera
+
+    def _init_camera_formats(self):
+        """
+        카메라별 출력 색 순서 기록 및 감지기 기본 입력 형식 설정
+
+        RGB 파이프라인(GstCapture)이면 전처리의 색 변환을 생략합니다.
+        카메라마다 형식이 다르면 감지기 기본값은 BGR로 두고, 전처리마다
+        카메라의 형식을 넘깁니다 (_frame_format).
+        """
+        if self.multi_camera:
+            cameras = [(source.camera_id, source.camera) for source in self.camera.sources]
+        else:
+            cameras = [("", self.camera)]
+        self.camera_formats = {
+            camera_id: getattr(camera, "output_format", "BGR") for camera_id, camera in cameras
+        }
+
+        formats = set(self.camera_formats.values())
+        if len(formats) > 1:
+            print(f"[INFO] Cameras output mixed color formats {sorted(formats)}, converting per camera")
+            self.detector.input_format = "BGR"
+            return
+        fmt = formats.pop() if formats else "BGR"
+        if fmt != "BGR":
+            print(f"[INFO] Camera outputs {fmt} frames, skipping color conversion in preprocess")
+        self.detector.input_format = fmt
+
+    def _frame_format(self, camera_id: str = "") -> str:
+        """카메라 ID의 프레임 색 순서 (모르는 카메라는 감지기 기본값)"""
+        return self.camera_formats.get(camera_id, self.detector.input_format)
+
+    def _init_multi_camera(self):
+        """멀티 카메라 초기화 (하나의 감지기를 공유)"""
+        sources = []
+        for config in self.camera_configs:
+            camera = self._create_camera(config["url"], config["id"])
+            sources.append(CameraSource(config["id"], camera, max_fps=config["max_fps"]))
+
+        self.camera = MultiCameraScheduler(sources)
+
+    def _read_frame(self, timeout: float = 1.0):
+        """
+        다음 프레임 읽기
+
+        Returns:
+            (camera_id, frame) - 단일 카메라 모드에서 camera_id는 빈 문자열
+        """
+        camera_id, frame, _ = self._read_latest(timeout=timeout)
+        return camera_id, frame
+
+    def _read_latest(self, timeout: float = 1.0, refs: Optional[list] = None):
+        """
+        가장 최근 프레임과 캡처 시각 읽기
+
+        RTSP 카메라는 메일박스(read_latest)에서 최신 프레임만 가져오고
+        디코딩 시각을 함께 받으므로 추론 시점의 프레임 나이를 잴 수 있습니다.
+        캡처 시각을 모르는 카메라는 읽은 시각을 사용합니다.
+
+        refs를 넘기면 링 버퍼 프레임을 복사하지 않고 참조(FrameRef)를 refs에
+        추가합니다. 프레임은 호출자가 참조를 release()할 때까지만 유효합니다.
+
+        Args:
+            timeout: 대기 시간 (초)
+            refs: 복사 없이 읽은 프레임 참조를 받을 리스트 (None이면 복사본)
+
+        Returns:
+            (camera_id, frame, capture_time) - 프레임이 없으면 frame은 None
+        """
+        if self.multi_camera:
+            item = self.camera.read(timeout=timeout)
+            if item is None:
+                return "", None, 0.0
+            return item
+
+        if refs is not None and hasattr(self.camera, "get_latest_ref"):
+            ref = self.camera.get_latest_ref(timeout=timeout)
+            if ref is None:
+                return "", None, 0.0
+            refs.append(ref)
+            return "", ref.frame, ref.timestamp
+
+        if hasattr(self.camera, "read_latest"):
+            item = self.camera.read_latest(timeout=timeout)
+            if item is None:
+                return "", None, 0.0
+            frame, _, capture_time = item
+            return "", frame, capture_time
+
+        return "", self.camera.get_frame(timeout=timeout), time.time()
+
+    def _read_batch(self, timeout: float = 1.0, refs: Optional[list] = None) -> List[tuple]:
+        """
+        배치 추론용 프레임 묶음 읽기
+
+        첫 프레임은 timeout까지 기다리고, 멀티 카메라 모드에서 배치 모델이면
+        이미 준비된 다른 카메라 프레임을 기다리지 않고 batch_size까지 더 가져옵니다.
+
+        Args:
+            timeout: 첫 프레임 대기 시간 (초)
+            refs: 복사 없이 읽은 프레임 참조를 받을 리스트 (_read_latest 참고)
+
+        Returns:
+            [(camera_id, frame, capture_time), ...] (프레임이 없으면 빈 리스트)
+        """
+        camera_id, frame, capture_time = self._read_latest(timeout=timeout, refs=refs)
+        if frame is None:
+            return []
+
+        items = [(camera_id, frame, capture_time)]
+        if self.multi_camera:
+            while len(items) < self.detector.batch_size:
+                item = self.camera.read(timeout=0)
+                if item is None:
+                    break
+                items.append(item)
+        return items
+
+    def _alert_topic(self, camera_id: str = "") -> str:
+        """카메라별 알림 토픽 (단일 카메라 모드는 기존 토픽)"""
+        if camera_id:
+            return f"{self.topic_alerts}/{camera_id}"
+        return self.topic_alerts
 
     def _init_detector(self):
         """PPE 감지기 초기화"""
         self.detector = PPEDetector(
             model_path=self.model_path,
-            input_size=(640, 640),
+            input_size=self.base_input_size,
             conf_threshold=0.5,
-            use_simulation=self.use_simulation
+            use_simulation=self.use_simulation,
+            num_npu_workers=self.npu_workers,
+            pool_policy=self.npu_pool_policy,
+            latency=self.latency,
+            sim_runtime_factory=self._sim_runtime_factory(),
+            batch_size=self.model_batch_size
         )
+        # 결과 시각화는 소비자(미리보기/녹화)가 요청할 때만 수행
+        self.overlay = OverlayRenderer(self.detector, in_place=self.overlay_in_place)
         print("[INFO] PPE detector initialized")
 
+        # 런타임 지연 초기화를 첫 실제 프레임 전에 처리
+        if self.warmup_runs > 0:
+            with self.startup.phase("warmup"):
+                self.detector.warmup(self.warmup_runs)
+
     def _init_greengrass(self):
         """Greengrass IPC 초기화"""
         if HAS_GREENGRASS:
             try:
+                import awsiot.greengrasscoreipc as ipc
                 self.ipc_client = ipc.connect()
                 print("[INFO] Greengrass IPC connected")
             except Exception as e:
                 print(f"[WARN] Greengrass IPC connection failed: {e}")
                 self.ipc_client = None
+        elif self.mqtt_local_ipc:
+            self.ipc_client = LocalIPCClient()
+            print("[INFO] Using local IPC stand-in")
         else:
             print("[WARN] Running without Greengrass IPC")
 
+        if self.ipc_client:
+            # 발행은 백그라운드에서 처리 (추론 루프를 막지 않음)
+            self.publisher = AsyncMQTTPublisher(
+                self.ipc_client,
+                max_in_flight=self.mqtt_max_in_flight,
+                queue_size=self.mqtt_queue_size,
+                batch_max=self.mqtt_alert_batch,
+                on_failure=self._on_publish_failure
+            )
+            self.publisher.start()
+
     def _init_s3(self):
         """S3 클라이언트 초기화"""
         if HAS_BOTO3:
             try:
+                import boto3
                 self.s3_client = boto3.client('s3', region_name=self.aws_region)
                 print("[INFO] S3 client initialized")
+
+                # 업로드는 백그라운드 워커에서 처리 (추론 루프를 막지 않음)
+                self.uploader = AsyncS3Uploader(
+                    self.s3_client,
+                    bucket=self.s3_bucket,
+                    num_workers=self.s3_upload_workers,
+                    queue_size=self.s3_upload_queue_size,
+                    max_retries=self.s3_upload_retries,
+                    on_failure=self._on_upload_failure
+                )
+                self.uploader.start()
             except Exception as e:
                 print(f"[WARN] S3 client initialization failed: {e}")
                 self.s3_client = None
         else:
             print("[WARN] Running without S3 support")
 
+    def _init_spool(self):
+        """저장 후 전달 스풀 초기화 (SPOOL_DIR 설정 시)"""
+        if not self.spool_dir:
+            return
+
+        try:
+            self.spool = Spool(
+                self.spool_dir,
+                max_bytes=int(self.spool_max_mb * 1024 * 1024),
+                max_age=self.spool_max_age_hours * 3600
+            )
+        except OSError as e:
+            print(f"[WARN] Spool initialization failed: {e}")
+            self.spool = None
+            return
+
+        self.spool_drainer = SpoolDrainer(
+            self.spool,
+            send=self._send_spooled,
+            is_online=self._spool_online,
+            rate=self.spool_drain_rate,
+            retry_interval=self.spool_retry_interval
+        )
+        self.spool_drainer.start()
+        print(f"[INFO] Spool enabled: {self.spool_dir} ({len(self.spool)} pending)")
+
+    def _init_metrics(self):
+        """Prometheus 형식 /metrics 서버 시작 (METRICS_PORT 설정 시)"""
+        if not self.metrics_port:
+            return
+        try:
+            self.metrics_server = MetricsServer(
+                self._collect_metrics,
+                host=self.metrics_host,
+                port=self.metrics_port
+            )
+            self.metrics_server.start()
+        except OSError as e:
+            print(f"[WARN] Metrics server failed to start: {e}")
+            self.metrics_server = None
+
+    def _init_model_reload(self):
+        """모델 교체 스레드, 모델 파일 감시, 컴포넌트 설정 변경 구독 시작"""
+        self.reloader = ModelReloader(self.detector, warmup_runs=max(1, self.warmup_runs))
+        self.reloader.start()
+
+        # 시뮬레이션 모드는 읽을 모델 파일이 없음
+        if self.model_path and not self.use_simulation and self.model_watch_interval > 0:
+            self.model_watcher = ModelWatcher(
+                self.model_path,
+                on_change=self._on_model_file_changed,
+                interval=self.model_watch_interval
+            )
+            self.model_watcher.start()
+            print(f"[INFO] Watching model file: {self.model_path} (every {self.model_watch_interval}s)")
+
+        if self.ipc_client:
+            try:
+                self._config_subscription = subscribe_config_updates(self.ipc_client, self._apply_config)
+                if self._config_subscription is not None:
+                    print("[INFO] Subscribed to component configuration updates")
+            except Exception as e:
+                print(f"[WARN] Configuration update subscription failed: {e}")
+
+    def _on_model_file_changed(self, path: str):
+        """모델 파일 변경 시 다시 로드 (작은 입력 모델 사용 중이면 복구 시 새 파일 로드)"""
+        if self.load_shedder and self.load_shedder.active("small_input"):
+            return
+        self.reloader.request(model_path=path)
+
+    def _apply_config(self, config: dict) -> bool:
+        """
+        컴포넌트 설정 변경 적용 (ModelPath / ConfThreshold / NmsThreshold)
+
+        Args:
+            config: 컴포넌트 설정
+
+        Returns:
+            교체 요청 여부 (바뀐 항목이 없거나 값이 잘못되면 False)
+        """
+        if not self.reloader:
+            return False
+        try:
+            changes = config_to_reload(config, self.detector)
+        except (TypeError, ValueError) as e:
+            print(f"[WARN] Invalid model configuration: {e}")
+            return False
+        if not changes:
+            return False
+
+        print(f"[INFO] Applying configuration update: {changes}")
+        model_path = changes.get("model_path")
+        if model_path:
+            self.base_model_path = model_path
+            if self.model_watcher:
+                self.model_watcher.set_path(model_path)
+            if self.load_shedder and self.load_shedder.active("small_input"):
+                # 작은 입력 모델 사용 중이면 부하가 내려간 뒤 새 모델로 복구
+                del changes["model_path"]
+                if not changes:
+                    return True
+        return self.reloader.request(**changes)
+
+    def _init_load_shedder(self):
+        """부하 조절 제어기 생성 (LOAD_SHED 설정 시)"""
+        if not self.load_shed_enabled:
+            return
+
+        # 사용할 수 없는 단계는 건너뜀
+        skip = []
+        if self.pipeline_mode or not (self.use_simulation or self.load_shed_model_path):
+            # 파이프라인 모드는 감지기 밖에서 단계를 나눠 호출하므로 프레임 사이 입력 크기 교체 불가
+            skip.append("small_input")
+        if not self.uploader:
+            skip.append("defer_uploads")
+
+        self.cpu_monitor = CpuMonitor()
+        self.load_shedder = LoadShedder(
+            self.load_shed_config,
+            on_change=self._apply_load_level,
+            skip_levels=skip
+        )
+        print(f"[INFO] Load shedding enabled (latency {self.load_shed_config.latency_target_ms:.0f}ms, "
+              f"queue {self.load_shed_config.queue_target}, cpu {self.load_shed_config.cpu_target:.0%}"
+              f"{', skip ' + '/'.join(skip) if skip else ''})")
+
+    def _apply_load_level(self, old_level: int, new_level: int, reason: str):
+        """부하 단계 변경 적용 후 즉시 상태 보고"""
+        shedder = self.load_shedder
+
+        if self.overlay:
+            self.overlay.enabled = not shedder.active("no_overlay")
+
+        if self.uploader:
+            if shedder.active("defer_uploads"):
+                self.uploader.pause()
+            else:
+                self.uploader.resume()
+
+        # 작은 입력 모델 로드/워밍업은 교체 스레드에서 (프레임 사이에서 교체)
+        small = shedder.active("small_input")
+        if self.reloader and small != (tuple(self.detector.input_size) != tuple(self.base_input_size)):
+            if small:
+                self.reloader.request(
+                    model_path=self.load_shed_model_path if not self.use_simulation else None,
+                    input_size=self.load_shed_input_size
+                )
+            else:
+                self.reloader.request(
+                    model_path=self.base_model_path if not self.use_simulation else None,
+                    input_size=self.base_input_size
+                )
+
+        self.send_status_update()
+
+    def _rate_allowed(self, camera_id: str = "") -> bool:
+        """부하 조절: 추론 빈도 제한 단계면 카메라별 최소 간격 적용"""
+        if not self.load_shedder or self.load_shed_max_fps <= 0 or not self.load_shedder.active("reduce_rate"):
+            return True
+
+        now = time.time()
+        if now - self._shed_last_infer.get(camera_id, 0.0) < 1.0 / self.load_shed_max_fps:
+            self.shed_skipped_frames += 1
+            return False
+        self._shed_last_infer[camera_id] = now
+        return True
+
+    def _queue_depth(self) -> int:
+        """처리 대기 중인 항목 수 (파이프라인 큐 + MQTT 발행 대기, 보류한 업로드는 제외)"""
+        depth = 0
+        if self.pipeline:
+            depth += sum(len(stage.input_queue) for stage in self.pipeline.stages if stage.input_queue is not None)
+        if self.publisher:
+            depth += self.publisher.backlog
+        return depth
+
+    def _evaluate_load(self):
+        """LOAD_SHED_INTERVAL마다 부하 단계 판정"""
+        if not self.load_shedder:
+            return
+        now = time.time()
+        if now - self._last_shed_eval < self.load_shed_interval:
+            return
+        self._last_shed_eval = now
+        self.load_shedder.evaluate(queue_depth=self._queue_depth(), cpu_load=self.cpu_monitor.sample())
+
+    def _camera_sources(self) -> List[tuple]:
+        """(카메라 ID, 카메라) 목록"""
+        if self.multi_camera and self.camera:
+            return [(s.camera_id, s.camera) for s in self.camera.sources]
+        return [("default", self.camera)] if self.camera else []
+
+    def _collect_metrics(self, m: MetricsWriter):
+        """
+        메트릭 수집 (스크레이프 스레드에서 호출)
+
+        카운터와 큐 길이만 읽으며, 처리 스레드를 기다리게 하는 잠금이나
+        무거운 통계 계산은 하지 않습니다.
+        """
+        m.counter("ppe_frames_processed_total", "Frames run through detection", self.frame_count)
+        m.counter("ppe_detections_total", "Objects detected", self.detection_count)
+        m.counter("ppe_violations_total", "PPE violations detected", self.violation_count)
+        m.gauge("ppe_uptime_seconds", "Seconds since the main loop started",
+                time.time() - self.start_time if self.start_time else 0)
+        m.gauge("ppe_throughput_fps", "Completed frames per second (last 10s)", self.latency.fps)
+
+        startup = self.startup.get_stats()
+        for phase, seconds in startup["phases_s"].items():
+            m.gauge("ppe_startup_phase_seconds", "Startup phase duration", seconds, {"phase": phase})
+        for event, seconds in startup["events_s"].items():
+            m.gauge("ppe_startup_event_seconds", "Seconds from startup (imports included) to a startup event",
+                    seconds, {"event": event})
+
+        if self.detector:
+            m.gauge("ppe_model_generation", "Model swaps since startup (0 = initial model)",
+                    self.detector.model_generation)
+            m.counter("ppe_model_reloads_total", "Successful hot model reloads", self.detector.reloads)
+            m.counter("ppe_model_reload_failures_total", "Hot model reloads that kept the previous model",
+                      self.detector.reload_failures)
+
+        if self.load_shedder:
+            m.gauge("ppe_load_shed_level", "Load shedding level (0 = normal, 4 = uploads deferred)",
+                    self.load_shedder.level)
+            m.counter("ppe_load_shed_skipped_frames_total", "Frames skipped by load shedding rate limit",
+                      self.shed_skipped_frames)
+
+        for stage, hist in list(self.latency.histograms.items()):
+            m.histogram("ppe_stage_latency_seconds", "Per-stage processing latency",
+                        hist, {"stage": stage})
+
+        if self.pipeline:
+            for stage in self.pipeline.stages:
+                if stage.input_queue is None:
+                    continue
+                queue = stage.input_queue
+                m.gauge("ppe_pipeline_queue_depth", "Items waiting in a pipeline stage queue",
+                        len(queue), {"stage": stage.name})
+                m.counter("ppe_pipeline_queue_dropped_total", "Items dropped by a full stage queue",
+                          queue.dropped, {"stage": stage.name})
+
+        for camera_id, camera in self._camera_sources():
+            labels = {"camera": camera_id}
+            m.gauge("ppe_camera_connected", "Camera connection state", bool(camera.is_connected), labels)
+            m.gauge("ppe_camera_fps", "Camera capture FPS", float(camera.fps), labels)
+            m.counter("ppe_camera_reconnects_total", "Camera reconnect attempts",
+                      getattr(camera, "reconnects", 0), labels)
+            m.gauge("ppe_camera_connection_errors", "Consecutive camera connection failures",
+                    getattr(camera, "connection_errors", 0), labels)
+
+            # 카메라 버퍼에서 버려진 프레임 + 스케줄러에서 교체된 프레임
+            dropped = getattr(camera, "frames_dropped", 0)
+            if self.multi_camera:
+                dropped += self.camera.get_source(camera_id).frames_dropped
+            m.counter("ppe_camera_frames_dropped_total", "Frames captured but never processed",
+                      dropped, labels)
+
+        for camera_id, gate in self.motion_gates.items():
+            m.counter("ppe_motion_skipped_frames_total", "Frames skipped by the motion gate",
+                      gate.skipped, {"camera": camera_id or "default"})
+
+        if self.uploader:
+            m.gauge("ppe_s3_upload_backlog", "Uploads queued or in progress", self.uploader.backlog)
+            for result in ("uploaded", "failed"):
+                m.counter("ppe_s3_uploads_total", "S3 uploads by result",
+                          getattr(self.uploader, result), {"result": result})
+            m.counter("ppe_s3_uploads_total", "S3 uploads by result",
+                      self.uploader.queue.dropped, {"result": "dropped"})
+
+        if self.publisher:
+            m.gauge("ppe_mqtt_publish_backlog", "MQTT messages queued or in flight", self.publisher.backlog)
+            for result in ("published", "failed", "dropped"):
+                m.counter("ppe_mqtt_messages_total", "MQTT publishes by result",
+                          getattr(self.publisher, result), {"result": result})
+
+        if self.spool is not None:
+            m.gauge("ppe_spool_pending_records", "Records waiting in the store-and-forward spool",
+                    len(self.spool))
+
+    def _on_publish_failure(self, topic: str, message: dict, error: Exception):
+        """MQTT 발행 실패 시 알림을 스풀에 보관"""
+        if self.spool is not None and self._message_kind(topic) == "alert":
+            self.spool.append_message(topic, message)
+
+    def _on_upload_failure(self, job, error: Exception):
+        """S3 업로드 실패 시 이미지를 스풀에 보관"""
+        if self.spool is not None and job.data is not None:
+            self.spool.append_image(job.key, job.data, job.metadata, job.content_type)
+
+    def _spool_online(self) -> bool:
+        """최근 발행/업로드가 실패 상태가 아니면 온라인으로 판단"""
+        now = time.time()
+        for service in (self.publisher, self.uploader):
+            if service and service.last_failure_time > service.last_success_time \
+                    and now - service.last_failure_time < self.spool_retry_interval:
+                return False
+        return self.publisher is not None or self.uploader is not None
+
+    def _send_spooled(self, record: SpoolRecord) -> bool:
+        """스풀 레코드 재전송 (발행기/업로더 큐에 넣으면 성공)"""
+        if record.kind == "message":
+            if not self.publisher:
+                return False
+            return self.publisher.publish(record.data["topic"], record.data["message"], kind="alert")
+
+        if record.kind == "image":
+            # 업로드 보류 중(부하 조절)이면 스풀에 남겨 둠
+            if not self.uploader or self.uploader.paused:
+                return False
+            data = self.spool.load_image(record)
+            if data is None:
+                return True  # 이미지 파일 없음 (건너뜀)
+            return self.uploader.submit(
+                record.data["key"],
+                data=data,
+                metadata=record.data.get("metadata"),
+                content_type=record.data.get("content_type", "image/jpeg")
+            ) is not None
+
+        return True
+
     def publish_mqtt(self, topic: str, message: dict) -> bool:
         """
-        MQTT 메시지 발행
+        MQTT 메시지 발행 (비동기)
+
+        메시지는 발행 큐에 들어가고 바로 반환합니다. 상태 토픽은 최신
+        메시지만 전송되고, 알림 토픽은 몰릴 경우 묶어서 전송됩니다.
 
         Args:
             topic: MQTT 토픽
             message: 메시지 딕셔너리
 
         Returns:
-            발행 성공 여부
+            발행 요청 성공 여부
         """
-        payload = json.dumps(message, default=str)
-
         if not self.ipc_client:
+            # 연결 복구 후 전달하도록 알림은 스풀에 보관
+            if self.spool is not None and self._message_kind(topic) == "alert":
+                return self.spool.append_message(topic, message)
+
             # IPC 없이 로컬 출력
+            payload = json.dumps(message, default=str)
             print(f"[MQTT] Topic: {topic}")
             print(f"[MQTT] Payload: {payload[:200]}...")
             return True
 
-        try:
-            request = PublishToIoTCoreRequest()
-            request.topic_name = topic
-            request.payload = payload.encode()
-            request.qos = QOS.AT_LEAST_ONCE
-
-            operation = self.ipc_client.new_publish_to_iot_core()
-            operation.activate(request)
-            future = operation.get_response()
-            future.result(timeout=10)
+        if not self.publisher:
+            return False
 
-            print(f"[MQTT] Published to {topic}")
-            return True
+        return self.publisher.publish(topic, message, kind=self._message_kind(topic))
 
-        except Exception as e:
-            print(f"[MQTT] Publish failed: {e}")
-            return False
+    def _message_kind(self, topic: str) -> str:
+        """토픽에 따른 발행 메시지 종류"""
+        if topic == self.topic_status:
+            return "status"
+        if topic.startswith(self.topic_alerts):
+            return "alert"
+        return "event"
 
     def upload_image_to_s3(
         self,
         frame: np.ndarray,
-        prefix: str = "violations"
+        prefix: str = "violations",
+        camera_id: str = ""
     ) -> Optional[str]:
         """
-        이미지를 S3에 업로드
+        이미지를 S3에 업로드 (비동기)
+
+        JPEG 인코딩과 업로드는 백그라운드 업로더에서 처리되며,
+        업로드될 URL을 즉시 반환합니다. frame은 업로더 소유가 되므로
+        호출 후 수정하면 안 됩니다.
 
         Args:
             frame: 이미지 프레임
             prefix: S3 키 접두사
+            camera_id: 카메라 식별자 (멀티 카메라 모드)
 
         Returns:
-            S3 URL 또는 None
+            S3 URL 또는 None (업로드 불가/큐 가득 참)
+            스풀에 보관한 경우에도 업로드될 URL을 반환합니다.
         """
-        if not self.s3_client:
+        if not self.uploader and self.spool is None:
             return None
 
-        try:
-            # 이미지 인코딩
-            _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 85])
-            image_data = buffer.tobytes()
-
-            # S3 키 생성
-            now = datetime.datetime.now()
-            key = f"{prefix}/{self.thing_name}/{now.strftime('%Y/%m/%d')}/{now.strftime('%H%M%S_%f')}.jpg"
-
-            # 업로드
-            self.s3_client.put_object(
-                Bucket=self.s3_bucket,
-                Key=key,
-                Body=image_data,
-                ContentType='image/jpeg',
-                Metadata={
-                    'device_id': self.thing_name,
-                    'timestamp': now.isoformat()
-                }
-            )
+        now = datetime.datetime.now()
+        device_path = f"{self.thing_name}/{camera_id}" if camera_id else self.thing_name
+        key = AsyncS3Uploader.make_key(prefix, device_path, now)
+        metadata = {
+            'device_id': self.thing_name,
+            'timestamp': now.isoformat()
+        }
 
-            s3_url = f"s3://{self.s3_bucket}/{key}"
-            print(f"[S3] Uploaded: {s3_url}")
-            return s3_url
+        if self.uploader:
+            url = self.uploader.submit(key, frame=frame, metadata=metadata)
+            if url or self.spool is None:
+                return url
 
-        except ClientError as e:
-            print(f"[S3] Upload failed: {e}")
-            return None
-        except Exception as e:
-            print(f"[S3] Unexpected error: {e}")
+        # 업로더 없음/큐 가득 참 → 스풀에 보관
+        data = encode_jpeg(frame)
+        if data is None or not self.spool.append_image(key, data, metadata):
             return None
+        return f"s3://{self.s3_bucket}/{key}"
+
+    def _alert_base_image(self, frame: np.ndarray, camera_id: str = ""):
+        """
+        위반 이미지 바탕 (BGR)
+
+        스냅샷 분기가 있는 카메라(GstCapture)는 감지한 프레임과 같은 버퍼의
+        전체 해상도 스냅샷을 사용하고, 짝이 맞는 스냅샷이 없거나 RGB 모델
+        프레임만 있으면 모델 프레임(RGB면 BGR로 변환한 사본)을 사용합니다.
+
+        Returns:
+            (바탕 이미지, 감지 좌표 → 바탕 좌표 x 배율, y 배율)
+        """
+        camera = self._camera_for(camera_id)
+        snapshot = camera.get_snapshot(frame=frame) if hasattr(camera, "get_snapshot") else None
+        if snapshot is not None:
+            return snapshot, snapshot.shape[1] / frame.shape[1], snapshot.shape[0] / frame.shape[0]
+        if self._frame_format(camera_id) == "RGB":
+            return np.ascontiguousarray(frame[..., ::-1]), 1.0, 1.0
+        return frame, 1.0, 1.0
 
     def send_violation_alert(
         self,
         detections: List[Detection],
-        frame: np.ndarray
+        frame: np.ndarray,
+        camera_id: str = ""
     ):
         """
         PPE 위반 알림 전송
@@ -298,6 +1130,7 @@ class PPEDetectionSystem:
         Args:
             detections: 감지 결과 리스트
             frame: 현재 프레임
+            camera_id: 카메라 식별자 (멀티 카메라 모드, 쿨다운/토픽 분리)
         """
         violations = [d for d in detections if d.is_violation]
 
@@ -306,21 +1139,50 @@ class PPEDetectionSystem:
 
         current_time = time.time()
 
+        # 지난 쿨다운 항목 정리 (트랙 ID가 계속 늘어나므로)
+        if len(self.last_alert_time) > 256:
+            self.last_alert_time = {
+                key: t for key, t in self.last_alert_time.items()
+                if current_time - t < self.alert_cooldown
+            }
+
+        tracker = self.trackers.get(camera_id)
+        base = None
         for violation in violations:
-            # 쿨다운 체크
-            last_time = self.last_alert_time.get(violation.class_name, 0)
+            # 확정되지 않은 트랙 (한두 프레임 오검출)은 알리지 않음
+            if tracker is not None and violation.track_id is not None and \
+                    not tracker.is_confirmed(violation.track_id):
+                continue
+
+            # 쿨다운 체크 (카메라별, 추적 중이면 작업자(트랙)별)
+            if violation.track_id is not None:
+                alert_key = (camera_id, violation.class_name, violation.track_id)
+            else:
+                alert_key = (camera_id, violation.class_name)
+            last_time = self.last_alert_time.get(alert_key, 0)
             if current_time - last_time < self.alert_cooldown:
                 continue
 
-            self.last_alert_time[violation.class_name] = current_time
+            self.last_alert_time[alert_key] = current_time
             self.violation_count += 1
             self.last_violation_time = datetime.datetime.now().isoformat()
 
-            # 결과 이미지 생성
-            result_frame = self.detector.draw_detections(frame, [violation])
+            # 결과 이미지 생성 (부하 조절로 시각화 생략 중이면 원본 사본)
+            if base is None:
+                base, scale_x, scale_y = self._alert_base_image(frame, camera_id)
+            marked = violation
+            if (scale_x, scale_y) != (1.0, 1.0):
+                x1, y1, x2, y2 = violation.bbox
+                marked = dataclasses.replace(violation, bbox=(
+                    int(x1 * scale_x), int(y1 * scale_y), int(x2 * scale_x), int(y2 * scale_y)
+                ))
+            if self.overlay and not self.overlay.enabled:
+                result_frame = base.copy()
+            else:
+                result_frame = self.detector.draw_detections(base, [marked])
 
             # S3 업로드
-            s3_url = self.upload_image_to_s3(result_frame, "violations")
+            s3_url = self.upload_image_to_s3(result_frame, "violations", camera_id=camera_id)
 
             # 알림 메시지 구성
             alert_message = {
@@ -328,6 +1190,7 @@ class PPEDetectionSystem:
                 "timestamp": datetime.datetime.now().isoformat(),
                 "event_type": "PPE_VIOLATION",
                 "severity": "HIGH",
+                "camera_id": camera_id or None,
                 "violation": violation.to_dict(),
                 "image_url": s3_url,
                 "message": f"PPE violation detected: {violation.class_name}",
@@ -338,8 +1201,9 @@ class PPEDetectionSystem:
             }
 
             # MQTT 발행
-            self.publish_mqtt(self.topic_alerts, alert_message)
-            print(f"[ALERT] {violation.class_name} violation detected!")
+            self.publish_mqtt(self._alert_topic(camera_id), alert_message)
+            camera_label = f" on {camera_id}" if camera_id else ""
+            print(f"[ALERT] {violation.class_name} violation detected{camera_label}!")
 
     def send_status_update(self):
         """상태 업데이트 전송"""
@@ -355,28 +1219,120 @@ class PPEDetectionSystem:
                 "detections_total": self.detection_count,
                 "violations_total": self.violation_count,
                 "last_violation": self.last_violation_time,
-                "inference_time_ms": round(self.detector.inference_time * 1000, 2) if self.detector else 0
+                "inference_time_ms": round(self.detector.inference_time * 1000, 2) if self.detector else 0,
+                "throughput_fps": round(self.latency.fps, 2)
             },
+            # 직전 상태 보고 이후 구간의 단계별 지연 시간 (ms)
+            "latency": self.latency.interval_stats(),
             "config": {
                 "simulation_mode": self.use_simulation,
+                "pipeline_mode": self.pipeline_mode,
                 "camera_resolution": self.camera.resolution if self.camera else (0, 0)
             }
         }
 
+        status_message["startup"] = self.startup.get_stats()
+
+        if self.reloader:
+            status_message["model"] = self.reloader.get_stats()
+
+        if self.load_shedder:
+            status_message["load_shed"] = self.load_shedder.get_stats()
+            status_message["load_shed"]["frames_skipped"] = self.shed_skipped_frames
+
+        if self.pipeline:
+            status_message["pipeline"] = self.pipeline.get_stats()
+
+        if self.multi_camera and self.camera:
+            status_message["cameras"] = self.camera.get_stats()
+        elif self.camera and hasattr(self.camera, "get_stats"):
+            status_message["camera"] = self.camera.get_stats()
+
+        if self.trackers:
+            status_message["tracking"] = {
+                camera_id or "default": tracker.get_stats()
+                for camera_id, tracker in self.trackers.items()
+            }
+
+        if self.overlay:
+            status_message["overlay"] = self.overlay.get_stats()
+
+        if self.rois:
+            status_message["roi"] = {
+                camera_id or "default": roi.get_stats()
+                for camera_id, roi in self.rois.items()
+            }
+
+        if self.motion_gates:
+            status_message["motion_gate"] = {
+                camera_id or "default": gate.get_stats()
+                for camera_id, gate in self.motion_gates.items()
+            }
+
+        if self.uploader:
+            status_message["uploads"] = self.uploader.get_stats()
+
+        if self.publisher:
+            status_message["mqtt"] = self.publisher.get_stats()
+
+        if self.spool_drainer:
+            status_message["spool"] = self.spool_drainer.get_stats()
+
+        if self.metrics_server:
+            status_message["metrics"] = self.metrics_server.get_stats()
+
         self.publish_mqtt(self.topic_status, status_message)
 
-    def process_frame(self, frame: np.ndarray) -> np.ndarray:
+    def process_frame(self, frame: np.ndarray, camera_id: str = "") -> AnnotatedFrame:
         """
         프레임 처리
 
         Args:
             frame: 입력 프레임
+            camera_id: 카메라 식별자 (멀티 카메라 모드)
 
         Returns:
-            처리된 프레임
+            감지 결과가 연결된 AnnotatedFrame (image 접근 시 렌더링)
         """
         # PPE 감지
-        detections = self.detector.detect(frame)
+        return self._handle_detections(frame, self._detect(frame, camera_id), camera_id)
+
+    def process_frames(self, items: List[tuple]) -> List[AnnotatedFrame]:
+        """
+        여러 카메라 프레임을 한 번의 배치 추론으로 처리
+
+        Args:
+            items: [(frame, camera_id), ...]
+
+        Returns:
+            프레임 순서대로의 AnnotatedFrame 리스트
+        """
+        views, rects = [], []
+        for frame, camera_id in items:
+            roi = self.rois.get(camera_id)
+            view, rect = roi.crop(frame) if roi is not None else (frame, None)
+            views.append(view)
+            rects.append(rect)
+
+        results = []
+        formats = [self._frame_format(camera_id) for _, camera_id in items]
+        for (frame, camera_id), rect, detections in zip(
+            items, rects, self.detector.detect_batch(views, input_formats=formats)
+        ):
+            if rect is not None:
+                detections = self.rois[camera_id].apply(detections, rect, frame.shape)
+            results.append(self._handle_detections(frame, detections, camera_id))
+        return results
+
+    def _handle_detections(
+        self,
+        frame: np.ndarray,
+        detections: List[Detection],
+        camera_id: str = ""
+    ) -> AnnotatedFrame:
+        """감지 결과 추적, 통계 반영, 위반 알림"""
+        detections = self._track(detections, camera_id)
+        self._mark_first_detection()
 
         # 통계 업데이트
         self.frame_count += 1
@@ -384,18 +1340,237 @@ class PPEDetectionSystem:
 
         # 위반 체크 및 알림
         violations = [d for d in detections if d.is_violation]
+        self._record_camera_result(camera_id, len(detections), len(violations))
         if violations:
-            self.send_violation_alert(detections, frame)
-
-        # 결과 시각화
-        result_frame = self.detector.draw_detections(
-            frame,
-            detections,
-            show_fps=True,
-            show_labels=True
+            with self.latency.time("alert"):
+                self.send_violation_alert(detections, frame, camera_id=camera_id)
+
+        # 결과 시각화 (요청 시 렌더링)
+        return self.overlay.annotate(frame, detections)
+
+    def _mark_first_detection(self):
+        """첫 감지 완료 시 시작 시간 보고"""
+        if self.startup.mark("first_detection"):
+            print(f"[STARTUP] {self.startup.summary()}")
+
+    def _motion_allowed(self, frame: np.ndarray, camera_id: str = "") -> bool:
+        """움직임 게이트: 이 프레임에 추론이 필요한지 여부"""
+        if not self.motion_gate_enabled:
+            return True
+
+        gate = self.motion_gates.get(camera_id)
+        if gate is None:
+            gate = MotionGate(
+                threshold=self.motion_threshold,
+                pixel_threshold=self.motion_pixel_threshold,
+                min_interval=self.motion_min_interval,
+                max_interval=self.motion_max_interval,
+                hold_time=self.motion_hold_time
+            )
+            self.motion_gates[camera_id] = gate
+        return gate.should_infer(frame)
+
+    def _detect(self, frame: np.ndarray, camera_id: str = "") -> List[Detection]:
+        """ROI가 있으면 구역 사각형만 잘라서 감지 후 구역 밖 결과 제거"""
+        roi = self.rois.get(camera_id)
+        input_format = self._frame_format(camera_id)
+        if roi is None:
+            return self.detector.detect(frame, input_format=input_format)
+
+        view, rect = roi.crop(frame)
+        return roi.apply(self.detector.detect(view, input_format=input_format), rect, frame.shape)
+
+    def _track(self, detections: List[Detection], camera_id: str = "") -> List[Detection]:
+        """카메라별 추적기로 감지 결과에 추적 ID 부여"""
+        if not self.tracker_enabled:
+            return detections
+
+        tracker = self.trackers.get(camera_id)
+        if tracker is None:
+            tracker = MultiObjectTracker(
+                iou_threshold=self.track_iou_threshold,
+                max_age=self.track_max_age,
+                min_hits=self.track_min_hits,
+                lost_max_age=self.track_lost_max_age
+            )
+            self.trackers[camera_id] = tracker
+        return tracker.update(detections)
+
+    def _record_camera_result(self, camera_id: str, num_detections: int, num_violations: int):
+        """카메라별 처리 통계 반영 (멀티 카메라 모드)"""
+        if not camera_id:
+            return
+        source = self.camera.get_source(camera_id)
+        if source:
+            source.record_result(num_detections, num_violations)
+
+    def _build_pipeline(self) -> Pipeline:
+        """
+        단계별 처리 파이프라인 구성
+
+        capture → preprocess → infer → postprocess → alert
+        - 캡처/전처리 큐: 최신 프레임 우선 (drop_oldest, 추론 큐에서 버려진
+          패킷의 입력 버퍼는 풀로 반환)
+        - 추론 → 후처리 큐: 추론 결과를 버리지 않도록 block
+        - 알림 큐: 위반이 있는 프레임만 전달, 크게 두고 drop_oldest
+          (느린 S3/MQTT가 추론을 멈추지 않음)
+        """
+        pipeline = Pipeline("ppe")
+        infer_workers = self.detector.num_npu_workers if self.detector.pool else 1
+
+        pipeline.add_stage("capture", self._stage_capture)
+        pipeline.add_stage("preprocess", self._stage_preprocess,
+                           queue_size=self.pipeline_queue_size, drop_policy="drop_oldest")
+        pipeline.add_stage("infer", self._stage_infer,
+                           queue_size=self.pipeline_queue_size, drop_policy="drop_oldest",
+                           workers=infer_workers, on_drop=self._release_input)
+        pipeline.add_stage("postprocess", self._stage_postprocess,
+                           queue_size=self.pipeline_queue_size, drop_policy="block")
+        pipeline.add_stage("alert", self._stage_alert,
+                           queue_size=self.alert_queue_size, drop_policy="drop_oldest")
+        return pipeline
+
+    def _stage_capture(self) -> Optional[FramePacket]:
+        """캡처 단계: 카메라에서 프레임 읽기"""
+        start = time.perf_counter()
+        camera_id, frame, capture_time = self._read_latest(timeout=0.5)
+        if frame is None:
+            return None
+        self.latency.record("capture_wait", time.perf_counter() - start)
+        self.startup.mark("first_frame")
+        if not self._motion_allowed(frame, camera_id) or not self._rate_allowed(camera_id):
+            return None
+
+        self._capture_seq += 1
+        return FramePacket(
+            seq=self._capture_seq,
+            frame=frame,
+            capture_time=capture_time,
+            camera_id=camera_id
         )
 
-        return result_frame
+    def _stage_preprocess(self, packet: FramePacket) -> FramePacket:
+        """전처리 단계"""
+        start = time.perf_counter()
+        image = packet.frame
+        roi = self.rois.get(packet.camera_id)
+        if roi is not None:
+            image, packet.crop = roi.crop(packet.frame)
+
+        # 프레임마다 별도 입력 버퍼 (추론 후 반환)
+        packet.input_data = self.detector.preprocess(
+            image,
+            out=self.detector.input_buffers.acquire(),
+            input_format=self._frame_format(packet.camera_id)
+        )
+        packet.timings["preprocess"] = time.perf_counter() - start
+        self.latency.record("preprocess", packet.timings["preprocess"])
+        return packet
+
+    def _release_input(self, packet: FramePacket):
+        """추론 전에 버려진 패킷의 입력 버퍼를 풀로 반환"""
+        if packet.input_data is not None:
+            self.detector.input_buffers.release(packet.input_data)
+            packet.input_data = None
+
+    def _stage_infer(self, packet: FramePacket) -> FramePacket:
+        """추론 단계 (풀 모드에서는 NPU 워커 수만큼 병렬)"""
+        self.latency.record("frame_age", time.time() - packet.capture_time)
+        start = time.perf_counter()
+        try:
+            packet.outputs = self.detector.infer(packet.input_data)
+        finally:
+            self.detector.input_buffers.release(packet.input_data)
+            packet.input_data = None
+        packet.timings["infer"] = time.perf_counter() - start
+        self.latency.record("infer", packet.timings["infer"])
+        return packet
+
+    def _stage_postprocess(self, packet: FramePacket) -> Optional[FramePacket]:
+        """후처리 단계: 감지 결과 생성, 위반 프레임만 알림 단계로 전달"""
+        start = time.perf_counter()
+        if packet.crop is None:
+            detections = self.detector.postprocess(packet.outputs, packet.frame.shape)
+        else:
+            x1, y1, x2, y2 = packet.crop
+            detections = self.detector.postprocess(
+                packet.outputs, (y2 - y1, x2 - x1) + packet.frame.shape[2:]
+            )
+            detections = self.rois[packet.camera_id].apply(
+                detections, packet.crop, packet.frame.shape
+            )
+        packet.detections = self._track(detections, packet.camera_id)
+        packet.outputs = None
+        self._mark_first_detection()
+        packet.timings["postprocess"] = time.perf_counter() - start
+        self.latency.record("postprocess", packet.timings["postprocess"])
+
+        self.detector.update_stats(
+            packet.timings.get("preprocess", 0.0)
+            + packet.timings.get("infer", 0.0)
+            + packet.timings["postprocess"]
+        )
+        self.frame_count += 1
+        self.detection_count += len(packet.detections)
+
+        num_violations = sum(1 for d in packet.detections if d.is_violation)
+        self._record_camera_result(packet.camera_id, len(packet.detections), num_violations)
+
+        if not num_violations:
+            self._record_end_to_end(time.time() - packet.capture_time)
+            return None
+        return packet
+
+    def _stage_alert(self, packet: FramePacket):
+        """알림 단계: S3 업로드 및 MQTT 발행"""
+        with self.latency.time("alert"):
+            self.send_violation_alert(packet.detections, packet.frame, camera_id=packet.camera_id)
+        self._record_end_to_end(time.time() - packet.capture_time)
+
+    def _record_end_to_end(self, seconds: float):
+        """종단 간 지연 시간 (캡처부터 처리 완료까지) 기록 및 부하 조절 관찰"""
+        self.latency.record("end_to_end", seconds)
+        if self.load_shedder:
+            self.load_shedder.observe(seconds)
+
+    def _run_pipeline(self, status_interval: float, log_interval: float = 10.0):
+        """
+        파이프라인 모드 실행
+
+        처리는 단계 스레드에서 이루어지고, 메인 스레드는
+        상태 보고와 로그 출력만 담당합니다.
+        """
+        self.pipeline = self._build_pipeline()
+        self.pipeline.start()
+
+        last_status_time = time.time()
+        last_log_time = time.time()
+        last_log_frames = self.frame_count
+
+        while self.running:
+            time.sleep(0.5)
+            self._evaluate_load()
+
+            if time.time() - last_status_time >= status_interval:
+                self.send_status_update()
+                last_status_time = time.time()
+
+            if time.time() - last_log_time >= log_interval:
+                now = time.time()
+                fps = (self.frame_count - last_log_frames) / (now - last_log_time)
+                queues = {
+                    name: stats["queue"]["depth"]
+                    for name, stats in self.pipeline.get_stats().items()
+                    if "queue" in stats
+                }
+                print(f"[INFO] Frames: {self.frame_count}, "
+                      f"Detections: {self.detection_count}, "
+                      f"Violations: {self.violation_count}, "
+                      f"FPS: {fps:.1f}, "
+                      f"Queues: {queues}, "
+                      f"Bottleneck: {self.pipeline.bottleneck()}")
+                last_log_time = now
+                last_log_frames = self.frame_count
 
     def run(self):
         """메인 실행 루프"""
@@ -416,21 +1591,56 @@ class PPEDetectionSystem:
 
         # 로그 출력 간격 (프레임 수)
         log_interval = 100
+        last_log_count = 0
 
         print("[INFO] Starting main processing loop...")
         print("[INFO] Press Ctrl+C to stop")
         print("-" * 60)
 
         try:
-            while self.running:
-                # 프레임 가져오기
-                frame = self.camera.get_frame(timeout=1.0)
-
-                if frame is None:
-                    continue
-
-                # 프레임 처리
-                result = self.process_frame(frame)
+            if self.pipeline_mode:
+                self._run_pipeline(status_interval)
+
+            while self.running and not self.pipeline_mode:
+                # 프레임 가져오기 (배치 모델이면 준비된 카메라 프레임을 묶어서)
+                # RTSP 링 버퍼 프레임은 복사하지 않고 처리가 끝나면 참조 반환
+                wait_start = time.perf_counter()
+                refs = []
+                items = self._read_batch(timeout=1.0, refs=refs)
+                try:
+                    self._evaluate_load()
+
+                    if not items:
+                        continue
+                    frame_start = time.perf_counter()
+                    self.latency.record("capture_wait", frame_start - wait_start)
+                    self.startup.mark("first_frame")
+
+                    # 정지 장면이면 추론 생략, 부하 조절 중이면 카메라별 추론 빈도 제한
+                    items = [item for item in items
+                             if self._motion_allowed(item[1], item[0]) and self._rate_allowed(item[0])]
+                    if not items:
+                        continue
+
+                    # 추론 시점의 프레임 나이 (디코딩 후 대기 시간)
+                    now = time.time()
+                    for _, _, capture_time in items:
+                        self.latency.record("frame_age", now - capture_time)
+
+                    # 프레임 처리 (위반 이미지는 그린 사본을 업로더에 넘기므로 링 버퍼를 잡지 않음)
+                    if len(items) == 1:
+                        camera_id, frame, _ = items[0]
+                        annotated = [self.process_frame(frame, camera_id=camera_id)]
+                    else:
+                        annotated = self.process_frames([(frame, camera_id) for camera_id, frame, _ in items])
+                    # 종단 간 지연은 파이프라인 모드와 같이 캡처부터 (처리 대기로 밀린 시간 포함)
+                    now = time.time()
+                    for result, (_, _, capture_time) in zip(annotated, items):
+                        result.release()
+                        self._record_end_to_end(now - capture_time)
+                finally:
+                    for ref in refs:
+                        ref.release()
 
                 # 주기적 상태 업데이트
                 if time.time() - last_status_time >= status_interval:
@@ -438,12 +1648,14 @@ class PPEDetectionSystem:
                     last_status_time = time.time()
 
                 # 주기적 로그 출력
-                if self.frame_count % log_interval == 0:
-                    fps = 1.0 / self.detector.inference_time if self.detector.inference_time > 0 else 0
+                if self.frame_count - last_log_count >= log_interval:
+                    last_log_count = self.frame_count
+                    e2e = self.latency.histogram("end_to_end")
                     print(f"[INFO] Frames: {self.frame_count}, "
                           f"Detections: {self.detection_count}, "
                           f"Violations: {self.violation_count}, "
-                          f"FPS: {fps:.1f}")
+                          f"FPS: {self.latency.fps:.1f}, "
+                          f"E2E p50/p99: {e2e.percentile(50):.1f}/{e2e.percentile(99):.1f}ms")
 
         except KeyboardInterrupt:
             print("\n[INFO] Interrupted by user")
@@ -458,13 +1670,46 @@ class PPEDetectionSystem:
         print("[INFO] Cleaning up...")
         self.running = False
 
+        # 파이프라인 정지 (카메라/감지기 해제 전에)
+        if self.pipeline:
+            self.pipeline.stop()
+
         # 최종 상태 전송
         self.send_status_update()
 
+        if self.metrics_server:
+            self.metrics_server.stop()
+
         # 카메라 정지
         if self.camera:
             self.camera.stop()
 
+        # 모델 교체 중지 (진행 중인 교체는 끝난 뒤 감지기 해제)
+        if self._config_subscription is not None:
+            try:
+                self._config_subscription.close()
+            except Exception:
+                pass
+        if self.model_watcher:
+            self.model_watcher.stop()
+        if self.reloader:
+            self.reloader.stop()
+
+        # 스풀 재전송 중지 (남은 레코드는 다음 실행에서 전달)
+        if self.spool_drainer:
+            self.spool_drainer.stop()
+
+        # 남은 업로드 처리
+        if self.uploader:
+            self.uploader.stop()
+
+        # 남은 MQTT 메시지 전송
+        if self.publisher:
+            self.publisher.stop()
+
+        if self.spool is not None:
+            self.spool.close()
+
         # 감지기 해제
         if self.detector:
             self.detector.release()
@@ -479,6 +1724,9 @@ class PPEDetectionSystem:
         if self.start_time:
             uptime = time.time() - self.start_time
             print(f"Uptime: {uptime:.1f} seconds")
+        for stage, stats in self.latency.get_stats()["stages_ms"].items():
+            print(f"{stage:>12}: p50 {stats['p50']:.1f}ms, p95 {stats['p95']:.1f}ms, "
+                  f"p99 {stats['p99']:.1f}ms, max {stats['max']:.1f}ms")
         print("=" * 60)
 
 
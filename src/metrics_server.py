@@ -0,0 +1,329 @@
+#!/usr/bin/env python3
+"""
+Prometheus 형식 메트릭 HTTP 엔드포인트
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+현장에서 느린 장비를 진단할 때 60초 주기 MQTT 상태 메시지 대신
+curl이나 Prometheus로 바로 긁어 갈 수 있도록 /metrics를 제공합니다.
+
+추론 루프에 영향을 주지 않도록:
+- 데몬 스레드의 ThreadingHTTPServer (소켓 I/O 중에는 GIL을 놓음)
+- 수집 함수는 카운터/큐 길이만 읽고 무거운 통계 계산을 하지 않음
+- 렌더링 결과를 cache_ttl초 동안 재사용 (잦은 스크레이프에도 비용 일정)
+- 히스토그램은 내부 버킷을 step개씩 묶어 내보냄 (기본 2배 간격)
+
+사용 예시:
+    from metrics_server import MetricsServer
+
+    def collect(m):
+        m.counter("ppe_frames_processed_total", "Frames processed", system.frame_count)
+        m.histogram("ppe_stage_latency_seconds", "Stage latency",
+                    latency.histogram("infer"), {"stage": "infer"})
+
+    server = MetricsServer(collect, port=9100)
+    server.start()
+    # curl http://device:9100/metrics
+    server.stop()
+"""
+
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Optional, Tuple
+
+from latency import LatencyHistogram
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _format_labels(labels: Optional[Dict[str, object]]) -> str:
+    if not labels:
+        return ""
+    parts = []
+    for key, value in labels.items():
+        text = str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        parts.append(f'{key}="{text}"')
+    return "{" + ",".join(parts) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class MetricsWriter:
+    """
+    Prometheus 텍스트 형식 작성기
+
+    같은 이름의 샘플은 라벨이 달라도 한 메트릭 패밀리로 묶여
+    HELP/TYPE 줄이 한 번만 출력됩니다.
+    """
+
+    def __init__(self):
+        self._families: Dict[str, Tuple[str, str, List[str]]] = {}
+
+    def _family(self, name: str, kind: str, help_text: str) -> List[str]:
+        family = self._families.get(name)
+        if family is None:
+            family = (kind, help_text, [])
+            self._families[name] = family
+        return family[2]
+
+    def counter(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, object]] = None):
+        """단조 증가 카운터 (이름은 _total로 끝나야 함)"""
+        self._family(name, "counter", help_text).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def gauge(self, name: str, help_text: str, value: float, labels: Optional[Dict[str, object]] = None):
+        """현재 값"""
+        self._family(name, "gauge", help_text).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        hist: LatencyHistogram,
+        labels: Optional[Dict[str, object]] = None,
+        step: int = 4
+    ):
+        """
+        LatencyHistogram을 초 단위 Prometheus 히스토그램으로 출력
+
+        Args:
+            hist: 지연 시간 히스토그램 (ms 버킷)
+            step: 내부 버킷 몇 개마다 le 경계를 출력할지 (누적값이므로 정확함)
+        """
+        with hist._lock:
+            counts = list(hist.counts)
+            count = hist.count
+            total_ms = hist.total
+
+        lines = self._family(name, "histogram", help_text)
+        labels = dict(labels or {})
+        cumulative = 0
+        for i, bound in enumerate(hist.bounds):
+            cumulative += counts[i]
+            if (i + 1) % step == 0 or i == len(hist.bounds) - 1:
+                labels["le"] = f"{bound / 1000.0:g}"
+                lines.append(f"{name}_bucket{_format_labels(labels)} {cumulative}")
+        labels["le"] = "+Inf"
+        lines.append(f"{name}_bucket{_format_labels(labels)} {count}")
+        del labels["le"]
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total_ms / 1000.0)}")
+        lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    def render(self) -> str:
+        """텍스트 형식 출력"""
+        out = []
+        for name, (kind, help_text, lines) in self._families.items():
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+            out.extend(lines)
+        return "\n".join(out) + "\n"
+
+
+class ProcessStats:
+    """
+    프로세스 RSS/CPU (/proc 직접 읽기, psutil 불필요)
+
+    /proc가 없는 환경에서는 resource 모듈로 대체합니다.
+    """
+
+    def __init__(self):
+        self.start_time = time.time()
+        try:
+            self._clk_tck = os.sysconf("SC_CLK_TCK")
+            self._page_size = os.sysconf("SC_PAGE_SIZE")
+        except (ValueError, OSError, AttributeError):
+            self._clk_tck = 100
+            self._page_size = 4096
+
+    def read(self) -> Dict[str, float]:
+        """rss_bytes, cpu_seconds, threads"""
+        try:
+            with open("/proc/self/stat") as f:
+                # comm(2번째 필드)에 공백이 있을 수 있으므로 ')' 뒤부터 분리
+                fields = f.read().rsplit(")", 1)[1].split()
+            return {
+                "cpu_seconds": (int(fields[11]) + int(fields[12])) / self._clk_tck,
+                "threads": int(fields[17]),
+                "rss_bytes": int(fields[21]) * self._page_size,
+            }
+        except (OSError, IndexError, ValueError):
+            import resource
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            return {
+                "cpu_seconds": usage.ru_utime + usage.ru_stime,
+                "threads": threading.active_count(),
+                "rss_bytes": usage.ru_maxrss * 1024,
+            }
+
+    def collect(self, writer: MetricsWriter):
+        """표준 process_* 메트릭 출력"""
+        stats = self.read()
+        writer.gauge("process_resident_memory_bytes", "Resident memory size in bytes", stats["rss_bytes"])
+        writer.counter("process_cpu_seconds_total", "Total user and system CPU time in seconds",
+                       stats["cpu_seconds"])
+        writer.gauge("process_threads", "Number of OS threads", stats["threads"])
+        writer.gauge("process_start_time_seconds", "Process start time (unix seconds)", self.start_time)
+
+
+class MetricsServer:
+    """
+    /metrics HTTP 서버
+
+    collect(writer)를 호출해 메트릭을 모으고 결과 텍스트를 캐시합니다.
+    수집 함수에서 예외가 나면 500을 반환하고 서버는 계속 동작합니다.
+    """
+
+    def __init__(
+        self,
+        collect: Callable[[MetricsWriter], None],
+        host: str = "0.0.0.0",
+        port: int = 9100,
+        cache_ttl: float = 1.0,
+        include_process: bool = True
+    ):
+        """
+        Args:
+            collect: 메트릭 수집 함수 (MetricsWriter를 받음)
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트, 실제 포트는 self.port)
+            cache_ttl: 렌더링 결과 재사용 시간 (초)
+            include_process: process_* 메트릭 포함 여부
+        """
+        self.collect = collect
+        self.host = host
+        self.port = port
+        self.cache_ttl = cache_ttl
+        self.process = ProcessStats() if include_process else None
+
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self._cached: Optional[bytes] = None
+        self._cached_at = 0.0
+
+        # 통계
+        self.scrapes = 0
+        self.renders = 0
+        self.errors = 0
+        self.render_time = 0.0
+
+    def render(self) -> bytes:
+        """메트릭 텍스트 (cache_ttl 안에서는 캐시 반환)"""
+        with self._lock:
+            now = time.monotonic()
+            if self._cached is not None and now - self._cached_at < self.cache_ttl:
+                return self._cached
+
+            start = time.perf_counter()
+            writer = MetricsWriter()
+            self.collect(writer)
+            if self.process is not None:
+                self.process.collect(writer)
+            writer.gauge("ppe_metrics_render_seconds", "Time spent rendering the previous scrape",
+                         self.render_time)
+
+            self._cached = writer.render().encode("utf-8")
+            self._cached_at = now
+            self.renders += 1
+            self.render_time = time.perf_counter() - start
+            return self._cached
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path == "/metrics":
+                    server.scrapes += 1
+                    try:
+                        body, status, content_type = server.render(), 200, CONTENT_TYPE
+                    except Exception as e:
+                        server.errors += 1
+                        print(f"[METRICS] Collect error: {e}")
+                        body, status, content_type = f"collect error: {e}\n".encode(), 500, "text/plain"
+                elif path == "/":
+                    body, status, content_type = b"PPE detection metrics: /metrics\n", 200, "text/plain"
+                else:
+                    body, status, content_type = b"not found\n", 404, "text/plain"
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청마다 로그를 남기지 않음
+
+        return Handler
+
+    def start(self):
+        """백그라운드 스레드에서 서버 시작"""
+        if self._server is not None:
+            return
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.5},
+            name="metrics-http",
+            daemon=True
+        )
+        self._thread.start()
+        print(f"[METRICS] Serving http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        """서버 정지"""
+        if self._server is None:
+            return
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+        self._server = None
+        self._thread = None
+
+    def get_stats(self) -> dict:
+        """서버 통계 반환"""
+        return {
+            "port": self.port,
+            "scrapes": self.scrapes,
+            "renders": self.renders,
+            "errors": self.errors,
+            "last_render_ms": round(self.render_time * 1000, 3)
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import urllib.request
+    from latency import LatencyRecorder
+
+    print("=== Metrics Server Test ===")
+
+    recorder = LatencyRecorder()
+    for i in range(1000):
+        recorder.record("infer", 0.02 + (i % 10) * 0.001)
+
+    def collect(m: MetricsWriter):
+        m.counter("ppe_frames_processed_total", "Frames processed", 1000)
+        m.histogram("ppe_stage_latency_seconds", "Stage latency", recorder.histogram("infer"), {"stage": "infer"})
+
+    server = MetricsServer(collect, host="127.0.0.1", port=0)
+    server.start()
+    text = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics").read().decode()
+    print(text[:800])
+    print(f"Stats: {server.get_stats()}")
+    server.stop()
+    print("Test completed!")
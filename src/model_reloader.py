@@ -0,0 +1,403 @@
+#!/usr/bin/env python3
+"""
+무중단 모델 교체
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+MODEL_PATH나 임계값을 바꾸려면 컴포넌트 전체를 재시작해야 했고, RTSP
+재연결까지 수십 초 동안 현장을 보지 못했습니다. 이 모듈은 교체 요청을
+백그라운드 스레드에서 PPEDetector.reload()로 처리하여 (새 모델 로드 +
+워밍업 후 프레임 사이에서 교체) 처리 루프가 멈추지 않게 합니다.
+
+구성:
+- ModelReloader: 교체 요청을 받아 하나씩 처리 (처리 중 들어온 요청은 최신 것만 유지)
+- ModelWatcher: 모델 파일 변경 감시 (mtime/크기 폴링, 복사가 끝나 안정된 뒤 요청)
+- config_to_reload: Greengrass 컴포넌트 설정 (ModelPath, ConfThreshold,
+  NmsThreshold)을 교체 요청 인자로 변환
+- subscribe_config_updates: 컴포넌트 설정 변경 구독 (Greengrass IPC)
+
+레시피 Setenv에 {configuration:/...}로 넣은 값이 바뀌면 Greengrass가
+컴포넌트를 재시작하므로, 무중단 교체할 키는 Setenv에 넣지 않고 IPC로 읽습니다.
+
+사용 예시:
+    from model_reloader import ModelReloader, ModelWatcher
+
+    reloader = ModelReloader(detector)
+    reloader.start()
+
+    watcher = ModelWatcher("/models/ppe.rknn", on_change=lambda path: reloader.request(model_path=path))
+    watcher.start()
+
+    # Greengrass 설정 변경 시
+    reloader.request(**config_to_reload(config, detector))
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+# Greengrass 컴포넌트 설정 키 → reload() 인자
+CONFIG_KEYS = {
+    "ModelPath": "model_path",
+    "ConfThreshold": "conf_threshold",
+    "NmsThreshold": "nms_threshold"
+}
+
+
+def config_to_reload(config: Dict[str, Any], detector: Any) -> Dict[str, Any]:
+    """
+    컴포넌트 설정에서 현재 감지기와 달라진 항목만 reload() 인자로 변환
+
+    Args:
+        config: 컴포넌트 설정 (GetConfiguration 응답 값)
+        detector: 현재 PPEDetector
+
+    Returns:
+        reload() 키워드 인자 (바뀐 것이 없으면 빈 딕셔너리)
+
+    Raises:
+        ValueError: 임계값이 숫자가 아닌 경우
+    """
+    changes: Dict[str, Any] = {}
+    for key, arg in CONFIG_KEYS.items():
+        value = config.get(key)
+        if value is None or value == "":
+            continue
+        value = str(value) if arg == "model_path" else float(value)
+        if value != getattr(detector, arg):
+            changes[arg] = value
+    return changes
+
+
+def subscribe_config_updates(
+    ipc_client: Any,
+    on_config: Callable[[Dict[str, Any]], Any],
+    timeout: float = 10.0
+) -> Optional[Any]:
+    """
+    컴포넌트 설정 변경 구독
+
+    변경 이벤트를 받으면 별도 스레드에서 전체 설정을 다시 읽어
+    on_config(config)를 호출합니다 (IPC 이벤트 스레드를 막지 않음).
+
+    Args:
+        ipc_client: Greengrass IPC 클라이언트
+        on_config: 설정 변경 시 호출할 함수 (인자: 설정 딕셔너리)
+        timeout: IPC 요청 타임아웃 (초)
+
+    Returns:
+        구독 작업 (닫을 때 close() 호출) 또는 None (IPC가 구독을 지원하지 않는 경우)
+    """
+    if not hasattr(ipc_client, "new_subscribe_to_configuration_update"):
+        return None
+    try:
+        from awsiot.greengrasscoreipc import client, model
+    except ImportError:
+        return None
+
+    def fetch_and_apply():
+        try:
+            operation = ipc_client.new_get_configuration()
+            operation.activate(model.GetConfigurationRequest(key_path=[]))
+            response = operation.get_response().result(timeout=timeout)
+            on_config(response.value or {})
+        except Exception as e:
+            print(f"[RELOAD] Failed to read configuration: {e}")
+
+    class ConfigUpdateHandler(client.SubscribeToConfigurationUpdateStreamHandler):
+        def on_stream_event(self, event) -> None:
+            threading.Thread(target=fetch_and_apply, name="config-update", daemon=True).start()
+
+        def on_stream_error(self, error: Exception) -> bool:
+            print(f"[RELOAD] Configuration update stream error: {error}")
+            return False    # 구독 유지
+
+        def on_stream_closed(self) -> None:
+            pass
+
+    operation = ipc_client.new_subscribe_to_configuration_update(ConfigUpdateHandler())
+    operation.activate(model.SubscribeToConfigurationUpdateRequest(key_path=[])).result(timeout=timeout)
+    return operation
+
+
+class ModelReloader:
+    """
+    모델 교체 요청 처리 스레드
+
+    교체(로드 + 워밍업)는 수 초가 걸릴 수 있으므로 요청한 스레드(설정 변경
+    콜백, 파일 감시)를 막지 않고 이 스레드에서 처리합니다. 교체 중에
+    들어온 요청은 합쳐서 (나중 값 우선) 교체가 끝난 뒤 한 번 더 처리합니다.
+    """
+
+    def __init__(self, detector: Any, warmup_runs: int = 1, drain_timeout: float = 10.0):
+        """
+        Args:
+            detector: 교체 대상 PPEDetector
+            warmup_runs: 교체 전 새 런타임 워밍업 횟수
+            drain_timeout: 이전 런타임의 진행 중 추론을 기다릴 최대 시간 (초)
+        """
+        self.detector = detector
+        self.warmup_runs = warmup_runs
+        self.drain_timeout = drain_timeout
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._cond = threading.Condition()
+        self._pending: Optional[Dict[str, Any]] = None
+        self._busy = False
+
+        # 통계
+        self.requests = 0
+        self.completed = 0
+        self.failed = 0
+        self.last_error = ""
+
+    def start(self):
+        """교체 스레드 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._reload_loop, name="model-reloader", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """교체 스레드 정지 (진행 중인 교체는 끝까지 실행)"""
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout=self.drain_timeout + 5.0)
+            self.thread = None
+
+    def request(
+        self,
+        model_path: Optional[str] = None,
+        conf_threshold: Optional[float] = None,
+        nms_threshold: Optional[float] = None,
+        input_size: Optional[Tuple[int, int]] = None
+    ) -> bool:
+        """
+        교체 요청 (즉시 반환)
+
+        Args:
+            model_path: 새 모델 경로 (같은 경로면 파일 다시 로드)
+            conf_threshold: 새 신뢰도 임계값
+            nms_threshold: 새 NMS 임계값
+            input_size: 새 모델 입력 크기 (width, height)
+
+        Returns:
+            요청이 등록되었는지 여부 (바꿀 항목이 없으면 False)
+        """
+        changes = {
+            key: value for key, value in (
+                ("model_path", model_path),
+                ("conf_threshold", conf_threshold),
+                ("nms_threshold", nms_threshold),
+                ("input_size", input_size)
+            ) if value is not None
+        }
+        if not changes:
+            return False
+
+        with self._cond:
+            if self._pending is None:
+                self._pending = {}
+            self._pending.update(changes)
+            self.requests += 1
+            self._cond.notify_all()
+        return True
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """대기/진행 중인 교체가 모두 끝날 때까지 대기"""
+        with self._cond:
+            return self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout=timeout)
+
+    def _reload_loop(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self.running)
+                if not self.running:
+                    return
+                changes, self._pending = self._pending, None
+                self._busy = True
+
+            try:
+                ok = self.detector.reload(
+                    warmup_runs=self.warmup_runs,
+                    drain_timeout=self.drain_timeout,
+                    **changes
+                )
+                error = "" if ok else "reload failed, previous model kept"
+            except Exception as e:
+                ok, error = False, str(e)
+                print(f"[RELOAD] Error: {e}")
+
+            with self._cond:
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+                    self.last_error = error
+                self._busy = False
+                self._cond.notify_all()
+
+    def get_stats(self) -> dict:
+        """교체 통계 반환"""
+        with self._cond:
+            pending = self._pending is not None or self._busy
+        return {
+            "model_path": self.detector.model_path,
+            "generation": self.detector.model_generation,
+            "conf_threshold": self.detector.conf_threshold,
+            "nms_threshold": self.detector.nms_threshold,
+            "input_size": list(self.detector.input_size),
+            "requests": self.requests,
+            "completed": self.completed,
+            "failed": self.failed,
+            "pending": pending,
+            "last_reload_ms": round(self.detector.last_reload_time * 1000, 1),
+            "last_error": self.last_error
+        }
+
+
+class ModelWatcher:
+    """
+    모델 파일 변경 감시 (폴링)
+
+    inotify 등 추가 의존성 없이 interval마다 mtime/크기를 확인합니다.
+    변경이 감지되어도 파일이 아직 복사 중일 수 있으므로 다음 확인에서
+    mtime/크기가 그대로일 때 on_change(path)를 호출합니다.
+    """
+
+    def __init__(self, path: str, on_change: Callable[[str], Any], interval: float = 5.0):
+        """
+        Args:
+            path: 감시할 모델 파일 경로
+            on_change: 변경 확정 시 호출할 함수 (인자: 경로)
+            interval: 확인 간격 (초)
+        """
+        self.path = path
+        self.on_change = on_change
+        self.interval = interval
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._baseline = self._stat(path)
+        self._candidate: Optional[Tuple[float, int]] = None
+
+        # 통계
+        self.changes = 0
+
+    @staticmethod
+    def _stat(path: str) -> Optional[Tuple[float, int]]:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime, st.st_size
+
+    def set_path(self, path: str):
+        """감시 경로 변경 (설정 변경으로 모델 경로가 바뀐 경우, 현재 파일을 기준으로)"""
+        with self._lock:
+            self.path = path
+            self._baseline = self._stat(path)
+            self._candidate = None
+
+    def start(self):
+        """감시 스레드 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._watch_loop, name="model-watcher", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """감시 스레드 정지"""
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def check(self) -> bool:
+        """
+        한 번 확인 (감시 스레드에서 interval마다 호출)
+
+        Returns:
+            이번 확인에서 변경이 확정되어 on_change를 호출했는지 여부
+        """
+        with self._lock:
+            path = self.path
+            current = self._stat(path)
+            if current is None or current == self._baseline:
+                self._candidate = None
+                return False
+            if current != self._candidate:
+                # 변경 감지, 다음 확인까지 그대로면 확정 (복사 중인 파일 제외)
+                self._candidate = current
+                return False
+            self._baseline = current
+            self._candidate = None
+            self.changes += 1
+
+        print(f"[RELOAD] Model file changed: {path}")
+        try:
+            self.on_change(path)
+        except Exception as e:
+            print(f"[RELOAD] Change handler error: {e}")
+        return True
+
+    def _watch_loop(self):
+        while self.running:
+            self._wake.wait(self.interval)
+            if not self.running:
+                break
+            self.check()
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from ppe_detector import PPEDetector
+    from yolo_simulator import LatencyModel, simulated_runtime_factory
+
+    print("=== Model Reloader Test ===")
+
+    detector = PPEDetector(
+        use_simulation=True,
+        sim_runtime_factory=simulated_runtime_factory(latency=LatencyModel(mean_ms=5.0, jitter_ms=0.0))
+    )
+    reloader = ModelReloader(detector)
+    reloader.start()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = os.path.join(tmp, "model.rknn")
+        with open(model, "wb") as f:
+            f.write(b"v1")
+
+        watcher = ModelWatcher(model, on_change=lambda path: reloader.request(model_path=path), interval=0.1)
+        watcher.start()
+
+        time.sleep(0.2)
+        with open(model, "wb") as f:
+            f.write(b"v2-longer")
+        os.utime(model, (time.time() + 1, time.time() + 1))
+
+        deadline = time.time() + 2.0
+        while detector.model_generation == 0 and time.time() < deadline:
+            time.sleep(0.05)
+        reloader.wait_idle(timeout=2.0)
+        watcher.stop()
+
+    reloader.request(conf_threshold=0.6)
+    reloader.wait_idle(timeout=2.0)
+    print(f"  Stats: {reloader.get_stats()}")
+    reloader.stop()
+    detector.release()
+    print("Test completed!")
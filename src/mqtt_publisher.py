@@ -0,0 +1,460 @@
+#!/usr/bin/env python3
+"""
+비동기 MQTT 발행기 (Greengrass IPC)
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+메시지마다 publish 완료를 기다리면 처리 루프가 IPC 왕복 시간만큼 멈춥니다.
+이 모듈은 발행 큐와 전송 스레드를 두고 여러 publish를 동시에 진행시킵니다.
+
+특징:
+- 여러 publish 동시 진행 (max_in_flight)
+- 상태 메시지 병합: 토픽별로 가장 최근 상태만 전송
+- 알림 묶음 전송: 같은 토픽에 알림이 몰리면 하나의 페이로드로 묶음
+- 발행 지연 백분위수 (p50/p95/p99) 통계
+- 오프라인 테스트용 LocalIPCClient
+
+사용 예시:
+    import awsiot.greengrasscoreipc as ipc
+    from mqtt_publisher import AsyncMQTTPublisher, LocalIPCClient
+
+    publisher = AsyncMQTTPublisher(ipc.connect())   # 또는 LocalIPCClient()
+    publisher.start()
+
+    publisher.publish("device/alerts/ppe", alert, kind="alert")
+    publisher.publish("device/status/ppe", status, kind="status")
+
+    publisher.stop()
+"""
+
+import json
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+
+def _load_ipc_model():
+    """
+    Greengrass IPC 요청 모델 (실제 IPC 클라이언트를 쓸 때만 import)
+
+    awsiot는 awscrt 네이티브 라이브러리까지 불러오므로 모듈 로드 시점이
+    아니라 발행기를 만들 때 가져옵니다.
+
+    Returns:
+        awsiot.greengrasscoreipc.model 모듈 또는 None (없으면 LocalPublishRequest 사용)
+    """
+    try:
+        from awsiot.greengrasscoreipc import model
+        return model
+    except ImportError:
+        return None
+
+
+# 메시지 종류
+KINDS = ("event", "alert", "status")
+
+
+@dataclass
+class LocalPublishRequest:
+    """awsiot 모델이 없을 때 사용하는 요청 객체"""
+    topic_name: str = ""
+    payload: bytes = b""
+    qos: str = "AT_LEAST_ONCE"
+
+
+class LocalIPCClient:
+    """
+    Greengrass IPC 클라이언트 대역 (오프라인 테스트용)
+
+    new_publish_to_iot_core() / activate() / get_response() 인터페이스를
+    흉내 내며, 지정한 지연 후 응답 Future를 완료시킵니다.
+    발행된 메시지는 published 리스트에 (topic, payload dict)로 기록됩니다.
+    """
+
+    def __init__(self, latency: float = 0.01, fail: bool = False):
+        """
+        Args:
+            latency: 응답 지연 (초)
+            fail: True면 모든 publish가 예외로 끝남
+        """
+        self.latency = latency
+        self.fail = fail
+        self.published: List[Tuple[str, dict]] = []
+        self._lock = threading.Lock()
+
+    def new_publish_to_iot_core(self) -> "_LocalPublishOperation":
+        return _LocalPublishOperation(self)
+
+    def _complete(self, request: Any, future: Future):
+        if self.fail:
+            future.set_exception(ConnectionError("Local IPC publish failed"))
+            return
+        with self._lock:
+            self.published.append((request.topic_name, json.loads(request.payload)))
+        future.set_result(None)
+
+    def close(self):
+        pass
+
+
+class _LocalPublishOperation:
+    """LocalIPCClient의 publish 작업"""
+
+    def __init__(self, client: LocalIPCClient):
+        self.client = client
+        self.response: Future = Future()
+
+    def activate(self, request: Any) -> Future:
+        timer = threading.Timer(self.client.latency, self.client._complete,
+                                args=(request, self.response))
+        timer.daemon = True
+        timer.start()
+        activated: Future = Future()
+        activated.set_result(None)
+        return activated
+
+    def get_response(self) -> Future:
+        return self.response
+
+    def close(self):
+        pass
+
+
+class AsyncMQTTPublisher:
+    """
+    비동기 MQTT 발행기
+
+    publish()는 메시지를 큐에 넣고 바로 반환합니다. 전송 스레드가
+    동시 진행 수(max_in_flight) 안에서 메시지를 보내고, 완료는
+    Future 콜백으로 처리합니다.
+    """
+
+    def __init__(
+        self,
+        ipc_client: Any,
+        max_in_flight: int = 8,
+        queue_size: int = 256,
+        batch_max: int = 10,
+        publish_timeout: float = 10.0,
+        on_failure: Optional[Callable[[str, dict, Exception], None]] = None
+    ):
+        """
+        Args:
+            ipc_client: Greengrass IPC 클라이언트 (또는 LocalIPCClient)
+            max_in_flight: 동시에 진행할 수 있는 publish 수
+            queue_size: 대기 메시지 최대 수 (상태 메시지 제외)
+            batch_max: 한 페이로드로 묶을 최대 알림 수
+            publish_timeout: 응답 대기 시간 (초, 초과 시 실패 처리)
+            on_failure: 발행 실패 콜백 (topic, message, error). lock 밖에서 호출하며,
+                        묶음 전송이 실패하면 묶인 알림마다 원래 메시지로 호출
+        """
+        self.ipc_client = ipc_client
+        self._ipc_model = None if isinstance(ipc_client, LocalIPCClient) else _load_ipc_model()
+        self.max_in_flight = max_in_flight
+        self.queue_size = queue_size
+        self.batch_max = batch_max
+        self.publish_timeout = publish_timeout
+        self.on_failure = on_failure
+
+        self._cond = threading.Condition()
+        self._messages: Deque[Tuple[str, str, dict]] = deque()       # (kind, topic, message)
+        self._statuses: "OrderedDict[str, dict]" = OrderedDict()       # 토픽별 최신 상태
+        self._in_flight: Dict[int, Tuple[float, str, dict, List[dict]]] = {}   # (시작, 토픽, 페이로드, 원본 메시지)
+        self._next_id = 0
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+
+        # 통계
+        self.queued = 0
+        self.published = 0
+        self.failed = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.batched_alerts = 0
+        self.latencies: deque = deque(maxlen=1024)
+        self.last_success_time = 0.0
+        self.last_failure_time = 0.0
+
+    def start(self):
+        """전송 스레드 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._sender, name="mqtt-publisher", daemon=True)
+        self.thread.start()
+        print(f"[MQTT] Async publisher started (max in-flight: {self.max_in_flight})")
+
+    def stop(self, timeout: float = 5.0):
+        """
+        남은 메시지를 보낸 후 종료
+
+        Args:
+            timeout: 남은 메시지 전송 대기 시간 (초)
+        """
+        if not self.running:
+            return
+        self.flush(timeout)
+
+        with self._cond:
+            self.running = False
+            self._cond.notify_all()
+        if self.thread:
+            self.thread.join(timeout=1.0)
+            self.thread = None
+        print("[MQTT] Async publisher stopped")
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        큐와 진행 중인 publish가 모두 끝날 때까지 대기
+
+        Returns:
+            시간 안에 모두 끝났는지 여부
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: not (self._messages or self._statuses or self._in_flight),
+                timeout
+            )
+
+    def publish(self, topic: str, message: dict, kind: str = "event") -> bool:
+        """
+        메시지 발행 요청 (기다리지 않음)
+
+        Args:
+            topic: MQTT 토픽
+            message: 메시지 딕셔너리
+            kind: "event" (일반), "alert" (묶음 전송 대상), "status" (토픽별 최신만 전송)
+
+        Returns:
+            큐에 들어갔는지 여부
+        """
+        if kind not in KINDS:
+            raise ValueError(f"Unknown message kind: {kind}")
+
+        dropped = None
+        with self._cond:
+            if kind == "status":
+                if topic in self._statuses:
+                    self.coalesced += 1
+                self._statuses[topic] = message
+            else:
+                if len(self._messages) >= self.queue_size:
+                    # 가장 오래된 메시지를 버림 (실패 콜백은 lock 밖에서)
+                    dropped = self._messages.popleft()
+                    self.dropped += 1
+                self._messages.append((kind, topic, message))
+
+            self.queued += 1
+            self._cond.notify_all()
+
+        if dropped is not None:
+            _, old_topic, old_message = dropped
+            self._notify_failure(old_topic, [old_message], OverflowError("MQTT queue full"))
+        return True
+
+    def _next_payload(self) -> Optional[Tuple[str, dict, List[dict]]]:
+        """
+        다음에 보낼 (topic, payload, 원본 메시지 리스트) 선택 (lock 보유 상태에서 호출)
+
+        알림/일반 메시지를 먼저 보내고, 상태 메시지는 나중에 보냅니다.
+        같은 토픽의 알림이 큐에 여러 개 있으면 batch_max개까지 묶습니다.
+        """
+        if self._messages:
+            kind, topic, message = self._messages.popleft()
+            if kind != "alert" or self.batch_max <= 1:
+                return topic, message, [message]
+
+            alerts = [message]
+            remaining: Deque[Tuple[str, str, dict]] = deque()
+            while self._messages and len(alerts) < self.batch_max:
+                item = self._messages.popleft()
+                if item[0] == "alert" and item[1] == topic:
+                    alerts.append(item[2])
+                else:
+                    remaining.append(item)
+            self._messages.extendleft(reversed(remaining))
+
+            if len(alerts) == 1:
+                return topic, message, alerts
+
+            self.batched_alerts += len(alerts)
+            payload = {
+                "device_id": alerts[0].get("device_id"),
+                "timestamp": alerts[-1].get("timestamp"),
+                "event_type": "PPE_VIOLATION_BATCH",
+                "count": len(alerts),
+                "alerts": alerts
+            }
+            return topic, payload, alerts
+
+        if self._statuses:
+            topic, message = self._statuses.popitem(last=False)
+            return topic, message, [message]
+
+        return None
+
+    def _sender(self):
+        """전송 루프 (별도 스레드)"""
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: not self.running
+                    or ((self._messages or self._statuses)
+                        and len(self._in_flight) < self.max_in_flight),
+                    timeout=0.5
+                )
+                if not self.running:
+                    return
+
+                expired = self._expire_in_flight()
+                item = None
+                if len(self._in_flight) < self.max_in_flight:
+                    item = self._next_payload()
+                if item is not None:
+                    topic, payload, messages = item
+                    publish_id = self._next_id
+                    self._next_id += 1
+                    self._in_flight[publish_id] = (time.time(), topic, payload, messages)
+
+            # 실패 콜백(스풀 기록 등)은 lock 밖에서
+            for failed_topic, failed_messages in expired:
+                self._notify_failure(failed_topic, failed_messages, TimeoutError("MQTT publish timed out"))
+            if item is not None:
+                self._send(publish_id, topic, payload)
+
+    def _send(self, publish_id: int, topic: str, payload: dict):
+        """IPC publish 시작 (완료는 콜백에서 처리)"""
+        try:
+            model = self._ipc_model
+            if model is not None:
+                request = model.PublishToIoTCoreRequest()
+                request.topic_name = topic
+                request.payload = json.dumps(payload, default=str).encode()
+                request.qos = model.QOS.AT_LEAST_ONCE
+            else:
+                request = LocalPublishRequest(
+                    topic_name=topic,
+                    payload=json.dumps(payload, default=str).encode()
+                )
+
+            operation = self.ipc_client.new_publish_to_iot_core()
+            operation.activate(request)
+            future = operation.get_response()
+            future.add_done_callback(lambda f: self._on_done(publish_id, f))
+
+        except Exception as e:
+            self._finish(publish_id, e)
+
+    def _on_done(self, publish_id: int, future: Future):
+        """publish 응답 콜백"""
+        error = None
+        try:
+            future.result(timeout=0)
+        except Exception as e:
+            error = e
+        self._finish(publish_id, error)
+
+    def _finish(self, publish_id: int, error: Optional[Exception]):
+        """publish 완료 처리"""
+        with self._cond:
+            entry = self._in_flight.pop(publish_id, None)
+            if entry is None:
+                return  # 이미 시간 초과 처리됨
+
+            start, topic, payload, messages = entry
+            if error is None:
+                self.published += 1
+                self.latencies.append(time.time() - start)
+                self.last_success_time = time.time()
+            else:
+                self.failed += 1
+                self.last_failure_time = time.time()
+            self._cond.notify_all()
+
+        if error is not None:
+            print(f"[MQTT] Publish failed on {topic}: {error}")
+            self._notify_failure(topic, messages, error)
+
+    def _expire_in_flight(self) -> List[Tuple[str, List[dict]]]:
+        """
+        응답이 오지 않는 publish 시간 초과 처리 (lock 보유 상태에서 호출)
+
+        Returns:
+            실패 콜백을 호출할 [(topic, 원본 메시지 리스트), ...] (호출은 lock 밖에서)
+        """
+        now = time.time()
+        expired = [
+            pid for pid, (start, _, _, _) in self._in_flight.items()
+            if now - start > self.publish_timeout
+        ]
+        failures = []
+        for pid in expired:
+            start, topic, payload, messages = self._in_flight.pop(pid)
+            self.failed += 1
+            self.last_failure_time = now
+            print(f"[MQTT] Publish timed out on {topic}")
+            failures.append((topic, messages))
+        return failures
+
+    def _notify_failure(self, topic: str, messages: List[dict], error: Exception):
+        """실패 콜백 호출 (묶음 전송이면 묶인 알림마다, lock 보유 상태에서 호출 금지)"""
+        if not self.on_failure:
+            return
+        for message in messages:
+            try:
+                self.on_failure(topic, message, error)
+            except Exception as e:
+                print(f"[MQTT] Failure callback error: {e}")
+
+    @property
+    def backlog(self) -> int:
+        """대기 중이거나 진행 중인 publish 수"""
+        with self._cond:
+            return len(self._messages) + len(self._statuses) + len(self._in_flight)
+
+    def get_stats(self) -> dict:
+        """발행 통계 반환"""
+        with self._cond:
+            latencies = np.array(self.latencies) * 1000 if self.latencies else None
+            stats = {
+                "queue_depth": len(self._messages) + len(self._statuses),
+                "in_flight": len(self._in_flight),
+                "queued": self.queued,
+                "published": self.published,
+                "failed": self.failed,
+                "dropped": self.dropped,
+                "coalesced_status": self.coalesced,
+                "batched_alerts": self.batched_alerts
+            }
+
+        if latencies is not None:
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            stats["latency_ms"] = {
+                "p50": round(float(p50), 1),
+                "p95": round(float(p95), 1),
+                "p99": round(float(p99), 1),
+                "max": round(float(latencies.max()), 1)
+            }
+        return stats
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Async MQTT Publisher Test ===")
+
+    client = LocalIPCClient(latency=0.05)
+    publisher = AsyncMQTTPublisher(client, max_in_flight=4)
+    publisher.start()
+
+    for i in range(20):
+        publisher.publish("test/alerts/ppe", {"device_id": "test", "n": i}, kind="alert")
+        publisher.publish("test/status/ppe", {"device_id": "test", "n": i}, kind="status")
+
+    publisher.stop()
+    print(f"Payloads sent: {len(client.published)}")
+    print(f"Stats: {publisher.get_stats()}")
+    print("Test completed!")
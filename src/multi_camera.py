@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+멀티 카메라 스케줄러
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+한 프로세스에서 여러 카메라를 읽어 하나의 감지기(모델)를 공유합니다.
+카메라마다 최신 프레임만 보관하는 수집 스레드를 두고, 스케줄러는
+프레임이 준비된 카메라를 라운드 로빈으로 돌아가며 꺼내므로
+한 카메라가 감지기를 독점하지 않습니다.
+
+특징:
+- 카메라별 최신 프레임 보관 (오래된 프레임은 버림)
+- 링 버퍼 카메라(RTSPReader)는 참조로 보관하여 버려지는 프레임은 복사하지 않음
+- 공정한 라운드 로빈 스케줄링
+- 카메라별 최대 처리 FPS 제한
+- 카메라별 통계 (수집/처리/버림/감지/위반)
+
+사용 예시:
+    from multi_camera import CameraSource, MultiCameraScheduler
+    from rtsp_reader import RTSPReader
+
+    scheduler = MultiCameraScheduler([
+        CameraSource("bay1", RTSPReader("rtsp://10.0.0.11/stream"), max_fps=5),
+        CameraSource("bay2", RTSPReader("rtsp://10.0.0.12/stream"), max_fps=5),
+    ])
+    scheduler.start()
+
+    item = scheduler.read(timeout=1.0)
+    if item:
+        camera_id, frame, capture_time = item
+
+    scheduler.stop()
+"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+
+from frame_ring import FrameRef
+
+
+def _release(frame: Any):
+    """FrameRef면 링 버퍼에 반환"""
+    if isinstance(frame, FrameRef):
+        frame.release()
+
+
+def _materialize(frame: Any) -> np.ndarray:
+    """FrameRef면 복사본으로 바꾸고 참조 반환"""
+    if isinstance(frame, FrameRef):
+        with frame:
+            return frame.copy()
+    return frame
+
+
+class CameraSource:
+    """
+    스케줄러에 등록되는 카메라 하나
+
+    별도 스레드에서 camera.get_frame()을 반복 호출하여
+    가장 최근 프레임 하나만 보관합니다. 카메라가 get_frame_ref()를
+    제공하면 링 버퍼 참조로 보관하고, 처리 차례가 된 프레임만 복사합니다.
+    """
+
+    def __init__(self, camera_id: str, camera: Any, max_fps: float = 0.0):
+        """
+        Args:
+            camera_id: 카메라 식별자 (토픽/통계에 사용)
+            camera: RTSPReader 또는 SimulatedCamera 등 카메라 인스턴스
+            max_fps: 최대 처리 FPS (0이면 제한 없음)
+        """
+        self.camera_id = camera_id
+        self.camera = camera
+        self.max_fps = max_fps
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._cond: Optional[threading.Condition] = None
+        self._latest: Optional[Tuple[Any, float]] = None   # (프레임 또는 FrameRef, 수집 시각)
+        self._last_served = 0.0
+
+        # 통계
+        self.frames_captured = 0
+        self.frames_served = 0
+        self.frames_dropped = 0
+        self.frames_processed = 0
+        self.detections = 0
+        self.violations = 0
+
+    def attach(self, cond: threading.Condition):
+        """스케줄러 조건 변수 연결"""
+        self._cond = cond
+
+    def start(self) -> bool:
+        """카메라 및 수집 스레드 시작"""
+        if self._cond is None:
+            self._cond = threading.Condition()
+
+        if not self.camera.start():
+            print(f"[MULTI] Failed to start camera {self.camera_id}")
+            return False
+
+        self.running = True
+        self.thread = threading.Thread(
+            target=self._grab_loop,
+            name=f"camera-{self.camera_id}",
+            daemon=True
+        )
+        self.thread.start()
+        return True
+
+    def stop(self):
+        """수집 스레드 및 카메라 정지"""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=5.0)
+            self.thread = None
+        with self._cond:
+            if self._latest is not None:
+                _release(self._latest[0])
+                self._latest = None
+        self.camera.stop()
+
+    def _grab_loop(self):
+        """최신 프레임 수집 루프 (별도 스레드)"""
+        use_refs = hasattr(self.camera, "get_frame_ref")
+        while self.running:
+            if use_refs:
+                frame = self.camera.get_frame_ref(timeout=0.5)
+            else:
+                frame = self.camera.get_frame(timeout=0.5)
+            if frame is None:
+                continue
+
+            with self._cond:
+                if self._latest is not None:
+                    # 처리되지 못하고 새 프레임으로 교체됨
+                    _release(self._latest[0])
+                    self.frames_dropped += 1
+                # 링 버퍼 프레임은 디코딩 시각을 캡처 시각으로 사용
+                capture_time = frame.timestamp if isinstance(frame, FrameRef) else time.time()
+                self._latest = (frame, capture_time)
+                self.frames_captured += 1
+                self._cond.notify_all()
+
+    def _take(self, now: float) -> Optional[Tuple[Any, float]]:
+        """
+        처리할 프레임 꺼내기 (스케줄러 lock 보유 상태에서 호출)
+
+        FPS 제한에 걸리면 프레임을 남겨두고 None을 반환합니다.
+        프레임이 FrameRef일 수 있으므로 호출자가 _materialize()로 변환합니다.
+        """
+        if self._latest is None:
+            return None
+        if self.min_interval and now - self._last_served < self.min_interval:
+            return None
+
+        item = self._latest
+        self._latest = None
+        self._last_served = now
+        self.frames_served += 1
+        return item
+
+    def _next_ready_in(self, now: float) -> Optional[float]:
+        """FPS 제한으로 보류 중인 프레임이 언제 준비되는지 (초)"""
+        if self._latest is None or not self.min_interval:
+            return None
+        return max(0.0, self._last_served + self.min_interval - now)
+
+    def record_result(self, num_detections: int, num_violations: int):
+        """처리 결과 통계 반영"""
+        self.frames_processed += 1
+        self.detections += num_detections
+        self.violations += num_violations
+
+    def get_stats(self) -> dict:
+        """카메라별 통계 반환"""
+        return {
+            "connected": self.camera.is_connected,
+            "resolution": self.camera.resolution,
+            "camera_fps": round(float(self.camera.fps), 1),
+            "max_fps": self.max_fps,
+            "frames_captured": self.frames_captured,
+            "frames_processed": self.frames_processed,
+            "frames_dropped": self.frames_dropped,
+            "detections": self.detections,
+            "violations": self.violations
+        }
+
+
+class MultiCameraScheduler:
+    """
+    여러 카메라에서 프레임을 공정하게 꺼내는 스케줄러
+
+    카메라 인터페이스(start/stop/get_frame/resolution/is_connected/fps)를
+    그대로 제공하므로 단일 카메라 자리에 사용할 수 있으며,
+    카메라 ID가 필요하면 read()를 사용합니다.
+    """
+
+    def __init__(self, sources: List[CameraSource]):
+        """
+        Args:
+            sources: 카메라 소스 리스트
+        """
+        ids = [s.camera_id for s in sources]
+        if len(set(ids)) != len(ids):
+            raise ValueError(f"Duplicate camera IDs: {ids}")
+
+        self.sources = sources
+        self._by_id: Dict[str, CameraSource] = {s.camera_id: s for s in sources}
+        self._cond = threading.Condition()
+        self._rr_index = 0
+        self.running = False
+
+        for source in sources:
+            source.attach(self._cond)
+
+    def start(self) -> bool:
+        """
+        모든 카메라 시작
+
+        Returns:
+            하나 이상의 카메라가 시작되었는지 여부
+        """
+        started = [s.start() for s in self.sources]
+        self.running = any(started)
+        print(f"[MULTI] Started {sum(started)}/{len(self.sources)} cameras")
+        return self.running
+
+    def stop(self):
+        """모든 카메라 정지"""
+        self.running = False
+        for source in self.sources:
+            source.stop()
+        with self._cond:
+            self._cond.notify_all()
+        print("[MULTI] Stopped")
+
+    def read(self, timeout: float = 1.0) -> Optional[Tuple[str, np.ndarray, float]]:
+        """
+        다음 차례 카메라의 프레임 가져오기
+
+        Args:
+            timeout: 대기 시간 (초)
+
+        Returns:
+            (camera_id, frame, capture_time) 또는 None
+        """
+        deadline = time.time() + timeout
+        n = len(self.sources)
+        taken = None
+
+        with self._cond:
+            while self.running:
+                now = time.time()
+                wake_in = None
+
+                for offset in range(n):
+                    index = (self._rr_index + offset) % n
+                    source = self.sources[index]
+                    item = source._take(now)
+                    if item is not None:
+                        self._rr_index = (index + 1) % n
+                        taken = (source.camera_id,) + item
+                        break
+
+                    ready_in = source._next_ready_in(now)
+                    if ready_in is not None:
+                        wake_in = ready_in if wake_in is None else min(wake_in, ready_in)
+
+                if taken is not None:
+                    break
+                remaining = deadline - now
+                if remaining <= 0:
+                    return None
+                self._cond.wait(remaining if wake_in is None else min(remaining, wake_in))
+
+        if taken is None:
+            return None
+
+        # 링 버퍼 프레임은 lock 밖에서 복사 후 바로 반환
+        camera_id, frame, capture_time = taken
+        return camera_id, _materialize(frame), capture_time
+
+    def get_frame(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """카메라 인터페이스 호환 (카메라 ID 없이 프레임만 반환)"""
+        item = self.read(timeout=timeout)
+        return item[1] if item else None
+
+    def get_source(self, camera_id: str) -> Optional[CameraSource]:
+        """카메라 ID로 소스 찾기"""
+        return self._by_id.get(camera_id)
+
+    @property
+    def camera_ids(self) -> List[str]:
+        """등록된 카메라 ID 목록"""
+        return [s.camera_id for s in self.sources]
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """첫 번째 카메라 해상도 (호환용)"""
+        return self.sources[0].camera.resolution if self.sources else (0, 0)
+
+    @property
+    def fps(self) -> float:
+        """전체 카메라 FPS 합계"""
+        return sum(float(s.camera.fps) for s in self.sources)
+
+    @property
+    def is_connected(self) -> bool:
+        """하나 이상의 카메라가 연결되어 있는지 여부"""
+        return any(s.camera.is_connected for s in self.sources)
+
+    def get_stats(self) -> dict:
+        """카메라별 통계 반환"""
+        return {s.camera_id: s.get_stats() for s in self.sources}
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    from rtsp_reader import SimulatedCamera
+
+    print("=== Multi Camera Scheduler Test ===")
+
+    scheduler = MultiCameraScheduler([
+        CameraSource("cam1", SimulatedCamera(fps=30)),
+        CameraSource("cam2", SimulatedCamera(fps=30)),
+        CameraSource("cam3", SimulatedCamera(fps=30), max_fps=5),
+    ])
+    scheduler.start()
+
+    served: Dict[str, int] = {}
+    end = time.time() + 2.0
+    while time.time() < end:
+        item = scheduler.read(timeout=0.5)
+        if item:
+            served[item[0]] = served.get(item[0], 0) + 1
+            time.sleep(0.01)  # 추론 시간 흉내
+
+    scheduler.stop()
+    print(f"Frames served per camera: {served}")
+    print("Test completed!")
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+멀티 코어 NPU 추론 풀
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+RK3588S NPU는 3개의 코어를 가지고 있습니다. 하나의 RKNNLite 인스턴스를
+NPU_CORE_0_1_2로 초기화하면 한 번에 한 프레임만 처리되므로, 코어마다
+별도의 런타임을 두고 프레임을 분배하여 처리량을 높입니다.
+
+특징:
+- 워커(런타임)별 전용 스레드
+- 라운드 로빈 / 최소 부하 (least-loaded) 분배
+- 시퀀스 ID 기반 순서 보장 결과 반환
+- 교체 가능한 런타임 팩토리 (테스트용 가짜 런타임 지원)
+
+사용 예시:
+    from npu_pool import NPUInferencePool, rknn_runtime_factory
+
+    pool = NPUInferencePool(
+        runtime_factory=rknn_runtime_factory("/path/to/model.rknn"),
+        num_workers=3,
+        policy="least_loaded"
+    )
+
+    seq = pool.submit(input_data, context={"frame_id": 1})
+    result = pool.get_result(timeout=1.0)   # 순서대로 반환
+
+    # 여러 스레드에서 동기 호출 (각자 자기 결과만 받음)
+    result = pool.infer(input_data)
+
+    pool.shutdown()
+"""
+
+import threading
+import time
+from queue import Queue
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+
+# 지원하는 분배 정책
+POLICIES = ("round_robin", "least_loaded")
+
+
+@dataclass
+class PoolResult:
+    """
+    추론 풀 결과
+
+    Attributes:
+        seq: 제출 순서대로 부여된 시퀀스 ID
+        outputs: 런타임 추론 출력
+        context: 제출 시 전달한 사용자 데이터
+        worker_id: 추론을 수행한 워커 번호
+        latency: 런타임 추론 시간 (초)
+        error: 추론 중 발생한 예외 (정상이면 None)
+    """
+    seq: int
+    outputs: Any
+    context: Any = None
+    worker_id: int = -1
+    latency: float = 0.0
+    error: Optional[Exception] = None
+
+
+class SimulatedRuntime:
+    """
+    시뮬레이션 런타임 (NPU 없는 환경용)
+
+    RKNNLite와 같은 inference/release 인터페이스를 제공하며,
+    지정한 시간만큼 대기한 후 None을 반환합니다.
+    """
+
+    def __init__(self, latency: float = 0.02):
+        """
+        Args:
+            latency: 시뮬레이션된 추론 시간 (초)
+        """
+        self.latency = latency
+
+    def inference(self, inputs: List[Any]) -> Any:
+        """추론 흉내"""
+        time.sleep(self.latency)
+        return None
+
+    def release(self):
+        """리소스 해제 (없음)"""
+        pass
+
+
+def rknn_runtime_factory(model_path: str) -> Callable[[int], Any]:
+    """
+    워커별 RKNNLite 런타임 팩토리 생성
+
+    워커 번호에 따라 NPU 코어 0, 1, 2에 순서대로 고정합니다.
+
+    Args:
+        model_path: RKNN 모델 파일 경로
+
+    Returns:
+        워커 번호를 받아 초기화된 RKNNLite를 반환하는 함수
+    """
+    def factory(worker_id: int):
+        from rknnlite.api import RKNNLite
+
+        core_masks = [
+            RKNNLite.NPU_CORE_0,
+            RKNNLite.NPU_CORE_1,
+            RKNNLite.NPU_CORE_2
+        ]
+
+        rknn = RKNNLite()
+        ret = rknn.load_rknn(model_path)
+        if ret != 0:
+            raise RuntimeError(f"Failed to load RKNN model: {ret}")
+
+        ret = rknn.init_runtime(core_mask=core_masks[worker_id % len(core_masks)])
+        if ret != 0:
+            rknn.release()
+            raise RuntimeError(f"Failed to init RKNN runtime on core {worker_id}: {ret}")
+
+        return rknn
+
+    return factory
+
+
+class _SyncCall:
+    """infer() 호출자에게 결과를 직접 전달하기 위한 슬롯"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result: Optional[PoolResult] = None
+
+
+class _Worker:
+    """런타임 하나를 담당하는 워커 스레드"""
+
+    def __init__(self, worker_id: int, runtime: Any, pool: "NPUInferencePool"):
+        self.worker_id = worker_id
+        self.runtime = runtime
+        self.pool = pool
+        self.jobs: Queue = Queue()
+        self.pending = 0          # 할당되었지만 완료되지 않은 작업 수
+        self.completed = 0
+        self.busy_time = 0.0
+        self.thread = threading.Thread(
+            target=self._run,
+            name=f"npu-worker-{worker_id}",
+            daemon=True
+        )
+
+    def _run(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                break
+
+            seq, inputs, context = job
+            start = time.time()
+            outputs = None
+            error = None
+
+            try:
+                outputs = self.runtime.inference(inputs=inputs)
+            except Exception as e:
+                error = e
+
+            latency = time.time() - start
+            self.pool._complete(self, PoolResult(
+                seq=seq,
+                outputs=outputs,
+                context=context,
+                worker_id=self.worker_id,
+                latency=latency,
+                error=error
+            ))
+
+
+class NPUInferencePool:
+    """
+    NPU 추론 풀
+
+    워커마다 독립된 런타임을 가지며, 제출된 입력을 정책에 따라 분배하고
+    결과는 제출 순서(시퀀스 ID)대로 돌려줍니다.
+    """
+
+    def __init__(
+        self,
+        runtime_factory: Callable[[int], Any],
+        num_workers: int = 3,
+        policy: str = "round_robin",
+        max_in_flight: int = 0
+    ):
+        """
+        Args:
+            runtime_factory: 워커 번호를 받아 런타임을 생성하는 함수
+                             (inference(inputs=...), release() 필요)
+            num_workers: 워커(런타임) 수
+            policy: 분배 정책 ("round_robin" 또는 "least_loaded")
+            max_in_flight: 동시에 처리 중일 수 있는 최대 작업 수
+                           (0이면 워커 수의 2배)
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be >= 1")
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown pool policy: {policy}")
+
+        self.num_workers = num_workers
+        self.policy = policy
+        self.max_in_flight = max_in_flight or num_workers * 2
+
+        self._lock = threading.Lock()
+        self._result_ready = threading.Condition(self._lock)
+        self._slots = threading.Semaphore(self.max_in_flight)
+        self._completed: Dict[int, PoolResult] = {}
+        self._next_submit_seq = 0
+        self._next_result_seq = 0
+        self._rr_index = 0
+        self._closed = False
+
+        # 런타임 생성 (실패 시 이미 만든 런타임 해제)
+        self.workers: List[_Worker] = []
+        try:
+            for worker_id in range(num_workers):
+                runtime = runtime_factory(worker_id)
+                self.workers.append(_Worker(worker_id, runtime, self))
+        except Exception:
+            for worker in self.workers:
+                worker.runtime.release()
+            raise
+
+        for worker in self.workers:
+            worker.thread.start()
+
+        print(f"[POOL] Started {num_workers} NPU workers (policy: {policy})")
+
+    def submit(
+        self,
+        input_data: Any,
+        context: Any = None,
+        timeout: Optional[float] = None
+    ) -> int:
+        """
+        추론 작업 제출
+
+        처리 중인 작업이 max_in_flight에 도달하면 결과가 소비될 때까지 대기합니다.
+
+        Args:
+            input_data: 모델 입력 (예: NHWC 텐서)
+            context: 결과와 함께 돌려받을 사용자 데이터
+            timeout: 슬롯 대기 시간 (None이면 무제한)
+
+        Returns:
+            시퀀스 ID
+        """
+        if self._closed:
+            raise RuntimeError("Inference pool is shut down")
+
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Inference pool is full")
+
+        with self._lock:
+            seq = self._next_submit_seq
+            self._next_submit_seq += 1
+            worker = self._select_worker()
+            worker.pending += 1
+
+        worker.jobs.put((seq, [input_data], context))
+        return seq
+
+    def _select_worker(self) -> _Worker:
+        """정책에 따라 워커 선택 (lock 보유 상태에서 호출)"""
+        if self.policy == "least_loaded":
+            # 부하가 같으면 라운드 로빈 순서를 따름
+            start = self._rr_index
+            order = self.workers[start:] + self.workers[:start]
+            worker = min(order, key=lambda w: w.pending)
+            self._rr_index = (worker.worker_id + 1) % self.num_workers
+            return worker
+
+        worker = self.workers[self._rr_index]
+        self._rr_index = (self._rr_index + 1) % self.num_workers
+        return worker
+
+    def infer(self, input_data: Any, timeout: Optional[float] = None) -> PoolResult:
+        """
+        동기 추론
+
+        여러 스레드에서 동시에 호출할 수 있으며, 각 호출자는 자신의 결과만
+        받습니다. submit()/get_result()의 순서 보장 큐와는 독립적입니다.
+
+        Args:
+            input_data: 모델 입력
+            timeout: 슬롯 및 결과 대기 시간 (None이면 무제한)
+
+        Returns:
+            PoolResult (seq는 -1)
+        """
+        if self._closed:
+            raise RuntimeError("Inference pool is shut down")
+
+        if not self._slots.acquire(timeout=timeout):
+            raise TimeoutError("Inference pool is full")
+
+        call = _SyncCall()
+        with self._lock:
+            worker = self._select_worker()
+            worker.pending += 1
+
+        worker.jobs.put((-1, [input_data], call))
+
+        try:
+            if not call.event.wait(timeout):
+                raise TimeoutError("Inference timed out")
+        finally:
+            self._slots.release()
+
+        return call.result
+
+    def _complete(self, worker: _Worker, result: PoolResult):
+        """워커 스레드에서 작업 완료 처리"""
+        with self._lock:
+            worker.pending -= 1
+            worker.completed += 1
+            worker.busy_time += result.latency
+
+            if isinstance(result.context, _SyncCall):
+                call = result.context
+                result.context = None
+                call.result = result
+                call.event.set()
+                return
+
+            self._completed[result.seq] = result
+            self._result_ready.notify_all()
+
+    def get_result(self, timeout: Optional[float] = None) -> Optional[PoolResult]:
+        """
+        다음 순서의 결과 가져오기
+
+        다른 워커가 먼저 끝나더라도 시퀀스 ID 순서대로만 반환합니다.
+
+        Args:
+            timeout: 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            PoolResult 또는 None (시간 초과/대기 중인 작업 없음)
+        """
+        deadline = None if timeout is None else time.time() + timeout
+
+        with self._result_ready:
+            while self._next_result_seq not in self._completed:
+                if self._next_result_seq >= self._next_submit_seq:
+                    return None
+
+                remaining = None if deadline is None else deadline - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._result_ready.wait(remaining)
+
+            result = self._completed.pop(self._next_result_seq)
+            self._next_result_seq += 1
+
+        self._slots.release()
+        return result
+
+    @property
+    def in_flight(self) -> int:
+        """제출되었지만 아직 반환되지 않은 작업 수"""
+        with self._lock:
+            return self._next_submit_seq - self._next_result_seq
+
+    def get_stats(self) -> dict:
+        """풀 통계 반환"""
+        with self._lock:
+            return {
+                "num_workers": self.num_workers,
+                "policy": self.policy,
+                "in_flight": self._next_submit_seq - self._next_result_seq,
+                "submitted": self._next_submit_seq,
+                "workers": [
+                    {
+                        "worker_id": w.worker_id,
+                        "pending": w.pending,
+                        "completed": w.completed,
+                        "busy_time_s": round(w.busy_time, 3)
+                    }
+                    for w in self.workers
+                ]
+            }
+
+    def shutdown(self):
+        """워커 종료 및 런타임 해제"""
+        if self._closed:
+            return
+        self._closed = True
+
+        for worker in self.workers:
+            worker.jobs.put(None)
+        for worker in self.workers:
+            worker.thread.join(timeout=5.0)
+            try:
+                worker.runtime.release()
+            except Exception as e:
+                print(f"[POOL] Runtime release error: {e}")
+
+        print("[POOL] Shut down")
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== NPU Inference Pool Test ===")
+
+    pool = NPUInferencePool(
+        runtime_factory=lambda worker_id: SimulatedRuntime(latency=0.02),
+        num_workers=3,
+        policy="least_loaded"
+    )
+
+    start = time.time()
+    for i in range(30):
+        pool.submit(i, context=i)
+        # 결과는 필요할 때 순서대로 소비
+        while pool.in_flight >= pool.max_in_flight:
+            pool.get_result()
+
+    while pool.get_result(timeout=1.0) is not None:
+        pass
+
+    elapsed = time.time() - start
+    print(f"30 inferences in {elapsed:.2f}s ({30 / elapsed:.1f} FPS)")
+    print(f"Pool stats: {pool.get_stats()}")
+
+    pool.shutdown()
+    print("Test completed!")
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+요청 시 렌더링 (lazy) 오버레이
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+감지 결과 시각화는 결과 이미지를 실제로 사용하는 곳(미리보기 클라이언트,
+녹화, 위반 스냅샷 등)이 있을 때만 수행합니다. annotate()는 프레임과 감지
+결과만 묶어 두고, image에 처음 접근할 때 풀 버퍼에 그립니다.
+
+특징:
+- AnnotatedFrame: 처음 접근할 때 한 번만 렌더링
+- 해상도별 버퍼 풀 재사용 (프레임마다 frame.copy() 하지 않음)
+- in_place 옵션: 원본 프레임에 직접 그리기 (원본을 더 쓰지 않을 때)
+- 소비자 등록 시에만 매 프레임 렌더링 후 전달
+- 생략한 렌더링 수와 절약한 CPU 시간(추정) 통계
+- enabled=False면 소비자 전달/측정 렌더링도 생략 (과부하 시 부하 조절)
+
+사용 예시:
+    from overlay import OverlayRenderer
+
+    renderer = OverlayRenderer(detector)
+    renderer.add_consumer(preview.send)     # 소비자가 없으면 렌더링 안 함
+
+    annotated = renderer.annotate(frame, detections)
+    image = annotated.image                 # 필요할 때만
+    annotated.release()
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+from ppe_detector import PPEDetector, Detection, InputBufferPool
+
+
+class AnnotatedFrame:
+    """
+    프레임 + 감지 결과 (렌더링은 image 접근 시)
+
+    풀 버퍼에 렌더링된 경우 release()로 버퍼를 반환해야 재사용됩니다.
+    """
+
+    def __init__(self, renderer: "OverlayRenderer", frame: np.ndarray, detections: List[Detection]):
+        self.renderer = renderer
+        self.frame = frame
+        self.detections = detections
+        self._image: Optional[np.ndarray] = None
+        self._buffer: Optional[np.ndarray] = None
+
+    @property
+    def rendered(self) -> bool:
+        """렌더링 여부"""
+        return self._image is not None
+
+    @property
+    def image(self) -> np.ndarray:
+        """감지 결과가 그려진 이미지 (처음 접근 시 렌더링)"""
+        if self._image is None:
+            self._image, self._buffer = self.renderer._render(self.frame, self.detections)
+        return self._image
+
+    def release(self):
+        """풀 버퍼 반환 (이후 image는 다시 렌더링됨)"""
+        if self._buffer is not None:
+            self.renderer._release(self._buffer)
+        self._image = None
+        self._buffer = None
+
+
+class OverlayRenderer:
+    """
+    요청 시 렌더링 관리자
+
+    PPEDetector.draw_detections를 풀 버퍼(out=) 또는 원본(in_place=)에
+    그리도록 호출하고, 렌더링/생략 통계를 집계합니다.
+    """
+
+    def __init__(
+        self,
+        detector: PPEDetector,
+        in_place: bool = False,
+        show_fps: bool = True,
+        show_labels: bool = True,
+        calibrate_every: int = 300
+    ):
+        """
+        Args:
+            detector: 그리기에 사용할 감지기
+            in_place: 원본 프레임에 직접 그리기 (버퍼 복사 생략)
+            show_fps: FPS 표시 여부
+            show_labels: 라벨 표시 여부
+            calibrate_every: 렌더링이 없을 때 절약 시간 추정을 위해
+                             N 프레임마다 한 번 측정용 렌더링 (0이면 안 함)
+        """
+        self.detector = detector
+        self.in_place = in_place
+        self.show_fps = show_fps
+        self.show_labels = show_labels
+        self.calibrate_every = calibrate_every
+        self.enabled = True     # False면 소비자에게 전달하지 않음 (과부하 시)
+
+        self._pools: Dict[Tuple[int, ...], InputBufferPool] = {}
+        self._consumers: List[Callable[[AnnotatedFrame], None]] = []
+        self._lock = threading.Lock()
+
+        # 통계
+        self.frames = 0
+        self.rendered = 0
+        self.suppressed = 0
+        self.render_time = 0.0
+        self._calibrations = 0
+        self._calibration_time = 0.0
+
+    def add_consumer(self, consumer: Callable[[AnnotatedFrame], None]):
+        """매 프레임 렌더링 결과를 받을 소비자 등록 (미리보기, 녹화 등)"""
+        with self._lock:
+            self._consumers.append(consumer)
+
+    def remove_consumer(self, consumer: Callable[[AnnotatedFrame], None]):
+        """소비자 제거"""
+        with self._lock:
+            if consumer in self._consumers:
+                self._consumers.remove(consumer)
+
+    @property
+    def has_consumers(self) -> bool:
+        return bool(self._consumers)
+
+    def annotate(self, frame: np.ndarray, detections: List[Detection]) -> AnnotatedFrame:
+        """
+        프레임과 감지 결과 묶기 (소비자가 있을 때만 렌더링)
+
+        비활성화 상태면 소비자에게 전달하지 않습니다 (image에 직접
+        접근하면 렌더링은 됨).
+
+        Returns:
+            AnnotatedFrame
+        """
+        self.frames += 1
+        annotated = AnnotatedFrame(self, frame, detections)
+        if not self.enabled:
+            self.suppressed += 1
+            return annotated
+
+        with self._lock:
+            consumers = list(self._consumers)
+        for consumer in consumers:
+            try:
+                consumer(annotated)
+            except Exception as e:
+                print(f"[OVERLAY] Consumer error: {e}")
+
+        if not annotated.rendered and self.calibrate_every and self.frames % self.calibrate_every == 0:
+            self._calibrate(frame, detections)
+        return annotated
+
+    def _pool_for(self, shape: Tuple[int, ...]) -> InputBufferPool:
+        pool = self._pools.get(shape)
+        if pool is None:
+            with self._lock:
+                pool = self._pools.setdefault(shape, InputBufferPool(shape))
+        return pool
+
+    def _render(self, frame: np.ndarray, detections: List[Detection]):
+        """렌더링 (이미지, 반환할 버퍼)"""
+        start = time.perf_counter()
+        if self.in_place:
+            buffer = None
+            image = self.detector.draw_detections(
+                frame, detections, self.show_fps, self.show_labels, in_place=True
+            )
+        else:
+            buffer = self._pool_for(frame.shape).acquire()
+            image = self.detector.draw_detections(
+                frame, detections, self.show_fps, self.show_labels, out=buffer
+            )
+        self.render_time += time.perf_counter() - start
+        self.rendered += 1
+        return image, buffer
+
+    def _release(self, buffer: np.ndarray):
+        self._pool_for(buffer.shape).release(buffer)
+
+    def _calibrate(self, frame: np.ndarray, detections: List[Detection]):
+        """렌더링 비용 측정 (결과는 버림, 원본은 수정하지 않음)"""
+        pool = self._pool_for(frame.shape)
+        buffer = pool.acquire()
+        start = time.perf_counter()
+        self.detector.draw_detections(frame, detections, self.show_fps, self.show_labels, out=buffer)
+        self._calibration_time += time.perf_counter() - start
+        self._calibrations += 1
+        pool.release(buffer)
+
+    @property
+    def avg_render_ms(self) -> float:
+        """평균 렌더링 시간 (ms, 측정용 렌더링 포함)"""
+        count = self.rendered + self._calibrations
+        if not count:
+            return 0.0
+        return (self.render_time + self._calibration_time) / count * 1000
+
+    def get_stats(self) -> dict:
+        """오버레이 통계 반환"""
+        skipped = max(0, self.frames - self.rendered)
+        avg_ms = self.avg_render_ms
+        return {
+            "frames": self.frames,
+            "rendered": self.rendered,
+            "skipped": skipped,
+            "consumers": len(self._consumers),
+            "enabled": self.enabled,
+            "suppressed": self.suppressed,
+            "avg_render_ms": round(avg_ms, 3),
+            "saved_ms_per_frame": round(avg_ms * skipped / self.frames, 3) if self.frames else 0.0,
+            "saved_cpu_seconds": round(avg_ms * skipped / 1000, 2)
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Overlay Renderer Test ===")
+
+    detector = PPEDetector(use_simulation=True)
+    renderer = OverlayRenderer(detector, calibrate_every=10)
+    frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+    detections = detector._simulate_detections(frame.shape)
+
+    for i in range(100):
+        annotated = renderer.annotate(frame, detections)
+        if i % 25 == 0:
+            _ = annotated.image
+            annotated.release()
+
+    print(f"Stats: {renderer.get_stats()}")
+    print("Test completed!")
@@ -0,0 +1,499 @@
+#!/usr/bin/env python3
+"""
+단계별 파이프라인 처리
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+캡처 → 전처리 → 추론 → 후처리 → 알림 단계를 각각 별도 스레드로 실행하고
+단계 사이를 크기가 제한된 큐로 연결합니다. 느린 S3 업로드가 추론을
+멈추지 않도록 하고, 단계별 큐 깊이와 대기 시간으로 병목을 확인할 수 있습니다.
+
+큐 드롭 정책:
+- block: 큐가 가득 차면 생산자가 대기 (백프레셔)
+- drop_oldest: 가장 오래된 항목을 버리고 새 항목 추가 (최신 프레임 우선)
+- drop_newest: 새 항목을 버림 (이미 대기 중인 작업 우선)
+
+사용 예시:
+    from pipeline import Pipeline
+
+    pipeline = Pipeline("ppe")
+    pipeline.add_stage("capture", read_frame)                   # 소스 단계
+    pipeline.add_stage("infer", run_inference, queue_size=2)
+    pipeline.add_stage("alert", send_alert, queue_size=32,
+                       drop_policy="drop_oldest")
+
+    pipeline.start()
+    print(pipeline.get_stats())
+    pipeline.stop()
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+import numpy as np
+
+
+# 지원하는 큐 드롭 정책
+DROP_POLICIES = ("block", "drop_oldest", "drop_newest")
+
+
+@dataclass
+class FramePacket:
+    """
+    파이프라인 단계 사이를 이동하는 프레임 데이터
+
+    Attributes:
+        seq: 캡처 순서 번호
+        frame: 원본 프레임 (BGR)
+        capture_time: 캡처 시각 (time.time())
+        camera_id: 카메라 식별자 (멀티 카메라 모드)
+        crop: 추론에 사용한 ROI 사각형 (x1, y1, x2, y2, 없으면 전체 프레임)
+        input_data: 전처리된 모델 입력
+        outputs: 모델 출력
+        detections: 감지 결과 리스트
+        timings: 단계별 처리 시간 (초)
+    """
+    seq: int
+    frame: np.ndarray
+    capture_time: float
+    camera_id: str = ""
+    crop: Optional[Tuple[int, int, int, int]] = None
+    input_data: Any = None
+    outputs: Any = None
+    detections: List[Any] = field(default_factory=list)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class StageQueue:
+    """
+    드롭 정책과 통계를 가진 제한 크기 큐
+
+    queue.Queue와 달리 항목이 큐에 머문 시간, 버려진 항목 수,
+    생산자가 막힌 시간(백프레셔)을 기록합니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        maxsize: int = 2,
+        drop_policy: str = "drop_oldest",
+        on_drop: Optional[Callable[[Any], None]] = None
+    ):
+        """
+        Args:
+            name: 큐 이름 (통계 표시용)
+            maxsize: 최대 항목 수
+            drop_policy: 가득 찼을 때 정책 ("block", "drop_oldest", "drop_newest")
+            on_drop: 버려진 항목 콜백 (항목이 가진 버퍼 반환 등, lock 밖에서 호출)
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be >= 1")
+        if drop_policy not in DROP_POLICIES:
+            raise ValueError(f"Unknown drop policy: {drop_policy}")
+
+        self.name = name
+        self.maxsize = maxsize
+        self.drop_policy = drop_policy
+        self.on_drop = on_drop
+
+        self._items: deque = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        # 통계
+        self.put_count = 0
+        self.get_count = 0
+        self.dropped = 0
+        self.max_depth = 0
+        self.total_wait = 0.0
+        self.last_wait = 0.0
+        self.blocked_time = 0.0
+
+    def put(self, item: Any, timeout: Optional[float] = None) -> bool:
+        """
+        항목 추가
+
+        Args:
+            item: 추가할 항목 (None 불가)
+            timeout: block 정책에서 대기할 시간 (None이면 무제한)
+
+        Returns:
+            항목이 큐에 들어갔는지 여부 (들어가지 못한 항목은 on_drop으로 전달)
+        """
+        dropped = self._put(item, timeout)
+        if dropped is not None and self.on_drop is not None:
+            try:
+                self.on_drop(dropped)
+            except Exception as e:
+                print(f"[PIPE] Queue '{self.name}' drop callback error: {e}")
+        return dropped is not item
+
+    def _put(self, item: Any, timeout: Optional[float]) -> Any:
+        """항목 추가 후 버려진 항목 반환 (없으면 None)"""
+        with self._cond:
+            if self._closed:
+                return item
+
+            dropped = None
+            if len(self._items) >= self.maxsize:
+                if self.drop_policy == "drop_newest":
+                    self.dropped += 1
+                    return item
+
+                if self.drop_policy == "drop_oldest":
+                    dropped = self._items.popleft()[1]
+                    self.dropped += 1
+                else:
+                    # block: 공간이 생길 때까지 대기
+                    start = time.time()
+                    ok = self._cond.wait_for(
+                        lambda: self._closed or len(self._items) < self.maxsize,
+                        timeout
+                    )
+                    self.blocked_time += time.time() - start
+                    if not ok or self._closed:
+                        return item
+
+            self._items.append((time.time(), item))
+            self.put_count += 1
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify_all()
+            return dropped
+
+    def get(self, timeout: Optional[float] = None) -> Any:
+        """
+        항목 꺼내기
+
+        Args:
+            timeout: 대기 시간 (None이면 무제한)
+
+        Returns:
+            항목 또는 None (시간 초과/큐 닫힘)
+        """
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._items or self._closed, timeout):
+                return None
+            if not self._items:
+                return None
+
+            enqueue_time, item = self._items.popleft()
+            self.last_wait = time.time() - enqueue_time
+            self.total_wait += self.last_wait
+            self.get_count += 1
+            self._cond.notify_all()
+            return item
+
+    def close(self):
+        """큐 닫기 (대기 중인 생산자/소비자 깨움)"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self) -> int:
+        with self._cond:
+            return len(self._items)
+
+    def get_stats(self) -> dict:
+        """큐 통계 반환"""
+        with self._cond:
+            avg_wait = self.total_wait / self.get_count if self.get_count else 0.0
+            return {
+                "depth": len(self._items),
+                "max_depth": self.max_depth,
+                "capacity": self.maxsize,
+                "drop_policy": self.drop_policy,
+                "put": self.put_count,
+                "dropped": self.dropped,
+                "avg_wait_ms": round(avg_wait * 1000, 2),
+                "last_wait_ms": round(self.last_wait * 1000, 2),
+                "blocked_ms": round(self.blocked_time * 1000, 1)
+            }
+
+
+class Stage:
+    """
+    파이프라인 단계
+
+    입력 큐에서 항목을 꺼내 func를 적용하고 결과를 출력 큐로 보냅니다.
+    func가 None을 반환하면 해당 항목은 다음 단계로 전달되지 않습니다.
+    입력 큐가 없는 단계는 소스 단계로, func()를 인자 없이 반복 호출합니다.
+
+    workers가 2 이상이면 여러 스레드가 동시에 func를 실행하며,
+    ordered=True인 경우 출력 순서는 입력 순서와 같게 유지됩니다.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        func: Callable,
+        input_queue: Optional[StageQueue] = None,
+        output_queue: Optional[StageQueue] = None,
+        workers: int = 1,
+        ordered: bool = True
+    ):
+        """
+        Args:
+            name: 단계 이름
+            func: 처리 함수 (소스 단계는 인자 없음)
+            input_queue: 입력 큐 (None이면 소스 단계)
+            output_queue: 출력 큐 (None이면 마지막 단계)
+            workers: 처리 스레드 수
+            ordered: 여러 스레드일 때 입력 순서 유지 여부
+        """
+        self.name = name
+        self.func = func
+        self.input_queue = input_queue
+        self.output_queue = output_queue
+        self.workers = max(1, workers) if input_queue is not None else 1
+        self.ordered = ordered and self.workers > 1
+
+        self.running = False
+        self.threads: List[threading.Thread] = []
+
+        # 순서 유지용 상태 (_emit_lock은 출력 큐 put 동안 보유, _lock보다 먼저 획득)
+        self._lock = threading.Lock()
+        self._emit_lock = threading.Lock()
+        self._next_ticket = 0
+        self._next_emit = 0
+        self._done: Dict[int, Any] = {}
+
+        # 통계
+        self.processed = 0
+        self.errors = 0
+        self.busy_time = 0.0
+        self.last_time = 0.0
+
+    def start(self):
+        """단계 스레드 시작"""
+        self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._run,
+                name=f"stage-{self.name}-{i}",
+                daemon=True
+            )
+            thread.start()
+            self.threads.append(thread)
+
+    def stop(self, timeout: float = 5.0):
+        """단계 스레드 종료 대기"""
+        self.running = False
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        self.threads = []
+
+    def _take(self):
+        """입력 항목과 순서 티켓 가져오기"""
+        if self.input_queue is None:
+            return None, None
+
+        if not self.ordered:
+            return None, self.input_queue.get(timeout=0.1)
+
+        # 티켓은 꺼낸 순서와 같아야 하므로 같은 lock 안에서 발급
+        with self._lock:
+            item = self.input_queue.get(timeout=0.01)
+            if item is None:
+                return None, None
+            ticket = self._next_ticket
+            self._next_ticket += 1
+        return ticket, item
+
+    def _run(self):
+        while self.running:
+            ticket, item = self._take()
+            if self.input_queue is not None and item is None:
+                continue
+
+            start = time.time()
+            result = None
+            try:
+                result = self.func() if self.input_queue is None else self.func(item)
+            except Exception as e:
+                self.errors += 1
+                print(f"[PIPE] Stage '{self.name}' error: {e}")
+
+            elapsed = time.time() - start
+            with self._lock:
+                self.busy_time += elapsed
+                self.last_time = elapsed
+                if result is not None or self.input_queue is not None:
+                    self.processed += 1
+
+            if ticket is None:
+                self._emit(result)
+            else:
+                self._emit_ordered(ticket, result)
+
+    def _emit(self, result: Any):
+        if result is not None and self.output_queue is not None:
+            self.output_queue.put(result)
+
+    def _emit_ordered(self, ticket: int, result: Any):
+        """티켓 순서대로 출력 (앞선 항목이 끝날 때까지 보류)"""
+        # 꺼내기와 내보내기를 _emit_lock 안에서 해야 스레드 간 순서가 뒤바뀌지 않음.
+        # "block" 정책 출력 큐가 가득 차도 _lock은 바로 놓으므로
+        # 입력 가져오기(_take)와 get_stats()는 막히지 않음
+        ready = []
+        with self._emit_lock:
+            with self._lock:
+                self._done[ticket] = result
+                while self._next_emit in self._done:
+                    ready.append(self._done.pop(self._next_emit))
+                    self._next_emit += 1
+
+            for r in ready:
+                self._emit(r)
+
+    def get_stats(self) -> dict:
+        """단계 통계 반환"""
+        with self._lock:
+            avg_time = self.busy_time / self.processed if self.processed else 0.0
+            stats = {
+                "workers": self.workers,
+                "processed": self.processed,
+                "errors": self.errors,
+                "avg_time_ms": round(avg_time * 1000, 2),
+                "last_time_ms": round(self.last_time * 1000, 2)
+            }
+        if self.input_queue is not None:
+            stats["queue"] = self.input_queue.get_stats()
+        return stats
+
+
+class Pipeline:
+    """
+    단계들을 큐로 연결한 처리 파이프라인
+
+    첫 번째로 추가한 단계는 소스 단계이며, 이후 단계는 앞 단계의
+    출력 큐를 입력으로 받습니다.
+    """
+
+    def __init__(self, name: str = "pipeline"):
+        """
+        Args:
+            name: 파이프라인 이름
+        """
+        self.name = name
+        self.stages: List[Stage] = []
+        self.running = False
+
+    def add_stage(
+        self,
+        name: str,
+        func: Callable,
+        queue_size: int = 2,
+        drop_policy: str = "drop_oldest",
+        workers: int = 1,
+        ordered: bool = True,
+        on_drop: Optional[Callable[[Any], None]] = None
+    ) -> Stage:
+        """
+        단계 추가
+
+        Args:
+            name: 단계 이름
+            func: 처리 함수
+            queue_size: 이 단계 입력 큐 크기 (소스 단계는 무시)
+            drop_policy: 이 단계 입력 큐 드롭 정책 (소스 단계는 무시)
+            workers: 처리 스레드 수
+            ordered: 여러 스레드일 때 순서 유지 여부
+            on_drop: 이 단계 입력 큐에서 버려진 항목 콜백 (소스 단계는 무시)
+
+        Returns:
+            추가된 Stage
+        """
+        if self.running:
+            raise RuntimeError("Cannot add stages to a running pipeline")
+
+        input_queue = None
+        if self.stages:
+            input_queue = StageQueue(name, maxsize=queue_size, drop_policy=drop_policy, on_drop=on_drop)
+            self.stages[-1].output_queue = input_queue
+
+        stage = Stage(
+            name=name,
+            func=func,
+            input_queue=input_queue,
+            workers=workers,
+            ordered=ordered
+        )
+        self.stages.append(stage)
+        return stage
+
+    def start(self):
+        """모든 단계 시작 (뒤 단계부터 시작하여 항목 유실 방지)"""
+        if self.running:
+            return
+        self.running = True
+        for stage in reversed(self.stages):
+            stage.start()
+        print(f"[PIPE] Pipeline '{self.name}' started: "
+              f"{' -> '.join(s.name for s in self.stages)}")
+
+    def stop(self, timeout: float = 5.0):
+        """모든 단계 중지"""
+        if not self.running:
+            return
+        self.running = False
+
+        for stage in self.stages:
+            stage.running = False
+            if stage.input_queue is not None:
+                stage.input_queue.close()
+        for stage in self.stages:
+            stage.stop(timeout=timeout)
+
+        print(f"[PIPE] Pipeline '{self.name}' stopped")
+
+    def get_stats(self) -> dict:
+        """단계별 통계 반환"""
+        return {stage.name: stage.get_stats() for stage in self.stages}
+
+    def bottleneck(self) -> Optional[str]:
+        """
+        병목 단계 추정
+
+        평균 처리 시간 / 워커 수가 가장 큰 단계를 반환합니다.
+        """
+        best_name = None
+        best_cost = 0.0
+        for stage in self.stages:
+            stats = stage.get_stats()
+            cost = stats["avg_time_ms"] / stage.workers
+            if cost > best_cost:
+                best_name, best_cost = stage.name, cost
+        return best_name
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Pipeline Test ===")
+
+    counter = {"n": 0}
+
+    def source():
+        time.sleep(0.005)
+        counter["n"] += 1
+        return counter["n"]
+
+    def slow(x):
+        time.sleep(0.02)
+        return x
+
+    results = []
+    pipeline = Pipeline("test")
+    pipeline.add_stage("source", source)
+    pipeline.add_stage("slow", slow, queue_size=2, drop_policy="drop_oldest")
+    pipeline.add_stage("sink", results.append, queue_size=8, drop_policy="block")
+
+    pipeline.start()
+    time.sleep(1.0)
+    pipeline.stop()
+
+    print(f"Produced: {counter['n']}, consumed: {len(results)}")
+    print(f"Bottleneck: {pipeline.bottleneck()}")
+    for name, stats in pipeline.get_stats().items():
+        print(f"  {name}: {stats}")
+    print("Test completed!")
@@ -23,14 +23,37 @@ Orange Pi 5 + Greengrass PPE Detection 시스템용
     result_frame = detector.draw_detections(frame, detections)
 
     detector.release()
+
+    # 멀티 코어 NPU 풀 모드 (코어별 런타임, 순서 보장 결과)
+    detector = PPEDetector(model_path="/path/to/model.rknn", num_npu_workers=3)
+
+    seq = detector.submit(frame)
+    result = detector.get_result(timeout=1.0)   # result.seq == seq
+
+    # 무중단 모델 교체 (새 모델 로드/워밍업 후 프레임 사이에서 교체)
+    detector.reload(model_path="/path/to/model_v2.rknn", conf_threshold=0.6)
+
+    # 여러 카메라 프레임을 한 번에 (배치 모델이면 추론 1회, 아니면 순차 처리)
+    detector = PPEDetector(model_path="/path/to/model_b4.rknn", batch_size=4)
+    results = detector.detect_batch([frame1, frame2, frame3])  # 프레임별 감지 결과
 """
 
 import cv2
 import numpy as np
 import time
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Tuple, Optional, Any, Callable, Iterable, Iterator, Union
 from dataclasses import dataclass, field
 import random
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from npu_pool import NPUInferencePool, PoolResult, SimulatedRuntime, rknn_runtime_factory
+from latency import LatencyRecorder
+
+
+# 입력 프레임 색 순서
+INPUT_FORMATS = ("BGR", "RGB")
 
 
 @dataclass
@@ -44,12 +67,14 @@ class Detection:
         confidence: 신뢰도 (0.0 ~ 1.0)
         bbox: 바운딩 박스 (x1, y1, x2, y2)
         is_violation: PPE 위반 여부
+        track_id: 추적 ID (추적기 사용 시)
     """
     class_id: int
     class_name: str
     confidence: float
     bbox: Tuple[int, int, int, int]  # x1, y1, x2, y2
     is_violation: bool = False
+    track_id: Optional[int] = None
 
     def to_dict(self) -> dict:
         """딕셔너리로 변환"""
@@ -63,10 +88,87 @@ class Detection:
                 "x2": self.bbox[2],
                 "y2": self.bbox[3]
             },
-            "is_violation": self.is_violation
+            "is_violation": self.is_violation,
+            "track_id": self.track_id
         }
 
 
+@dataclass(frozen=True)
+class LetterboxInfo:
+    """
+    레터박스 변환 정보
+
+    원본 이미지를 비율 유지 리사이즈 후 모델 입력 중앙에 배치할 때의
+    스케일과 패딩입니다. 박스를 원본 좌표로 되돌릴 때 사용합니다.
+
+    Attributes:
+        scale: 원본 → 모델 입력 배율
+        pad_x: 왼쪽 패딩 (픽셀)
+        pad_y: 위쪽 패딩 (픽셀)
+        resized: 리사이즈된 이미지 크기 (width, height)
+    """
+    scale: float
+    pad_x: int
+    pad_y: int
+    resized: Tuple[int, int]
+
+
+class InputBufferPool:
+    """
+    모델 입력 버퍼 풀
+
+    여러 프레임이 동시에 처리 중일 때 (풀 모드, 파이프라인 모드)
+    각 프레임이 자신의 입력 버퍼를 갖도록 미리 할당된 버퍼를 재사용합니다.
+    처리 중인 프레임 수만큼 버퍼가 생기면 이후로는 새로 할당하지 않습니다.
+    """
+
+    def __init__(self, shape: Tuple[int, ...], dtype=np.uint8):
+        """
+        Args:
+            shape: 버퍼 shape (예: (1, 640, 640, 3))
+            dtype: 버퍼 자료형
+        """
+        self.shape = shape
+        self.dtype = dtype
+        self._free: List[np.ndarray] = []
+        self._lock = threading.Lock()
+        self.allocated = 0
+
+    def acquire(self) -> np.ndarray:
+        """버퍼 가져오기 (없으면 새로 할당)"""
+        with self._lock:
+            if self._free:
+                return self._free.pop()
+            self.allocated += 1
+        return np.empty(self.shape, dtype=self.dtype)
+
+    def release(self, buffer: np.ndarray):
+        """버퍼 반환"""
+        if buffer is None or buffer.shape != self.shape:
+            return
+        with self._lock:
+            self._free.append(buffer)
+
+
+@dataclass
+class DetectionResult:
+    """
+    풀 모드 감지 결과
+
+    Attributes:
+        seq: 제출 순서 시퀀스 ID
+        detections: 감지 결과 리스트
+        context: submit() 시 전달한 사용자 데이터
+        inference_time: 제출부터 결과까지 걸린 시간 (초)
+        worker_id: 추론을 수행한 NPU 워커 번호
+    """
+    seq: int
+    detections: List[Detection]
+    context: Any = None
+    inference_time: float = 0.0
+    worker_id: int = -1
+
+
 class PPEDetector:
     """
     RKNN NPU 기반 PPE 감지기
@@ -104,6 +206,9 @@ class PPEDetector:
         'gloves': (0, 200, 0)           # 녹색
     }
 
+    # 레터박스 패딩 색상 (YOLOv5 기본값)
+    PAD_VALUE = 114
+
     # 클래스별 한글 라벨
     LABELS_KO = {
         'person': '사람',
@@ -123,7 +228,14 @@ class PPEDetector:
         input_size: Tuple[int, int] = (640, 640),
         conf_threshold: float = 0.5,
         nms_threshold: float = 0.45,
-        use_simulation: bool = False
+        use_simulation: bool = False,
+        num_npu_workers: int = 1,
+        pool_policy: str = "round_robin",
+        runtime_factory: Optional[Callable[[int], Any]] = None,
+        latency: Optional[LatencyRecorder] = None,
+        sim_runtime_factory: Optional[Callable[[int], Any]] = None,
+        batch_size: int = 1,
+        input_format: str = "BGR"
     ):
         """
         Args:
@@ -132,42 +244,139 @@ class PPEDetector:
             conf_threshold: 신뢰도 임계값
             nms_threshold: NMS (Non-Maximum Suppression) 임계값
             use_simulation: 시뮬레이션 모드 사용 여부
+            num_npu_workers: NPU 런타임 수 (2 이상이면 풀 모드, 코어당 1개 권장)
+            pool_policy: 풀 분배 정책 ("round_robin" 또는 "least_loaded")
+            runtime_factory: 워커별 런타임 생성 함수 (지정 시 풀 모드, 테스트용)
+            latency: 단계별 지연 시간 기록기 (공유할 때 지정, 없으면 생성)
+            sim_runtime_factory: 시뮬레이션 모드에서 사용할 런타임 생성 함수
+                                 (yolo_simulator.simulated_runtime_factory 등,
+                                 지정하면 원시 출력 텐서로 실제 후처리 경로 실행)
+            batch_size: 모델 입력 배치 크기 (배치 크기로 변환된 모델에서만 2 이상,
+                        1이면 detect_batch는 프레임별 순차 처리)
+            input_format: 입력 프레임 색 순서 ("BGR" 또는 GStreamer 파이프라인에서
+                          변환된 "RGB", RGB면 전처리에서 색 변환 생략)
         """
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unknown input format: {input_format}")
+
         self.model_path = model_path
         self.input_size = input_size
         self.conf_threshold = conf_threshold
         self.nms_threshold = nms_threshold
         self.use_simulation = use_simulation
+        self.num_npu_workers = num_npu_workers
+        self.pool_policy = pool_policy
+        self.batch_size = max(1, batch_size)
+        self.input_format = input_format
 
         self.rknn = None
+        self.pool: Optional[NPUInferencePool] = None
         self.inference_time = 0.0
         self.total_inferences = 0
-
-        if not use_simulation and model_path:
+        self.render_count = 0
+        self.render_time = 0.0  # draw_detections 누적 시간 (초)
+        self.warmup_time = 0.0  # warmup 소요 시간 (초)
+        self.latency = latency if latency is not None else LatencyRecorder()
+
+        # 전처리 버퍼 (재사용)
+        self.input_buffers = InputBufferPool((1, input_size[1], input_size[0], 3))
+        self._input_buffer = self.input_buffers.acquire()
+        self.batch_buffers: Optional[InputBufferPool] = None
+        if self.batch_size > 1:
+            self.batch_buffers = InputBufferPool((self.batch_size, input_size[1], input_size[0], 3))
+        self._scratch = threading.local()      # 스레드별 리사이즈 스크래치 버퍼 {(w, h): 배열}
+        self._letterbox_cache: Dict[Tuple[int, int], LetterboxInfo] = {}
+
+        # 런타임 교체 (reload) 상태: 런타임별 진행 중 추론 수
+        self._runtime_factory = runtime_factory
+        self._sim_runtime_factory = sim_runtime_factory
+        self._runtime_cond = threading.Condition()
+        self._in_flight: Dict[int, int] = {}
+        self._submitted: "OrderedDict[int, list]" = OrderedDict()   # 풀별 결과 미수신 제출 [pool, 수]
+        self._reload_lock = threading.Lock()
+        self._frame_lock = threading.RLock()   # detect() 한 프레임 동안 보유 (입력 크기는 프레임 사이에서만 변경)
+        self._batch_executor: Optional[ThreadPoolExecutor] = None   # 풀 모드 detect_batch용 (pool.infer 호출)
+        self.model_generation = 0
+        self.reloads = 0
+        self.reload_failures = 0
+        self.last_reload_time = 0.0     # 마지막 교체 소요 시간 (초, 로드 + 워밍업)
+
+        if runtime_factory is not None:
+            self._init_pool(runtime_factory)
+        elif not use_simulation and model_path:
             self._load_model()
         else:
             print("[PPE] Running in simulation mode")
 
-    def _load_model(self):
-        """RKNN 모델 로드"""
-        try:
-            from rknnlite.api import RKNNLite
+        # 시뮬레이션 런타임 (풀 모드 동작도 유지)
+        if self.use_simulation and self.pool is None:
+            self.rknn, self.pool = self._open_simulation()
+
+    def _create_pool(self, runtime_factory: Callable[[int], Any]) -> NPUInferencePool:
+        """멀티 코어 추론 풀 생성"""
+        return NPUInferencePool(
+            runtime_factory=runtime_factory,
+            num_workers=max(1, self.num_npu_workers),
+            policy=self.pool_policy
+        )
+
+    def _init_pool(self, runtime_factory: Callable[[int], Any]):
+        """멀티 코어 추론 풀을 현재 런타임으로 설정"""
+        self.pool = self._create_pool(runtime_factory)
+
+    def _open_simulation(self) -> Tuple[Any, Optional[NPUInferencePool]]:
+        """시뮬레이션 런타임 생성 (단일 런타임, 풀)"""
+        factory = self._sim_runtime_factory
+        if self.num_npu_workers > 1:
+            return None, self._create_pool(factory or (lambda worker_id: SimulatedRuntime()))
+        # 런타임 없이 무작위 감지 결과를 내는 기본 시뮬레이션은 None
+        return (factory(0) if factory else None), None
+
+    def _open_runtime(self, model_path: str) -> Tuple[Any, Optional[NPUInferencePool]]:
+        """
+        모델을 로드한 새 런타임 생성 (현재 런타임은 건드리지 않음)
+
+        Returns:
+            (단일 런타임, 풀) 중 하나만 설정된 튜플
+
+        Raises:
+            ImportError: RKNN Lite가 없는 경우
+            RuntimeError: 모델 로드/런타임 초기화 실패
+        """
+        if self._runtime_factory is not None:
+            return None, self._create_pool(self._runtime_factory)
 
-            self.rknn = RKNNLite()
+        if self.num_npu_workers > 1:
+            # 코어별 런타임 풀
+            print(f"[PPE] Loading model on {self.num_npu_workers} NPU workers: {model_path}")
+            return None, self._create_pool(rknn_runtime_factory(model_path))
 
+        from rknnlite.api import RKNNLite
+
+        rknn = RKNNLite()
+        try:
             # 모델 로드
-            print(f"[PPE] Loading model: {self.model_path}")
-            ret = self.rknn.load_rknn(self.model_path)
+            print(f"[PPE] Loading model: {model_path}")
+            ret = rknn.load_rknn(model_path)
             if ret != 0:
                 raise RuntimeError(f"Failed to load RKNN model: {ret}")
 
             # 런타임 환경 초기화 (3개 NPU 코어 모두 사용)
-            ret = self.rknn.init_runtime(core_mask=RKNNLite.NPU_CORE_0_1_2)
+            ret = rknn.init_runtime(core_mask=RKNNLite.NPU_CORE_0_1_2)
             if ret != 0:
                 raise RuntimeError(f"Failed to init RKNN runtime: {ret}")
+        except Exception:
+            rknn.release()
+            raise
+        return rknn, None
+
+    def _load_model(self):
+        """RKNN 모델 로드"""
+        try:
+            self.rknn, self.pool = self._open_runtime(self.model_path)
 
             print(f"[PPE] Model loaded successfully")
-            print(f"[PPE] Input size: {self.input_size}")
+            print(f"[PPE] Input size: {self.input_size}, batch: {self.batch_size}")
             print(f"[PPE] Confidence threshold: {self.conf_threshold}")
 
         except ImportError:
@@ -182,26 +391,365 @@ class PPEDetector:
             print("[PPE] Switching to simulation mode")
             self.use_simulation = True
 
-    def preprocess(self, frame: np.ndarray) -> np.ndarray:
+    def reload(
+        self,
+        model_path: Optional[str] = None,
+        conf_threshold: Optional[float] = None,
+        nms_threshold: Optional[float] = None,
+        warmup_runs: int = 1,
+        drain_timeout: float = 10.0,
+        input_size: Optional[Tuple[int, int]] = None
+    ) -> bool:
+        """
+        모델 / 임계값 / 입력 크기 무중단 교체 (이중 버퍼)
+
+        새 런타임을 호출한 스레드에서 로드하고 워밍업한 뒤, 프레임 사이에서
+        현재 런타임과 한 번에 바꿉니다. 교체 전에 시작한 추론(제출된 풀 작업
+        포함)은 이전 런타임에서 끝나며, 모두 끝나면 이전 런타임을 해제합니다.
+        로드나 워밍업이 실패하면 현재 모델을 그대로 유지합니다.
+
+        임계값만 지정하면 런타임은 그대로 두고 값만 바꿉니다. 입력 크기는
+        그 크기로 만든 모델과 함께 바꾸며 (시뮬레이션은 모델 없이도 가능),
+        detect()/detect_batch() 프레임 사이에서 적용됩니다. 단계별
+        파이프라인처럼 감지기 밖에서 전처리/추론을 나눠 호출하는 경우에는
+        프레임 경계가 보장되지 않습니다. 배치 크기는 바꿀 수 없습니다.
+
+        Args:
+            model_path: 새 모델 경로 (None이면 임계값만 변경, 같은 경로면 파일 다시 로드)
+            conf_threshold: 새 신뢰도 임계값 (None이면 유지)
+            nms_threshold: 새 NMS 임계값 (None이면 유지)
+            warmup_runs: 교체 전 새 런타임 워밍업 횟수
+            drain_timeout: 이전 런타임의 진행 중 추론을 기다릴 최대 시간 (초)
+            input_size: 새 모델 입력 크기 (width, height, None이면 유지)
+
+        Returns:
+            교체 성공 여부
+        """
+        if input_size is not None:
+            input_size = tuple(input_size)
+            if input_size == tuple(self.input_size):
+                input_size = None
+
+        with self._reload_lock:
+            if model_path is None:
+                if input_size is not None:
+                    if not self.use_simulation:
+                        # 고정 입력 모델은 그 크기로 만든 모델이 있어야 함
+                        self.reload_failures += 1
+                        print(f"[PPE] Input size {input_size} requires a model built for it")
+                        return False
+                    with self._frame_lock:
+                        self._resize_input(input_size)
+                    print(f"[PPE] Input size changed: {self.input_size}")
+                if conf_threshold is not None:
+                    self.conf_threshold = conf_threshold
+                if nms_threshold is not None:
+                    self.nms_threshold = nms_threshold
+                if conf_threshold is not None or nms_threshold is not None:
+                    print(f"[PPE] Thresholds updated: conf={self.conf_threshold}, nms={self.nms_threshold}")
+                return True
+
+            start = time.perf_counter()
+            try:
+                if self.use_simulation:
+                    rknn, pool = self._open_simulation()
+                else:
+                    rknn, pool = self._open_runtime(model_path)
+            except Exception as e:
+                self.reload_failures += 1
+                print(f"[PPE] Model reload failed, keeping current model: {e}")
+                return False
+
+            try:
+                self._warmup_runtime(warmup_runs, rknn, pool, input_size)
+            except Exception as e:
+                self._release_runtime(rknn, pool)
+                self.reload_failures += 1
+                print(f"[PPE] New model warmup failed, keeping current model: {e}")
+                return False
+
+            # 프레임 사이에서 한 번에 교체 (이후 추론은 새 런타임 사용)
+            with self._frame_lock, self._runtime_cond:
+                old_rknn, old_pool = self.rknn, self.pool
+                self.rknn, self.pool = rknn, pool
+                if input_size is not None:
+                    self._resize_input(input_size)
+                self.model_path = model_path
+                if conf_threshold is not None:
+                    self.conf_threshold = conf_threshold
+                if nms_threshold is not None:
+                    self.nms_threshold = nms_threshold
+                self.model_generation += 1
+            self.reloads += 1
+            self.last_reload_time = time.perf_counter() - start
+            print(f"[PPE] Model swapped (generation {self.model_generation}): {model_path} "
+                  f"in {self.last_reload_time * 1000:.0f}ms")
+
+            # 이전 런타임은 진행 중인 추론이 끝난 뒤 해제
+            old = old_pool if old_pool is not None else old_rknn
+            with self._runtime_cond:
+                drained = self._runtime_cond.wait_for(
+                    lambda: self._in_flight.get(id(old), 0) == 0, timeout=drain_timeout
+                )
+            if not drained:
+                print(f"[PPE] Previous model still busy after {drain_timeout}s, releasing anyway")
+            self._release_runtime(old_rknn, old_pool)
+            return True
+
+    def _resize_input(self, input_size: Tuple[int, int]):
+        """입력 크기 변경 (입력 버퍼/레터박스 캐시 다시 생성, _frame_lock 보유 상태에서 호출)"""
+        self.input_size = input_size
+        self.input_buffers = InputBufferPool((1, input_size[1], input_size[0], 3))
+        self._input_buffer = self.input_buffers.acquire()
+        if self.batch_buffers is not None:
+            self.batch_buffers = InputBufferPool((self.batch_size, input_size[1], input_size[0], 3))
+        self._letterbox_cache = {}
+
+    def _release_runtime(self, rknn: Any, pool: Optional[NPUInferencePool]):
+        """런타임 해제 (교체된 이전 런타임 / 실패한 새 런타임)"""
+        if pool is not None:
+            pool.shutdown()
+        if rknn is not None:
+            rknn.release()
+
+    def _acquire_runtime(self) -> Tuple[Any, Optional[NPUInferencePool]]:
+        """현재 런타임을 가져오고 진행 중 추론 수 증가 (교체 시 해제를 미룸)"""
+        with self._runtime_cond:
+            rknn, pool = self.rknn, self.pool
+            key = id(pool if pool is not None else rknn)
+            self._in_flight[key] = self._in_flight.get(key, 0) + 1
+        return rknn, pool
+
+    def _done_runtime(self, runtime: Any):
+        """진행 중 추론 수 감소"""
+        key = id(runtime)
+        with self._runtime_cond:
+            count = self._in_flight.get(key, 0) - 1
+            if count > 0:
+                self._in_flight[key] = count
+            else:
+                self._in_flight.pop(key, None)
+                self._runtime_cond.notify_all()
+
+    def warmup(self, runs: int = 2) -> float:
+        """
+        더미 입력으로 감지 경로 미리 실행
+
+        NPU 런타임은 첫 추론에서 지연 초기화(메모리 할당, 커널 준비)를 하므로
+        워밍업 없이는 첫 실제 프레임이 그 비용을 치릅니다. 전처리/후처리
+        버퍼와 NMS 경로도 함께 실행하며, 감지 통계에는 반영하지 않습니다.
+
+        Args:
+            runs: 워밍업 횟수 (풀 모드에서는 워커당 횟수)
+
+        Returns:
+            소요 시간 (초)
+        """
+        if runs <= 0:
+            return 0.0
+
+        start = time.perf_counter()
+        self._warmup_runtime(runs, self.rknn, self.pool)
+        self.warmup_time = time.perf_counter() - start
+        print(f"[PPE] Warmup: {runs} run(s) in {self.warmup_time * 1000:.1f}ms")
+        return self.warmup_time
+
+    def _warmup_runtime(
+        self,
+        runs: int,
+        rknn: Any,
+        pool: Optional[NPUInferencePool],
+        input_size: Optional[Tuple[int, int]] = None
+    ):
+        """
+        지정한 런타임 워밍업 (교체 전 새 런타임에도 사용)
+
+        처리 중인 프레임과 동시에 실행될 수 있으므로 내부 전처리 버퍼 대신
+        버퍼 풀에서 받은 버퍼를 사용합니다. 추론 오류는 그대로 발생시킵니다.
+        input_size가 현재와 다르면 전처리/후처리 없이 런타임만 실행합니다.
+        """
+        if input_size is not None:
+            self._warmup_raw(runs, rknn, pool, input_size)
+            return
+
+        in_w, in_h = self.input_size
+        frame = np.full((in_h, in_w, 3), self.PAD_VALUE, dtype=np.uint8)
+
+        if pool is not None:
+            # 모든 워커가 한 번 이상 실행되도록 워커 수만큼 동시에 제출
+            inputs = (
+                self.preprocess(frame, out=self.input_buffers.acquire())
+                for _ in range(runs * pool.num_workers)
+            )
+            error = None
+            for result in self._pool_window(pool, inputs):
+                self.input_buffers.release(result.context)
+                if result.error is not None:
+                    error = result.error
+                else:
+                    self.postprocess(result.outputs, frame.shape)
+            if error is not None:
+                raise error
+            return
+
+        for _ in range(runs):
+            if self.batch_buffers is not None:
+                batch = self.batch_buffers.acquire()
+                try:
+                    for i in range(self.batch_size):
+                        self.preprocess(frame, out=batch[i:i + 1])
+                    outputs = rknn.inference(inputs=[batch]) if rknn else None
+                finally:
+                    self.batch_buffers.release(batch)
+                self.postprocess_batch(outputs, [frame.shape] * self.batch_size)
+            else:
+                input_data = self.preprocess(frame, out=self.input_buffers.acquire())
+                try:
+                    # 런타임이 없는 시뮬레이션 모드는 데울 추론이 없음
+                    outputs = rknn.inference(inputs=[input_data]) if rknn else None
+                finally:
+                    self.input_buffers.release(input_data)
+                self.postprocess(outputs, frame.shape)
+
+    @staticmethod
+    def _pool_window(pool: NPUInferencePool, inputs: Iterable[Any]) -> Iterator[PoolResult]:
+        """
+        입력을 풀에 차례로 제출하며 결과를 제출 순서대로 반환 (제너레이터)
+
+        제출만 계속하면 처리 중 작업이 max_in_flight에 도달한 뒤 submit()이
+        결과 소비를 기다리며 멈추므로, 그 전에 가장 오래된 결과를 먼저 받습니다.
+        각 입력은 결과의 context로 돌려줍니다.
         """
-        전처리: 리사이즈 및 정규화
+        pending = 0
+        for input_data in inputs:
+            if pending >= pool.max_in_flight:
+                result = pool.get_result()
+                pending -= 1
+                if result is not None:
+                    yield result
+            pool.submit(input_data, context=input_data)
+            pending += 1
+
+        for _ in range(pending):
+            result = pool.get_result()
+            if result is not None:
+                yield result
+
+    def _warmup_raw(self, runs: int, rknn: Any, pool: Optional[NPUInferencePool], input_size: Tuple[int, int]):
+        """패딩 값 입력으로 런타임만 워밍업 (교체 후 입력 크기가 달라지는 새 런타임)"""
+        in_w, in_h = input_size
+        if pool is not None:
+            tensor = np.full((1, in_h, in_w, 3), self.PAD_VALUE, dtype=np.uint8)
+            error = None
+            for result in self._pool_window(pool, (tensor for _ in range(runs * pool.num_workers))):
+                if result.error is not None:
+                    error = result.error
+            if error is not None:
+                raise error
+        elif rknn is not None:
+            tensor = np.full((self.batch_size, in_h, in_w, 3), self.PAD_VALUE, dtype=np.uint8)
+            for _ in range(runs):
+                rknn.inference(inputs=[tensor])
+
+    def letterbox_info(self, orig_shape: Tuple[int, ...]) -> LetterboxInfo:
+        """
+        원본 크기에 대한 레터박스 스케일/패딩 계산 (해상도별 캐시)
 
         Args:
-            frame: 입력 이미지 (BGR, HWC)
+            orig_shape: 원본 이미지 shape (H, W, C)
 
         Returns:
-            전처리된 이미지 (RGB, NHWC)
+            LetterboxInfo
+        """
+        h, w = orig_shape[:2]
+        info = self._letterbox_cache.get((w, h))
+        if info is None:
+            in_w, in_h = self.input_size
+            scale = min(in_w / w, in_h / h)
+            new_w = min(in_w, int(round(w * scale)))
+            new_h = min(in_h, int(round(h * scale)))
+            info = LetterboxInfo(
+                scale=scale,
+                pad_x=(in_w - new_w) // 2,
+                pad_y=(in_h - new_h) // 2,
+                resized=(new_w, new_h)
+            )
+            self._letterbox_cache[(w, h)] = info
+        return info
+
+    def preprocess(
+        self,
+        frame: np.ndarray,
+        out: Optional[np.ndarray] = None,
+        return_info: bool = False,
+        input_format: Optional[str] = None
+    ) -> Union[np.ndarray, Tuple[np.ndarray, LetterboxInfo]]:
         """
-        # 리사이즈
-        img = cv2.resize(frame, self.input_size)
+        전처리: 레터박스 리사이즈 및 BGR → RGB 변환
+
+        비율을 유지하여 리사이즈하고 남는 영역은 PAD_VALUE로 채웁니다.
+        결과는 미리 할당된 NHWC 버퍼에 직접 기록되며, 중간 배열을
+        새로 할당하지 않습니다.
 
-        # BGR -> RGB
-        img = cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        입력 색 순서가 "RGB"면 색 변환 없이 복사만 합니다. GStreamer
+        파이프라인에서 이미 모델 입력 크기에 맞게 축소한 프레임이면
+        리사이즈도 생략되어 패딩과 복사만 남습니다. 카메라마다 출력 형식이
+        다르면 input_format으로 프레임별 색 순서를 지정합니다.
 
-        # HWC -> NHWC (배치 차원 추가)
-        img = np.expand_dims(img, axis=0)
+        주의: out을 지정하지 않으면 감지기 내부 버퍼를 반환하므로
+        다음 preprocess() 호출 시 내용이 바뀝니다. 여러 프레임을 동시에
+        다루는 경우 input_buffers.acquire()로 받은 버퍼를 out으로 전달하세요.
+        리사이즈 스크래치 버퍼는 스레드별이므로 풀 워커/파이프라인 스레드에서
+        동시에 호출해도 됩니다.
 
-        return img
+        Args:
+            frame: 입력 이미지 (input_format 색 순서, HWC)
+            out: 결과를 기록할 (1, H, W, 3) uint8 버퍼 (None이면 내부 버퍼)
+            return_info: 레터박스 정보를 함께 반환
+            input_format: 이 프레임의 색 순서 (None이면 self.input_format)
+
+        Returns:
+            전처리된 이미지 (RGB, NHWC), return_info면 (이미지, LetterboxInfo)
+        """
+        input_format = input_format or self.input_format
+        if input_format not in INPUT_FORMATS:
+            raise ValueError(f"Unknown input format: {input_format}")
+        info = self.letterbox_info(frame.shape)
+        buf = self._input_buffer if out is None else out
+        img = buf[0]
+
+        new_w, new_h = info.resized
+        x0, y0 = info.pad_x, info.pad_y
+        x1, y1 = x0 + new_w, y0 + new_h
+
+        # 패딩 영역 채우기 (이미지 영역은 아래에서 덮어씀)
+        img[:y0] = self.PAD_VALUE
+        img[y1:] = self.PAD_VALUE
+        img[y0:y1, :x0] = self.PAD_VALUE
+        img[y0:y1, x1:] = self.PAD_VALUE
+
+        # 리사이즈 (스레드별, 해상도별 스크래치 버퍼에 기록)
+        if frame.shape[1] == new_w and frame.shape[0] == new_h:
+            resized = frame
+        else:
+            buffers = getattr(self._scratch, "resize", None)
+            if buffers is None:
+                buffers = self._scratch.resize = {}
+            resized = buffers.get(info.resized)
+            if resized is None:
+                resized = np.empty((new_h, new_w, 3), dtype=np.uint8)
+                buffers[info.resized] = resized
+            cv2.resize(frame, info.resized, dst=resized, interpolation=cv2.INTER_LINEAR)
+
+        # BGR -> RGB (입력 버퍼의 이미지 영역에 직접 기록, RGB 입력은 복사만)
+        if input_format == "RGB":
+            np.copyto(img[y0:y1, x0:x1], resized)
+        else:
+            cv2.cvtColor(resized, cv2.COLOR_BGR2RGB, dst=img[y0:y1, x0:x1])
+
+        if return_info:
+            return buf, info
+        return buf
 
     def postprocess(
         self,
@@ -218,88 +766,171 @@ class PPEDetector:
         Returns:
             감지 결과 리스트
         """
-        # 시뮬레이션 모드
-        if self.use_simulation:
+        # 시뮬레이션 모드 (원시 출력을 내는 시뮬레이션 런타임이면 실제 경로 실행)
+        if self.use_simulation and outputs is None:
             return self._simulate_detections(orig_shape)
+        return self.postprocess_batch(outputs, [orig_shape])[0]
 
-        detections = []
+    def postprocess_batch(
+        self,
+        outputs: Any,
+        orig_shapes: List[Tuple[int, int, int]]
+    ) -> List[List[Detection]]:
+        """
+        배치 후처리: 배치 전체를 한 번에 필터링/좌표 변환/NMS
+
+        배치 출력의 앞쪽 len(orig_shapes)개 이미지만 사용합니다
+        (마지막 배치가 덜 찬 경우 남는 슬롯 무시).
+
+        Args:
+            outputs: 모델 출력 (첫 번째 텐서가 (B, N, 5 + 클래스 수) 또는 (N, 5 + 클래스 수))
+            orig_shapes: 이미지별 원본 shape (H, W, C)
+
+        Returns:
+            이미지별 감지 결과 리스트
+        """
+        results: List[List[Detection]] = [[] for _ in orig_shapes]
+        if self.use_simulation and outputs is None:
+            return [self._simulate_detections(shape) for shape in orig_shapes]
 
         try:
             # YOLOv5 출력 형식 처리
-            output = np.array(outputs[0])
-
-            if output.ndim == 3:
-                output = output[0]  # 배치 차원 제거
+            output = np.asarray(outputs[0], dtype=np.float32)
+            if output.ndim == 2:
+                output = output[np.newaxis]
+            output = output[:len(orig_shapes)]
+            num_rows, row_width = output.shape[1], output.shape[2]
+            flat = output.reshape(-1, row_width)
 
             # [x, y, w, h, conf, class_scores...]
-            boxes = output[:, :4]
-            obj_conf = output[:, 4:5]
-            class_scores = output[:, 5:]
+            # 클래스 점수는 sigmoid 출력(<= 1)이므로 obj_conf가 임계값 이하인
+            # 행은 최종 신뢰도도 임계값을 넘을 수 없음 → 먼저 걸러서 연산량 감소
+            rows = np.flatnonzero(flat[:, 4] > self.conf_threshold)
+            if len(rows) == 0:
+                return results
+            candidates = flat[rows]
+            batch_idx = rows // num_rows
 
             # 클래스별 신뢰도 계산
-            scores = obj_conf * class_scores
+            scores = candidates[:, 5:] * candidates[:, 4:5]
             class_ids = np.argmax(scores, axis=1)
-            confidences = np.max(scores, axis=1)
+            confidences = scores[np.arange(len(scores)), class_ids]
 
             # 신뢰도 필터링
             mask = confidences > self.conf_threshold
-            boxes = boxes[mask]
+            if not mask.any():
+                return results
+
+            boxes = candidates[mask, :4]
             class_ids = class_ids[mask]
             confidences = confidences[mask]
-
-            if len(boxes) == 0:
-                return detections
-
-            # xywh -> xyxy 변환
-            boxes_xyxy = self._xywh_to_xyxy(boxes)
-
-            # NMS
-            indices = cv2.dnn.NMSBoxes(
-                boxes_xyxy.tolist(),
-                confidences.tolist(),
-                self.conf_threshold,
-                self.nms_threshold
-            )
-
-            # 좌표 스케일 변환
-            h, w = orig_shape[:2]
-            scale_x = w / self.input_size[0]
-            scale_y = h / self.input_size[1]
-
-            for i in indices.flatten():
-                x1, y1, x2, y2 = boxes_xyxy[i]
-                x1 = int(max(0, x1 * scale_x))
-                y1 = int(max(0, y1 * scale_y))
-                x2 = int(min(w, x2 * scale_x))
-                y2 = int(min(h, y2 * scale_y))
-
-                class_id = int(class_ids[i])
-                class_name = self.CLASSES[class_id] if class_id < len(self.CLASSES) else 'unknown'
-                confidence = float(confidences[i])
-                is_violation = class_name in self.VIOLATION_CLASSES
-
-                detection = Detection(
+            batch_idx = batch_idx[mask]
+
+            # xywh -> xyxy 변환 후 이미지별 원본 좌표로 스케일 및 클리핑
+            boxes_xyxy = self._scale_boxes(self._xywh_to_xyxy(boxes), orig_shapes, batch_idx)
+
+            # 이미지별/클래스별 NMS (hardhat 박스가 겹치는 no_hardhat 박스를 지우지 않도록,
+            # 다른 카메라 이미지의 박스끼리 억제하지 않도록)
+            groups = batch_idx * (row_width - 5) + class_ids
+            keep = self._batched_nms(boxes_xyxy, confidences, groups)
+
+            # 마지막에 한 번만 Python 객체로 변환
+            bboxes = boxes_xyxy[keep].astype(np.int32).tolist()
+            kept_ids = class_ids[keep].tolist()
+            kept_conf = confidences[keep].tolist()
+            kept_batch = batch_idx[keep].tolist()
+            num_classes = len(self.CLASSES)
+
+            for bbox, class_id, confidence, b in zip(bboxes, kept_ids, kept_conf, kept_batch):
+                class_name = self.CLASSES[class_id] if class_id < num_classes else 'unknown'
+                results[b].append(Detection(
                     class_id=class_id,
                     class_name=class_name,
                     confidence=confidence,
-                    bbox=(x1, y1, x2, y2),
-                    is_violation=is_violation
-                )
-                detections.append(detection)
+                    bbox=tuple(bbox),
+                    is_violation=class_name in self.VIOLATION_CLASSES
+                ))
 
         except Exception as e:
             print(f"[PPE] Postprocess error: {e}")
 
-        return detections
+        return results
 
     def _xywh_to_xyxy(self, boxes: np.ndarray) -> np.ndarray:
         """xywh 형식을 xyxy 형식으로 변환"""
-        xyxy = np.zeros_like(boxes)
-        xyxy[:, 0] = boxes[:, 0] - boxes[:, 2] / 2  # x1
-        xyxy[:, 1] = boxes[:, 1] - boxes[:, 3] / 2  # y1
-        xyxy[:, 2] = boxes[:, 0] + boxes[:, 2] / 2  # x2
-        xyxy[:, 3] = boxes[:, 1] + boxes[:, 3] / 2  # y2
-        return xyxy
+        half_wh = boxes[:, 2:4] / 2
+        return np.concatenate(
+            (boxes[:, 0:2] - half_wh, boxes[:, 0:2] + half_wh),
+            axis=1
+        )
+
+    def _scale_boxes(
+        self,
+        boxes_xyxy: np.ndarray,
+        orig_shapes: List[Tuple[int, int, int]],
+        batch_idx: np.ndarray
+    ) -> np.ndarray:
+        """
+        모델 입력 좌표를 원본 이미지 좌표로 변환 (제자리 연산)
+
+        박스마다 자기 이미지의 레터박스 패딩을 빼고 스케일을 되돌립니다.
+
+        Args:
+            boxes_xyxy: 모델 입력 기준 박스 (N, 4)
+            orig_shapes: 이미지별 원본 shape (H, W, C)
+            batch_idx: 박스별 이미지 인덱스 (N,)
+
+        Returns:
+            각 원본 이미지 범위로 클리핑된 박스 (N, 4)
+        """
+        params = np.empty((len(orig_shapes), 5), dtype=boxes_xyxy.dtype)
+        for i, shape in enumerate(orig_shapes):
+            info = self.letterbox_info(shape)
+            params[i] = (info.pad_x, info.pad_y, info.scale, shape[1], shape[0])
+        if len(orig_shapes) > 1:
+            params = params[batch_idx]
+
+        boxes_xyxy -= params[:, [0, 1, 0, 1]]
+        boxes_xyxy /= params[:, 2:3]
+        np.clip(boxes_xyxy[:, 0::2], 0, params[:, 3:4], out=boxes_xyxy[:, 0::2])
+        np.clip(boxes_xyxy[:, 1::2], 0, params[:, 4:5], out=boxes_xyxy[:, 1::2])
+        return boxes_xyxy
+
+    def _batched_nms(
+        self,
+        boxes_xyxy: np.ndarray,
+        confidences: np.ndarray,
+        class_ids: np.ndarray
+    ) -> np.ndarray:
+        """
+        클래스별 NMS (좌표 오프셋 방식)
+
+        클래스마다 박스를 서로 겹치지 않는 영역으로 평행 이동시켜
+        한 번의 NMS 호출로 클래스별 NMS와 같은 결과를 얻습니다.
+        class_ids 대신 (이미지, 클래스) 그룹 ID를 넘기면 배치 전체를
+        한 번에 처리할 수 있습니다.
+
+        Returns:
+            남길 박스의 인덱스 배열
+        """
+        if len(boxes_xyxy) == 0:
+            return np.zeros(0, dtype=np.int64)
+
+        offset = class_ids.astype(np.float32) * (float(boxes_xyxy.max()) + 1.0)
+
+        # cv2.dnn.NMSBoxes는 (x, y, w, h) 형식을 사용
+        rects = np.empty_like(boxes_xyxy)
+        rects[:, 0] = boxes_xyxy[:, 0] + offset
+        rects[:, 1] = boxes_xyxy[:, 1] + offset
+        rects[:, 2:4] = boxes_xyxy[:, 2:4] - boxes_xyxy[:, 0:2]
+
+        indices = cv2.dnn.NMSBoxes(
+            rects,
+            confidences,
+            self.conf_threshold,
+            self.nms_threshold
+        )
+        return np.asarray(indices, dtype=np.int64).reshape(-1)
 
     def _simulate_detections(
         self,
@@ -345,59 +976,341 @@ class PPEDetector:
 
         return detections
 
-    def detect(self, frame: np.ndarray) -> List[Detection]:
+    def detect(self, frame: np.ndarray, input_format: Optional[str] = None) -> List[Detection]:
         """
         PPE 감지 실행
 
         Args:
             frame: 입력 이미지 (BGR)
+            input_format: 이 프레임의 색 순서 (None이면 self.input_format)
 
         Returns:
             감지 결과 리스트
         """
-        start_time = time.time()
+        with self._frame_lock:
+            return self._detect(frame, input_format)
+
+    def _detect(self, frame: np.ndarray, input_format: Optional[str] = None) -> List[Detection]:
+        """
+        한 프레임 감지 (_frame_lock 보유 상태에서 호출)
+
+        풀 모드에서도 submit()/get_result()의 순서 보장 큐 대신 infer()
+        (pool.infer)로 자신의 결과만 받으므로, 비동기 제출과 섞여도
+        다른 프레임의 결과를 가져가지 않습니다.
+        """
+        start_time = time.perf_counter()
 
         # 전처리
-        input_data = self.preprocess(frame)
+        input_data = self.preprocess(frame, input_format=input_format)
+        preprocessed = time.perf_counter()
 
         # 추론
-        if self.use_simulation:
-            outputs = None
-            time.sleep(0.02)  # 시뮬레이션된 추론 시간 (~20ms)
-        else:
-            outputs = self.rknn.inference(inputs=[input_data])
+        outputs = self.infer(input_data)
+        inferred = time.perf_counter()
 
         # 후처리
         detections = self.postprocess(outputs, frame.shape)
+        end_time = time.perf_counter()
 
         # 통계 업데이트
-        self.inference_time = time.time() - start_time
-        self.total_inferences += 1
+        self.latency.record("preprocess", preprocessed - start_time)
+        self.latency.record("infer", inferred - preprocessed)
+        self.latency.record("postprocess", end_time - inferred)
+        self.update_stats(end_time - start_time)
+
+        return detections
+
+    def detect_batch(
+        self,
+        frames: List[np.ndarray],
+        input_formats: Optional[List[Optional[str]]] = None
+    ) -> List[List[Detection]]:
+        """
+        여러 프레임 PPE 감지 (멀티 카메라)
+
+        배치 모델(batch_size > 1)이면 batch_size개씩 하나의 연속된 입력 텐서로
+        전처리하여 추론을 한 번만 호출하고 배치 전체를 한 번에 후처리합니다.
+        풀 모드에서는 워커 수만큼의 스레드에서 프레임별로 pool.infer를 호출하여
+        NPU 워커에서 병렬로 처리하고 (submit()/get_result()의 순서 보장 큐를
+        쓰지 않으므로 다른 호출자의 비동기 제출과 섞이지 않음), batch_size가
+        1이면 프레임별로 detect()를 호출합니다.
+
+        Args:
+            frames: 입력 이미지 리스트 (BGR, 해상도가 달라도 됨)
+            input_formats: 프레임별 색 순서 (None이면 모두 self.input_format)
+
+        Returns:
+            프레임 순서대로의 감지 결과 리스트
+        """
+        if not frames:
+            return []
+
+        formats = list(input_formats) if input_formats is not None else [None] * len(frames)
+        with self._frame_lock:
+            return self._detect_frames(frames, formats)
+
+    def _detect_frames(
+        self,
+        frames: List[np.ndarray],
+        formats: List[Optional[str]]
+    ) -> List[List[Detection]]:
+        """여러 프레임 감지 (_frame_lock 보유 상태에서 호출)"""
+        if self.pool is not None:
+            if self._batch_executor is None:
+                self._batch_executor = ThreadPoolExecutor(
+                    max_workers=self.num_npu_workers, thread_name_prefix="detect-batch"
+                )
+            futures = [
+                self._batch_executor.submit(self._detect_pooled, frame, fmt)
+                for frame, fmt in zip(frames, formats)
+            ]
+            results = [future.result() for future in futures]
+
+            # 통계는 호출 스레드에서 기록
+            for _, (preprocess_time, infer_time, postprocess_time) in results:
+                self.latency.record("preprocess", preprocess_time)
+                self.latency.record("infer", infer_time)
+                self.latency.record("postprocess", postprocess_time)
+                self.update_stats(preprocess_time + infer_time + postprocess_time)
+            return [detections for detections, _ in results]
+
+        if self.batch_size <= 1:
+            return [self._detect(frame, fmt) for frame, fmt in zip(frames, formats)]
+
+        detections: List[List[Detection]] = []
+        for start in range(0, len(frames), self.batch_size):
+            end = start + self.batch_size
+            detections += self._detect_chunk(frames[start:end], formats[start:end])
+        return detections
+
+    def _detect_pooled(
+        self,
+        frame: np.ndarray,
+        input_format: Optional[str]
+    ) -> Tuple[List[Detection], Tuple[float, float, float]]:
+        """
+        풀 모드 한 프레임 감지 (detect_batch 실행기 스레드에서 호출)
+
+        프레임마다 input_buffers의 버퍼에 전처리하고 pool.infer로 자신의
+        결과만 받습니다.
+
+        Returns:
+            (감지 결과, (전처리, 추론, 후처리 시간))
+        """
+        start_time = time.perf_counter()
+        input_data = self.preprocess(frame, out=self.input_buffers.acquire(), input_format=input_format)
+        preprocessed = time.perf_counter()
+        try:
+            outputs = self.infer(input_data)
+        finally:
+            self.input_buffers.release(input_data)
+        inferred = time.perf_counter()
+        detections = self.postprocess(outputs, frame.shape)
+        end_time = time.perf_counter()
+        return detections, (preprocessed - start_time, inferred - preprocessed, end_time - inferred)
+
+    def _detect_chunk(
+        self,
+        frames: List[np.ndarray],
+        formats: List[Optional[str]]
+    ) -> List[List[Detection]]:
+        """
+        batch_size개 이하 프레임을 추론 1회로 감지
+
+        모델 입력 shape가 고정이므로 프레임이 batch_size보다 적어도 전체
+        배치 버퍼로 추론하고 남는 슬롯의 출력은 무시합니다.
+        """
+        start_time = time.perf_counter()
+
+        # 이미지별 슬롯에 직접 전처리 (하나의 연속된 NHWC 텐서)
+        batch = self.batch_buffers.acquire()
+        try:
+            for i, (frame, fmt) in enumerate(zip(frames, formats)):
+                self.preprocess(frame, out=batch[i:i + 1], input_format=fmt)
+            preprocessed = time.perf_counter()
+
+            outputs = self.infer(batch)
+            inferred = time.perf_counter()
+        finally:
+            self.batch_buffers.release(batch)
+
+        detections = self.postprocess_batch(outputs, [frame.shape for frame in frames])
+        end_time = time.perf_counter()
+
+        # 통계는 프레임당 몫으로 기록 (처리량은 프레임 수만큼)
+        n = len(frames)
+        for _ in range(n):
+            self.latency.record("preprocess", (preprocessed - start_time) / n)
+            self.latency.record("infer", (inferred - preprocessed) / n)
+            self.latency.record("postprocess", (end_time - inferred) / n)
+            self.latency.record("detect", (end_time - start_time) / n)
+        self.inference_time = (end_time - start_time) / n
+        self.total_inferences += n
+        self.latency.tick(n)
 
         return detections
 
+    def infer(self, input_data: np.ndarray) -> Any:
+        """
+        NPU 추론 (전처리/후처리 제외)
+
+        풀 모드에서는 여러 스레드에서 동시에 호출할 수 있으며
+        각 호출이 서로 다른 NPU 워커에서 실행됩니다.
+
+        Args:
+            input_data: 전처리된 입력 (NHWC)
+
+        Returns:
+            모델 출력 (시뮬레이션 런타임이 없는 시뮬레이션 모드에서는 None)
+        """
+        rknn, pool = self._acquire_runtime()
+        try:
+            if pool is not None:
+                result = pool.infer(input_data)
+                if result.error is not None:
+                    raise result.error
+                return result.outputs
+
+            if rknn is None:
+                time.sleep(0.02)  # 시뮬레이션된 추론 시간 (~20ms)
+                return None
+            return rknn.inference(inputs=[input_data])
+        finally:
+            self._done_runtime(pool if pool is not None else rknn)
+
+    def update_stats(self, inference_time: float):
+        """
+        추론 통계 갱신
+
+        detect()를 거치지 않고 preprocess/infer/postprocess를 직접
+        호출하는 경우 (파이프라인 모드) 사용합니다.
+
+        Args:
+            inference_time: 한 프레임의 감지 소요 시간 (초)
+        """
+        self.inference_time = inference_time
+        self.total_inferences += 1
+        self.latency.record("detect", inference_time)
+        self.latency.tick()
+
+    def submit(self, frame: np.ndarray, context: Any = None, input_format: Optional[str] = None) -> int:
+        """
+        풀 모드 비동기 감지 요청
+
+        Args:
+            frame: 입력 이미지 (BGR)
+            context: 결과와 함께 돌려받을 사용자 데이터
+            input_format: 이 프레임의 색 순서 (None이면 self.input_format)
+
+        Returns:
+            시퀀스 ID
+        """
+        if self.pool is None:
+            raise RuntimeError("submit() requires pool mode (num_npu_workers > 1)")
+
+        # 처리 중인 프레임마다 별도 입력 버퍼 사용 (결과 수신 시 반환)
+        start = time.perf_counter()
+        input_data = self.preprocess(frame, out=self.input_buffers.acquire(), input_format=input_format)
+        self.latency.record("preprocess", time.perf_counter() - start)
+
+        # 모델 교체 후에도 결과는 제출한 풀에서 받음 (받을 때까지 이전 풀 해제 보류)
+        with self._runtime_cond:
+            pool = self.pool
+            self._in_flight[id(pool)] = self._in_flight.get(id(pool), 0) + 1
+            self._submitted.setdefault(id(pool), [pool, 0])[1] += 1
+        return pool.submit(
+            input_data,
+            context=(frame.shape, context, time.time(), input_data)
+        )
+
+    def get_result(self, timeout: Optional[float] = None) -> Optional[DetectionResult]:
+        """
+        풀 모드 감지 결과를 제출 순서대로 가져오기
+
+        Args:
+            timeout: 대기 시간 (초, None이면 무제한)
+
+        Returns:
+            DetectionResult 또는 None
+        """
+        if self.pool is None:
+            raise RuntimeError("get_result() requires pool mode (num_npu_workers > 1)")
+
+        # 가장 먼저 제출된 풀부터 (교체 전 제출분이 남아 있으면 이전 풀)
+        with self._runtime_cond:
+            pool = next(iter(self._submitted.values()))[0] if self._submitted else self.pool
+
+        result = pool.get_result(timeout=timeout)
+        if result is None:
+            return None
+
+        with self._runtime_cond:
+            entry = self._submitted.get(id(pool))
+            if entry is not None:
+                entry[1] -= 1
+                if entry[1] <= 0:
+                    del self._submitted[id(pool)]
+        self._done_runtime(pool)
+
+        orig_shape, context, submit_time, input_data = result.context
+        self.input_buffers.release(input_data)
+
+        if result.error is not None:
+            print(f"[PPE] Inference error on worker {result.worker_id}: {result.error}")
+            detections = []
+        else:
+            self.latency.record("infer", result.latency)
+            start = time.perf_counter()
+            detections = self.postprocess(result.outputs, orig_shape)
+            self.latency.record("postprocess", time.perf_counter() - start)
+
+        self.update_stats(time.time() - submit_time)
+
+        return DetectionResult(
+            seq=result.seq,
+            detections=detections,
+            context=context,
+            inference_time=self.inference_time,
+            worker_id=result.worker_id
+        )
+
     def draw_detections(
         self,
         frame: np.ndarray,
         detections: List[Detection],
         show_fps: bool = True,
         show_labels: bool = True,
-        use_korean: bool = False
+        use_korean: bool = False,
+        out: Optional[np.ndarray] = None,
+        in_place: bool = False
     ) -> np.ndarray:
         """
         감지 결과를 프레임에 그리기
 
+        기본적으로 프레임을 복사한 후 그립니다. out 버퍼를 넘기면 새로
+        할당하지 않고 그 버퍼에 복사 후 그리며, in_place=True면 입력
+        프레임에 직접 그립니다.
+
         Args:
             frame: 입력 이미지
             detections: 감지 결과 리스트
             show_fps: FPS 표시 여부
             show_labels: 라벨 표시 여부
             use_korean: 한글 라벨 사용 여부
+            out: 결과를 기록할 버퍼 (frame과 같은 shape)
+            in_place: 입력 프레임에 직접 그리기
 
         Returns:
             결과가 그려진 이미지
         """
-        result = frame.copy()
+        start = time.perf_counter()
+        if in_place:
+            result = frame
+        elif out is not None:
+            np.copyto(out, frame)
+            result = out
+        else:
+            result = frame.copy()
 
         for det in detections:
             x1, y1, x2, y2 = det.bbox
@@ -414,6 +1327,9 @@ class PPEDetector:
                 else:
                     label = f"{det.class_name}: {det.confidence:.2f}"
 
+                if det.track_id is not None:
+                    label = f"#{det.track_id} {label}"
+
                 if det.is_violation:
                     label = f"! {label}"
 
@@ -440,10 +1356,11 @@ class PPEDetector:
                     2
                 )
 
-        # FPS 및 추론 시간 표시
+        # 처리량 및 감지 시간 중앙값 표시
         if show_fps:
-            fps = 1.0 / self.inference_time if self.inference_time > 0 else 0
-            fps_text = f"FPS: {fps:.1f} | Inference: {self.inference_time*1000:.1f}ms"
+            fps = self.latency.fps
+            p50 = self.latency.histogram("detect").percentile(50)
+            fps_text = f"FPS: {fps:.1f} | Detect p50: {p50:.1f}ms"
             cv2.putText(
                 result,
                 fps_text,
@@ -466,6 +1383,8 @@ class PPEDetector:
                     2
                 )
 
+        self.render_count += 1
+        self.render_time += time.perf_counter() - start
         return result
 
     def get_violations(self, detections: List[Detection]) -> List[Detection]:
@@ -474,18 +1393,40 @@ class PPEDetector:
 
     def get_stats(self) -> dict:
         """감지기 통계 반환"""
-        return {
+        stats = {
             "model_path": self.model_path,
             "input_size": self.input_size,
+            "batch_size": self.batch_size,
+            "input_format": self.input_format,
             "conf_threshold": self.conf_threshold,
             "simulation_mode": self.use_simulation,
             "total_inferences": self.total_inferences,
             "last_inference_time_ms": round(self.inference_time * 1000, 2),
-            "average_fps": round(1.0 / self.inference_time, 1) if self.inference_time > 0 else 0
+            "warmup_ms": round(self.warmup_time * 1000, 2),
+            "model_generation": self.model_generation,
+            "reloads": self.reloads,
+            "reload_failures": self.reload_failures,
+            "last_reload_ms": round(self.last_reload_time * 1000, 1),
+            "average_fps": round(self.latency.fps, 1),
+            "renders": self.render_count,
+            "avg_render_ms": round(self.render_time / self.render_count * 1000, 3) if self.render_count else 0
         }
+        stats["latency"] = self.latency.get_stats()
+        if self.pool is not None:
+            stats["pool"] = self.pool.get_stats()
+        return stats
 
     def release(self):
         """리소스 해제"""
+        if self._batch_executor is not None:
+            self._batch_executor.shutdown(wait=True)
+            self._batch_executor = None
+
+        if self.pool:
+            self.pool.shutdown()
+            self.pool = None
+            print("[PPE] Inference pool released")
+
         if self.rknn:
             self.rknn.release()
             self.rknn = None
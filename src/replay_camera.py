@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+"""
+녹화 영상 / 이미지 시퀀스 재생 카메라
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+고객 현장 영상(MP4/MKV 등) 또는 JPEG 디렉터리를 RTSPReader와 같은
+인터페이스(start/get_frame/stop/resolution/fps)로 재생합니다. 현장에서
+발생한 성능 저하를 같은 영상으로 재현하거나, 카메라 없이 실제 처리
+속도를 측정할 때 사용합니다.
+
+특징:
+- 실시간 재생 (원본 FPS 기준 시각표, 처리가 늦으면 실제 카메라처럼 지난 프레임 버림)
+- 최대 속도 재생 (realtime=False, 모든 프레임을 순서대로 전달, 벤치마크용)
+- 반복 재생, 프레임/시간 단위 탐색 (seek)
+- 별도 디코드 스레드가 제한된 큐에 미리 디코드 (read-ahead)
+- 디코드 처리량, 전달/버린 프레임 통계
+
+사용 예시:
+    from replay_camera import ReplayCamera
+
+    camera = ReplayCamera("/data/site-a/morning.mp4", realtime=True, loop=True)
+    camera.start()
+    frame = camera.get_frame()
+    camera.seek_time(120.0)     # 2분 지점으로
+    camera.stop()
+
+    # JPEG 디렉터리, 최대 속도
+    camera = ReplayCamera("/data/site-a/frames/", fps=10, realtime=False, loop=False)
+"""
+
+import glob
+import os
+import threading
+import time
+from queue import Empty, Full, Queue
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+def is_replay_source(source: Optional[str]) -> bool:
+    """로컬 파일/디렉터리/glob 패턴 또는 file:// URL인지 여부"""
+    if not source:
+        return False
+    if source.startswith("file://"):
+        return True
+    if "://" in source:
+        return False
+    return os.path.exists(source) or bool(glob.has_magic(source) and glob.glob(source))
+
+
+def list_images(source: str) -> List[str]:
+    """디렉터리 또는 glob 패턴의 이미지 파일 (이름순)"""
+    if os.path.isdir(source):
+        paths = [os.path.join(source, name) for name in os.listdir(source)]
+    else:
+        paths = glob.glob(source)
+    return sorted(p for p in paths if p.lower().endswith(IMAGE_EXTENSIONS))
+
+
+class ReplayCamera:
+    """
+    영상 파일 / 이미지 시퀀스 재생 소스
+
+    디코드 스레드가 (세대, 프레임 번호, 프레임)을 큐에 넣고, get_frame()은
+    재생 모드에 맞춰 꺼냅니다. seek()는 세대를 올려 큐에 남은 이전 위치의
+    프레임을 무효화합니다.
+    """
+
+    def __init__(
+        self,
+        source: str,
+        fps: Optional[float] = None,
+        realtime: bool = True,
+        loop: bool = True,
+        read_ahead: int = 8,
+        start_frame: int = 0
+    ):
+        """
+        Args:
+            source: 영상 파일, 이미지 디렉터리, glob 패턴 또는 file:// URL
+            fps: 재생 FPS (None이면 영상의 FPS, 이미지 시퀀스는 15)
+            realtime: True면 원본 속도로 재생, False면 최대 속도
+            loop: 끝에 도달하면 처음부터 다시 재생
+            read_ahead: 미리 디코드해 둘 프레임 수
+            start_frame: 시작 프레임 번호
+        """
+        if source.startswith("file://"):
+            source = source[len("file://"):]
+        self.source = source
+        self.realtime = realtime
+        self.loop = loop
+        self.read_ahead = read_ahead
+
+        self.images: List[str] = []
+        self.cap: Optional[cv2.VideoCapture] = None
+        self.is_sequence = os.path.isdir(source) or (glob.has_magic(source) and not os.path.exists(source))
+        self._requested_fps = fps
+        self.source_fps = fps or 15.0
+        self.total_frames = 0
+        self._resolution = (0, 0)
+
+        self.frame_queue: Queue = Queue(maxsize=read_ahead)
+        self.running = False
+        self.finished = False
+        self.thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+        # 디코드 위치 / 탐색
+        self._position = start_frame       # 다음에 디코드할 프레임 번호
+        self._generation = 0
+        self._seek_to: Optional[int] = None
+
+        # 실시간 재생 시각표 (clock_start 시각에 clock_frame 프레임)
+        self._clock_start = 0.0
+        self._clock_frame = start_frame
+        self._prev_index = -1
+        self.last_index = -1
+
+        # 통계
+        self.decoded = 0
+        self.decode_time = 0.0
+        self.delivered = 0
+        self.dropped = 0
+        self.loops = 0
+        self.connection_errors = 0
+
+    # ------------------------------------------------------------------
+    # 열기 / 디코드
+    # ------------------------------------------------------------------
+
+    def _open(self) -> bool:
+        """소스 열기 및 메타데이터 읽기"""
+        if self.is_sequence:
+            self.images = list_images(self.source)
+            if not self.images:
+                print(f"[REPLAY] No images found in {self.source}")
+                return False
+            first = cv2.imread(self.images[0], cv2.IMREAD_COLOR)
+            if first is None:
+                print(f"[REPLAY] Failed to read {self.images[0]}")
+                return False
+            self.total_frames = len(self.images)
+            self._resolution = (first.shape[1], first.shape[0])
+            return True
+
+        self.cap = cv2.VideoCapture(self.source)
+        if not self.cap.isOpened():
+            print(f"[REPLAY] Failed to open {self.source}")
+            self.cap = None
+            return False
+
+        file_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        if self._requested_fps is None and file_fps and file_fps > 0:
+            self.source_fps = float(file_fps)
+        self.total_frames = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        self._resolution = (
+            int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        )
+        if self._position:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, self._position)
+        return True
+
+    def _decode(self, index: int) -> Optional[np.ndarray]:
+        """index번 프레임 디코드 (영상은 현재 위치에서 순서대로)"""
+        if self.is_sequence:
+            if index >= len(self.images):
+                return None
+            return cv2.imread(self.images[index], cv2.IMREAD_COLOR)
+
+        ok, frame = self.cap.read()
+        return frame if ok else None
+
+    def _rewind(self, index: int):
+        """디코드 위치 이동"""
+        self._position = index
+        if self.cap is not None:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+
+    def _decode_loop(self):
+        """디코드 스레드: 큐가 찰 때까지 미리 디코드"""
+        while self.running:
+            with self._lock:
+                if self._seek_to is not None:
+                    self._rewind(self._seek_to)
+                    self._seek_to = None
+                generation = self._generation
+                index = self._position
+
+            start = time.perf_counter()
+            frame = self._decode(index)
+            elapsed = time.perf_counter() - start
+
+            if frame is None:
+                if self.loop and index > 0:
+                    with self._lock:
+                        if self._seek_to is None:
+                            self._rewind(0)
+                    self.loops += 1
+                    continue
+                # 끝 표시 후 탐색 요청이 오면 다시 재생
+                self.finished = True
+                self._put(generation, (generation, -1, None))
+                while self.running and self._seek_to is None:
+                    time.sleep(0.05)
+                if self._seek_to is not None:
+                    self.finished = False
+                continue
+
+            self.decoded += 1
+            self.decode_time += elapsed
+            with self._lock:
+                if generation == self._generation:
+                    self._position = index + 1
+
+            self._put(generation, (generation, index, frame))
+
+    def _put(self, generation: int, item):
+        """큐에 넣기 (가득 차면 대기, 탐색/정지 시 포기)"""
+        while self.running and generation == self._generation:
+            try:
+                self.frame_queue.put(item, timeout=0.1)
+                return
+            except Full:
+                pass
+
+    # ------------------------------------------------------------------
+    # 카메라 인터페이스
+    # ------------------------------------------------------------------
+
+    def start(self) -> bool:
+        """
+        재생 시작
+
+        Returns:
+            소스 열기 성공 여부
+        """
+        if not self._open():
+            self.connection_errors += 1
+            return False
+
+        self.running = True
+        self.finished = False
+        self._clock_start = time.time()
+        self._clock_frame = self._position
+        self.thread = threading.Thread(target=self._decode_loop, name="replay-decode", daemon=True)
+        self.thread.start()
+
+        mode = "realtime" if self.realtime else "max speed"
+        print(f"[REPLAY] Playing {self.source} ({self.total_frames} frames, "
+              f"{self._resolution[0]}x{self._resolution[1]} @ {self.source_fps:.1f} fps, {mode})")
+        return True
+
+    def stop(self):
+        """재생 중지"""
+        self.running = False
+        # 디코드 스레드가 put에서 기다리지 않도록 큐 비우기
+        self._drain()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+        if self.cap is not None:
+            self.cap.release()
+            self.cap = None
+        print("[REPLAY] Replay camera stopped")
+
+    def _drain(self):
+        while True:
+            try:
+                self.frame_queue.get_nowait()
+            except Empty:
+                return
+
+    def get_frame(self, timeout: float = 1.0) -> Optional[np.ndarray]:
+        """
+        다음 프레임
+
+        실시간 모드에서는 시각표상의 시각까지 기다렸다가 반환하며,
+        이미 지난 프레임은 버립니다 (느린 소비자 = 실제 카메라에서 프레임 유실).
+
+        Returns:
+            프레임 또는 None (타임아웃, 재생 끝)
+        """
+        deadline = time.time() + timeout
+        while self.running:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                return None
+            try:
+                item = self.frame_queue.get(timeout=remaining)
+            except Empty:
+                return None
+
+            generation, index, frame = item
+            if generation != self._generation:
+                continue
+            if frame is None:
+                self._requeue(item)             # 끝 표시는 남겨 둠
+                return None
+
+            if self.realtime:
+                now = time.time()
+                if index < self._prev_index:
+                    # 반복 재생으로 처음으로 돌아옴: 시각표를 다시 맞춤
+                    self._clock_start = now
+                    self._clock_frame = index
+                self._prev_index = index
+
+                # 늦은 프레임은 더 새 프레임이 준비되어 있을 때만 버림
+                # (디코드가 원본 속도보다 느리면 늦더라도 전달)
+                due = self._clock_start + (index - self._clock_frame) / self.source_fps
+                if now - due > 1.0 / self.source_fps and not self.frame_queue.empty():
+                    self.dropped += 1
+                    continue
+                if due > now:
+                    if due > deadline:
+                        # 시간 안에 낼 수 없음: 다음 호출에서 다시 사용
+                        time.sleep(max(0.0, deadline - now))
+                        self._requeue(item)
+                        return None
+                    time.sleep(due - now)
+
+            self.last_index = index
+            self.delivered += 1
+            return frame
+        return None
+
+    def _requeue(self, item):
+        """꺼낸 프레임을 큐 앞에 되돌리기"""
+        with self.frame_queue.mutex:
+            self.frame_queue.queue.appendleft(item)
+            self.frame_queue.not_empty.notify()
+
+    def seek(self, frame_index: int):
+        """프레임 번호로 이동 (미리 디코드한 프레임은 버림)"""
+        if self.total_frames:
+            frame_index = max(0, min(frame_index, self.total_frames - 1))
+        with self._lock:
+            self._generation += 1
+            self._seek_to = frame_index
+            self._clock_start = time.time()
+            self._clock_frame = frame_index
+            self._prev_index = -1
+        self._drain()
+
+    def seek_time(self, seconds: float):
+        """재생 시각(초)으로 이동"""
+        self.seek(int(seconds * self.source_fps))
+
+    @property
+    def position(self) -> float:
+        """마지막으로 전달한 프레임의 재생 시각 (초)"""
+        return max(self.last_index, 0) / self.source_fps
+
+    @property
+    def resolution(self) -> Tuple[int, int]:
+        """프레임 해상도"""
+        return self._resolution
+
+    @property
+    def fps(self) -> float:
+        """재생 FPS"""
+        return self.source_fps
+
+    @property
+    def is_connected(self) -> bool:
+        """재생 중 여부"""
+        return self.running and not self.finished
+
+    @property
+    def frames_dropped(self) -> int:
+        """실시간 재생에서 늦어 버린 프레임 수 (RTSPReader와 같은 이름)"""
+        return self.dropped
+
+    @property
+    def decode_fps(self) -> float:
+        """디코드 처리량 (디코드에 쓴 시간 기준 초당 프레임)"""
+        return self.decoded / self.decode_time if self.decode_time > 0 else 0.0
+
+    def get_stats(self) -> dict:
+        """재생 통계 반환"""
+        return {
+            "source": self.source,
+            "mode": "realtime" if self.realtime else "max_speed",
+            "position_frame": self.last_index,
+            "total_frames": self.total_frames,
+            "decoded": self.decoded,
+            "decode_fps": round(self.decode_fps, 1),
+            "avg_decode_ms": round(self.decode_time / self.decoded * 1000, 2) if self.decoded else 0.0,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "loops": self.loops,
+            "read_ahead": self.frame_queue.qsize(),
+            "finished": self.finished
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import sys
+    import tempfile
+
+    print("=== Replay Camera Test ===")
+
+    if len(sys.argv) > 1:
+        source = sys.argv[1]
+    else:
+        source = tempfile.mkdtemp()
+        for i in range(60):
+            image = np.full((480, 640, 3), i * 4, dtype=np.uint8)
+            cv2.imwrite(os.path.join(source, f"{i:05d}.jpg"), image)
+
+    camera = ReplayCamera(source, realtime=False, loop=False)
+    camera.start()
+    start = time.time()
+    count = 0
+    while camera.get_frame(timeout=1.0) is not None:
+        count += 1
+    elapsed = time.time() - start
+    print(f"Read {count} frames in {elapsed:.2f}s ({count / elapsed:.1f} fps)")
+    print(f"Stats: {camera.get_stats()}")
+    camera.stop()
+    print("Test completed!")
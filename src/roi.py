@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+관심 영역 (ROI) 구역 필터
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+PPE 규칙이 적용되는 구역(비계, 작업장 등)을 카메라별 다각형으로 설정하면:
+1. 구역들을 감싸는 가장 작은 사각형만 잘라서 추론 (입력 면적 감소,
+   같은 모델 입력 크기에서 작업 영역의 유효 해상도 증가)
+2. 잘라낸 좌표를 원본 좌표로 되돌린 뒤, 기준점이 구역 밖인 감지 결과는
+   제거 (벡터화된 point-in-polygon)
+
+설정 형식 (JSON):
+    [
+        {"name": "scaffold", "polygon": [[0.1, 0.2], [0.6, 0.2], [0.6, 0.9], [0.1, 0.9]]},
+        {"name": "loading", "polygon": [[1200, 300], [1800, 300], [1800, 1000]]}
+    ]
+    좌표가 모두 0~1이면 정규화 좌표, 아니면 픽셀 좌표로 해석합니다.
+
+사용 예시:
+    from roi import ROIFilter
+
+    roi = ROIFilter.from_config(zones_json)
+    view, rect = roi.crop(frame)            # 복사 없는 뷰
+    detections = detector.detect(view)
+    detections = roi.apply(detections, rect)
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+import numpy as np
+
+from ppe_detector import Detection
+
+
+ANCHORS = ("center", "bottom")
+
+
+@dataclass
+class Zone:
+    """
+    ROI 구역
+
+    Attributes:
+        name: 구역 이름
+        polygon: (N, 2) 꼭짓점 좌표
+        normalized: 좌표가 0~1 정규화 값인지 여부
+    """
+    name: str
+    polygon: np.ndarray
+    normalized: bool = False
+
+    def to_pixels(self, width: int, height: int) -> np.ndarray:
+        """픽셀 좌표 다각형"""
+        if self.normalized:
+            return self.polygon * np.array([width, height], dtype=np.float64)
+        return self.polygon
+
+
+def points_in_polygon(points: np.ndarray, polygon: np.ndarray) -> np.ndarray:
+    """
+    점들이 다각형 안에 있는지 판정 (ray casting, 점 × 변 벡터화)
+
+    Args:
+        points: (M, 2) 점 좌표
+        polygon: (N, 2) 꼭짓점 좌표
+
+    Returns:
+        (M,) bool
+    """
+    if len(points) == 0:
+        return np.zeros(0, dtype=bool)
+
+    x = points[:, 0:1]
+    y = points[:, 1:2]
+    x1 = polygon[None, :, 0]
+    y1 = polygon[None, :, 1]
+    x2 = np.roll(polygon[:, 0], -1)[None, :]
+    y2 = np.roll(polygon[:, 1], -1)[None, :]
+
+    crosses = (y1 > y) != (y2 > y)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_cross = (x2 - x1) * (y - y1) / (y2 - y1) + x1
+    return np.count_nonzero(crosses & (x < x_cross), axis=1) % 2 == 1
+
+
+class ROIFilter:
+    """
+    카메라 한 대의 ROI 구역 집합
+
+    해상도별로 픽셀 다각형과 자르기 사각형을 캐시합니다.
+    """
+
+    def __init__(self, zones: List[Zone], margin: float = 0.05, anchor: str = "center"):
+        """
+        Args:
+            zones: 구역 리스트 (1개 이상)
+            margin: 자르기 사각형 여백 (사각형 크기 대비 비율)
+            anchor: 구역 포함 판정 기준점 ("center": 박스 중심, "bottom": 하단 중앙)
+        """
+        if not zones:
+            raise ValueError("At least one zone is required")
+        if anchor not in ANCHORS:
+            raise ValueError(f"Unknown anchor: {anchor} (expected one of {ANCHORS})")
+
+        self.zones = zones
+        self.margin = margin
+        self.anchor = anchor
+        self._cache: Dict[Tuple[int, int], Tuple[List[np.ndarray], Tuple[int, int, int, int]]] = {}
+
+        # 통계
+        self.kept = 0
+        self.filtered = 0
+        self.crop_ratio = 1.0
+
+    @classmethod
+    def from_config(cls, config: List[dict], margin: float = 0.05, anchor: str = "center") -> "ROIFilter":
+        """
+        JSON 설정에서 생성
+
+        Args:
+            config: [{"name": str, "polygon": [[x, y], ...]}, ...]
+        """
+        zones = []
+        for i, zone in enumerate(config):
+            polygon = np.asarray(zone["polygon"], dtype=np.float64)
+            if polygon.ndim != 2 or polygon.shape[1] != 2 or len(polygon) < 3:
+                raise ValueError(f"Zone polygon needs at least 3 [x, y] points: {zone}")
+            zones.append(Zone(
+                name=str(zone.get("name", f"zone{i + 1}")),
+                polygon=polygon,
+                normalized=bool(polygon.max() <= 1.0)
+            ))
+        return cls(zones, margin=margin, anchor=anchor)
+
+    def _geometry(self, width: int, height: int):
+        """해상도별 픽셀 다각형과 자르기 사각형 (캐시)"""
+        cached = self._cache.get((width, height))
+        if cached is None:
+            polygons = [zone.to_pixels(width, height) for zone in self.zones]
+            points = np.concatenate(polygons)
+            x1, y1 = points.min(axis=0)
+            x2, y2 = points.max(axis=0)
+            pad_x = (x2 - x1) * self.margin
+            pad_y = (y2 - y1) * self.margin
+            rect = (
+                int(max(0, np.floor(x1 - pad_x))),
+                int(max(0, np.floor(y1 - pad_y))),
+                int(min(width, np.ceil(x2 + pad_x))),
+                int(min(height, np.ceil(y2 + pad_y)))
+            )
+            cached = (polygons, rect)
+            self._cache[(width, height)] = cached
+            self.crop_ratio = (rect[2] - rect[0]) * (rect[3] - rect[1]) / float(width * height)
+        return cached
+
+    def crop_rect(self, frame_shape: Tuple[int, ...]) -> Tuple[int, int, int, int]:
+        """구역들을 감싸는 자르기 사각형 (x1, y1, x2, y2)"""
+        return self._geometry(frame_shape[1], frame_shape[0])[1]
+
+    def crop(self, frame: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+        """
+        프레임에서 구역 사각형 잘라내기 (복사 없는 뷰)
+
+        Returns:
+            (잘라낸 뷰, 원본 기준 사각형)
+        """
+        x1, y1, x2, y2 = rect = self.crop_rect(frame.shape)
+        return frame[y1:y2, x1:x2], rect
+
+    def contains(self, points: np.ndarray, frame_shape: Tuple[int, ...]) -> np.ndarray:
+        """
+        점들이 어느 구역에든 포함되는지 판정
+
+        Args:
+            points: (M, 2) 원본 좌표
+            frame_shape: 원본 프레임 shape
+
+        Returns:
+            (M,) bool
+        """
+        polygons, _ = self._geometry(frame_shape[1], frame_shape[0])
+        inside = np.zeros(len(points), dtype=bool)
+        for polygon in polygons:
+            inside |= points_in_polygon(points, polygon)
+        return inside
+
+    def apply(
+        self,
+        detections: List[Detection],
+        rect: Tuple[int, int, int, int],
+        frame_shape: Tuple[int, ...]
+    ) -> List[Detection]:
+        """
+        잘라낸 좌표를 원본 좌표로 되돌리고 구역 밖 감지 결과 제거
+
+        Args:
+            detections: 잘라낸 뷰 기준 감지 결과
+            rect: crop()이 반환한 사각형
+            frame_shape: 원본 프레임 shape
+
+        Returns:
+            구역 안의 감지 결과 (bbox는 원본 좌표)
+        """
+        if not detections:
+            return detections
+
+        ox, oy = rect[0], rect[1]
+        boxes = np.array([d.bbox for d in detections], dtype=np.float64)
+        boxes += (ox, oy, ox, oy)
+
+        if self.anchor == "bottom":
+            anchors = np.stack([(boxes[:, 0] + boxes[:, 2]) / 2, boxes[:, 3]], axis=1)
+        else:
+            anchors = np.stack([(boxes[:, 0] + boxes[:, 2]) / 2, (boxes[:, 1] + boxes[:, 3]) / 2], axis=1)
+        inside = self.contains(anchors, frame_shape)
+
+        kept = []
+        for det, box, keep in zip(detections, boxes.astype(int), inside):
+            if keep:
+                det.bbox = tuple(int(v) for v in box)
+                kept.append(det)
+
+        self.kept += len(kept)
+        self.filtered += len(detections) - len(kept)
+        return kept
+
+    def get_stats(self) -> dict:
+        """ROI 통계 반환"""
+        return {
+            "zones": [zone.name for zone in self.zones],
+            "crop_area_ratio": round(self.crop_ratio, 3),
+            "kept": self.kept,
+            "filtered": self.filtered
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import time
+
+    print("=== ROI Filter Test ===")
+
+    roi = ROIFilter.from_config([
+        {"name": "scaffold", "polygon": [[0.1, 0.2], [0.5, 0.2], [0.5, 0.9], [0.1, 0.9]]},
+        {"name": "ramp", "polygon": [[0.6, 0.5], [0.9, 0.5], [0.75, 0.95]]}
+    ])
+    frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+    view, rect = roi.crop(frame)
+    print(f"Crop rect: {rect}, view: {view.shape}, area ratio: {roi.get_stats()['crop_area_ratio']}")
+
+    rng = np.random.default_rng(0)
+    points = rng.uniform([0, 0], [1920, 1080], (1000, 2))
+    start = time.perf_counter()
+    inside = roi.contains(points, frame.shape)
+    print(f"contains(): 1000 points in {(time.perf_counter() - start) * 1000:.3f} ms, inside={inside.sum()}")
+    print("Test completed!")
@@ -12,6 +12,9 @@ Orange Pi 5 + Greengrass PPE Detection 시스템용
     # 또는 시뮬레이션 카메라 (테스트용)
     camera = SimulatedCamera(width=640, height=480, fps=30)
 
+    # 또는 녹화 영상 재생 (replay_camera.ReplayCamera)
+    camera = create_camera("/data/site-a/morning.mp4")
+
     camera.start()
     frame = camera.get_frame()
     camera.stop()
@@ -20,28 +23,43 @@ Orange Pi 5 + Greengrass PPE Detection 시스템용
 import cv2
 import threading
 import time
-from queue import Queue
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 import numpy as np
 
+from frame_ring import FrameRing, FrameRef
+import gst_pipeline
+from gst_pipeline import GstCapture, GstPipelineConfig, build_pipeline
+from replay_camera import ReplayCamera, is_replay_source
+
 
 class RTSPReader:
     """
-    RTSP 스트림을 읽어 프레임 큐에 저장하는 클래스
+    RTSP 스트림을 읽어 프레임 링 버퍼에 저장하는 클래스
 
     특징:
     - 별도 스레드에서 프레임 읽기 (블로킹 방지)
     - 자동 재연결 지원
-    - 프레임 버퍼링으로 최신 프레임 제공
-    - GStreamer 하드웨어 디코딩 지원 (Orange Pi 5)
+    - 미리 할당된 링 버퍼에 직접 디코딩 (정상 상태에서 프레임 할당 없음)
+    - 최신 프레임 우선 (소비되지 못한 오래된 프레임은 버퍼 재사용)
+    - GStreamer 하드웨어 디코딩 지원 (Orange Pi 5, H.264/H.265)
+    - 파이프라인 안에서 축소 (output_width, 디코딩 후 CPU 복사/변환량 감소)
+
+    FFmpeg 대체 경로와 같은 형식을 유지하도록 항상 BGR을 출력합니다.
+    RGB 출력/스냅샷 분기는 create_camera(output_format="RGB" 또는
+    snapshot=True)가 만드는 GstCapture를 사용하세요.
     """
 
+    output_format = "BGR"
+
     def __init__(
         self,
         rtsp_url: str,
         queue_size: int = 2,
         reconnect_delay: float = 5.0,
-        use_gstreamer: bool = True
+        use_gstreamer: bool = True,
+        ring_size: int = 0,
+        codec: str = "h264",
+        output_width: int = 0
     ):
         """
         Args:
@@ -49,23 +67,32 @@ class RTSPReader:
             queue_size: 프레임 버퍼 크기 (작을수록 지연 감소)
             reconnect_delay: 연결 실패 시 재시도 대기 시간 (초)
             use_gstreamer: GStreamer 하드웨어 디코딩 사용 여부
+            ring_size: 링 버퍼 슬롯 수 (0이면 queue_size + 2:
+                       대기 프레임 + 디코딩 중 1 + 소비자 보유 1)
+            codec: 스트림 코덱 ("h264", "h265", "auto")
+            output_width: GStreamer 출력 너비 (0이면 원본 해상도, 높이는 비율 유지)
         """
         self.rtsp_url = rtsp_url
         self.queue_size = queue_size
         self.reconnect_delay = reconnect_delay
         self.use_gstreamer = use_gstreamer
+        self.codec = codec
+        self.output_width = output_width
 
-        self.frame_queue: Queue = Queue(maxsize=queue_size)
+        self.ring = FrameRing(size=ring_size or queue_size + 2, queue_size=queue_size)
         self.cap: Optional[cv2.VideoCapture] = None
         self.running = False
         self.thread: Optional[threading.Thread] = None
-        self.lock = threading.Lock()
+        self.lock = threading.Lock()        # cap 교체/해제 보호 (read 중에는 잡지 않음)
+        self._resolution: Tuple[int, int] = (0, 0)
+        self._connected = False
 
         # 통계
         self.frame_count = 0
         self.fps = 0.0
         self.last_fps_time = time.time()
-        self.connection_errors = 0
+        self.connection_errors = 0  # 연속 연결 실패 수 (연결되면 0)
+        self.reconnects = 0         # 누적 재연결 시도 수
 
     def start(self) -> bool:
         """
@@ -95,22 +122,19 @@ class RTSPReader:
             self.thread.join(timeout=5.0)
             self.thread = None
 
-        if self.cap:
-            self.cap.release()
-            self.cap = None
+        self._set_cap(None)
 
-        # 큐 비우기
-        while not self.frame_queue.empty():
-            try:
-                self.frame_queue.get_nowait()
-            except:
-                pass
+        # 대기 프레임 비우기 (소비자가 잡은 프레임은 release 시 반환)
+        self.ring.clear()
 
         print("[RTSP] Stopped")
 
     def get_frame(self, timeout: float = 1.0) -> Optional[np.ndarray]:
         """
-        큐에서 프레임 가져오기
+        프레임 가져오기 (복사본)
+
+        반환된 배열은 호출자 소유이므로 큐에 넣거나 오래 보관해도 됩니다.
+        복사 없이 처리하려면 get_frame_ref()를 사용하세요.
 
         Args:
             timeout: 대기 시간 (초)
@@ -118,89 +142,165 @@ class RTSPReader:
         Returns:
             프레임 (BGR numpy array) 또는 None
         """
-        try:
-            frame = self.frame_queue.get(timeout=timeout)
-            return frame
-        except:
+        ref = self.ring.get(timeout=timeout)
+        if ref is None:
+            return None
+        with ref:
+            return ref.copy()
+
+    def read_latest(
+        self,
+        timeout: float = 1.0,
+        after_seq: int = 0
+    ) -> Optional[Tuple[np.ndarray, int, float]]:
+        """
+        가장 최근 프레임 가져오기 (메일박스)
+
+        더 오래된 대기 프레임은 버립니다. after_seq를 주면 그보다 새
+        프레임이 디코딩될 때까지 기다립니다.
+
+        Args:
+            timeout: 대기 시간 (초)
+            after_seq: 이미 처리한 마지막 시퀀스 번호
+
+        Returns:
+            (프레임 복사본, 시퀀스 번호, 캡처 시각 time.time()) 또는 None
+            시퀀스 번호가 건너뛴 만큼 프레임이 버려진 것입니다.
+        """
+        ref = self.ring.get_latest(timeout=timeout, after_seq=after_seq)
+        if ref is None:
             return None
+        with ref:
+            return ref.copy(), ref.seq, ref.timestamp
+
+    def get_latest_ref(self, timeout: float = 1.0, after_seq: int = 0) -> Optional[FrameRef]:
+        """read_latest()의 복사 없는 버전 (사용 후 release 필요)"""
+        return self.ring.get_latest(timeout=timeout, after_seq=after_seq)
+
+    def get_frame_ref(self, timeout: float = 1.0) -> Optional[FrameRef]:
+        """
+        링 버퍼 프레임 참조 가져오기 (복사 없음)
+
+        사용 후 반드시 release()해야 버퍼가 재사용됩니다.
+
+        Args:
+            timeout: 대기 시간 (초)
+
+        Returns:
+            FrameRef 또는 None
+        """
+        return self.ring.get(timeout=timeout)
 
     def _connect(self) -> bool:
-        """RTSP 스트림 연결"""
+        """
+        RTSP 스트림 연결
+
+        연결(수 초가 걸릴 수 있음)은 lock 밖에서 하고 완성된 캡처 객체만
+        lock 안에서 교체하므로 상태 조회가 연결 대기에 막히지 않습니다.
+        """
+        cap = None
         try:
-            with self.lock:
-                if self.cap is not None:
-                    self.cap.release()
-
-                # GStreamer 파이프라인 (RK3588 하드웨어 디코딩)
-                if self.use_gstreamer:
-                    gst_pipeline = self._build_gstreamer_pipeline()
-                    self.cap = cv2.VideoCapture(gst_pipeline, cv2.CAP_GSTREAMER)
-
-                    if not self.cap.isOpened():
-                        print("[RTSP] GStreamer failed, falling back to FFmpeg")
-                        self.cap = cv2.VideoCapture(self.rtsp_url)
-                else:
-                    self.cap = cv2.VideoCapture(self.rtsp_url)
-
-                if not self.cap.isOpened():
-                    print(f"[RTSP] Failed to connect to {self.rtsp_url}")
-                    self.connection_errors += 1
-                    return False
-
-                # 버퍼 크기 최소화 (지연 감소)
-                self.cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-
-                self.connection_errors = 0
-                print(f"[RTSP] Connected to {self.rtsp_url}")
-                print(f"[RTSP] Resolution: {self.resolution}")
-                return True
+            # GStreamer 파이프라인 (RK3588 하드웨어 디코딩)
+            if self.use_gstreamer:
+                gst_pipeline = self._build_gstreamer_pipeline()
+                cap = cv2.VideoCapture(gst_pipeline, cv2.CAP_GSTREAMER)
+
+                if not cap.isOpened():
+                    print("[RTSP] GStreamer failed, falling back to FFmpeg")
+                    cap = cv2.VideoCapture(self.rtsp_url)
+            else:
+                cap = cv2.VideoCapture(self.rtsp_url)
+
+            if not cap.isOpened():
+                print(f"[RTSP] Failed to connect to {self.rtsp_url}")
+                self.connection_errors += 1
+                return False
+
+            # 버퍼 크기 최소화 (지연 감소)
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+            # 해상도 캐시 및 링 버퍼 미리 할당
+            w = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            h = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if w > 0 and h > 0:
+                self.ring.allocate((h, w, 3))
+
+            self._set_cap(cap, (w, h))
+            self.connection_errors = 0
+            print(f"[RTSP] Connected to {self.rtsp_url}")
+            print(f"[RTSP] Resolution: {(w, h)}")
+            return True
 
         except Exception as e:
             print(f"[RTSP] Connection error: {e}")
+            if cap is not None:
+                cap.release()
             self.connection_errors += 1
             return False
 
+    def _set_cap(self, cap: Optional[cv2.VideoCapture], resolution: Tuple[int, int] = (0, 0)):
+        """캡처 객체 교체 (이전 객체는 해제)"""
+        with self.lock:
+            old, self.cap = self.cap, cap
+            self._resolution = resolution
+            self._connected = cap is not None
+        if old is not None and old is not cap:
+            old.release()
+
     def _build_gstreamer_pipeline(self) -> str:
-        """RK3588용 GStreamer 파이프라인 생성"""
-        # MPP (Media Process Platform) 하드웨어 디코더 사용
-        pipeline = (
-            f"rtspsrc location={self.rtsp_url} latency=0 ! "
-            f"rtph264depay ! h264parse ! "
-            f"mppvideodec ! "
-            f"videoconvert ! video/x-raw,format=BGR ! "
-            f"appsink drop=1 sync=0"
-        )
-        return pipeline
+        """
+        GStreamer 파이프라인 생성
+
+        RK3588에서는 MPP (Media Process Platform) 하드웨어 디코더를 사용합니다.
+        OpenCV는 appsink 하나만 읽으므로 BGR 단일 출력입니다
+        (스냅샷 분기는 gst_pipeline.GstCapture).
+        """
+        return build_pipeline(GstPipelineConfig(
+            source=self.rtsp_url,
+            codec=self.codec,
+            output_format="BGR",
+            output_width=self.output_width or None
+        ))
 
     def _read_loop(self):
-        """프레임 읽기 루프 (별도 스레드에서 실행)"""
+        """
+        프레임 읽기 루프 (별도 스레드에서 실행)
+
+        캡처 객체는 이 스레드만 읽으므로 블로킹되는 read() 동안
+        lock을 잡지 않습니다.
+        """
         while self.running:
             try:
-                with self.lock:
-                    if self.cap is None or not self.cap.isOpened():
-                        pass
-                    else:
-                        ret, frame = self.cap.read()
-
-                        if not ret:
-                            print("[RTSP] Frame read failed")
-                            self.cap.release()
-                            self.cap = None
+                cap = self.cap
+                if cap is not None:
+                    # 빈 슬롯 버퍼에 직접 디코딩 (해상도가 바뀌면 OpenCV가 새로 할당)
+                    slot = self.ring.claim()
+                    try:
+                        if slot.buffer is not None:
+                            ret, frame = cap.read(image=slot.buffer)
                         else:
-                            # 오래된 프레임 버리기
-                            if self.frame_queue.full():
-                                try:
-                                    self.frame_queue.get_nowait()
-                                except:
-                                    pass
+                            ret, frame = cap.read()
+                    except Exception:
+                        self.ring.abort(slot)
+                        raise
+
+                    if ret:
+                        # 큐가 가득 차면 오래된 프레임은 링에서 버려짐
+                        self.ring.commit(slot, frame)
+                        self._update_fps()
+                        continue
 
-                            self.frame_queue.put(frame)
-                            self._update_fps()
-                            continue
+                    self.ring.abort(slot)
+                    print("[RTSP] Frame read failed")
+                    self._set_cap(None)
+
+                if not self.running:
+                    break
 
                 # 연결 끊긴 경우 재연결
                 print(f"[RTSP] Reconnecting in {self.reconnect_delay}s...")
                 time.sleep(self.reconnect_delay)
+                self.reconnects += 1
                 self._connect()
 
             except Exception as e:
@@ -220,19 +320,31 @@ class RTSPReader:
 
     @property
     def resolution(self) -> Tuple[int, int]:
-        """스트림 해상도 반환"""
-        with self.lock:
-            if self.cap and self.cap.isOpened():
-                w = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-                h = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-                return (w, h)
-        return (0, 0)
+        """스트림 해상도 반환 (연결 시 캐시한 값, 디코딩과 경합하지 않음)"""
+        return self._resolution
 
     @property
     def is_connected(self) -> bool:
-        """연결 상태 확인"""
-        with self.lock:
-            return self.cap is not None and self.cap.isOpened()
+        """연결 상태 확인 (디코딩과 경합하지 않음)"""
+        return self._connected
+
+    @property
+    def frames_dropped(self) -> int:
+        """처리되지 못하고 버려진 프레임 수"""
+        return self.ring.dropped
+
+    def get_stats(self) -> dict:
+        """리더 통계 반환"""
+        return {
+            "connected": self._connected,
+            "resolution": self._resolution,
+            "fps": round(self.fps, 1),
+            "reconnects": self.reconnects,
+            "connection_errors": self.connection_errors,
+            "frames_dropped": self.ring.dropped,
+            "last_seq": self.ring.last_seq,
+            "ring": self.ring.get_stats()
+        }
 
 
 class SimulatedCamera:
@@ -240,25 +352,39 @@ class SimulatedCamera:
     RTSP 카메라 시뮬레이션 (테스트 및 개발용)
 
     실제 카메라 없이 PPE 감지 시스템을 테스트할 수 있습니다.
-    랜덤한 패턴의 프레임을 생성합니다.
+
+    정적인 장면(배경, 작업자 영역)은 해상도별로 한 번만 그려 두고
+    매 프레임에는 타임스탬프/프레임 번호 오버레이만 갱신합니다.
+    - fps <= 0: FPS 제한 없이 최대 속도로 생성 (파이프라인 부하 테스트용)
+    - pool_size > 0: 미리 할당한 출력 버퍼를 순환 재사용 (할당/복사 없음)
+      반환된 프레임은 pool_size번 뒤의 get_frame에서 덮어써지므로
+      프레임을 보관하는 소비자(알림 큐, S3 업로드 큐)가 있으면 0을 사용
     """
 
+    # 프레임 번호 오버레이 영역 계산용 최대 길이 문자열
+    _FRAME_TEXT_SAMPLE = "Frame: 000000000000"
+    _TITLE_TEXT_SAMPLE = "SIMULATED CAMERA - 0000-00-00 00:00:00"
+
     def __init__(
         self,
         width: int = 640,
         height: int = 480,
-        fps: int = 30
+        fps: int = 30,
+        pool_size: int = 0
     ):
         """
         Args:
             width: 프레임 너비
             height: 프레임 높이
-            fps: 목표 프레임 레이트
+            fps: 목표 프레임 레이트 (0 이하면 제한 없음)
+            pool_size: 재사용할 출력 버퍼 수 (0이면 매 프레임 새 배열)
         """
         self.width = width
         self.height = height
         self.target_fps = fps
-        self.frame_delay = 1.0 / fps
+        self.unthrottled = fps <= 0
+        self.frame_delay = 0.0 if self.unthrottled else 1.0 / fps
+        self.pool_size = max(0, int(pool_size))
         self.running = False
         self.last_frame_time = time.time()
         self.frame_count = 0
@@ -269,11 +395,30 @@ class SimulatedCamera:
             (350, 100, 500, 400),
         ]
 
+        # 정적 장면 템플릿 / 출력 버퍼 풀 (첫 프레임에서 생성)
+        self._template: Optional[np.ndarray] = None
+        self._pool: List[np.ndarray] = []
+        self._pool_index = 0
+        self._overlay_rects: List[Tuple[int, int, int, int]] = []
+
+        # 타임스탬프 문자열 캐시 (초가 바뀔 때만 strftime)
+        self._timestamp_second = -1
+        self._title_text = ""
+
+        # 통계
+        self.render_time = 0.0
+        self.measured_fps = 0.0
+        self._fps_frames = 0
+        self._fps_time = time.time()
+
     def start(self) -> bool:
         """시뮬레이션 시작"""
         self.running = True
         self.last_frame_time = time.time()
-        print(f"[SIM] Simulated camera started ({self.width}x{self.height}@{self.target_fps}fps)")
+        self._fps_frames = 0
+        self._fps_time = self.last_frame_time
+        rate = "unthrottled" if self.unthrottled else f"{self.target_fps}fps"
+        print(f"[SIM] Simulated camera started ({self.width}x{self.height}@{rate})")
         return True
 
     def stop(self):
@@ -292,27 +437,25 @@ class SimulatedCamera:
             return None
 
         # FPS 제한
-        elapsed = time.time() - self.last_frame_time
-        if elapsed < self.frame_delay:
-            time.sleep(self.frame_delay - elapsed)
+        if not self.unthrottled:
+            elapsed = time.time() - self.last_frame_time
+            if elapsed < self.frame_delay:
+                time.sleep(self.frame_delay - elapsed)
 
         self.last_frame_time = time.time()
         self.frame_count += 1
 
-        # 배경 프레임 생성
+        start = time.perf_counter()
         frame = self._create_frame()
+        self.render_time += time.perf_counter() - start
 
+        self._update_fps(self.last_frame_time)
         return frame
 
-    def _create_frame(self) -> np.ndarray:
-        """시뮬레이션 프레임 생성"""
-        # 그라데이션 배경
-        frame = np.zeros((self.height, self.width, 3), dtype=np.uint8)
-
-        # 배경 색상 (약간의 노이즈 추가)
-        frame[:, :] = [40 + np.random.randint(-5, 5),
-                       40 + np.random.randint(-5, 5),
-                       50 + np.random.randint(-5, 5)]
+    def _render_template(self) -> np.ndarray:
+        """정적 장면 (배경, 작업자 영역) 렌더링"""
+        frame = np.empty((self.height, self.width, 3), dtype=np.uint8)
+        frame[:, :] = (40, 40, 50)
 
         # 시뮬레이션된 사람 영역 그리기
         for i, (x1, y1, x2, y2) in enumerate(self.person_regions):
@@ -331,11 +474,49 @@ class SimulatedCamera:
             cv2.rectangle(frame, (x1 + 20, body_top), (x2 - 20, body_bottom),
                          (150, 140, 130), -1)
 
+        return frame
+
+    def _text_rect(self, text: str, origin: Tuple[int, int], scale: float) -> Tuple[int, int, int, int]:
+        """putText가 덮는 영역 (프레임 범위로 자름)"""
+        (w, h), baseline = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 1)
+        x, y = origin
+        x1, y1 = max(0, x - 2), max(0, y - h - 2)
+        x2, y2 = min(self.width, x + w + 2), min(self.height, y + baseline + 2)
+        return (x1, y1, x2, y2)
+
+    def _ensure_template(self):
+        """템플릿과 버퍼 풀 준비"""
+        if self._template is not None:
+            return
+        self._template = self._render_template()
+        self._overlay_rects = [
+            self._text_rect(self._TITLE_TEXT_SAMPLE, (10, 25), 0.6),
+            self._text_rect(self._FRAME_TEXT_SAMPLE, (10, self.height - 15), 0.5),
+        ]
+        self._pool = [self._template.copy() for _ in range(self.pool_size)]
+        self._pool_index = 0
+
+    def _create_frame(self) -> np.ndarray:
+        """시뮬레이션 프레임 생성 (템플릿 + 동적 오버레이)"""
+        self._ensure_template()
+
+        if self._pool:
+            # 이전 오버레이 영역만 템플릿으로 복원
+            frame = self._pool[self._pool_index]
+            self._pool_index = (self._pool_index + 1) % len(self._pool)
+            for x1, y1, x2, y2 in self._overlay_rects:
+                frame[y1:y2, x1:x2] = self._template[y1:y2, x1:x2]
+        else:
+            frame = self._template.copy()
+
         # 타임스탬프 추가
-        timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+        now = int(time.time())
+        if now != self._timestamp_second:
+            self._timestamp_second = now
+            self._title_text = f"SIMULATED CAMERA - {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(now))}"
         cv2.putText(
             frame,
-            f"SIMULATED CAMERA - {timestamp}",
+            self._title_text,
             (10, 25),
             cv2.FONT_HERSHEY_SIMPLEX,
             0.6,
@@ -356,6 +537,15 @@ class SimulatedCamera:
 
         return frame
 
+    def _update_fps(self, now: float):
+        """실제 생성 FPS 계산"""
+        self._fps_frames += 1
+        elapsed = now - self._fps_time
+        if elapsed >= 1.0:
+            self.measured_fps = self._fps_frames / elapsed
+            self._fps_frames = 0
+            self._fps_time = now
+
     @property
     def resolution(self) -> Tuple[int, int]:
         """해상도 반환"""
@@ -363,7 +553,9 @@ class SimulatedCamera:
 
     @property
     def fps(self) -> float:
-        """현재 FPS"""
+        """현재 FPS (제한 없음 모드는 실제 생성 속도)"""
+        if self.unthrottled:
+            return self.measured_fps
         return self.target_fps
 
     @property
@@ -371,6 +563,16 @@ class SimulatedCamera:
         """연결 상태"""
         return self.running
 
+    def get_stats(self) -> dict:
+        """시뮬레이션 통계 반환"""
+        return {
+            "frames": self.frame_count,
+            "fps": round(self.fps, 1),
+            "unthrottled": self.unthrottled,
+            "pool_size": self.pool_size,
+            "avg_render_ms": round(self.render_time / self.frame_count * 1000, 3) if self.frame_count else 0.0
+        }
+
 
 def create_camera(
     rtsp_url: Optional[str] = None,
@@ -380,26 +582,59 @@ def create_camera(
     """
     카메라 인스턴스 생성 팩토리 함수
 
+    로컬 영상 파일/이미지 디렉터리/file:// URL은 시뮬레이션 모드에서도
+    ReplayCamera로 재생합니다.
+
     Args:
-        rtsp_url: RTSP URL (None이면 시뮬레이션)
+        rtsp_url: RTSP URL 또는 재생할 파일/디렉터리 (None이면 시뮬레이션)
         use_simulation: 강제 시뮬레이션 모드
-        **kwargs: 추가 설정
+        **kwargs: 추가 설정 (시뮬레이션: width, height, fps, pool_size /
+                  RTSP: queue_size, reconnect_delay, codec, output_width,
+                  output_format, snapshot / 재생: replay_fps, realtime, loop)
+
+    RTSP에서 output_format="RGB" 또는 snapshot=True면 PyGObject로 파이프라인을
+    직접 실행하는 GstCapture를 반환합니다 (모델 분기는 파이프라인 안에서
+    색 변환, 위반 이미지는 전체 해상도 BGR 스냅샷). PyGObject가 없으면
+    BGR을 출력하는 RTSPReader로 대체합니다.
 
     Returns:
-        RTSPReader 또는 SimulatedCamera 인스턴스
+        RTSPReader, GstCapture, ReplayCamera 또는 SimulatedCamera 인스턴스
     """
+    if is_replay_source(rtsp_url):
+        return ReplayCamera(
+            rtsp_url,
+            fps=kwargs.get('replay_fps'),
+            realtime=kwargs.get('realtime', True),
+            loop=kwargs.get('loop', True)
+        )
     if use_simulation or not rtsp_url:
         width = kwargs.get('width', 640)
         height = kwargs.get('height', 480)
         fps = kwargs.get('fps', 30)
-        return SimulatedCamera(width=width, height=height, fps=fps)
+        pool_size = kwargs.get('pool_size', 0)
+        return SimulatedCamera(width=width, height=height, fps=fps, pool_size=pool_size)
     else:
-        queue_size = kwargs.get('queue_size', 2)
+        output_format = kwargs.get('output_format', 'BGR')
+        snapshot = kwargs.get('snapshot', False)
         reconnect_delay = kwargs.get('reconnect_delay', 5.0)
+        if output_format != "BGR" or snapshot:
+            if gst_pipeline.HAS_GST:
+                return GstCapture(GstPipelineConfig(
+                    source=rtsp_url,
+                    codec=kwargs.get('codec', 'h264'),
+                    output_format=output_format,
+                    output_width=kwargs.get('output_width', 0) or None,
+                    snapshot=snapshot
+                ), reconnect_delay=reconnect_delay)
+            print("[RTSP] PyGObject not available, using BGR capture without snapshot branch")
+
+        queue_size = kwargs.get('queue_size', 2)
         return RTSPReader(
             rtsp_url=rtsp_url,
             queue_size=queue_size,
-            reconnect_delay=reconnect_delay
+            reconnect_delay=reconnect_delay,
+            codec=kwargs.get('codec', 'h264'),
+            output_width=kwargs.get('output_width', 0)
         )
 
 
@@ -418,4 +653,13 @@ if __name__ == "__main__":
             print(f"  Frame {i+1}: shape={frame.shape}")
 
     camera.stop()
+
+    # 제한 없음 모드 (부하 테스트용 4K 생성 속도)
+    camera = SimulatedCamera(width=3840, height=2160, fps=0, pool_size=4)
+    camera.start()
+    start = time.time()
+    for _ in range(200):
+        camera.get_frame()
+    print(f"  4K unthrottled: {200 / (time.time() - start):.0f} fps, {camera.get_stats()}")
+    camera.stop()
     print("Test completed!")
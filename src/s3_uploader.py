@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+비동기 S3 업로더
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+위반 이미지의 JPEG 인코딩과 put_object 호출을 백그라운드 워커 스레드에서
+수행합니다. submit()은 기다리지 않고 업로드될 S3 키를 바로 돌려주므로
+알림 메시지에 이미지 URL을 넣을 수 있습니다.
+
+특징:
+- 크기가 제한된 작업 큐 (가득 차면 새 작업을 버림)
+- 하나의 boto3 클라이언트를 공유하는 워커 스레드 풀
+- 지수 백오프 재시도
+- 큐 깊이, 업로드 지연, 실패 횟수 통계
+
+사용 예시:
+    import boto3
+    from s3_uploader import AsyncS3Uploader
+
+    uploader = AsyncS3Uploader(boto3.client("s3"), bucket="my-bucket")
+    uploader.start()
+
+    key = uploader.make_key("violations", "orangepi5-core-001")
+    url = uploader.submit(key, frame=frame)   # 즉시 반환
+
+    uploader.stop()
+"""
+
+import datetime
+import random
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+import cv2
+import numpy as np
+
+from pipeline import StageQueue
+
+
+def encode_jpeg(frame: np.ndarray, quality: int = 85) -> Optional[bytes]:
+    """
+    JPEG 인코딩
+
+    Args:
+        frame: BGR 이미지
+        quality: JPEG 품질 (0~100)
+
+    Returns:
+        인코딩된 바이트 (실패 시 None)
+    """
+    ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    if not ok:
+        return None
+    return buffer.tobytes()
+
+
+@dataclass
+class UploadJob:
+    """
+    업로드 작업
+
+    Attributes:
+        key: S3 객체 키
+        frame: 인코딩할 이미지 (data가 없을 때 사용)
+        data: 이미 인코딩된 바이트
+        content_type: Content-Type
+        metadata: S3 사용자 메타데이터
+        submit_time: 제출 시각
+        attempts: 시도 횟수
+    """
+    key: str
+    frame: Optional[np.ndarray] = None
+    data: Optional[bytes] = None
+    content_type: str = "image/jpeg"
+    metadata: Dict[str, str] = field(default_factory=dict)
+    submit_time: float = 0.0
+    attempts: int = 0
+
+
+class AsyncS3Uploader:
+    """
+    백그라운드 S3 업로드 서비스
+
+    boto3 클라이언트는 스레드 안전하므로 모든 워커가 하나를 공유합니다.
+    """
+
+    def __init__(
+        self,
+        s3_client: Any,
+        bucket: str,
+        num_workers: int = 2,
+        queue_size: int = 64,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 8.0,
+        jpeg_quality: int = 85,
+        on_failure: Optional[Callable[[UploadJob, Exception], None]] = None
+    ):
+        """
+        Args:
+            s3_client: boto3 S3 클라이언트 (put_object 필요)
+            bucket: S3 버킷 이름
+            num_workers: 업로드 워커 스레드 수
+            queue_size: 대기 작업 최대 수
+            max_retries: 실패 시 재시도 횟수
+            backoff_base: 첫 재시도 대기 시간 (초, 이후 2배씩 증가)
+            backoff_max: 재시도 대기 시간 상한 (초)
+            jpeg_quality: JPEG 품질
+            on_failure: 재시도까지 모두 실패한 작업 콜백
+        """
+        self.s3_client = s3_client
+        self.bucket = bucket
+        self.num_workers = num_workers
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.jpeg_quality = jpeg_quality
+        self.on_failure = on_failure
+
+        self.queue = StageQueue("s3_upload", maxsize=queue_size, drop_policy="drop_newest")
+        self.running = False
+        self.threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._active = 0
+        self._resume = threading.Event()
+        self._resume.set()
+
+        # 통계
+        self.submitted = 0
+        self.uploaded = 0
+        self.failed = 0
+        self.retries = 0
+        self.bytes_uploaded = 0
+        self.latencies: deque = deque(maxlen=256)
+        self.last_error: Optional[str] = None
+        self.last_success_time = 0.0
+        self.last_failure_time = 0.0
+
+    def start(self):
+        """워커 스레드 시작"""
+        if self.running:
+            return
+        self.running = True
+        for i in range(self.num_workers):
+            thread = threading.Thread(target=self._worker, name=f"s3-upload-{i}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+        print(f"[S3] Async uploader started ({self.num_workers} workers)")
+
+    def pause(self):
+        """
+        업로드 보류 (과부하 시)
+
+        새 작업은 큐에 쌓이기만 하고 JPEG 인코딩/업로드는 resume()까지
+        미룹니다. 큐가 가득 차면 submit()이 None을 반환합니다.
+        """
+        if self._resume.is_set():
+            self._resume.clear()
+            print(f"[S3] Uploads paused ({len(self.queue)} queued)")
+
+    def resume(self):
+        """보류한 업로드 재개"""
+        if not self._resume.is_set():
+            self._resume.set()
+            print(f"[S3] Uploads resumed ({len(self.queue)} queued)")
+
+    @property
+    def paused(self) -> bool:
+        return not self._resume.is_set()
+
+    def stop(self, timeout: float = 10.0):
+        """
+        남은 작업을 처리한 후 워커 종료 (보류 중이면 재개 후 처리)
+
+        Args:
+            timeout: 남은 작업 처리 대기 시간 (초)
+        """
+        if not self.running:
+            return
+
+        self.resume()
+        deadline = time.time() + timeout
+        while (len(self.queue) or self._active) and time.time() < deadline:
+            time.sleep(0.05)
+
+        self.running = False
+        self.queue.close()
+        for thread in self.threads:
+            thread.join(timeout=max(0.1, deadline - time.time()))
+        self.threads = []
+
+        if len(self.queue):
+            print(f"[S3] Stopped with {len(self.queue)} uploads pending")
+        print("[S3] Async uploader stopped")
+
+    @staticmethod
+    def make_key(
+        prefix: str,
+        device_path: str,
+        now: Optional[datetime.datetime] = None,
+        extension: str = "jpg"
+    ) -> str:
+        """
+        S3 키 생성
+
+        Returns:
+            "{prefix}/{device_path}/YYYY/MM/DD/HHMMSS_ffffff.{extension}"
+        """
+        now = now or datetime.datetime.now()
+        return f"{prefix}/{device_path}/{now.strftime('%Y/%m/%d')}/{now.strftime('%H%M%S_%f')}.{extension}"
+
+    def url_for(self, key: str) -> str:
+        """S3 URL 반환"""
+        return f"s3://{self.bucket}/{key}"
+
+    def submit(
+        self,
+        key: str,
+        frame: Optional[np.ndarray] = None,
+        data: Optional[bytes] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: str = "image/jpeg"
+    ) -> Optional[str]:
+        """
+        업로드 작업 제출 (기다리지 않음)
+
+        frame을 넘기면 JPEG 인코딩도 워커에서 수행합니다. 이 경우 frame은
+        업로더 소유가 되므로 호출자가 이후에 수정하면 안 됩니다.
+
+        Args:
+            key: S3 객체 키
+            frame: 인코딩할 이미지 (BGR)
+            data: 이미 인코딩된 바이트 (frame 대신)
+            metadata: S3 사용자 메타데이터
+            content_type: Content-Type
+
+        Returns:
+            업로드될 S3 URL 또는 None (큐가 가득 참)
+        """
+        if frame is None and data is None:
+            raise ValueError("Either frame or data is required")
+
+        job = UploadJob(
+            key=key,
+            frame=frame,
+            data=data,
+            content_type=content_type,
+            metadata=dict(metadata or {}),
+            submit_time=time.time()
+        )
+
+        if not self.queue.put(job):
+            print(f"[S3] Upload queue full, dropped: {key}")
+            return None
+
+        with self._lock:
+            self.submitted += 1
+        return self.url_for(key)
+
+    def _worker(self):
+        """업로드 워커 루프"""
+        while self.running:
+            if not self._resume.wait(timeout=0.2):
+                continue
+            job = self.queue.get(timeout=0.2)
+            if job is None:
+                continue
+            # 꺼내는 사이에 보류된 경우 재개될 때까지 대기 (stop()은 먼저 재개함)
+            while not self._resume.wait(timeout=0.2):
+                pass
+
+            with self._lock:
+                self._active += 1
+            try:
+                self._process(job)
+            finally:
+                with self._lock:
+                    self._active -= 1
+
+    def _process(self, job: UploadJob):
+        """인코딩 및 재시도 포함 업로드"""
+        if job.data is None:
+            job.data = encode_jpeg(job.frame, self.jpeg_quality)
+            if job.data is None:
+                self._record_failure(job, RuntimeError("JPEG encoding failed"))
+                return
+            job.frame = None
+
+        while True:
+            job.attempts += 1
+            try:
+                self.s3_client.put_object(
+                    Bucket=self.bucket,
+                    Key=job.key,
+                    Body=job.data,
+                    ContentType=job.content_type,
+                    Metadata=job.metadata
+                )
+                latency = time.time() - job.submit_time
+                with self._lock:
+                    self.uploaded += 1
+                    self.bytes_uploaded += len(job.data)
+                    self.latencies.append(latency)
+                    self.last_success_time = time.time()
+                print(f"[S3] Uploaded: {self.url_for(job.key)} ({latency * 1000:.0f}ms)")
+                return
+
+            except Exception as e:
+                if job.attempts > self.max_retries or not self.running:
+                    self._record_failure(job, e)
+                    return
+
+                with self._lock:
+                    self.retries += 1
+                delay = min(self.backoff_max, self.backoff_base * (2 ** (job.attempts - 1)))
+                delay *= random.uniform(0.8, 1.2)
+                print(f"[S3] Upload failed ({e}), retry {job.attempts}/{self.max_retries} "
+                      f"in {delay:.1f}s")
+                time.sleep(delay)
+
+    def _record_failure(self, job: UploadJob, error: Exception):
+        """최종 실패 처리"""
+        with self._lock:
+            self.failed += 1
+            self.last_error = str(error)
+            self.last_failure_time = time.time()
+        print(f"[S3] Upload failed: {job.key}: {error}")
+
+        if self.on_failure:
+            try:
+                self.on_failure(job, error)
+            except Exception as e:
+                print(f"[S3] Failure callback error: {e}")
+
+    @property
+    def backlog(self) -> int:
+        """대기 중이거나 처리 중인 업로드 수"""
+        return len(self.queue) + self._active
+
+    def get_stats(self) -> dict:
+        """업로드 통계 반환"""
+        with self._lock:
+            latencies = np.array(self.latencies) * 1000 if self.latencies else None
+            stats = {
+                "queue_depth": len(self.queue),
+                "in_progress": self._active,
+                "paused": self.paused,
+                "submitted": self.submitted,
+                "uploaded": self.uploaded,
+                "failed": self.failed,
+                "dropped": self.queue.dropped,
+                "retries": self.retries,
+                "bytes_uploaded": self.bytes_uploaded,
+                "last_error": self.last_error
+            }
+
+        if latencies is not None:
+            stats["latency_ms"] = {
+                "p50": round(float(np.percentile(latencies, 50)), 1),
+                "p95": round(float(np.percentile(latencies, 95)), 1),
+                "max": round(float(latencies.max()), 1)
+            }
+        return stats
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Async S3 Uploader Test ===")
+
+    class PrintClient:
+        """업로드 대신 출력만 하는 클라이언트"""
+
+        def put_object(self, **kwargs):
+            time.sleep(0.05)
+            print(f"  put_object {kwargs['Key']} ({len(kwargs['Body'])} bytes)")
+
+    uploader = AsyncS3Uploader(PrintClient(), bucket="test-bucket", num_workers=2)
+    uploader.start()
+
+    frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+    for i in range(5):
+        key = uploader.make_key("violations", "test-device")
+        print(f"Submitted: {uploader.submit(key, frame=frame.copy())}")
+
+    uploader.stop()
+    print(f"Stats: {uploader.get_stats()}")
+    print("Test completed!")
@@ -0,0 +1,649 @@
+#!/usr/bin/env python3
+"""
+디스크 기반 저장 후 전달 (store-and-forward) 스풀
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+네트워크 장애로 MQTT 알림이나 S3 이미지를 보낼 수 없을 때 로컬 디스크에
+보관했다가, 연결이 돌아오면 제한된 속도로 묶어서 다시 보냅니다.
+
+저장 형식:
+    {directory}/
+        segment-00000001.log    # 추가 전용 로그 (한 줄 = "crc32 json")
+        segment-00000002.log
+        images/                 # 스풀된 이미지 파일
+        checkpoint.json         # 전달 완료 위치 {"segment": n, "offset": bytes}
+
+특징:
+- 레코드마다 CRC32 기록, fsync로 전원 차단에도 안전
+- 마지막 줄이 잘린 경우 재시작 시 잘라내고 이어서 기록
+- 체크포인트로 재시작 후 이어서 전달 (최소 한 번 전달)
+- 전체 크기 / 보관 기간 상한, 초과 시 오래된 세그먼트부터 삭제
+- SpoolDrainer: 연결 상태를 확인하며 초당 레코드 수를 제한해 전달
+
+사용 예시:
+    from spool import Spool, SpoolDrainer
+
+    spool = Spool("/greengrass/v2/work/ppe/spool")
+    spool.append_message("device/alerts/ppe", alert)
+    spool.append_image("violations/device/...jpg", jpeg_bytes)
+
+    drainer = SpoolDrainer(spool, send=send_record, is_online=lambda: True)
+    drainer.start()
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".log"
+CHECKPOINT_FILE = "checkpoint.json"
+IMAGE_DIR = "images"
+
+
+@dataclass
+class SpoolRecord:
+    """
+    스풀 레코드
+
+    Attributes:
+        kind: "message" (MQTT) 또는 "image" (S3)
+        data: 레코드 내용 (message: topic/message, image: key/file/metadata/content_type)
+        created: 기록 시각
+        segment: 세그먼트 번호
+        end_offset: 세그먼트 내 다음 레코드 시작 위치
+    """
+    kind: str
+    data: Dict = field(default_factory=dict)
+    created: float = 0.0
+    segment: int = 0
+    end_offset: int = 0
+
+
+def _encode_line(record: dict) -> bytes:
+    body = json.dumps(record, separators=(",", ":"), default=str).encode()
+    return b"%08x %s\n" % (zlib.crc32(body), body)
+
+
+def _decode_line(line: bytes) -> Optional[dict]:
+    """CRC가 맞지 않거나 잘린 줄은 None"""
+    if len(line) < 10 or not line.endswith(b"\n") or line[8:9] != b" ":
+        return None
+    body = line[9:-1]
+    try:
+        if int(line[:8], 16) != zlib.crc32(body):
+            return None
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+def _fsync_dir(path: str):
+    """디렉터리 항목 변경(생성/이름 변경) 영구화"""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class Spool:
+    """
+    추가 전용 세그먼트 로그 기반 스풀
+
+    모든 메서드는 스레드 안전합니다.
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        max_bytes: int = 256 * 1024 * 1024,
+        max_age: float = 7 * 24 * 3600,
+        segment_bytes: int = 4 * 1024 * 1024,
+        fsync: bool = True
+    ):
+        """
+        Args:
+            directory: 스풀 디렉터리
+            max_bytes: 로그 + 이미지 전체 크기 상한
+            max_age: 보관 기간 (초, 초과한 세그먼트는 삭제)
+            segment_bytes: 세그먼트 전환 크기
+            fsync: 기록마다 fsync 수행 여부
+        """
+        self.directory = directory
+        self.image_dir = os.path.join(directory, IMAGE_DIR)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.segment_bytes = segment_bytes
+        self.fsync = fsync
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._segments: List[int] = []
+        self._segment_sizes: Dict[int, int] = {}
+        self._image_bytes = 0
+        self._checkpoint: Tuple[int, int] = (0, 0)
+        self._pending = 0
+
+        # 통계
+        self.appended = 0
+        self.acked = 0
+        self.evicted = 0
+        self.corrupt = 0
+
+        os.makedirs(self.image_dir, exist_ok=True)
+        self._open()
+
+    # ---------- 파일 경로 ----------
+
+    def _segment_path(self, segment: int) -> str:
+        return os.path.join(self.directory, f"{SEGMENT_PREFIX}{segment:08d}{SEGMENT_SUFFIX}")
+
+    def _image_path(self, name: str) -> str:
+        return os.path.join(self.image_dir, name)
+
+    # ---------- 열기 / 복구 ----------
+
+    def _open(self):
+        """기존 세그먼트와 체크포인트 복구"""
+        for name in os.listdir(self.directory):
+            if name.startswith(SEGMENT_PREFIX) and name.endswith(SEGMENT_SUFFIX):
+                try:
+                    self._segments.append(int(name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+                except ValueError:
+                    continue
+        self._segments.sort()
+
+        self._checkpoint = self._load_checkpoint()
+
+        # 체크포인트 이전 세그먼트는 이미 전달 완료
+        for segment in [s for s in self._segments if s < self._checkpoint[0]]:
+            self._delete_segment(segment)
+
+        if self._segments:
+            self._repair_tail(self._segments[-1])
+
+        # 전달 대기 레코드 수와 참조 중인 이미지
+        referenced = set()
+        for segment in self._segments:
+            self._segment_sizes[segment] = os.path.getsize(self._segment_path(segment))
+            start = self._checkpoint[1] if segment == self._checkpoint[0] else 0
+            for record in self._scan(segment, start):
+                self._pending += 1
+                if record.kind == "image":
+                    referenced.add(record.data.get("file"))
+
+        # 로그에 기록되기 전에 중단된 이미지 파일 정리
+        for name in os.listdir(self.image_dir):
+            path = self._image_path(name)
+            if name in referenced:
+                self._image_bytes += os.path.getsize(path)
+            else:
+                os.remove(path)
+
+        if not self._segments:
+            self._segments.append(max(1, self._checkpoint[0] + 1))
+            self._segment_sizes[self._segments[-1]] = 0
+        if self._checkpoint[0] < self._segments[0]:
+            self._checkpoint = (self._segments[0], 0)
+
+        self._file = open(self._segment_path(self._segments[-1]), "ab")
+        if self._pending:
+            print(f"[SPOOL] Recovered {self._pending} pending records from {self.directory}")
+
+    def _load_checkpoint(self) -> Tuple[int, int]:
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return int(data["segment"]), int(data["offset"])
+        except (OSError, ValueError, KeyError):
+            return (self._segments[0], 0) if self._segments else (0, 0)
+
+    def _save_checkpoint(self):
+        path = os.path.join(self.directory, CHECKPOINT_FILE)
+        tmp = path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"segment": self._checkpoint[0], "offset": self._checkpoint[1]}, f)
+            if self.fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def _repair_tail(self, segment: int):
+        """기록 중 중단되어 잘린 마지막 줄 제거"""
+        path = self._segment_path(segment)
+        with open(path, "rb") as f:
+            data = f.read()
+        if not data or data.endswith(b"\n"):
+            return
+        keep = data.rfind(b"\n") + 1
+        with open(path, "r+b") as f:
+            f.truncate(keep)
+        self.corrupt += 1
+        print(f"[SPOOL] Truncated partial record in {os.path.basename(path)}")
+
+    def _scan(self, segment: int, start: int = 0, limit: int = 0) -> List[SpoolRecord]:
+        """세그먼트에서 레코드 읽기 (손상된 줄은 건너뜀)"""
+        records = []
+        try:
+            f = open(self._segment_path(segment), "rb")
+        except OSError:
+            return records
+        with f:
+            f.seek(start)
+            offset = start
+            for line in f:
+                offset += len(line)
+                data = _decode_line(line)
+                if data is None:
+                    self.corrupt += 1
+                    continue
+                records.append(SpoolRecord(
+                    kind=data.get("kind", "message"),
+                    data=data.get("data", {}),
+                    created=data.get("created", 0.0),
+                    segment=segment,
+                    end_offset=offset
+                ))
+                if limit and len(records) >= limit:
+                    break
+        return records
+
+    # ---------- 기록 ----------
+
+    def append_message(self, topic: str, message: dict) -> bool:
+        """
+        MQTT 메시지 스풀
+
+        Returns:
+            기록 성공 여부
+        """
+        return self._append("message", {"topic": topic, "message": message})
+
+    def append_image(
+        self,
+        key: str,
+        data: bytes,
+        metadata: Optional[Dict[str, str]] = None,
+        content_type: str = "image/jpeg"
+    ) -> bool:
+        """
+        S3 업로드할 이미지 스풀
+
+        이미지 파일을 먼저 기록(fsync 후 이름 변경)한 뒤 로그에 추가하므로
+        로그에 있는 이미지 레코드는 항상 파일이 존재합니다.
+
+        Returns:
+            기록 성공 여부
+        """
+        name = f"{uuid.uuid4().hex}.bin"
+        path = self._image_path(name)
+        try:
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+                if self.fsync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(path + ".tmp", path)
+            if self.fsync:
+                _fsync_dir(self.image_dir)
+        except OSError as e:
+            print(f"[SPOOL] Image write failed: {e}")
+            return False
+
+        with self._lock:
+            self._image_bytes += len(data)
+        ok = self._append("image", {
+            "key": key,
+            "file": name,
+            "size": len(data),
+            "metadata": dict(metadata or {}),
+            "content_type": content_type
+        })
+        if not ok:
+            self._remove_image(name)
+        return ok
+
+    def _append(self, kind: str, data: dict) -> bool:
+        line = _encode_line({"kind": kind, "created": time.time(), "data": data})
+
+        with self._lock:
+            self._evict(len(line))
+
+            segment = self._segments[-1]
+            if self._segment_sizes[segment] + len(line) > self.segment_bytes \
+                    and self._segment_sizes[segment] > 0:
+                segment = self._roll()
+
+            try:
+                self._file.write(line)
+                self._file.flush()
+                if self.fsync:
+                    os.fsync(self._file.fileno())
+            except OSError as e:
+                print(f"[SPOOL] Append failed: {e}")
+                return False
+
+            self._segment_sizes[segment] += len(line)
+            self._pending += 1
+            self.appended += 1
+            return True
+
+    def _roll(self) -> int:
+        """새 세그먼트로 전환"""
+        self._file.close()
+        segment = self._segments[-1] + 1
+        self._segments.append(segment)
+        self._segment_sizes[segment] = 0
+        self._file = open(self._segment_path(segment), "ab")
+        if self.fsync:
+            _fsync_dir(self.directory)
+        return segment
+
+    # ---------- 삭제 ----------
+
+    @property
+    def size_bytes(self) -> int:
+        """로그 + 이미지 전체 크기"""
+        with self._lock:
+            return sum(self._segment_sizes.values()) + self._image_bytes
+
+    def _evict(self, incoming: int = 0):
+        """크기/기간 상한을 넘는 오래된 세그먼트 삭제 (lock 보유 상태에서 호출)"""
+        now = time.time()
+        while len(self._segments) > 1:
+            oldest = self._segments[0]
+            too_big = self.size_bytes + incoming > self.max_bytes
+            try:
+                too_old = now - os.path.getmtime(self._segment_path(oldest)) > self.max_age
+            except OSError:
+                too_old = True
+            if not (too_big or too_old):
+                break
+            self._drop_oldest_segment()
+
+        # 세그먼트가 하나뿐인데 가득 찼으면 전환 후 삭제
+        if self.size_bytes + incoming > self.max_bytes and self._segment_sizes[self._segments[0]] > 0:
+            self._roll()
+            self._drop_oldest_segment()
+
+    def _drop_oldest_segment(self):
+        """가장 오래된 세그먼트와 이미지 삭제 (전달 전 레코드 포함)"""
+        segment = self._segments[0]
+        start = self._checkpoint[1] if segment == self._checkpoint[0] else 0
+        lost = self._scan(segment, start) if segment >= self._checkpoint[0] else []
+
+        for record in self._scan(segment):
+            if record.kind == "image":
+                self._remove_image(record.data.get("file", ""))
+
+        self._delete_segment(segment)
+        self._pending -= len(lost)
+        self.evicted += len(lost)
+        if self._checkpoint[0] <= segment:
+            self._checkpoint = (self._segments[0], 0)
+            self._save_checkpoint()
+        if lost:
+            print(f"[SPOOL] Evicted segment {segment} ({len(lost)} undelivered records)")
+
+    def _delete_segment(self, segment: int):
+        try:
+            os.remove(self._segment_path(segment))
+        except OSError:
+            pass
+        if segment in self._segments:
+            self._segments.remove(segment)
+        self._segment_sizes.pop(segment, None)
+
+    def _remove_image(self, name: str):
+        if not name:
+            return
+        path = self._image_path(name)
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+            with self._lock:
+                self._image_bytes -= size
+        except OSError:
+            pass
+
+    def evict_expired(self):
+        """보관 기간이 지난 세그먼트 삭제"""
+        with self._lock:
+            self._evict()
+
+    # ---------- 전달 ----------
+
+    def peek(self, max_records: int = 50) -> List[SpoolRecord]:
+        """
+        체크포인트 이후 레코드를 최대 max_records개 읽기 (체크포인트는 그대로)
+        """
+        with self._lock:
+            records: List[SpoolRecord] = []
+            segment, offset = self._checkpoint
+            for seg in [s for s in self._segments if s >= segment]:
+                start = offset if seg == segment else 0
+                records.extend(self._scan(seg, start, max_records - len(records)))
+                if len(records) >= max_records:
+                    break
+            return records
+
+    def load_image(self, record: SpoolRecord) -> Optional[bytes]:
+        """이미지 레코드의 파일 내용"""
+        try:
+            with open(self._image_path(record.data.get("file", "")), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def ack(self, records: List[SpoolRecord]):
+        """
+        전달 완료 처리 (peek 순서대로 앞에서부터)
+
+        체크포인트를 마지막 레코드 뒤로 옮기고, 이미지 파일과
+        다 읽은 세그먼트를 삭제합니다.
+        """
+        if not records:
+            return
+
+        with self._lock:
+            last = records[-1]
+            if (last.segment, last.end_offset) <= self._checkpoint:
+                return  # 이미 처리됨 (삭제된 세그먼트 등)
+
+            for record in records:
+                if record.kind == "image":
+                    self._remove_image(record.data.get("file", ""))
+
+            self._checkpoint = (last.segment, last.end_offset)
+            self._pending = max(0, self._pending - len(records))
+            self.acked += len(records)
+
+            # 다 읽은 이전 세그먼트 삭제 (현재 기록 중인 세그먼트 제외)
+            for segment in [s for s in self._segments[:-1] if s < last.segment]:
+                self._delete_segment(segment)
+            if last.segment != self._segments[-1] \
+                    and last.end_offset >= self._segment_sizes.get(last.segment, 0):
+                self._delete_segment(last.segment)
+                self._checkpoint = (self._segments[0], 0)
+
+            self._save_checkpoint()
+
+    def __len__(self) -> int:
+        return self._pending
+
+    def close(self):
+        """파일 닫기"""
+        with self._lock:
+            if self._file:
+                self._file.close()
+                self._file = None
+
+    def get_stats(self) -> dict:
+        """스풀 통계 반환"""
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "segments": len(self._segments),
+                "size_bytes": self.size_bytes,
+                "appended": self.appended,
+                "acked": self.acked,
+                "evicted": self.evicted,
+                "corrupt": self.corrupt
+            }
+
+
+class SpoolDrainer:
+    """
+    스풀 전달 스레드
+
+    is_online()이 True일 때 batch_size개씩 꺼내 send()로 보내며,
+    전체 전달 속도는 초당 rate개로 제한합니다. send()가 False를 반환하면
+    해당 레코드부터 retry_interval 후 다시 시도합니다.
+    """
+
+    def __init__(
+        self,
+        spool: Spool,
+        send: Callable[[SpoolRecord], bool],
+        is_online: Callable[[], bool] = lambda: True,
+        rate: float = 10.0,
+        batch_size: int = 20,
+        retry_interval: float = 30.0
+    ):
+        """
+        Args:
+            spool: 대상 스풀
+            send: 레코드 전달 함수 (성공 시 True)
+            is_online: 연결 상태 확인 함수
+            rate: 초당 최대 전달 레코드 수
+            batch_size: 한 번에 꺼낼 레코드 수
+            retry_interval: 실패/오프라인 시 재시도 간격 (초)
+        """
+        self.spool = spool
+        self.send = send
+        self.is_online = is_online
+        self.rate = rate
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+
+        self.running = False
+        self.thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+
+        # 통계
+        self.drained = 0
+        self.failures = 0
+
+    def start(self):
+        """전달 스레드 시작"""
+        if self.running:
+            return
+        self.running = True
+        self.thread = threading.Thread(target=self._drain_loop, name="spool-drainer", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """전달 스레드 정지"""
+        self.running = False
+        self._wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def wake(self):
+        """대기 중인 전달 즉시 재시도"""
+        self._wake.set()
+
+    def _sleep(self, seconds: float):
+        self._wake.wait(seconds)
+        self._wake.clear()
+
+    def _drain_loop(self):
+        interval = 1.0 / self.rate if self.rate > 0 else 0.0
+
+        while self.running:
+            self.spool.evict_expired()
+
+            if not len(self.spool):
+                self._sleep(1.0)
+                continue
+            if not self.is_online():
+                self._sleep(self.retry_interval)
+                continue
+
+            records = self.spool.peek(self.batch_size)
+            sent: List[SpoolRecord] = []
+            failed = False
+            for record in records:
+                if not self.running:
+                    break
+                start = time.time()
+                try:
+                    ok = self.send(record)
+                except Exception as e:
+                    print(f"[SPOOL] Send error: {e}")
+                    ok = False
+                if not ok:
+                    failed = True
+                    break
+                sent.append(record)
+                remaining = interval - (time.time() - start)
+                if remaining > 0:
+                    time.sleep(remaining)
+
+            self.spool.ack(sent)
+            self.drained += len(sent)
+            if sent:
+                print(f"[SPOOL] Drained {len(sent)} records ({len(self.spool)} pending)")
+            if failed:
+                self.failures += 1
+                self._sleep(self.retry_interval)
+
+    def get_stats(self) -> dict:
+        """전달 통계 반환"""
+        stats = self.spool.get_stats()
+        stats["drained"] = self.drained
+        stats["drain_failures"] = self.failures
+        return stats
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    import tempfile
+
+    print("=== Spool Test ===")
+
+    with tempfile.TemporaryDirectory() as directory:
+        spool = Spool(directory, fsync=False)
+        for i in range(1000):
+            spool.append_message("test/alerts/ppe", {"n": i})
+        spool.append_image("violations/test.jpg", b"\xff\xd8" + b"0" * 1024)
+        spool.close()
+
+        spool = Spool(directory, fsync=False)
+        print(f"Recovered: {spool.get_stats()}")
+
+        delivered = []
+        drainer = SpoolDrainer(spool, send=lambda r: delivered.append(r) or True,
+                               rate=0, batch_size=200)
+        drainer.start()
+        while len(spool):
+            time.sleep(0.05)
+        drainer.stop()
+
+        print(f"Delivered: {len(delivered)}")
+        print(f"Stats: {drainer.get_stats()}")
+    print("Test completed!")
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+시작 시간 측정
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+Greengrass 배포 후 컴포넌트가 재시작되면 첫 감지까지의 시간 동안
+현장을 보지 못합니다. 이 모듈은 시작 과정을 단계(phase, 소요 시간)와
+이벤트(event, 시작 기준 시각)로 기록하여 상태 메시지와 메트릭으로
+보고합니다.
+
+단계 예시:
+- imports: 모듈 import
+- camera / detector / greengrass / s3: 구성 요소별 초기화 (병렬)
+- warmup: 더미 입력 추론
+- init: 초기화 전체
+
+이벤트 예시:
+- ready: 초기화 완료
+- first_frame: 첫 프레임 수신 (time-to-first-frame)
+- first_detection: 첫 감지 완료 (time-to-first-detection)
+
+사용 예시:
+    from startup import StartupTimer
+
+    startup = StartupTimer()
+    with startup.phase("detector"):
+        detector = PPEDetector(...)
+    startup.mark("first_frame")
+    startup.get_stats()
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+class StartupTimer:
+    """
+    시작 단계/이벤트 기록기
+
+    이벤트는 처음 한 번만 기록되며, 이미 기록된 이벤트의 mark()는
+    잠금 없이 바로 반환하므로 프레임 루프에서 호출해도 됩니다.
+    여러 초기화 스레드에서 동시에 phase()를 사용할 수 있습니다.
+    """
+
+    def __init__(self, origin: Optional[float] = None):
+        """
+        Args:
+            origin: 기준 시각 (time.perf_counter 값, None이면 지금)
+        """
+        self.origin = time.perf_counter() if origin is None else origin
+        self.phases: Dict[str, float] = {}
+        self.events: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record(self, name: str, seconds: float):
+        """단계 소요 시간 기록 (초)"""
+        with self._lock:
+            self.phases[name] = seconds
+
+    @contextmanager
+    def phase(self, name: str):
+        """with 블록 실행 시간을 단계로 기록"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def mark(self, event: str) -> bool:
+        """
+        이벤트 시각 기록 (처음 한 번만)
+
+        Returns:
+            이번 호출에서 처음 기록되었는지 여부
+        """
+        if event in self.events:
+            return False
+        now = time.perf_counter() - self.origin
+        with self._lock:
+            if event in self.events:
+                return False
+            self.events[event] = now
+        return True
+
+    def elapsed(self, event: str) -> Optional[float]:
+        """이벤트 시각 (기준 시각부터 초, 없으면 None)"""
+        return self.events.get(event)
+
+    def summary(self) -> str:
+        """로그용 한 줄 요약"""
+        with self._lock:
+            items = list(self.phases.items()) + list(self.events.items())
+        return ", ".join(f"{name}={seconds * 1000:.0f}ms" for name, seconds in items)
+
+    def get_stats(self) -> dict:
+        """단계/이벤트 통계 (초)"""
+        with self._lock:
+            return {
+                "phases_s": {name: round(seconds, 4) for name, seconds in self.phases.items()},
+                "events_s": {name: round(seconds, 4) for name, seconds in self.events.items()}
+            }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Startup Timer Test ===")
+
+    startup = StartupTimer()
+    with startup.phase("init"):
+        time.sleep(0.05)
+    startup.mark("ready")
+    time.sleep(0.02)
+    startup.mark("first_frame")
+    startup.mark("first_frame")     # 무시됨
+
+    print(f"  {startup.summary()}")
+    print(f"  {startup.get_stats()}")
+    print("Test completed!")
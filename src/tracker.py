@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+다중 객체 추적기 (SORT 방식)
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+프레임마다 감지 결과에 안정적인 추적 ID를 붙여, 위반 알림을 클래스가
+아닌 작업자(트랙) 단위로 중복 제거할 수 있게 합니다.
+
+구성:
+- 등속 칼만 필터: 상태 [cx, cy, area, aspect, vx, vy, v_area]
+  (모든 트랙을 하나의 배열로 묶어 예측/갱신을 한 번에 계산)
+- IoU 행렬: 트랙 예측 박스 × 감지 박스, 클래스 그룹이 다르면 0
+  (hardhat ↔ no_hardhat처럼 같은 보호구의 착용/미착용은 한 그룹이라
+  클래스가 바뀌어도 같은 트랙 유지)
+- 탐욕적 매칭: IoU가 큰 쌍부터 임계값 이상만 매칭
+- 확정: min_hits번 이상 매칭된 트랙만 확정 (알림 대상)
+- 재연결: 사라진 확정 트랙의 마지막 박스를 lost_max_age 프레임 동안 보관하여,
+  같은 자리에 다시 나타난 감지에 이전 ID를 다시 부여
+
+사용 예시:
+    from tracker import MultiObjectTracker
+
+    tracker = MultiObjectTracker(iou_threshold=0.3, max_age=30, min_hits=3)
+    for frame in frames:
+        detections = tracker.update(detector.detect(frame))
+        for det in detections:
+            print(det.track_id, det.class_name, tracker.is_confirmed(det.track_id))
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from ppe_detector import Detection
+
+
+# 칼만 필터 모델 (SORT와 동일한 등속 모델)
+_F = np.eye(7, dtype=np.float64)
+_F[0, 4] = _F[1, 5] = _F[2, 6] = 1.0
+_Q = np.diag([1.0, 1.0, 1.0, 1.0, 0.01, 0.01, 1e-4])
+_R = np.diag([1.0, 1.0, 10.0, 10.0])
+_P0 = np.diag([10.0, 10.0, 10.0, 10.0, 1e4, 1e4, 1e4])
+
+# 매칭 시 같은 객체로 볼 클래스 그룹 (PPEDetector.CLASSES 기준, 착용/미착용 쌍)
+PPE_CLASS_GROUPS: Dict[int, int] = {1: 1, 2: 1, 3: 3, 4: 3, 5: 5, 6: 5}
+
+
+def iou_matrix(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """
+    IoU 행렬 계산
+
+    Args:
+        boxes_a: (N, 4) xyxy
+        boxes_b: (M, 4) xyxy
+
+    Returns:
+        (N, M) IoU
+    """
+    if len(boxes_a) == 0 or len(boxes_b) == 0:
+        return np.zeros((len(boxes_a), len(boxes_b)), dtype=np.float64)
+
+    a = boxes_a[:, None, :]
+    b = boxes_b[None, :, :]
+    w = np.clip(np.minimum(a[..., 2], b[..., 2]) - np.maximum(a[..., 0], b[..., 0]), 0, None)
+    h = np.clip(np.minimum(a[..., 3], b[..., 3]) - np.maximum(a[..., 1], b[..., 1]), 0, None)
+    inter = w * h
+    area_a = (boxes_a[:, 2] - boxes_a[:, 0]) * (boxes_a[:, 3] - boxes_a[:, 1])
+    area_b = (boxes_b[:, 2] - boxes_b[:, 0]) * (boxes_b[:, 3] - boxes_b[:, 1])
+    union = area_a[:, None] + area_b[None, :] - inter
+    return inter / np.maximum(union, 1e-9)
+
+
+def greedy_assignment(cost: np.ndarray, threshold: float) -> List[Tuple[int, int]]:
+    """
+    탐욕적 매칭 (값이 큰 쌍부터, 임계값 이상만)
+
+    Args:
+        cost: (N, M) 유사도 행렬 (IoU)
+        threshold: 최소 유사도
+
+    Returns:
+        (행, 열) 매칭 리스트
+    """
+    rows, cols = np.nonzero(cost >= threshold)
+    if len(rows) == 0:
+        return []
+
+    order = np.argsort(-cost[rows, cols], kind="stable")
+    used_rows = np.zeros(cost.shape[0], dtype=bool)
+    used_cols = np.zeros(cost.shape[1], dtype=bool)
+    matches = []
+    for r, c in zip(rows[order], cols[order]):
+        if not used_rows[r] and not used_cols[c]:
+            used_rows[r] = used_cols[c] = True
+            matches.append((int(r), int(c)))
+    return matches
+
+
+def _bbox_to_z(boxes: np.ndarray) -> np.ndarray:
+    """xyxy → [cx, cy, area, aspect]"""
+    w = boxes[:, 2] - boxes[:, 0]
+    h = boxes[:, 3] - boxes[:, 1]
+    return np.stack([
+        boxes[:, 0] + w / 2,
+        boxes[:, 1] + h / 2,
+        w * h,
+        w / np.maximum(h, 1e-6)
+    ], axis=1)
+
+
+def _x_to_bbox(x: np.ndarray) -> np.ndarray:
+    """상태 [cx, cy, area, aspect, ...] → xyxy"""
+    area = np.maximum(x[:, 2], 0)
+    w = np.sqrt(area * np.maximum(x[:, 3], 0))
+    h = area / np.maximum(w, 1e-6)
+    return np.stack([
+        x[:, 0] - w / 2,
+        x[:, 1] - h / 2,
+        x[:, 0] + w / 2,
+        x[:, 1] + h / 2
+    ], axis=1)
+
+
+class MultiObjectTracker:
+    """
+    SORT 방식 다중 객체 추적기
+
+    트랙 상태는 (N, 7) 배열과 (N, 7, 7) 공분산 배열로 관리하며,
+    감지 결과의 bbox는 그대로 두고 track_id만 채웁니다.
+    """
+
+    def __init__(
+        self,
+        iou_threshold: float = 0.3,
+        max_age: int = 30,
+        min_hits: int = 3,
+        lost_max_age: int = 450,
+        class_groups: Optional[Dict[int, int]] = None
+    ):
+        """
+        Args:
+            iou_threshold: 매칭 최소 IoU
+            max_age: 감지되지 않아도 트랙을 유지할 최대 프레임 수
+            min_hits: 트랙을 확정하기 위한 최소 매칭 수
+            lost_max_age: 사라진 확정 트랙을 재연결 대상으로 보관할 프레임 수 (0이면 사용 안 함)
+            class_groups: 같은 객체로 매칭할 클래스 ID → 그룹 ID (None이면 PPE_CLASS_GROUPS)
+        """
+        self.iou_threshold = iou_threshold
+        self.max_age = max_age
+        self.min_hits = min_hits
+        self.lost_max_age = lost_max_age
+        self.class_groups = PPE_CLASS_GROUPS if class_groups is None else class_groups
+
+        self._x = np.zeros((0, 7), dtype=np.float64)
+        self._P = np.zeros((0, 7, 7), dtype=np.float64)
+        self._ids = np.zeros(0, dtype=np.int64)
+        self._classes = np.zeros(0, dtype=np.int64)
+        self._groups = np.zeros(0, dtype=np.int64)
+        self._boxes = np.zeros((0, 4), dtype=np.float64)     # 마지막 매칭 박스
+        self._hits = np.zeros(0, dtype=np.int64)
+        self._misses = np.zeros(0, dtype=np.int64)
+        self._next_id = 1
+
+        # 사라진 확정 트랙 (재연결 대상)
+        self._lost_ids = np.zeros(0, dtype=np.int64)
+        self._lost_groups = np.zeros(0, dtype=np.int64)
+        self._lost_boxes = np.zeros((0, 4), dtype=np.float64)
+        self._lost_hits = np.zeros(0, dtype=np.int64)
+        self._lost_frame = np.zeros(0, dtype=np.int64)
+
+        # 확정된 트랙 ID (다른 스레드에서 is_confirmed로 조회)
+        self._confirmed = set()
+
+        # 통계
+        self.frame_count = 0
+        self.update_time = 0.0
+        self.reassociated = 0
+
+    def _group(self, class_ids: np.ndarray) -> np.ndarray:
+        """클래스 ID → 매칭 그룹 ID (그룹이 없으면 음수 클래스 ID로 구분)"""
+        return np.array([self.class_groups.get(int(c), -1 - int(c)) for c in class_ids], dtype=np.int64)
+
+    def _predict(self):
+        """모든 트랙 한 프레임 예측"""
+        if not len(self._x):
+            return
+        # 면적이 음수가 되지 않도록 면적 속도 제거
+        shrinking = self._x[:, 2] + self._x[:, 6] <= 0
+        self._x[shrinking, 6] = 0.0
+
+        self._x = self._x @ _F.T
+        self._P = _F @ self._P @ _F.T + _Q
+
+    def _correct(self, idx: np.ndarray, z: np.ndarray):
+        """매칭된 트랙 칼만 갱신 (일괄 계산)"""
+        x = self._x[idx]
+        P = self._P[idx]
+
+        y = z - x[:, :4]
+        S = P[:, :4, :4] + _R
+        K = P[:, :, :4] @ np.linalg.inv(S)
+        self._x[idx] = x + (K @ y[:, :, None])[:, :, 0]
+        self._P[idx] = P - K @ P[:, :4, :]
+
+    def update(self, detections: List[Detection]) -> List[Detection]:
+        """
+        한 프레임의 감지 결과로 트랙 갱신
+
+        Args:
+            detections: 감지 결과 리스트
+
+        Returns:
+            track_id가 채워진 같은 리스트
+        """
+        start = time.time()
+        self.frame_count += 1
+        self._predict()
+
+        if detections:
+            det_boxes = np.array([d.bbox for d in detections], dtype=np.float64)
+            det_classes = np.array([d.class_id for d in detections], dtype=np.int64)
+        else:
+            det_boxes = np.zeros((0, 4), dtype=np.float64)
+            det_classes = np.zeros(0, dtype=np.int64)
+        det_groups = self._group(det_classes)
+
+        iou = iou_matrix(_x_to_bbox(self._x), det_boxes)
+        iou[self._groups[:, None] != det_groups[None, :]] = 0.0
+        # 같은 클래스를 다른 클래스(같은 그룹)보다 우선 매칭
+        iou[self._classes[:, None] == det_classes[None, :]] += 1e-6
+        matches = greedy_assignment(iou, self.iou_threshold)
+
+        matched_tracks = np.array([t for t, _ in matches], dtype=np.int64)
+        matched_dets = np.array([d for _, d in matches], dtype=np.int64)
+        track_ids = np.zeros(len(detections), dtype=np.int64)
+
+        if len(matches):
+            self._correct(matched_tracks, _bbox_to_z(det_boxes[matched_dets]))
+            self._hits[matched_tracks] += 1
+            self._classes[matched_tracks] = det_classes[matched_dets]
+            self._boxes[matched_tracks] = det_boxes[matched_dets]
+            track_ids[matched_dets] = self._ids[matched_tracks]
+
+        self._misses += 1
+        self._misses[matched_tracks] = 0
+
+        # 매칭되지 않은 감지 → 사라진 트랙 재연결 또는 새 트랙
+        unmatched = np.setdiff1d(np.arange(len(detections)), matched_dets)
+        if len(unmatched):
+            n = len(unmatched)
+            new_x = np.zeros((n, 7), dtype=np.float64)
+            new_x[:, :4] = _bbox_to_z(det_boxes[unmatched])
+            new_ids, new_hits = self._reassociate(det_boxes[unmatched], det_groups[unmatched])
+            fresh = new_ids == 0
+            new_ids[fresh] = np.arange(self._next_id, self._next_id + int(fresh.sum()), dtype=np.int64)
+            self._next_id += int(fresh.sum())
+
+            self._x = np.concatenate([self._x, new_x])
+            self._P = np.concatenate([self._P, np.broadcast_to(_P0, (n, 7, 7))])
+            self._ids = np.concatenate([self._ids, new_ids])
+            self._classes = np.concatenate([self._classes, det_classes[unmatched]])
+            self._groups = np.concatenate([self._groups, det_groups[unmatched]])
+            self._boxes = np.concatenate([self._boxes, det_boxes[unmatched]])
+            self._hits = np.concatenate([self._hits, new_hits])
+            self._misses = np.concatenate([self._misses, np.zeros(n, dtype=np.int64)])
+            track_ids[unmatched] = new_ids
+
+        confirmed = self._ids[self._hits >= self.min_hits]
+        if len(confirmed):
+            self._confirmed.update(confirmed.tolist())
+
+        # 오래 감지되지 않은 트랙 제거 (확정 트랙은 재연결 대상으로 보관)
+        alive = self._misses <= self.max_age
+        if not alive.all():
+            lost = ~alive & (self._hits >= self.min_hits)
+            if self.lost_max_age > 0 and lost.any():
+                self._lost_ids = np.concatenate([self._lost_ids, self._ids[lost]])
+                self._lost_groups = np.concatenate([self._lost_groups, self._groups[lost]])
+                self._lost_boxes = np.concatenate([self._lost_boxes, self._boxes[lost]])
+                self._lost_hits = np.concatenate([self._lost_hits, self._hits[lost]])
+                self._lost_frame = np.concatenate([
+                    self._lost_frame, np.full(int(lost.sum()), self.frame_count, dtype=np.int64)
+                ])
+            else:
+                self._confirmed.difference_update(self._ids[lost].tolist())
+
+            self._x = self._x[alive]
+            self._P = self._P[alive]
+            self._ids = self._ids[alive]
+            self._classes = self._classes[alive]
+            self._groups = self._groups[alive]
+            self._boxes = self._boxes[alive]
+            self._hits = self._hits[alive]
+            self._misses = self._misses[alive]
+
+        self._expire_lost()
+
+        for det, track_id in zip(detections, track_ids):
+            det.track_id = int(track_id)
+
+        self.update_time = time.time() - start
+        return detections
+
+    def _reassociate(self, boxes: np.ndarray, groups: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        새 감지를 사라진 확정 트랙의 마지막 박스와 매칭
+
+        Returns:
+            (트랙 ID, 매칭 수) - 재연결되지 않은 감지는 ID 0, 매칭 수 1
+        """
+        ids = np.zeros(len(boxes), dtype=np.int64)
+        hits = np.ones(len(boxes), dtype=np.int64)
+        if not len(self._lost_ids):
+            return ids, hits
+
+        iou = iou_matrix(self._lost_boxes, boxes)
+        iou[self._lost_groups[:, None] != groups[None, :]] = 0.0
+        matches = greedy_assignment(iou, self.iou_threshold)
+        if not matches:
+            return ids, hits
+
+        lost_idx = np.array([l for l, _ in matches], dtype=np.int64)
+        det_idx = np.array([d for _, d in matches], dtype=np.int64)
+        ids[det_idx] = self._lost_ids[lost_idx]
+        hits[det_idx] = self._lost_hits[lost_idx]
+        self.reassociated += len(matches)
+
+        keep = np.ones(len(self._lost_ids), dtype=bool)
+        keep[lost_idx] = False
+        self._keep_lost(keep)
+        return ids, hits
+
+    def _expire_lost(self):
+        """lost_max_age를 넘긴 사라진 트랙 삭제"""
+        if not len(self._lost_ids):
+            return
+        keep = self.frame_count - self._lost_frame <= self.lost_max_age
+        if not keep.all():
+            self._confirmed.difference_update(self._lost_ids[~keep].tolist())
+            self._keep_lost(keep)
+
+    def _keep_lost(self, keep: np.ndarray):
+        """사라진 트랙 중 keep만 남김"""
+        self._lost_ids = self._lost_ids[keep]
+        self._lost_groups = self._lost_groups[keep]
+        self._lost_boxes = self._lost_boxes[keep]
+        self._lost_hits = self._lost_hits[keep]
+        self._lost_frame = self._lost_frame[keep]
+
+    def is_confirmed(self, track_id: Optional[int]) -> bool:
+        """트랙이 min_hits번 이상 매칭되어 확정되었는지 여부 (사라진 뒤 재연결 대기 중 포함)"""
+        return track_id in self._confirmed
+
+    @property
+    def active_tracks(self) -> int:
+        """유지 중인 트랙 수"""
+        return len(self._ids)
+
+    def has_track(self, track_id: int) -> bool:
+        """트랙이 아직 유지 중인지 여부"""
+        return bool(np.any(self._ids == track_id))
+
+    def reset(self):
+        """모든 트랙 삭제"""
+        self.__init__(self.iou_threshold, self.max_age, self.min_hits, self.lost_max_age, self.class_groups)
+
+    def get_stats(self) -> dict:
+        """추적 통계 반환"""
+        return {
+            "active_tracks": self.active_tracks,
+            "lost_tracks": len(self._lost_ids),
+            "total_tracks": self._next_id - 1,
+            "reassociated": self.reassociated,
+            "frames": self.frame_count,
+            "update_time_ms": round(self.update_time * 1000, 3)
+        }
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== Multi-Object Tracker Test ===")
+
+    tracker = MultiObjectTracker()
+    for frame in range(10):
+        detections = [
+            Detection(2, "no_hardhat", 0.9, (100 + frame * 5, 100, 160 + frame * 5, 200), True),
+            Detection(2, "no_hardhat", 0.9, (400 - frame * 5, 120, 460 - frame * 5, 220), True),
+        ]
+        tracker.update(detections)
+        print(f"Frame {frame}: {[(d.track_id, d.bbox[0]) for d in detections]}")
+
+    print(f"Stats: {tracker.get_stats()}")
+    print("Test completed!")
@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+YOLOv5 원시 출력 텐서 시뮬레이터
+Orange Pi 5 + Greengrass PPE Detection 시스템용
+
+NPU 없이도 PPEDetector.postprocess (후보 필터링, 좌표 변환, 클래스별 NMS)가
+실제와 같은 경로로 실행되도록 RKNNLite와 같은 인터페이스의 가짜 런타임이
+(1, 25200, 5 + 클래스 수) 형식의 출력을 만들어 냅니다.
+
+특징:
+- 시드 고정 (같은 시드면 같은 출력 순서)
+- 장면 설정: 객체 수, 객체당 후보 박스 수, 객체 간 겹침, 점수 분포, 위반 비율
+- 프레임마다 객체가 조금씩 이동 (추적기/알림 쿨다운 경로도 실제처럼 동작)
+- 추론 지연 모델: 평균 + 정규분포 흔들림 + 간헐적 스파이크
+- 배경 노이즈 행은 한 번만 생성해 두고 복사 (출력 생성 비용이 지연에 포함됨)
+- 배치 입력 (B, H, W, 3)이면 (B, 25200, 5 + 클래스 수) 출력 (배치 모델 흉내)
+
+사용 예시:
+    from yolo_simulator import SceneConfig, LatencyModel, simulated_runtime_factory
+
+    factory = simulated_runtime_factory(
+        scene=SceneConfig(num_objects=20, overlap=0.5),
+        latency=LatencyModel(mean_ms=25.0, jitter_ms=3.0),
+        seed=42
+    )
+    detector = PPEDetector(use_simulation=True, sim_runtime_factory=factory)
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class SceneConfig:
+    """
+    시뮬레이션 장면 설정 (좌표는 모델 입력 공간 기준)
+
+    Attributes:
+        num_objects: 장면 속 객체 수
+        boxes_per_object: 객체당 높은 점수를 내는 후보 행 수 (앵커 중복 반응, NMS 부하)
+        box_jitter: 같은 객체 후보 박스 중심의 표준편차 (픽셀)
+        overlap: 새 객체를 기존 객체와 겹치게 배치할 확률 (밀집 장면)
+        score_mean: 객체 후보 obj_conf 평균
+        score_std: 객체 후보 obj_conf 표준편차
+        noise_score_max: 배경 행 obj_conf 상한 (임계값보다 낮게)
+        violation_ratio: 위반 클래스 객체 비율
+        motion: 프레임당 최대 이동 거리 (픽셀)
+        size_range: 객체 크기 범위 (픽셀)
+        num_rows: 출력 행 수 (YOLOv5 640 입력: 25200)
+        num_classes: 클래스 수
+        input_size: 모델 입력 크기 (정사각형)
+        violation_class_ids: 위반 클래스 ID (PPEDetector.CLASSES 순서)
+        normal_class_ids: 정상 클래스 ID
+    """
+    num_objects: int = 3
+    boxes_per_object: int = 12
+    box_jitter: float = 3.0
+    overlap: float = 0.2
+    score_mean: float = 0.85
+    score_std: float = 0.08
+    noise_score_max: float = 0.3
+    violation_ratio: float = 0.3
+    motion: float = 4.0
+    size_range: Tuple[float, float] = (40.0, 200.0)
+    num_rows: int = 25200
+    num_classes: int = 9
+    input_size: int = 640
+    violation_class_ids: Tuple[int, ...] = (2, 4, 6)
+    normal_class_ids: Tuple[int, ...] = (0, 1, 3, 5, 7, 8)
+
+
+@dataclass
+class LatencyModel:
+    """
+    추론 지연 모델
+
+    Attributes:
+        mean_ms: 평균 추론 시간
+        jitter_ms: 정규분포 표준편차
+        spike_prob: 스파이크 발생 확률 (NPU 경합, 열 스로틀링 등)
+        spike_ms: 스파이크 시 추가 지연
+        batch_item_ms: 배치 모델에서 이미지 하나가 늘 때마다 추가되는 지연
+                       (호출당 고정 비용은 mean_ms에 한 번만 포함)
+    """
+    mean_ms: float = 20.0
+    jitter_ms: float = 2.0
+    spike_prob: float = 0.0
+    spike_ms: float = 0.0
+    batch_item_ms: float = 0.0
+
+    def sample(self, rng: np.random.Generator, batch: int = 1) -> float:
+        """지연 시간 샘플 (초)"""
+        ms = self.mean_ms + self.batch_item_ms * (batch - 1)
+        if self.jitter_ms > 0:
+            ms += rng.normal(0.0, self.jitter_ms)
+        if self.spike_prob > 0 and rng.random() < self.spike_prob:
+            ms += self.spike_ms
+        return max(0.0, ms) / 1000.0
+
+
+class SimulatedYoloRuntime:
+    """
+    YOLOv5 원시 출력을 만드는 시뮬레이션 런타임
+
+    RKNNLite와 같은 inference/release 인터페이스를 제공하므로
+    단일 런타임(PPEDetector.rknn)이나 NPUInferencePool 워커로 그대로
+    사용할 수 있습니다. 스레드 안전하지 않으므로 워커마다 별도 인스턴스를
+    사용하세요.
+    """
+
+    def __init__(
+        self,
+        scene: Optional[SceneConfig] = None,
+        latency: Optional[LatencyModel] = None,
+        seed: int = 0
+    ):
+        """
+        Args:
+            scene: 장면 설정 (None이면 기본값)
+            latency: 추론 지연 모델 (None이면 기본값, 지연 없이 쓰려면 LatencyModel(0, 0))
+            seed: 난수 시드
+        """
+        self.scene = scene or SceneConfig()
+        self.latency = latency or LatencyModel()
+        self.rng = np.random.default_rng(seed)
+
+        s = self.scene
+        num_objects = max(0, s.num_objects)
+        self._row_width = 5 + s.num_classes
+
+        # 배경 노이즈 행 (임계값 아래 점수, 한 번만 생성)
+        self._background = np.empty((s.num_rows, self._row_width), dtype=np.float32)
+        self._background[:, 0:2] = self.rng.uniform(0, s.input_size, (s.num_rows, 2))
+        self._background[:, 2:4] = self.rng.uniform(8, 64, (s.num_rows, 2))
+        self._background[:, 4] = self.rng.uniform(0, s.noise_score_max, s.num_rows)
+        self._background[:, 5:] = self.rng.uniform(0, 1, (s.num_rows, s.num_classes))
+
+        # 객체 후보가 쓰는 행 (같은 위치에 반응하는 앵커처럼 고정)
+        num_dense = min(s.num_rows, num_objects * s.boxes_per_object)
+        self._rows = self.rng.choice(s.num_rows, num_dense, replace=False)
+        self._obj_index = np.repeat(np.arange(num_objects), s.boxes_per_object)[:num_dense]
+
+        # 장면 객체
+        self.centers = np.zeros((num_objects, 2), dtype=np.float32)
+        self.sizes = np.zeros((num_objects, 2), dtype=np.float32)
+        self.classes = np.zeros(num_objects, dtype=np.int64)
+        self.velocity = np.zeros((num_objects, 2), dtype=np.float32)
+        for i in range(num_objects):
+            self._spawn(i)
+
+        # 통계
+        self.frames = 0
+        self.generate_time = 0.0
+
+    def _spawn(self, i: int):
+        """i번째 객체 배치"""
+        s = self.scene
+        self.sizes[i] = self.rng.uniform(s.size_range[0], s.size_range[1], 2)
+        if i > 0 and self.rng.random() < s.overlap:
+            # 기존 객체와 겹치게 (크기의 30% 이내로 떨어진 위치)
+            other = self.rng.integers(0, i)
+            offset = self.rng.uniform(-0.3, 0.3, 2) * self.sizes[other]
+            self.centers[i] = self.centers[other] + offset
+        else:
+            self.centers[i] = self.rng.uniform(0, s.input_size, 2)
+        np.clip(self.centers[i], self.sizes[i] / 2, s.input_size - self.sizes[i] / 2, out=self.centers[i])
+
+        if self.rng.random() < s.violation_ratio:
+            self.classes[i] = self.rng.choice(s.violation_class_ids)
+        else:
+            self.classes[i] = self.rng.choice(s.normal_class_ids)
+        self.velocity[i] = self.rng.uniform(-s.motion, s.motion, 2)
+
+    def _step(self):
+        """객체 이동 (가장자리에서 반사)"""
+        s = self.scene
+        self.centers += self.velocity
+        half = self.sizes / 2
+        low = self.centers < half
+        high = self.centers > s.input_size - half
+        self.velocity[low | high] *= -1
+        np.clip(self.centers, half, s.input_size - half, out=self.centers)
+
+    def generate(self, batch: int = 1) -> np.ndarray:
+        """
+        다음 프레임의 원시 출력 생성
+
+        Args:
+            batch: 배치 크기 (이미지마다 장면이 한 단계씩 진행)
+
+        Returns:
+            (batch, num_rows, 5 + num_classes) float32 배열
+        """
+        s = self.scene
+        output = np.empty((batch,) + self._background.shape, dtype=np.float32)
+        rows, obj = self._rows, self._obj_index
+        n = len(rows)
+
+        for image in output:
+            self._step()
+            image[:] = self._background
+            if n:
+                image[rows, 0:2] = self.centers[obj] + self.rng.normal(0, s.box_jitter, (n, 2))
+                image[rows, 2:4] = self.sizes[obj] * self.rng.uniform(0.9, 1.1, (n, 2))
+                image[rows, 4] = np.clip(self.rng.normal(s.score_mean, s.score_std, n), 0.01, 0.99)
+                image[rows, 5:] = self.rng.uniform(0, 0.2, (n, s.num_classes))
+                image[rows, 5 + self.classes[obj]] = self.rng.uniform(0.8, 1.0, n)
+
+        return output
+
+    def inference(self, inputs: Any = None) -> List[np.ndarray]:
+        """
+        추론 흉내 (출력 생성 시간을 포함해 지연 모델만큼 소요)
+
+        Args:
+            inputs: [입력 텐서] (NHWC, 첫 차원이 배치 크기, None이면 1)
+
+        Returns:
+            [출력 텐서] (RKNNLite.inference와 같은 리스트 형식)
+        """
+        batch = 1
+        if inputs and getattr(inputs[0], "ndim", 0) == 4:
+            batch = inputs[0].shape[0]
+
+        start = time.perf_counter()
+        target = self.latency.sample(self.rng, batch)
+        output = self.generate(batch)
+        elapsed = time.perf_counter() - start
+
+        self.frames += batch
+        self.generate_time += elapsed
+        if target > elapsed:
+            time.sleep(target - elapsed)
+        return [output]
+
+    def release(self):
+        """리소스 해제 (없음)"""
+        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        """런타임 통계 반환"""
+        return {
+            "frames": self.frames,
+            "objects": len(self.classes),
+            "avg_generate_ms": round(self.generate_time / self.frames * 1000, 3) if self.frames else 0.0
+        }
+
+
+def simulated_runtime_factory(
+    scene: Optional[SceneConfig] = None,
+    latency: Optional[LatencyModel] = None,
+    seed: int = 0
+) -> Callable[[int], SimulatedYoloRuntime]:
+    """
+    워커별 시뮬레이션 런타임 팩토리 생성
+
+    워커마다 시드를 seed + worker_id로 달리하여 같은 장면이 중복되지 않게 합니다.
+
+    Returns:
+        워커 번호를 받아 SimulatedYoloRuntime을 반환하는 함수
+    """
+    def factory(worker_id: int) -> SimulatedYoloRuntime:
+        return SimulatedYoloRuntime(scene=scene, latency=latency, seed=seed + worker_id)
+    return factory
+
+
+# 테스트용 메인
+if __name__ == "__main__":
+    print("=== YOLO Simulator Test ===")
+
+    runtime = SimulatedYoloRuntime(
+        scene=SceneConfig(num_objects=5, overlap=0.5),
+        latency=LatencyModel(mean_ms=20.0, jitter_ms=2.0, spike_prob=0.1, spike_ms=30.0),
+        seed=0
+    )
+
+    for i in range(5):
+        start = time.perf_counter()
+        output = runtime.inference()[0]
+        candidates = int((output[0, :, 4] > 0.5).sum())
+        print(f"  Frame {i+1}: shape={output.shape}, candidates={candidates}, "
+              f"latency={(time.perf_counter() - start) * 1000:.1f}ms")
+
+    print(f"Stats: {runtime.get_stats()}")
+    print("Test completed!")
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+벤치마크 모음 테스트 (측정값이 아니라 실행/저장/비교 동작 확인)
+
+테스트 실행:
+    python -m pytest tests/test_benchmarks.py -v
+"""
+
+import sys
+import os
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'benchmarks'))
+
+import bench_suite
+from bench_suite import compare_results, summarize, measure
+
+
+def make_report(**medians):
+    return {
+        "version": bench_suite.RESULT_VERSION,
+        "results": {name: {"median_ms": value} for name, value in medians.items()}
+    }
+
+
+class TestStatistics:
+    """통계 계산 테스트"""
+
+    def test_summarize(self):
+        stats = summarize([1.0, 2.0, 3.0, 4.0, 100.0])
+        assert stats["repeats"] == 5
+        assert stats["median_ms"] == 3.0
+        assert stats["min_ms"] == 1.0 and stats["max_ms"] == 100.0
+        assert stats["p95_ms"] > stats["median_ms"]
+
+    def test_measure_counts_calls(self):
+        calls = []
+        samples = measure(lambda: calls.append(1), repeats=4, warmup=2, number=3)
+        assert len(samples) == 4
+        assert len(calls) == 2 + 4 * 3
+
+
+class TestCompare:
+    """기준 결과 비교 테스트"""
+
+    def test_flags_regression_over_threshold(self):
+        baseline = make_report(a=1.0, b=1.0, c=1.0)
+        current = make_report(a=1.1, b=1.3, c=0.5)
+        status = {row["name"]: row["status"] for row in compare_results(current, baseline, threshold=0.15)}
+        assert status == {"a": "ok", "b": "regression", "c": "improvement"}
+
+    def test_ignores_tiny_absolute_changes(self):
+        """µs 단위 항목은 비율이 커도 min_delta_ms 미만이면 무시"""
+        rows = compare_results(make_report(a=0.010), make_report(a=0.005), min_delta_ms=0.02)
+        assert rows[0]["status"] == "ok"
+
+    def test_new_and_missing(self):
+        rows = compare_results(make_report(new=1.0), make_report(old=1.0))
+        assert {row["name"]: row["status"] for row in rows} == {"new": "new", "old": "missing"}
+
+
+class TestSuite:
+    """벤치마크 실행 테스트"""
+
+    def test_all_cases_run(self):
+        report = bench_suite.run_suite(bench_suite.build_cases(), repeats=1, warmup=0, verbose=False)
+        names = set(report["results"])
+        for group in ("preprocess/", "postprocess/", "xywh_to_xyxy/", "nms/",
+                      "draw_detections/", "jpeg_encode/", "simulated_camera/"):
+            assert any(name.startswith(group) for name in names)
+
+    def test_output_and_compare_exit_code(self, tmp_path):
+        """저장한 기준보다 느려지면 종료 코드 1"""
+        baseline_path = str(tmp_path / "baseline.json")
+        assert bench_suite.main(["--filter", "nms/objects=5", "--repeats", "3",
+                                 "--output", baseline_path]) == 0
+
+        baseline = bench_suite.load_results(baseline_path)
+        assert "nms/objects=5" in baseline["results"]
+        assert baseline["settings"]["repeats"] == 3
+
+        # 기준을 실제보다 훨씬 빠르게 조작 → 회귀
+        for stats in baseline["results"].values():
+            stats["median_ms"] = 0.001
+        bench_suite.save_results(baseline, baseline_path)
+        assert bench_suite.main(["--filter", "nms/objects=5", "--repeats", "3",
+                                 "--compare", baseline_path]) == 1
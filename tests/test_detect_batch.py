@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+배치 감지 (detect_batch) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_detect_batch.py -v
+"""
+
+import sys
+import os
+import json
+import threading
+import time
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import PPEDetector
+from yolo_simulator import SceneConfig, LatencyModel, SimulatedYoloRuntime
+
+
+SHAPES = [(480, 640, 3), (1080, 1920, 3), (720, 1280, 3), (640, 640, 3), (240, 320, 3)]
+
+
+def make_outputs(batch, seed=0):
+    runtime = SimulatedYoloRuntime(SceneConfig(num_objects=6, overlap=0.5), LatencyModel(0, 0), seed=seed)
+    return runtime.generate(batch)
+
+
+class BatchRuntime:
+    """고정 출력을 돌려주고 입력 shape를 기록하는 가짜 배치 런타임"""
+
+    def __init__(self, outputs):
+        self.outputs = outputs
+        self.calls = []
+
+    def inference(self, inputs):
+        batch = inputs[0]
+        self.calls.append(batch.shape)
+        return [self.outputs[len(self.calls) - 1]]
+
+    def release(self):
+        pass
+
+
+def as_tuples(detections):
+    return [(d.class_id, d.bbox, round(d.confidence, 5)) for d in detections]
+
+
+def frames_for(shapes):
+    return [np.full(shape, 100, dtype=np.uint8) for shape in shapes]
+
+
+class TestPostprocessBatch:
+    """배치 후처리 테스트"""
+
+    def test_matches_per_image(self):
+        detector = PPEDetector(use_simulation=False)
+        output = make_outputs(len(SHAPES))
+
+        batched = detector.postprocess_batch([output], SHAPES)
+        for i, shape in enumerate(SHAPES):
+            single = detector.postprocess([output[i:i + 1]], shape)
+            assert as_tuples(batched[i]) == as_tuples(single)
+            assert all(d.bbox[2] <= shape[1] and d.bbox[3] <= shape[0] for d in batched[i])
+        assert sum(len(d) for d in batched) > 0
+
+    def test_no_suppression_across_images(self):
+        """같은 위치의 박스라도 다른 이미지면 각각 남음"""
+        detector = PPEDetector(use_simulation=False)
+        output = np.repeat(make_outputs(1), 3, axis=0)
+        batched = detector.postprocess_batch([output], [(640, 640, 3)] * 3)
+        assert as_tuples(batched[0]) == as_tuples(batched[1]) == as_tuples(batched[2])
+        assert batched[0]
+
+    def test_ignores_unused_slots(self):
+        detector = PPEDetector(use_simulation=False)
+        output = make_outputs(4)
+        assert len(detector.postprocess_batch([output], SHAPES[:2])) == 2
+
+
+class TestDetectBatch:
+    """detect_batch 테스트"""
+
+    def test_single_inference_per_batch(self):
+        detector = PPEDetector(use_simulation=False, batch_size=4)
+        outputs = [make_outputs(4, seed=0), make_outputs(4, seed=1)]
+        detector.rknn = BatchRuntime(outputs)
+
+        results = detector.detect_batch(frames_for(SHAPES))
+
+        # 5프레임 → 배치 2회 (마지막 배치는 1프레임만 사용)
+        assert detector.rknn.calls == [(4, 640, 640, 3)] * 2
+        assert len(results) == len(SHAPES)
+        expected = detector.postprocess_batch([outputs[0]], SHAPES[:4]) + \
+            detector.postprocess_batch([outputs[1]], SHAPES[4:])
+        assert [as_tuples(r) for r in results] == [as_tuples(e) for e in expected]
+
+        assert detector.total_inferences == len(SHAPES)
+        assert detector.batch_buffers.allocated == 1
+
+    def test_batch_input_matches_preprocess(self):
+        """배치 슬롯마다 단일 전처리와 같은 입력"""
+        detector = PPEDetector(use_simulation=False, batch_size=2)
+        detector.rknn = BatchRuntime([make_outputs(2)])
+        captured = []
+        detector.rknn.inference = lambda inputs: captured.append(inputs[0].copy()) or [make_outputs(2)]
+
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 255, shape, dtype=np.uint8) for shape in SHAPES[:2]]
+        detector.detect_batch(frames)
+
+        for i, frame in enumerate(frames):
+            np.testing.assert_array_equal(captured[0][i], detector.preprocess(frame)[0])
+
+    def test_sequential_fallback(self):
+        detector = PPEDetector(use_simulation=False)
+        detector.rknn = BatchRuntime([make_outputs(1, seed=i) for i in range(3)])
+
+        results = detector.detect_batch(frames_for(SHAPES[:3]))
+        assert detector.rknn.calls == [(1, 640, 640, 3)] * 3
+        assert len(results) == 3
+        assert detector.batch_buffers is None
+
+    def test_pool_mode(self):
+        detector = PPEDetector(
+            use_simulation=True, num_npu_workers=2,
+            sim_runtime_factory=lambda worker_id: SimulatedYoloRuntime(latency=LatencyModel(5, 0), seed=worker_id)
+        )
+        results = detector.detect_batch(frames_for(SHAPES[:4]))
+        detector.release()
+        assert len(results) == 4
+
+    def test_pool_mode_more_frames_than_in_flight(self):
+        """프레임 수가 max_in_flight를 넘어도 멈추지 않음"""
+        detector = PPEDetector(use_simulation=True, num_npu_workers=2)
+        frames = frames_for([(480, 640, 3)] * (detector.pool.max_in_flight * 2 + 1))
+        results = []
+        thread = threading.Thread(target=lambda: results.extend(detector.detect_batch(frames)), daemon=True)
+        thread.start()
+        thread.join(timeout=5.0)
+        assert not thread.is_alive()
+        assert len(results) == len(frames)
+        assert detector.pool.in_flight == 0 and detector.total_inferences == len(frames)
+        detector.release()
+
+    def test_pool_mode_with_outstanding_submissions(self):
+        """다른 호출자의 비동기 제출 결과를 가져가지 않음"""
+        box = np.zeros((1, 1, 14), dtype=np.float32)
+        box[0, 0, :5] = [320, 320, 100, 200, 0.9]
+        box[0, 0, 5 + 2] = 1.0
+
+        class BrightnessRuntime:
+            """밝은 입력에서만 박스를 출력"""
+            def inference(self, inputs):
+                time.sleep(0.01)
+                return [box if inputs[0].mean() > 128 else np.zeros((1, 1, 14), dtype=np.float32)]
+
+            def release(self):
+                pass
+
+        detector = PPEDetector(num_npu_workers=2, runtime_factory=lambda worker_id: BrightnessRuntime())
+        dark = np.zeros((640, 640, 3), dtype=np.uint8)
+        bright = np.full((640, 640, 3), 255, dtype=np.uint8)
+
+        seqs = [detector.submit(dark, context=i) for i in range(2)]
+        results = detector.detect_batch([bright] * 5)
+        assert [len(r) for r in results] == [1] * 5
+
+        for i, seq in enumerate(seqs):
+            result = detector.get_result(timeout=2.0)
+            assert result.seq == seq and result.context == i and result.detections == []
+        assert detector.get_result(timeout=0.1) is None
+        assert detector.total_inferences == 7
+        detector.release()
+
+    def test_simulation_without_runtime(self):
+        detector = PPEDetector(use_simulation=True, batch_size=4)
+        results = detector.detect_batch(frames_for([(480, 640, 3)] * 3))
+        assert len(results) == 3 and all(results)
+        assert detector.detect_batch([]) == []
+
+
+class TestSimulatedBatchRuntime:
+    """시뮬레이션 런타임 배치 출력"""
+
+    def test_batch_output_and_latency(self):
+        runtime = SimulatedYoloRuntime(latency=LatencyModel(mean_ms=5, jitter_ms=0, batch_item_ms=5))
+        start = time.perf_counter()
+        output = runtime.inference([np.zeros((3, 640, 640, 3), dtype=np.uint8)])[0]
+        elapsed = time.perf_counter() - start
+
+        assert output.shape == (3, 25200, 14)
+        assert elapsed >= 0.015 * 0.9
+        assert runtime.get_stats()["frames"] == 3
+
+
+class TestSystemBatch:
+    """멀티 카메라 배치 처리"""
+
+    def test_process_frames(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("USE_SIMULATION", "true")
+        monkeypatch.setenv("SIM_DETECTOR", "tensor")
+        monkeypatch.setenv("MODEL_BATCH_SIZE", "3")
+        monkeypatch.setenv("CAMERAS", json.dumps([{"id": "bay1"}, {"id": "bay2"}, {"id": "bay3"}]))
+
+        system = PPEDetectionSystem()
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+        assert system.detector.batch_size == 3
+
+        system.camera.start()
+        time.sleep(0.3)
+        items = system._read_batch(timeout=1.0)
+        system.camera.stop()
+
+        assert 1 <= len(items) <= 3
+        annotated = system.process_frames([(frame, camera_id) for camera_id, frame, _ in items])
+        for result in annotated:
+            result.release()
+
+        assert system.frame_count == len(items)
+        stats = system.camera.get_stats()
+        assert sum(stats[c]["frames_processed"] for c in ("bay1", "bay2", "bay3")) == len(items)
+        system.detector.release()
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+최신 프레임 메일박스 (시퀀스 번호, 캡처 시각) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_frame_mailbox.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+import cv2
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from frame_ring import FrameRing
+from rtsp_reader import RTSPReader
+
+
+SHAPE = (120, 160, 3)
+
+
+def produce(ring, value):
+    slot = ring.claim()
+    buffer = slot.buffer if slot.buffer is not None else np.empty(SHAPE, dtype=np.uint8)
+    buffer[:] = value
+    ring.commit(slot, buffer)
+
+
+class BlockingCapture:
+    """read()가 풀릴 때까지 멈추는 캡처 (응답 없는 카메라 흉내)"""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.unblock = threading.Event()
+
+    def read(self, image=None):
+        self.entered.set()
+        self.unblock.wait(5.0)
+        frame = image if image is not None else np.empty(SHAPE, dtype=np.uint8)
+        frame[:] = 1
+        return True, frame
+
+    def isOpened(self):
+        return True
+
+    def release(self):
+        self.unblock.set()
+
+
+class TestMailbox:
+    """FrameRing.get_latest 테스트"""
+
+    def test_latest_drops_older(self):
+        ring = FrameRing(size=5, queue_size=3)
+        ring.allocate(SHAPE)
+        for i in range(3):
+            produce(ring, i)
+
+        with ring.get_latest(timeout=0.1) as ref:
+            assert ref.frame[0, 0, 0] == 2
+            assert ref.seq == 3 and ref.timestamp <= time.time()
+        assert ring.dropped == 2
+        assert ring.get_latest(timeout=0.01) is None
+
+    def test_wait_for_newer_than_seq(self):
+        ring = FrameRing(size=4, queue_size=2)
+        ring.allocate(SHAPE)
+        produce(ring, 0)
+
+        def later():
+            time.sleep(0.1)
+            produce(ring, 1)
+        threading.Thread(target=later).start()
+
+        start = time.time()
+        with ring.get_latest(timeout=2.0, after_seq=1) as ref:
+            assert ref.seq == 2 and ref.frame[0, 0, 0] == 1
+        assert time.time() - start >= 0.08
+
+
+class TestRTSPReaderMailbox:
+    """RTSPReader 상태 조회 / read_latest 테스트"""
+
+    def test_state_queries_do_not_wait_for_read(self):
+        reader = RTSPReader("rtsp://camera.invalid/stream", use_gstreamer=False)
+        cap = BlockingCapture()
+        reader._set_cap(cap, (160, 120))
+        reader.running = True
+        thread = threading.Thread(target=reader._read_loop, daemon=True)
+        thread.start()
+        try:
+            assert cap.entered.wait(2.0)
+            start = time.perf_counter()
+            assert reader.is_connected
+            assert reader.resolution == (160, 120)
+            assert reader.get_stats()["connected"]
+            assert time.perf_counter() - start < 0.05
+        finally:
+            reader.running = False
+            cap.unblock.set()
+            thread.join(2.0)
+
+        frame, seq, capture_time = reader.read_latest(timeout=1.0)
+        assert frame.shape == SHAPE and seq == 1
+        assert time.time() - capture_time < 5.0
+        reader.stop()
+        assert not reader.is_connected and reader.resolution == (0, 0)
+
+    def test_read_latest_from_file(self, tmp_path):
+        path = str(tmp_path / "clip.avi")
+        writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (SHAPE[1], SHAPE[0]))
+        if not writer.isOpened():
+            pytest.skip("No video encoder available")
+        for i in range(30):
+            writer.write(np.full(SHAPE, i * 8, dtype=np.uint8))
+        writer.release()
+
+        reader = RTSPReader(path, reconnect_delay=0.05, use_gstreamer=False)
+        assert reader.start()
+        try:
+            seqs = []
+            last = 0
+            for _ in range(5):
+                frame, last, capture_time = reader.read_latest(timeout=1.0, after_seq=last)
+                seqs.append(last)
+                assert capture_time <= time.time()
+                time.sleep(0.01)
+        finally:
+            reader.stop()
+
+        assert seqs == sorted(set(seqs))
+        stats = reader.get_stats()
+        assert stats["frames_dropped"] == reader.frames_dropped
+        assert stats["last_seq"] >= seqs[-1]
+
+
+class TestSystemFrameAge:
+    """PPEDetectionSystem 프레임 나이 기록 테스트"""
+
+    def test_pipeline_records_frame_age(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+
+        system.camera.start()
+        try:
+            camera_id, frame, capture_time = system._read_latest()
+            assert frame is not None and capture_time <= time.time()
+
+            packet = system._stage_capture()
+            time.sleep(0.02)
+            system._stage_infer(system._stage_preprocess(packet))
+        finally:
+            system.camera.stop()
+            system.detector.release()
+
+        age = system.latency.histogram("frame_age").get_stats()
+        assert age["count"] == 1 and age["max"] >= 20
+
+        system.send_status_update()
+        assert published[-1]["camera"]["frames"] >= 2
+        assert published[-1]["latency"]["stages_ms"]["frame_age"]["count"] == 1
+
+    def test_read_without_copy(self, monkeypatch):
+        """refs를 넘기면 링 버퍼 프레임을 복사하지 않고 참조를 넘김"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        reader = RTSPReader("rtsp://camera.invalid/stream", use_gstreamer=False)
+        reader.ring.allocate((480, 640, 3))     # 시뮬레이션 감지 결과가 나오는 크기
+        system.camera = reader
+
+        produce(reader.ring, 7)
+        refs = []
+        items = system._read_batch(timeout=0.5, refs=refs)
+        assert len(items) == 1 and len(refs) == 1
+        assert items[0][1] is refs[0].frame and items[0][1][0, 0, 0] == 7
+        assert reader.ring.get_stats()["held"] == 1
+
+        system.process_frame(items[0][1]).release()
+        refs[0].release()
+        assert reader.ring.get_stats()["held"] == 0
+
+        # refs가 없으면 기존처럼 복사본
+        produce(reader.ring, 9)
+        camera_id, frame, _ = system._read_latest(timeout=0.5)
+        assert frame[0, 0, 0] == 9 and reader.ring.get_stats()["held"] == 0
+        system.detector.release()
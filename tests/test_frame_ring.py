@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+프레임 링 버퍼 / RTSPReader 무할당 캡처 테스트
+
+테스트 실행:
+    python -m pytest tests/test_frame_ring.py -v
+"""
+
+import sys
+import os
+import time
+import cv2
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from frame_ring import FrameRing
+from rtsp_reader import RTSPReader
+from multi_camera import CameraSource, MultiCameraScheduler
+
+
+SHAPE = (120, 160, 3)
+
+
+def produce(ring, value):
+    """cap.read(image=slot.buffer) 흉내"""
+    slot = ring.claim()
+    buffer = slot.buffer if slot.buffer is not None else np.empty(SHAPE, dtype=np.uint8)
+    buffer[:] = value
+    ring.commit(slot, buffer)
+
+
+class TestFrameRing:
+    """링 버퍼 테스트"""
+
+    def test_reuses_preallocated_buffers(self):
+        ring = FrameRing(size=4, queue_size=2)
+        ring.allocate(SHAPE)
+        buffers = {id(slot.buffer) for slot in ring._slots}
+
+        for i in range(50):
+            produce(ring, i)
+            with ring.get(timeout=0.1) as ref:
+                assert ref.frame[0, 0, 0] == i
+                assert id(ref.frame) in buffers
+        assert ring.allocations == 4
+
+    def test_drops_oldest_when_consumer_is_slow(self):
+        ring = FrameRing(size=4, queue_size=2)
+        ring.allocate(SHAPE)
+        for i in range(10):
+            produce(ring, i)
+
+        values = [ring.get(timeout=0.1) for _ in range(2)]
+        assert [ref.frame[0, 0, 0] for ref in values] == [8, 9]
+        assert ring.get(timeout=0.01) is None
+        assert ring.get_stats()["dropped"] == 8
+        for ref in values:
+            ref.release()
+
+    def test_refcount(self):
+        """모든 참조가 반환되어야 슬롯 재사용"""
+        ring = FrameRing(size=3, queue_size=1)
+        ring.allocate(SHAPE)
+        produce(ring, 7)
+        ref = ring.get(timeout=0.1)
+        extra = ref.acquire()
+
+        ref.release()
+        ref.release()                       # 중복 호출 무시
+        assert ring.get_stats()["held"] == 1
+        assert extra.frame[0, 0, 0] == 7
+        extra.release()
+        assert ring.get_stats()["held"] == 0 and ring.get_stats()["free"] == 3
+
+        with pytest.raises(RuntimeError):
+            extra.acquire()
+        with pytest.raises(RuntimeError):
+            ref.copy()
+
+    def test_held_frames_are_not_overwritten(self):
+        """소비자가 모든 슬롯을 잡고 있으면 임시 버퍼 사용"""
+        ring = FrameRing(size=2, queue_size=1)
+        ring.allocate(SHAPE)
+        held = []
+        for i in range(2):
+            produce(ring, i)
+            held.append(ring.get(timeout=0.1))
+
+        produce(ring, 99)
+        assert [ref.frame[0, 0, 0] for ref in held] == [0, 1]
+        with ring.get(timeout=0.1) as ref:
+            assert ref.frame[0, 0, 0] == 99
+        assert ring.get_stats()["overflows"] == 1
+        for ref in held:
+            ref.release()
+        assert ring.get_stats()["free"] == 2
+
+    def test_resolution_change_adopts_new_buffer(self):
+        ring = FrameRing(size=3, queue_size=1)
+        ring.allocate(SHAPE)
+        slot = ring.claim()
+        ring.commit(slot, np.zeros((240, 320, 3), dtype=np.uint8))
+        with ring.get(timeout=0.1) as ref:
+            assert ref.frame.shape == (240, 320, 3)
+        assert ring.allocations == 4
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (SHAPE[1], SHAPE[0]))
+    if not writer.isOpened():
+        pytest.skip("No video encoder available")
+    for i in range(30):
+        writer.write(np.full(SHAPE, i * 8, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+class TestRTSPReaderRing:
+    """RTSPReader 링 버퍼 캡처 (로컬 영상 파일로 FFmpeg 경로 사용)"""
+
+    def test_capture_without_allocation(self, video_file):
+        reader = RTSPReader(video_file, queue_size=2, reconnect_delay=0.05, use_gstreamer=False)
+        assert reader.start()
+        try:
+            refs = 0
+            deadline = time.time() + 5.0
+            while refs < 100 and time.time() < deadline:
+                ref = reader.get_frame_ref(timeout=1.0)
+                if ref is None:
+                    continue
+                with ref:
+                    assert ref.frame.shape == SHAPE
+                refs += 1
+
+            frame = reader.get_frame(timeout=1.0)
+            assert frame.shape == SHAPE
+        finally:
+            reader.stop()
+
+        stats = reader.get_stats()["ring"]
+        assert refs == 100
+        assert stats["allocations"] == reader.ring.size   # 연결 시 미리 할당한 것뿐
+        assert stats["overflows"] == 0
+        assert reader.resolution == (0, 0)                 # 정지 후
+
+    def test_multi_camera_copies_only_served_frames(self, video_file):
+        reader = RTSPReader(video_file, queue_size=1, reconnect_delay=0.05, use_gstreamer=False)
+        scheduler = MultiCameraScheduler([CameraSource("cam1", reader)])
+        assert scheduler.start()
+        try:
+            camera_id, frame, _ = scheduler.read(timeout=2.0)
+            saved = frame.copy()
+            time.sleep(0.2)                 # 그동안 계속 디코딩 (링 버퍼 재사용)
+            assert camera_id == "cam1"
+            assert np.array_equal(frame, saved)
+            assert scheduler.read(timeout=2.0) is not None
+        finally:
+            scheduler.stop()
+
+        assert reader.ring.get_stats()["held"] == 0
+        assert reader.ring.allocations == reader.ring.size
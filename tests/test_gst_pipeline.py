@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+GStreamer 캡처 파이프라인 빌더 테스트
+
+파이프라인 문자열 테스트는 항상 실행되고, 실제 실행 테스트는 GStreamer
+(PyGObject 또는 OpenCV GStreamer 빌드)가 있을 때만 videotestsrc로 실행됩니다.
+
+테스트 실행:
+    python -m pytest tests/test_gst_pipeline.py -v
+"""
+
+import sys
+import os
+from types import SimpleNamespace
+import cv2
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import gst_pipeline
+from gst_pipeline import GstPipelineConfig, build_pipeline, select_decoder
+from rtsp_reader import RTSPReader, create_camera
+from ppe_detector import PPEDetector, Detection
+
+
+RTSP = "rtsp://192.168.1.100:554/stream"
+
+
+@pytest.fixture
+def rockchip(monkeypatch):
+    monkeypatch.setattr(gst_pipeline, "is_rockchip", lambda: True)
+    monkeypatch.setattr(gst_pipeline, "element_available", lambda name: True)
+
+
+@pytest.fixture
+def generic_linux(monkeypatch):
+    monkeypatch.setattr(gst_pipeline, "is_rockchip", lambda: False)
+    monkeypatch.setattr(gst_pipeline, "element_available", lambda name: True)
+
+
+def elements(pipeline):
+    return [e.strip() for e in pipeline.split("!")]
+
+
+class TestBuildPipeline:
+    """파이프라인 문자열 생성 테스트"""
+
+    def test_h264_rockchip(self, rockchip):
+        pipeline = build_pipeline(GstPipelineConfig(source=RTSP))
+        assert elements(pipeline) == [
+            f"rtspsrc location={RTSP} latency=0",
+            "rtph264depay", "h264parse", "mppvideodec",
+            "videoconvert", "video/x-raw,format=BGR",
+            "appsink name=model drop=true max-buffers=1 sync=false"
+        ]
+
+    def test_h265_software_decoder(self, generic_linux):
+        pipeline = build_pipeline(GstPipelineConfig(source=RTSP, codec="h265"))
+        assert "rtph265depay ! h265parse ! avdec_h265" in pipeline
+
+    def test_auto_codec_uses_decodebin(self, rockchip):
+        pipeline = build_pipeline(GstPipelineConfig(source=RTSP, codec="auto"))
+        assert "decodebin" in pipeline and "depay" not in pipeline
+
+    def test_width_only_keeps_aspect(self, generic_linux):
+        pipeline = build_pipeline(GstPipelineConfig(source=RTSP, output_format="RGB", output_width=640))
+        assert "videoscale ! video/x-raw,format=RGB,width=640,pixel-aspect-ratio=1/1" in pipeline
+        assert "height=" not in pipeline
+
+    def test_hardware_scale(self, rockchip):
+        pipeline = build_pipeline(GstPipelineConfig(
+            source=RTSP, output_format="RGB", output_width=640, output_height=384
+        ))
+        assert "mppvideodec width=640 height=384 format=RGB" in pipeline
+        # 다른 하드웨어에서도 같은 결과가 되도록 caps는 유지
+        assert "video/x-raw,format=RGB,width=640,height=384" in pipeline
+
+    def test_snapshot_branch(self, rockchip):
+        pipeline = build_pipeline(GstPipelineConfig(
+            source=RTSP, output_format="RGB", output_width=640, output_height=384, snapshot=True
+        ))
+        # 스냅샷은 전체 해상도가 필요하므로 디코더에서 축소하지 않음
+        assert "mppvideodec ! tee name=t" in pipeline
+        model, snapshot = pipeline.split(" t. ! ")[1:]
+        assert model.endswith("appsink name=model drop=true max-buffers=1 sync=false")
+        assert "width=640" in model
+        assert snapshot.startswith("queue leaky=downstream max-size-buffers=1")
+        assert "video/x-raw,format=BGR ! appsink name=snapshot" in snapshot
+        assert "width=" not in snapshot
+
+    def test_file_and_test_sources(self, generic_linux):
+        pipeline = build_pipeline(GstPipelineConfig(source="file:///data/clip.mp4", output_width=320))
+        assert pipeline.startswith('filesrc location="/data/clip.mp4" ! decodebin')
+
+        pipeline = build_pipeline(GstPipelineConfig(source="videotestsrc", test_size=(320, 240), test_fps=10))
+        assert pipeline.startswith("videotestsrc is-live=true pattern=ball ! "
+                                   "video/x-raw,width=320,height=240,framerate=10/1")
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            build_pipeline(GstPipelineConfig(source=RTSP, codec="vp9"))
+        with pytest.raises(ValueError):
+            build_pipeline(GstPipelineConfig(source=RTSP, output_format="NV12"))
+
+    def test_select_decoder(self, monkeypatch, generic_linux):
+        assert select_decoder("h264") == "avdec_h264"
+        assert select_decoder("h264", decoder="v4l2h264dec") == "v4l2h264dec"
+
+        # Rockchip인데 MPP 플러그인이 없으면 소프트웨어 디코더
+        monkeypatch.setattr(gst_pipeline, "is_rockchip", lambda: True)
+        monkeypatch.setattr(gst_pipeline, "element_available", lambda name: False)
+        monkeypatch.setattr(gst_pipeline, "HAS_GST", True)
+        assert select_decoder("h265") == "avdec_h265"
+
+
+class TestRTSPReaderPipeline:
+    """RTSPReader 연동 테스트"""
+
+    def test_reader_uses_builder(self, rockchip):
+        reader = RTSPReader(RTSP, codec="h265", output_width=960)
+        pipeline = reader._build_gstreamer_pipeline()
+        assert "rtph265depay" in pipeline
+        assert "format=BGR,width=960" in pipeline
+        assert pipeline.count("appsink") == 1
+
+    def test_create_camera_passes_options(self):
+        camera = create_camera(RTSP, use_simulation=False, codec="auto", output_width=640)
+        assert isinstance(camera, RTSPReader)
+        assert camera.codec == "auto" and camera.output_width == 640
+        assert camera.output_format == "BGR"
+
+    def test_create_camera_rgb_uses_gst_capture(self, monkeypatch, generic_linux):
+        monkeypatch.setattr(gst_pipeline, "HAS_GST", True)
+        camera = create_camera(RTSP, use_simulation=False, output_width=640,
+                               output_format="RGB", snapshot=True)
+        assert isinstance(camera, gst_pipeline.GstCapture)
+        assert camera.output_format == "RGB"
+        assert "format=RGB,width=640" in camera.pipeline_string
+        assert "appsink name=snapshot" in camera.pipeline_string
+
+    def test_create_camera_rgb_fallback(self, monkeypatch):
+        monkeypatch.setattr(gst_pipeline, "HAS_GST", False)
+        camera = create_camera(RTSP, use_simulation=False, output_format="RGB", snapshot=True)
+        assert isinstance(camera, RTSPReader) and camera.output_format == "BGR"
+
+
+class FakeGst:
+    """GstCapture 동작 확인용 최소 Gst 대역 (PyGObject 없이 실행)"""
+
+    State = SimpleNamespace(PLAYING="playing", NULL="null")
+    StateChangeReturn = SimpleNamespace(FAILURE="failure", SUCCESS="success")
+    MessageType = SimpleNamespace(ERROR=1, EOS=2)
+    MapFlags = SimpleNamespace(READ=1)
+    SECOND = 10 ** 9
+    CLOCK_TIME_NONE = 2 ** 64 - 1
+
+    def __init__(self):
+        self.pipelines = []
+
+    def parse_launch(self, description):
+        pipeline = FakePipeline()
+        self.pipelines.append(pipeline)
+        return pipeline
+
+
+class FakeSample:
+    def __init__(self, frame, pts=0):
+        self.frame = frame
+        self.pts = pts
+
+    def get_caps(self):
+        h, w = self.frame.shape[:2]
+        values = {"width": w, "height": h}
+        return SimpleNamespace(get_structure=lambda i: SimpleNamespace(get_value=values.get))
+
+    def get_buffer(self):
+        data = self.frame.tobytes()
+        return SimpleNamespace(map=lambda flags: (True, SimpleNamespace(data=data)),
+                               unmap=lambda info: None, pts=self.pts)
+
+
+class FakePipeline:
+    """프레임 3개를 내보낸 뒤 EOS"""
+
+    def __init__(self, frames=3):
+        self.frames = frames
+        self.state = None
+        self.eos = False
+
+    def set_state(self, state):
+        self.state = state
+        return FakeGst.StateChangeReturn.SUCCESS
+
+    def get_by_name(self, name):
+        if name != "model":
+            return None
+        return SimpleNamespace(emit=self._pull)
+
+    def _pull(self, signal, timeout):
+        if self.state != FakeGst.State.PLAYING or self.frames == 0:
+            self.eos = True
+            return None
+        self.frames -= 1
+        return FakeSample(np.full((4, 6, 3), self.frames, dtype=np.uint8))
+
+    def get_bus(self):
+        def pop_filtered(types):
+            if not self.eos:
+                return None
+            self.eos = False
+            return SimpleNamespace(type=FakeGst.MessageType.EOS)
+        return SimpleNamespace(pop_filtered=pop_filtered)
+
+
+class TestGstCaptureReconnect:
+    """GstCapture 연결 끊김 후 재연결"""
+
+    def test_frames_resume_after_eos(self, monkeypatch):
+        gst = FakeGst()
+        monkeypatch.setattr(gst_pipeline, "HAS_GST", True)
+        monkeypatch.setattr(gst_pipeline, "Gst", gst, raising=False)
+
+        capture = gst_pipeline.GstCapture(GstPipelineConfig(source=RTSP, output_format="RGB"),
+                                          reconnect_delay=0.05)
+        assert capture.start()
+        assert [capture.get_frame(timeout=0.01) is not None for _ in range(3)] == [True] * 3
+
+        # EOS → 파이프라인 해제, 재연결 대기
+        assert capture.get_frame(timeout=0.01) is None
+        assert not capture.is_connected and gst.pipelines[0].state == FakeGst.State.NULL
+        assert capture.get_frame(timeout=0.01) is None          # 아직 대기 중
+
+        frame = capture.get_frame(timeout=0.2)
+        assert frame is not None and frame.shape == (4, 6, 3)
+        assert capture.is_connected and len(gst.pipelines) == 2
+        stats = capture.get_stats()
+        assert stats["reconnects"] == 1 and stats["frames"] == 4 and stats["connected"]
+
+        capture.stop()
+        assert capture.get_frame(timeout=0.01) is None and len(gst.pipelines) == 2
+
+
+class SnapshotPipeline(FakePipeline):
+    """모델/스냅샷 분기가 같은 PTS의 샘플을 내보내는 파이프라인 (스냅샷은 2배 해상도)"""
+
+    def __init__(self):
+        super().__init__(frames=100)
+        self.pts = 0
+        self.snapshot_queue = []
+
+    def get_by_name(self, name):
+        if name == "snapshot":
+            return SimpleNamespace(emit=self._pull_snapshot)
+        return super().get_by_name(name)
+
+    def _pull(self, signal, timeout):
+        self.pts += 1
+        # appsink는 최신 스냅샷 하나만 보관
+        self.snapshot_queue = [FakeSample(np.full((8, 12, 3), self.pts, dtype=np.uint8), self.pts)]
+        return FakeSample(np.full((4, 6, 3), self.pts, dtype=np.uint8), self.pts)
+
+    def _pull_snapshot(self, signal, timeout):
+        return self.snapshot_queue.pop(0) if self.snapshot_queue else None
+
+
+class TestGstCaptureSnapshot:
+    """GstCapture 모델 프레임 ↔ 스냅샷 짝짓기"""
+
+    def make_capture(self, monkeypatch, history=4):
+        gst = FakeGst()
+        gst.parse_launch = lambda description: SnapshotPipeline()
+        monkeypatch.setattr(gst_pipeline, "HAS_GST", True)
+        monkeypatch.setattr(gst_pipeline, "Gst", gst, raising=False)
+        capture = gst_pipeline.GstCapture(GstPipelineConfig(source=RTSP, output_format="RGB", snapshot=True),
+                                          snapshot_history=history)
+        assert capture.start()
+        return capture
+
+    def test_snapshot_matches_detected_frame(self, monkeypatch):
+        """감지가 늦게 끝나도 그 프레임의 스냅샷"""
+        capture = self.make_capture(monkeypatch)
+        frames = [capture.get_frame(timeout=0.01) for _ in range(3)]
+
+        snapshot = capture.get_snapshot(timeout=0.01, frame=frames[0])
+        assert snapshot.shape == (8, 12, 3) and (snapshot == frames[0][0, 0, 0]).all()
+        assert (capture.get_snapshot(timeout=0.01, frame=frames[2]) == 3).all()
+        assert (capture.get_snapshot(timeout=0.01) == 3).all()          # frame 없으면 최신
+
+    def test_old_frame_without_snapshot(self, monkeypatch):
+        """보관 범위를 벗어난 프레임/모르는 프레임은 None (모델 프레임 사용)"""
+        capture = self.make_capture(monkeypatch, history=2)
+        old = capture.get_frame(timeout=0.01)
+        for _ in range(3):
+            capture.get_frame(timeout=0.01)
+        assert capture.get_snapshot(timeout=0.01, frame=old) is None
+        assert capture.get_snapshot(timeout=0.01, frame=old.copy()) is None
+        assert capture.get_stats()["snapshot_misses"] == 2
+
+
+class TestRGBInput:
+    """RGB / 이미 축소된 입력 전처리"""
+
+    def test_rgb_input_matches_bgr(self):
+        bgr = np.random.RandomState(0).randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        rgb = np.ascontiguousarray(bgr[..., ::-1])
+
+        expected = PPEDetector(use_simulation=True).preprocess(bgr).copy()
+        detector = PPEDetector(use_simulation=True, input_format="RGB")
+        assert np.array_equal(detector.preprocess(rgb), expected)
+
+    def test_model_ready_frame_only_pads(self):
+        """파이프라인에서 640폭으로 축소된 RGB 프레임은 리사이즈 없이 복사"""
+        frame = np.full((360, 640, 3), 7, dtype=np.uint8)
+        tensor = PPEDetector(use_simulation=True, input_format="RGB").preprocess(frame)
+        assert (tensor[0, 140:500] == 7).all()
+        assert (tensor[0, :140] == PPEDetector.PAD_VALUE).all()
+
+    def test_invalid_format(self):
+        with pytest.raises(ValueError):
+            PPEDetector(use_simulation=True, input_format="YUV")
+        with pytest.raises(ValueError):
+            PPEDetector(use_simulation=True).preprocess(np.zeros((8, 8, 3), np.uint8), input_format="YUV")
+
+    def test_per_frame_format(self):
+        """프레임마다 색 순서를 지정하면 감지기 기본값과 관계없이 같은 텐서"""
+        bgr = np.random.RandomState(1).randint(0, 255, (480, 640, 3), dtype=np.uint8)
+        rgb = np.ascontiguousarray(bgr[..., ::-1])
+        detector = PPEDetector(use_simulation=True)
+        expected = detector.preprocess(bgr).copy()
+        assert np.array_equal(detector.preprocess(rgb, input_format="RGB"), expected)
+
+        seen = []
+        preprocess = detector.preprocess
+        detector.preprocess = lambda frame, **kwargs: seen.append(kwargs.get("input_format")) or \
+            preprocess(frame, **kwargs)
+        detector.detect_batch([bgr, rgb], input_formats=["BGR", "RGB"])
+        detector.detect(rgb, input_format="RGB")
+        assert seen == ["BGR", "RGB", "RGB"]
+
+
+class SnapshotCamera:
+    """RGB 모델 프레임 + 2배 해상도 BGR 스냅샷을 주는 가짜 카메라 (paired 프레임만 짝이 맞음)"""
+
+    output_format = "RGB"
+
+    def __init__(self, snapshot=True):
+        self.snapshot = snapshot
+        self.snapshots = 0
+        self.paired = None
+
+    def get_snapshot(self, timeout=0.5, frame=None):
+        if not self.snapshot or (self.paired is not None and frame is not self.paired):
+            return None
+        self.snapshots += 1
+        return np.zeros((960, 1280, 3), dtype=np.uint8)
+
+
+class TestSystemRGBCapture:
+    """PPEDetectionSystem RGB 캡처 연동"""
+
+    def make_system(self, monkeypatch, camera):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        system._init_camera = lambda: setattr(system, "camera", camera)
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: None
+        system.uploaded = []
+        system.upload_image_to_s3 = lambda image, prefix="", camera_id="": system.uploaded.append(image)
+        return system
+
+    def violations(self, count=1):
+        return [Detection(class_id=2, class_name=name, confidence=0.9, bbox=(100, 100, 200, 200),
+                          is_violation=True) for name in ("no_hardhat", "no_safety_vest")[:count]]
+
+    def test_snapshot_used_for_alert_image(self, monkeypatch):
+        camera = SnapshotCamera()
+        system = self.make_system(monkeypatch, camera)
+        assert system.detector.input_format == "RGB"
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        system.send_violation_alert(self.violations(2), frame)
+        assert [image.shape for image in system.uploaded] == [(960, 1280, 3)] * 2
+        assert camera.snapshots == 1                        # 알림 묶음당 한 번만
+        # 박스가 스냅샷 좌표로 옮겨져 그려짐
+        assert system.uploaded[0][200:400, 200].any() and not system.uploaded[0][100:190, 100].any()
+        system.detector.release()
+
+    def test_unpaired_frame_uses_model_frame(self, monkeypatch):
+        """감지한 프레임의 스냅샷이 없으면 최신 스냅샷 대신 모델 프레임"""
+        camera = SnapshotCamera()
+        system = self.make_system(monkeypatch, camera)
+        camera.paired = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        system.send_violation_alert(self.violations(), np.zeros((480, 640, 3), dtype=np.uint8))
+        assert system.uploaded[0].shape == (480, 640, 3)
+        system.send_violation_alert(self.violations(2)[1:], camera.paired)     # 쿨다운 피해 다른 클래스
+        assert system.uploaded[1].shape == (960, 1280, 3)
+        system.detector.release()
+
+    def test_rgb_frame_converted_without_snapshot(self, monkeypatch):
+        system = self.make_system(monkeypatch, SnapshotCamera(snapshot=False))
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[..., 0] = 255                                 # RGB 빨간색
+        system.overlay.enabled = False
+        system.send_violation_alert(self.violations(), frame)
+        assert system.uploaded[0].shape == (480, 640, 3)
+        assert (system.uploaded[0][..., 2] == 255).all() and not system.uploaded[0][..., 0].any()
+        system.detector.release()
+
+
+class TestSystemMixedFormats:
+    """카메라마다 출력 색 순서가 다른 멀티 카메라"""
+
+    def test_format_passed_per_camera(self, monkeypatch):
+        import json
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+        monkeypatch.setenv("CAMERAS", json.dumps([{"id": "bay1"}, {"id": "bay2"}]))
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        create = system._create_camera
+
+        def create_camera(url, camera_id=""):
+            camera = create(url, camera_id)
+            camera.output_format = "RGB" if camera_id == "bay2" else "BGR"
+            return camera
+        system._create_camera = create_camera
+        assert system.initialize()
+        system.ipc_client = None
+        assert system.camera_formats == {"bay1": "BGR", "bay2": "RGB"}
+        assert system.detector.input_format == "BGR"
+
+        seen = []
+        preprocess = system.detector.preprocess
+        system.detector.preprocess = lambda frame, **kwargs: seen.append(kwargs.get("input_format")) or \
+            preprocess(frame, **kwargs)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        frame[..., 0] = 255
+        system._detect(frame, "bay2")
+        system._detect(frame, "bay1")
+        system.process_frames([(frame, "bay1"), (frame, "bay2")])
+        assert seen == ["RGB", "BGR", "BGR", "RGB"]
+
+        # 위반 이미지도 카메라 형식에 맞춰 BGR로 변환
+        assert system._alert_base_image(frame, "bay1")[0] is frame
+        assert (system._alert_base_image(frame, "bay2")[0][..., 2] == 255).all()
+        system.detector.release()
+
+
+@pytest.mark.skipif(not gst_pipeline.gstreamer_available(), reason="GStreamer not available")
+class TestRuntime:
+    """videotestsrc로 실제 파이프라인 실행"""
+
+    def test_model_ready_frames(self):
+        config = GstPipelineConfig(source="videotestsrc", output_format="RGB", output_width=320,
+                                   test_size=(640, 480))
+        if gst_pipeline.HAS_GST:
+            capture = gst_pipeline.GstCapture(config)
+            assert capture.start()
+            frame = capture.get_frame(timeout=5.0)
+            capture.stop()
+        else:
+            cap = cv2.VideoCapture(build_pipeline(config), cv2.CAP_GSTREAMER)
+            ok, frame = cap.read()
+            cap.release()
+            assert ok
+        assert frame.shape == (240, 320, 3)
+
+    @pytest.mark.skipif(not gst_pipeline.HAS_GST, reason="PyGObject required for snapshot branch")
+    def test_snapshot_branch(self):
+        capture = gst_pipeline.GstCapture(GstPipelineConfig(
+            source="videotestsrc", output_width=320, snapshot=True, test_size=(640, 480)
+        ))
+        assert capture.start()
+        frame = capture.get_frame(timeout=5.0)
+        snapshot = capture.get_snapshot(timeout=5.0)
+        capture.stop()
+        assert frame.shape == (240, 320, 3)
+        assert snapshot.shape == (480, 640, 3)
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+단계별 지연 시간 히스토그램 테스트
+
+테스트 실행:
+    python -m pytest tests/test_latency.py -v
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from latency import LatencyHistogram, LatencyRecorder, ThroughputMeter
+from ppe_detector import PPEDetector
+
+
+class TestLatencyHistogram:
+    """히스토그램 테스트"""
+
+    def test_percentiles_close_to_exact(self):
+        """버킷 보간 백분위수가 실제 값과 10% 이내"""
+        rng = np.random.default_rng(0)
+        samples = rng.lognormal(np.log(0.02), 0.4, 20000)
+        hist = LatencyHistogram()
+        for s in samples:
+            hist.record(s)
+
+        stats = hist.get_stats()
+        assert stats["count"] == 20000
+        for q in (50, 95, 99):
+            exact = np.percentile(samples * 1000, q)
+            assert abs(stats[f"p{q}"] - exact) / exact < 0.1
+        assert stats["max"] == round(samples.max() * 1000, 3)
+
+    def test_outlier_does_not_dominate(self):
+        """느린 프레임 하나는 p50에 영향 없음, max에만 반영"""
+        hist = LatencyHistogram()
+        for _ in range(99):
+            hist.record(0.020)
+        hist.record(2.0)
+
+        stats = hist.get_stats()
+        assert 18 < stats["p50"] <= 20
+        assert stats["max"] == 2000.0
+
+    def test_overflow_bucket(self):
+        hist = LatencyHistogram(bounds=[1.0, 10.0])
+        hist.record(0.5)
+        assert hist.percentile(100) == 500.0
+        assert 10.0 < hist.percentile(50) < 500.0
+
+    def test_interval_stats(self):
+        """interval_stats는 직전 호출 이후 샘플만 집계"""
+        hist = LatencyHistogram()
+        for _ in range(10):
+            hist.record(0.100)
+        assert hist.interval_stats()["count"] == 10
+
+        for _ in range(5):
+            hist.record(0.010)
+        interval = hist.interval_stats()
+        assert interval["count"] == 5
+        assert interval["max"] == 10.0
+        assert hist.interval_stats() == {"count": 0}
+        assert hist.get_stats()["count"] == 15
+
+
+class TestThroughput:
+    """처리량 테스트"""
+
+    def test_rate_over_window(self):
+        meter = ThroughputMeter(window=5)
+        meter._start = 0.0
+        for i in range(100):
+            meter.tick(now=100.0 + i * 0.05)     # 20 fps, 5초
+        assert abs(meter.rate(now=105.0) - 20.0) < 1.0
+
+        # 오래된 구간은 제외
+        assert meter.rate(now=120.0) == 0.0
+
+    def test_recorder_context_and_unknown_stage(self):
+        recorder = LatencyRecorder()
+        with recorder.time("custom"):
+            pass
+        recorder.tick()
+        stats = recorder.get_stats()
+        assert stats["stages_ms"]["custom"]["count"] == 1
+        assert stats["frames"] == 1
+
+
+class TestDetectorLatency:
+    """감지기 연동 테스트"""
+
+    def test_detect_records_stages(self):
+        detector = PPEDetector(use_simulation=True)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(5):
+            detector.detect(frame)
+
+        stats = detector.get_stats()
+        stages = stats["latency"]["stages_ms"]
+        for stage in ("preprocess", "infer", "postprocess", "detect"):
+            assert stages[stage]["count"] == 5
+        assert stages["infer"]["p50"] >= 15    # 시뮬레이션 추론 ~20ms
+        assert stats["average_fps"] > 0
+        assert stats["latency"]["frames"] == 5
+
+
+class TestSystemLatency:
+    """PPEDetectionSystem 상태 보고 테스트"""
+
+    def test_status_includes_latency(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(3):
+            system.process_frame(frame).release()
+
+        system.send_status_update()
+        status = published[-1]
+        assert status["latency"]["stages_ms"]["infer"]["count"] == 3
+        assert status["stats"]["throughput_fps"] > 0
+
+        # 다음 보고는 새 구간만
+        system.send_status_update()
+        assert "infer" not in published[-1]["latency"]["stages_ms"]
+        system.detector.release()
+
+    def test_sequential_end_to_end_from_capture(self, monkeypatch):
+        """순차 모드 종단 간 지연도 파이프라인 모드처럼 캡처 시각부터"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: None
+        system.initialize = lambda: True
+
+        class StaleCamera:
+            """0.5초 전에 캡처된 프레임을 3번 주고 루프 종료"""
+            resolution = (640, 480)
+
+            def __init__(self):
+                self.reads = 0
+
+            def start(self):
+                return True
+
+            def stop(self):
+                pass
+
+            def read_latest(self, timeout=1.0):
+                self.reads += 1
+                if self.reads > 3:
+                    system.running = False
+                    return None
+                return np.zeros((480, 640, 3), dtype=np.uint8), self.reads, time.time() - 0.5
+
+        system.camera = StaleCamera()
+        system.run()
+
+        e2e = system.latency.histogram("end_to_end")
+        assert e2e.count == 3
+        assert e2e.percentile(0) >= 450
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+적응형 부하 조절 (LoadShedder) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_load_shedder.py -v
+"""
+
+import sys
+import os
+import threading
+import time
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from load_shedder import LEVELS, LoadShedder, LoadShedConfig, CpuMonitor
+from ppe_detector import PPEDetector
+from overlay import OverlayRenderer
+from s3_uploader import AsyncS3Uploader
+
+
+FRAME = np.full((480, 640, 3), 100, dtype=np.uint8)
+
+
+def fast_config(**kwargs):
+    params = dict(latency_target_ms=100, queue_target=4, cpu_target=0.9,
+                  degrade_after=2, recover_after=3, min_dwell=0)
+    params.update(kwargs)
+    return LoadShedConfig(**params)
+
+
+def run(shedder, latency, queue_depth=0, cpu_load=None, steps=1, start=0.0):
+    """steps초 동안 매초 지연 시간 기록 후 판정"""
+    now = start
+    for _ in range(steps):
+        for _ in range(10):
+            shedder.observe(latency)
+        now += 1.0
+        shedder.evaluate(queue_depth=queue_depth, cpu_load=cpu_load, now=now)
+    return now
+
+
+class TestLoadShedder:
+    """단계 판정 테스트"""
+
+    def test_degrade_and_recover_in_order(self):
+        events = []
+        shedder = LoadShedder(fast_config(), on_change=lambda old, new, reason: events.append((old, new)))
+
+        now = run(shedder, 0.3, steps=1)
+        assert shedder.level == 0           # 한 번의 과부하로는 바꾸지 않음
+        now = run(shedder, 0.3, steps=20, start=now)
+        assert shedder.level_name == "defer_uploads"
+        assert events == [(0, 1), (1, 2), (2, 3), (3, 4)]
+
+        run(shedder, 0.01, steps=30, start=now)
+        assert shedder.level == 0
+        assert events[4:] == [(4, 3), (3, 2), (2, 1), (1, 0)]
+
+        stats = shedder.get_stats()
+        assert stats["degrades"] == 4 and stats["recoveries"] == 4
+        assert [c["to"] for c in stats["changes"]][:2] == ["reduce_rate", "small_input"]
+        assert "latency p95" in stats["changes"][0]["reason"]
+
+    def test_each_signal_triggers(self):
+        shedder = LoadShedder(fast_config())
+        run(shedder, 0.01, queue_depth=10, steps=2)
+        assert shedder.level == 1 and "queue 10" in shedder.changes[-1]["reason"]
+
+        shedder = LoadShedder(fast_config())
+        run(shedder, 0.01, cpu_load=0.99, steps=2)
+        assert shedder.level == 1 and "cpu" in shedder.changes[-1]["reason"]
+
+    def test_hysteresis_band(self):
+        """목표치 아래지만 여유 구간이 아니면 단계 유지"""
+        shedder = LoadShedder(fast_config())
+        now = run(shedder, 0.3, steps=2)
+        assert shedder.level == 1
+        run(shedder, 0.08, steps=20, start=now)     # 80ms: 목표(100) 미만, 복구 기준(60) 이상
+        assert shedder.level == 1
+
+    def test_min_dwell(self):
+        shedder = LoadShedder(fast_config(min_dwell=5.0))
+        now = run(shedder, 0.3, steps=6, start=10.0)
+        assert shedder.level == 1
+        run(shedder, 0.3, steps=5, start=now)
+        assert shedder.level == 2
+
+    def test_skip_levels(self):
+        shedder = LoadShedder(fast_config(), skip_levels=["small_input", "defer_uploads"])
+        now = run(shedder, 0.3, steps=20)
+        assert shedder.level_name == "no_overlay"
+        assert shedder.active("reduce_rate") and not shedder.active("small_input")
+        assert [c["to"] for c in shedder.changes] == ["reduce_rate", "no_overlay"]
+
+        run(shedder, 0.01, steps=30, start=now)
+        assert [c["to"] for c in shedder.changes][2:] == ["reduce_rate", "normal"]
+
+        with pytest.raises(ValueError):
+            LoadShedder(skip_levels=["turbo"])
+
+    def test_callback_error_does_not_stop(self):
+        def fail(old, new, reason):
+            raise RuntimeError("boom")
+        shedder = LoadShedder(fast_config(), on_change=fail)
+        run(shedder, 0.3, steps=2)
+        assert shedder.level == 1
+
+
+class TestCpuMonitor:
+    """CPU 사용률 측정 테스트"""
+
+    def test_proc_stat_delta(self, tmp_path):
+        stat = tmp_path / "stat"
+        stat.write_text("cpu  100 0 100 800 0 0 0 0 0 0\ncpu0 1 2 3 4\n")
+        monitor = CpuMonitor(str(stat))
+        # 다음 구간: 사용 150, 유휴 50
+        stat.write_text("cpu  200 0 150 850 0 0 0 0 0 0\n")
+        assert monitor.sample() == pytest.approx(0.75)
+        assert monitor.sample() is None             # 변화 없음
+
+    def test_fallback_loadavg(self, tmp_path):
+        monitor = CpuMonitor(str(tmp_path / "missing"))
+        value = monitor.sample()
+        assert value is None or value >= 0.0
+
+
+class TestShedActions:
+    """단계별 조치 테스트"""
+
+    def test_detector_input_size_simulation(self):
+        detector = PPEDetector(use_simulation=True)
+        assert detector.reload(input_size=(416, 416))
+        assert detector.input_size == (416, 416)
+        assert detector.preprocess(FRAME).shape == (1, 416, 416, 3)
+        assert detector.detect(FRAME)
+        assert detector.reload(input_size=(640, 640)) and detector.input_size == (640, 640)
+
+    def test_fixed_model_requires_model_path(self):
+        detector = PPEDetector(use_simulation=False)
+        assert not detector.reload(input_size=(416, 416))
+        assert detector.input_size == (640, 640)
+
+    def test_reload_with_input_size_warms_new_shape(self):
+        shapes = []
+
+        class Runtime:
+            def inference(self, inputs):
+                shapes.append(inputs[0].shape)
+                return [np.zeros((1, 100, 14), dtype=np.float32)]
+
+            def release(self):
+                pass
+
+        detector = PPEDetector(use_simulation=True, sim_runtime_factory=lambda worker_id: Runtime())
+        assert detector.reload(model_path="/models/small.rknn", input_size=(320, 320), warmup_runs=1)
+        assert shapes == [(1, 320, 320, 3)]
+        detector.detect(FRAME)
+        assert shapes[-1] == (1, 320, 320, 3)
+        assert detector.letterbox_info(FRAME.shape).resized == (320, 240)
+
+    def test_pool_reload_warmup_beyond_in_flight_limit(self):
+        """풀 모드 입력 크기 교체 워밍업이 max_in_flight를 넘어도 멈추지 않음"""
+        detector = PPEDetector(use_simulation=True, num_npu_workers=2)
+        done = threading.Event()
+        thread = threading.Thread(
+            target=lambda: detector.reload(model_path="/models/small.rknn", input_size=(320, 320),
+                                           warmup_runs=3) and done.set(),
+            daemon=True
+        )
+        thread.start()
+        thread.join(timeout=5.0)
+        assert done.is_set()
+        assert detector.input_size == (320, 320)
+        assert detector.pool.get_stats()["submitted"] == 6
+        assert detector.detect(FRAME) is not None
+        detector.release()
+
+    def test_overlay_disabled(self):
+        renderer = OverlayRenderer(PPEDetector(use_simulation=True), calibrate_every=1)
+        received = []
+        renderer.add_consumer(received.append)
+        renderer.enabled = False
+        renderer.annotate(FRAME, [])
+        assert received == [] and renderer.get_stats()["suppressed"] == 1
+
+        renderer.enabled = True
+        renderer.annotate(FRAME, [])
+        assert len(received) == 1
+
+    def test_uploader_pause(self):
+        class Client:
+            def __init__(self):
+                self.keys = []
+
+            def put_object(self, **kwargs):
+                self.keys.append(kwargs["Key"])
+
+        client = Client()
+        uploader = AsyncS3Uploader(client, bucket="bucket", num_workers=1)
+        uploader.start()
+        uploader.pause()
+        assert uploader.submit("a.jpg", data=b"x")
+        time.sleep(0.3)
+        assert client.keys == [] and uploader.get_stats()["paused"]
+
+        uploader.resume()
+        deadline = time.time() + 2.0
+        while not client.keys and time.time() < deadline:
+            time.sleep(0.02)
+        assert client.keys == ["a.jpg"]
+
+        # 보류 중에 정지하면 남은 작업을 처리한 뒤 종료
+        uploader.pause()
+        uploader.submit("b.jpg", data=b"x")
+        uploader.stop(timeout=2.0)
+        assert client.keys == ["a.jpg", "b.jpg"]
+
+
+class TestSystemLoadShed:
+    """PPEDetectionSystem 부하 조절"""
+
+    def make_system(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+        monkeypatch.setenv("LOAD_SHED", "true")
+        monkeypatch.setenv("LOAD_SHED_MAX_FPS", "5")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.published = []
+        system.publish_mqtt = lambda topic, message: system.published.append(message)
+
+        # 업로드 보류 단계 확인용 업로더
+        class Client:
+            def put_object(self, **kwargs):
+                pass
+        system.uploader = AsyncS3Uploader(Client(), bucket="bucket", num_workers=1)
+        system.uploader.start()
+        system.load_shedder.config = fast_config()
+        system.load_shedder.skip_levels.discard("defer_uploads")
+        return system
+
+    def test_levels_apply_and_report(self, monkeypatch):
+        system = self.make_system(monkeypatch)
+        shedder = system.load_shedder
+
+        now = run(shedder, 0.3, steps=2)
+        assert shedder.level_name == "reduce_rate"
+        assert system.published[-1]["load_shed"]["state"] == "reduce_rate"
+
+        # 카메라별 추론 빈도 제한 (최대 5 FPS)
+        assert system._rate_allowed("cam1")
+        assert not system._rate_allowed("cam1")
+        assert system._rate_allowed("cam2")
+
+        now = run(shedder, 0.3, steps=2, start=now)
+        assert system.reloader.wait_idle(timeout=2.0)
+        assert system.detector.input_size == system.load_shed_input_size
+
+        now = run(shedder, 0.3, steps=4, start=now)
+        assert shedder.level_name == "defer_uploads"
+        assert not system.overlay.enabled and system.uploader.paused
+
+        # 시각화 생략 중에도 위반 알림은 즉시 발행
+        violation = PPEDetector(use_simulation=True)._simulate_detections(FRAME.shape)[0]
+        violation.is_violation = True
+        system.send_violation_alert([violation], FRAME, camera_id="cam1")
+        assert any(m.get("event_type") == "PPE_VIOLATION" for m in system.published)
+
+        # 역순 복구
+        run(shedder, 0.01, steps=40, start=now)
+        assert shedder.level == 0
+        assert system.reloader.wait_idle(timeout=2.0)
+        assert system.overlay.enabled and not system.uploader.paused
+        assert system.detector.input_size == system.base_input_size
+        assert system._rate_allowed("cam1") and system._rate_allowed("cam1")
+
+        system.send_status_update()
+        status = system.published[-1]["load_shed"]
+        assert [c["to"] for c in status["changes"]] == list(LEVELS[1:]) + list(reversed(LEVELS[:-1]))
+        assert status["frames_skipped"] == 1
+
+        from metrics_server import MetricsWriter
+        writer = MetricsWriter()
+        system._collect_metrics(writer)
+        assert "ppe_load_shed_level 0" in writer.render()
+
+        system.uploader.stop()
+        system.reloader.stop()
+        system.detector.release()
+
+    def test_disabled_by_default(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        assert system.load_shedder is None
+        assert system._rate_allowed("cam1") and system._rate_allowed("cam1")
+        system.reloader.stop()
+        system.detector.release()
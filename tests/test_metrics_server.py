@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Prometheus 메트릭 엔드포인트 테스트
+
+테스트 실행:
+    python -m pytest tests/test_metrics_server.py -v
+"""
+
+import sys
+import os
+import urllib.request
+import urllib.error
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from latency import LatencyHistogram
+from metrics_server import MetricsServer, MetricsWriter, ProcessStats
+
+
+def parse_samples(text):
+    """{'name{labels}': value} (주석 제외)"""
+    samples = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            key, value = line.rsplit(" ", 1)
+            samples[key] = float(value)
+    return samples
+
+
+def scrape(server, path="/metrics"):
+    return urllib.request.urlopen(f"http://127.0.0.1:{server.port}{path}", timeout=5)
+
+
+class TestMetricsWriter:
+    """텍스트 형식 테스트"""
+
+    def test_families_grouped(self):
+        m = MetricsWriter()
+        m.counter("x_total", "X", 1, {"result": "ok"})
+        m.gauge("y", "Y", 2.5)
+        m.counter("x_total", "X", 3, {"result": "failed"})
+        text = m.render()
+
+        assert text.count("# TYPE x_total counter") == 1
+        assert parse_samples(text) == {
+            'x_total{result="ok"}': 1, 'x_total{result="failed"}': 3, "y": 2.5
+        }
+
+    def test_label_escaping(self):
+        m = MetricsWriter()
+        m.gauge("g", "G", 1, {"camera": 'a"b\\c'})
+        assert 'g{camera="a\\"b\\\\c"} 1' in m.render()
+
+    def test_histogram_cumulative_seconds(self):
+        hist = LatencyHistogram()
+        for seconds in (0.001, 0.010, 0.010, 0.100, 100.0):
+            hist.record(seconds)
+
+        m = MetricsWriter()
+        m.histogram("lat_seconds", "Latency", hist, {"stage": "infer"})
+        samples = parse_samples(m.render())
+
+        buckets = [(float(k.split('le="')[1].rstrip('"}').replace("+Inf", "inf")), v)
+                   for k, v in samples.items() if k.startswith("lat_seconds_bucket")]
+        counts = [v for _, v in buckets]
+        assert counts == sorted(counts)
+        assert dict(buckets)[float("inf")] == 5
+        # 0.02초 경계 이하 누적은 3개
+        assert max(v for le, v in buckets if le <= 0.02) == 3
+        assert samples['lat_seconds_count{stage="infer"}'] == 5
+        assert samples['lat_seconds_sum{stage="infer"}'] == pytest.approx(100.121)
+
+
+class TestProcessStats:
+    def test_reads_rss_and_cpu(self):
+        stats = ProcessStats().read()
+        assert stats["rss_bytes"] > 1024 * 1024
+        assert stats["cpu_seconds"] > 0
+        assert stats["threads"] >= 1
+
+
+class TestMetricsServer:
+    """HTTP 서버 테스트"""
+
+    def test_scrape_and_cache(self):
+        calls = []
+
+        def collect(m):
+            calls.append(1)
+            m.counter("ppe_frames_processed_total", "Frames", len(calls))
+
+        server = MetricsServer(collect, host="127.0.0.1", port=0, cache_ttl=60)
+        server.start()
+        try:
+            response = scrape(server)
+            assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+            samples = parse_samples(response.read().decode())
+            assert samples["ppe_frames_processed_total"] == 1
+            assert "process_resident_memory_bytes" in samples
+
+            # cache_ttl 안에서는 다시 수집하지 않음
+            scrape(server).read()
+            assert len(calls) == 1
+            assert server.get_stats()["scrapes"] == 2
+        finally:
+            server.stop()
+
+    def test_errors(self):
+        def collect(m):
+            raise RuntimeError("boom")
+
+        server = MetricsServer(collect, host="127.0.0.1", port=0)
+        server.start()
+        try:
+            with pytest.raises(urllib.error.HTTPError) as e:
+                scrape(server)
+            assert e.value.code == 500
+            with pytest.raises(urllib.error.HTTPError) as e:
+                scrape(server, "/nope")
+            assert e.value.code == 404
+            assert server.get_stats()["errors"] == 1
+        finally:
+            server.stop()
+
+
+class TestSystemMetrics:
+    """PPEDetectionSystem 수집 함수 테스트"""
+
+    def test_system_metrics(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("MOTION_GATE", "true")
+        monkeypatch.setenv("MOTION_MAX_INTERVAL", "60")
+        monkeypatch.setenv("MOTION_HOLD_TIME", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+        assert system.metrics_server is None  # METRICS_PORT 미설정
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(3):
+            if system._motion_allowed(frame):
+                system.process_frame(frame).release()
+
+        server = MetricsServer(system._collect_metrics, host="127.0.0.1", port=0)
+        server.start()
+        try:
+            samples = parse_samples(scrape(server).read().decode())
+        finally:
+            server.stop()
+            system.detector.release()
+
+        assert samples["ppe_frames_processed_total"] == system.frame_count
+        assert samples['ppe_stage_latency_seconds_count{stage="infer"}'] == system.frame_count
+        assert samples['ppe_camera_reconnects_total{camera="default"}'] == 0
+        assert samples['ppe_motion_skipped_frames_total{camera="default"}'] == 2
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+무중단 모델 교체 (PPEDetector.reload, ModelReloader, ModelWatcher) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_model_reload.py -v
+"""
+
+import sys
+import os
+import threading
+import time
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import PPEDetector
+from model_reloader import ModelReloader, ModelWatcher, config_to_reload
+
+
+FRAME = np.full((480, 640, 3), 100, dtype=np.uint8)
+
+
+class CountingRuntime:
+    """추론/해제 호출을 기록하는 가짜 런타임 (gate가 있으면 추론을 멈춤)"""
+
+    def __init__(self, name, gate=None, fail=False):
+        self.name = name
+        self.gate = gate
+        self.fail = fail
+        self.calls = 0
+        self.released = False
+        self.started = threading.Event()
+
+    def inference(self, inputs):
+        if self.released:
+            raise RuntimeError(f"{self.name} used after release")
+        self.calls += 1
+        self.started.set()
+        if self.gate is not None:
+            self.gate.wait(timeout=5.0)
+        if self.fail:
+            raise RuntimeError("bad model")
+        return [np.zeros((1, 100, 14), dtype=np.float32)]
+
+    def release(self):
+        self.released = True
+
+
+class RuntimeFactory:
+    """생성한 런타임을 순서대로 보관하는 팩토리"""
+
+    def __init__(self):
+        self.runtimes = []
+        self.gate = None
+        self.fail = False
+
+    def __call__(self, worker_id):
+        runtime = CountingRuntime(f"rt{len(self.runtimes)}", gate=self.gate, fail=self.fail)
+        self.runtimes.append(runtime)
+        return runtime
+
+
+def make_detector(factory, **kwargs):
+    return PPEDetector(use_simulation=True, sim_runtime_factory=factory, **kwargs)
+
+
+class TestDetectorReload:
+    """PPEDetector.reload 테스트"""
+
+    def test_swap_and_release(self):
+        factory = RuntimeFactory()
+        detector = make_detector(factory)
+        old = detector.rknn
+
+        assert detector.reload(model_path="/models/v2.rknn", conf_threshold=0.6, warmup_runs=2)
+        new = detector.rknn
+        assert new is not old and old.released and not new.released
+        assert new.calls == 2                   # 교체 전 워밍업
+        assert detector.model_path == "/models/v2.rknn"
+        assert detector.conf_threshold == 0.6
+        assert detector.model_generation == 1
+
+        detector.detect(FRAME)
+        assert new.calls == 3 and old.calls == 0
+        stats = detector.get_stats()
+        assert stats["reloads"] == 1 and stats["model_generation"] == 1
+
+    def test_old_runtime_released_after_in_flight(self):
+        factory = RuntimeFactory()
+        factory.gate = threading.Event()
+        detector = make_detector(factory)
+        old = detector.rknn
+        input_data = detector.preprocess(FRAME)
+
+        # 이전 런타임에서 추론 진행 중
+        worker = threading.Thread(target=detector.infer, args=(input_data,))
+        worker.start()
+        assert old.started.wait(timeout=2.0)
+
+        factory.gate = None
+        swapped = threading.Event()
+        reload_thread = threading.Thread(
+            target=lambda: detector.reload(model_path="/models/v2.rknn", warmup_runs=1) and swapped.set()
+        )
+        reload_thread.start()
+
+        # 교체는 끝났지만 진행 중 추론이 끝날 때까지 해제하지 않음
+        deadline = time.time() + 2.0
+        while detector.model_generation == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        assert detector.rknn is not old
+        detector.infer(input_data)              # 새 추론은 새 런타임에서
+        assert detector.rknn.calls == 2
+        assert not old.released and not swapped.is_set()
+
+        old.gate.set()
+        worker.join(timeout=2.0)
+        reload_thread.join(timeout=2.0)
+        assert swapped.is_set() and old.released
+
+    def test_load_failure_keeps_model(self):
+        detector = PPEDetector(use_simulation=False)
+        detector.rknn = CountingRuntime("current")
+
+        # RKNN Lite가 없는 환경에서는 로드가 실패함
+        assert not detector.reload(model_path="/models/missing.rknn", conf_threshold=0.9)
+        assert detector.rknn.name == "current" and not detector.rknn.released
+        assert detector.conf_threshold == 0.5
+        assert detector.reload_failures == 1 and detector.model_generation == 0
+
+    def test_warmup_failure_keeps_model(self):
+        factory = RuntimeFactory()
+        detector = make_detector(factory)
+        old = detector.rknn
+
+        factory.fail = True
+        assert not detector.reload(model_path="/models/broken.rknn")
+        assert detector.rknn is old and not old.released
+        assert factory.runtimes[-1].released
+        assert detector.model_path == ""
+
+    def test_thresholds_only(self):
+        factory = RuntimeFactory()
+        detector = make_detector(factory)
+        assert detector.reload(conf_threshold=0.7, nms_threshold=0.3)
+        assert len(factory.runtimes) == 1
+        assert (detector.conf_threshold, detector.nms_threshold) == (0.7, 0.3)
+        assert detector.model_generation == 0
+
+    def test_pool_result_from_previous_pool(self):
+        """교체 전에 제출한 작업은 교체 후에도 이전 풀에서 결과를 받음"""
+        factory = RuntimeFactory()
+        detector = make_detector(factory, num_npu_workers=2)
+        old_pool = detector.pool
+        seq = detector.submit(FRAME)
+
+        done = threading.Event()
+        reload_thread = threading.Thread(
+            target=lambda: detector.reload(model_path="/models/v2.rknn") and done.set()
+        )
+        reload_thread.start()
+        deadline = time.time() + 2.0
+        while detector.pool is old_pool and time.time() < deadline:
+            time.sleep(0.01)
+        assert detector.pool is not old_pool
+
+        # 결과를 받기 전에는 이전 풀을 해제하지 않음
+        assert not done.wait(timeout=0.1)
+        result = detector.get_result(timeout=2.0)
+        assert result is not None and result.seq == seq
+
+        reload_thread.join(timeout=2.0)
+        assert done.is_set()
+        assert detector.detect(FRAME) is not None
+        detector.release()
+
+
+class TestModelReloader:
+    """ModelReloader 테스트"""
+
+    def test_background_reload(self):
+        factory = RuntimeFactory()
+        detector = make_detector(factory)
+        reloader = ModelReloader(detector)
+        reloader.start()
+
+        assert reloader.request(model_path="/models/v2.rknn")
+        assert not reloader.request()
+        assert reloader.wait_idle(timeout=2.0)
+        reloader.stop()
+
+        stats = reloader.get_stats()
+        assert stats["generation"] == 1 and stats["completed"] == 1
+        assert stats["model_path"] == "/models/v2.rknn"
+
+    def test_requests_coalesce(self):
+        factory = RuntimeFactory()
+        detector = make_detector(factory)
+        reloader = ModelReloader(detector)
+
+        # 스레드 시작 전 요청은 합쳐져서 한 번만 교체
+        reloader.request(model_path="/models/v2.rknn")
+        reloader.request(model_path="/models/v3.rknn", conf_threshold=0.4)
+        reloader.start()
+        assert reloader.wait_idle(timeout=2.0)
+        reloader.stop()
+
+        assert detector.model_generation == 1
+        assert detector.model_path == "/models/v3.rknn" and detector.conf_threshold == 0.4
+        assert reloader.requests == 2 and reloader.completed == 1
+
+    def test_config_to_reload(self):
+        detector = PPEDetector(use_simulation=True, model_path="/models/v1.rknn")
+        assert config_to_reload({"ModelPath": "/models/v1.rknn", "ConfThreshold": "0.5"}, detector) == {}
+        assert config_to_reload({"ModelPath": "/models/v2.rknn", "NmsThreshold": "0.3", "RtspUrl": ""},
+                                detector) == {"model_path": "/models/v2.rknn", "nms_threshold": 0.3}
+        with pytest.raises(ValueError):
+            config_to_reload({"ConfThreshold": "high"}, detector)
+
+
+class TestModelWatcher:
+    """ModelWatcher 테스트"""
+
+    def test_change_after_stable(self, tmp_path):
+        model = tmp_path / "model.rknn"
+        model.write_bytes(b"v1")
+        changes = []
+        watcher = ModelWatcher(str(model), on_change=changes.append)
+
+        assert not watcher.check()
+        model.write_bytes(b"v2-new")
+        os.utime(model, (time.time() + 10, time.time() + 10))
+
+        # 첫 확인에서는 복사 중일 수 있으므로 대기, 다음 확인에서 확정
+        assert not watcher.check()
+        assert watcher.check()
+        assert changes == [str(model)]
+        assert not watcher.check()
+
+    def test_missing_file_ignored(self, tmp_path):
+        changes = []
+        watcher = ModelWatcher(str(tmp_path / "missing.rknn"), on_change=changes.append)
+        assert not watcher.check() and not watcher.check()
+
+        new_model = tmp_path / "v2.rknn"
+        new_model.write_bytes(b"v2")
+        watcher.set_path(str(new_model))
+        assert not watcher.check() and not watcher.check()
+        assert changes == []
+
+    def test_thread_triggers_reload(self, tmp_path):
+        model = tmp_path / "model.rknn"
+        model.write_bytes(b"v1")
+        detector = make_detector(RuntimeFactory())
+        reloader = ModelReloader(detector)
+        reloader.start()
+        watcher = ModelWatcher(str(model), on_change=lambda path: reloader.request(model_path=path),
+                               interval=0.05)
+        watcher.start()
+
+        model.write_bytes(b"v2-new")
+        os.utime(model, (time.time() + 10, time.time() + 10))
+        deadline = time.time() + 2.0
+        while detector.model_generation == 0 and time.time() < deadline:
+            time.sleep(0.02)
+        watcher.stop()
+        reloader.stop()
+        assert detector.model_generation == 1
+        assert detector.model_path == str(model)
+
+
+class TestSystemReload:
+    """PPEDetectionSystem 설정 변경 적용"""
+
+    def test_apply_config(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+        assert system.reloader is not None and system.model_watcher is None
+
+        assert not system._apply_config({"ConfThreshold": "0.5"})
+        assert not system._apply_config({"ConfThreshold": "abc"})
+        assert system._apply_config({"ModelPath": "/models/v2.rknn", "ConfThreshold": 0.65})
+        assert system.reloader.wait_idle(timeout=2.0)
+        assert system.detector.model_path == "/models/v2.rknn"
+        assert system.detector.conf_threshold == 0.65
+
+        system.send_status_update()
+        assert published[-1]["model"]["generation"] == 1
+
+        from metrics_server import MetricsWriter
+        writer = MetricsWriter()
+        system._collect_metrics(writer)
+        assert "ppe_model_generation 1" in writer.render()
+
+        system.reloader.stop()
+        system.detector.release()
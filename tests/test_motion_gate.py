@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+움직임 게이트 테스트
+
+테스트 실행:
+    python -m pytest tests/test_motion_gate.py -v
+"""
+
+import sys
+import os
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from motion_gate import MotionGate
+
+
+FPS = 15
+
+
+def static_frame():
+    return np.full((360, 640, 3), 80, dtype=np.uint8)
+
+
+def moving_frame(step):
+    frame = static_frame()
+    x = 50 + step * 20
+    frame[100:250, x:x + 60] = 230
+    return frame
+
+
+def run(gate, frames, start=1000.0):
+    decisions = []
+    for i, frame in enumerate(frames):
+        decisions.append(gate.should_infer(frame, now=start + i / FPS))
+    return decisions
+
+
+class TestMotionGate:
+    """게이트 판단 테스트"""
+
+    def test_static_scene_throttled(self):
+        """정지 장면은 max_interval마다 한 번만 추론"""
+        gate = MotionGate(max_interval=1.0, hold_time=0.5)
+        decisions = run(gate, [static_frame() for _ in range(FPS * 10)])
+
+        # 첫 프레임(기준 없음) 후 hold_time, 이후 1초마다
+        assert 9 <= sum(decisions) <= 20
+        assert gate.get_stats()["skip_ratio"] > 0.85
+        assert gate.get_stats()["state"] == "idle"
+
+    def test_motion_restores_full_rate(self):
+        """움직임이 생기면 즉시 모든 프레임 추론"""
+        gate = MotionGate(max_interval=5.0, hold_time=0.5)
+        frames = [static_frame() for _ in range(FPS * 3)] + [moving_frame(i) for i in range(20)]
+        decisions = run(gate, frames)
+
+        assert all(decisions[FPS * 3:])
+        assert gate.get_stats()["state"] == "active"
+
+    def test_hold_time_after_motion(self):
+        """움직임이 멈춘 후 hold_time 동안 전체 속도 유지"""
+        gate = MotionGate(max_interval=10.0, hold_time=1.0)
+        frames = [moving_frame(i) for i in range(10)] + [moving_frame(9)] * (FPS * 2)
+        decisions = run(gate, frames)
+
+        after = decisions[10:]
+        assert all(after[:FPS - 1])
+        assert not any(after[FPS + 1:])
+
+    def test_min_interval_caps_rate(self):
+        """움직임이 있어도 min_interval보다 자주 추론하지 않음"""
+        gate = MotionGate(min_interval=0.5, hold_time=1.0)
+        decisions = run(gate, [moving_frame(i % 20) for i in range(FPS * 2)])
+
+        assert sum(decisions) <= 5
+
+    def test_small_noise_ignored(self):
+        """임계값보다 작은 밝기 변화/잡음은 움직임이 아님"""
+        rng = np.random.default_rng(0)
+        gate = MotionGate()
+        gate.measure(static_frame())
+
+        noisy = (static_frame().astype(np.int16) + rng.integers(-8, 9, (360, 640, 3)))
+        score = gate.measure(np.clip(noisy, 0, 255).astype(np.uint8))
+        assert score < gate.threshold
+
+    def test_resolution_change(self):
+        """해상도가 바뀌면 버퍼 재할당"""
+        gate = MotionGate()
+        gate.measure(static_frame())
+        assert gate.measure(np.zeros((720, 1280, 3), dtype=np.uint8)) == 1.0
+
+
+class TestSystemMotionGate:
+    """PPEDetectionSystem 움직임 게이트 연동 테스트"""
+
+    def test_skip_ratio_in_status(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("MOTION_GATE", "true")
+        monkeypatch.setenv("MOTION_MAX_INTERVAL", "60")
+        monkeypatch.setenv("MOTION_HOLD_TIME", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+
+        frame = static_frame()
+        allowed = [system._motion_allowed(frame, "bay1") for _ in range(10)]
+        assert allowed[0] and not any(allowed[1:])
+
+        system.send_status_update()
+        assert published[-1]["motion_gate"]["bay1"]["skip_ratio"] == 0.9
+        system.detector.release()
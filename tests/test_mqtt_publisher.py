@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+비동기 MQTT 발행기 테스트
+
+LocalIPCClient로 Greengrass IPC 없이 검증합니다.
+
+테스트 실행:
+    python -m pytest tests/test_mqtt_publisher.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from mqtt_publisher import AsyncMQTTPublisher, LocalIPCClient
+
+
+class ManualIPCClient(LocalIPCClient):
+    """응답 Future를 테스트가 직접 완료시키는 IPC 대역"""
+
+    def __init__(self):
+        super().__init__()
+        self.pending = []
+        self.pending_lock = threading.Lock()
+
+    def _complete(self, request, future):
+        with self.pending_lock:
+            self.pending.append((request, future))
+
+    def release_all(self):
+        with self.pending_lock:
+            pending, self.pending = self.pending, []
+        for request, future in pending:
+            LocalIPCClient._complete(self, request, future)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestAsyncMQTTPublisher:
+    """발행기 테스트"""
+
+    def test_publish_does_not_block(self):
+        """느린 IPC에서도 publish는 즉시 반환"""
+        client = LocalIPCClient(latency=0.2)
+        publisher = AsyncMQTTPublisher(client, max_in_flight=4)
+        publisher.start()
+
+        start = time.time()
+        for i in range(10):
+            assert publisher.publish("t/events", {"n": i})
+        assert time.time() - start < 0.05
+
+        assert publisher.flush(timeout=5.0)
+        publisher.stop()
+        assert sorted(m["n"] for _, m in client.published) == list(range(10))
+        assert publisher.get_stats()["latency_ms"]["p50"] >= 150
+
+    def test_max_in_flight(self):
+        """동시 진행 publish 수 제한"""
+        client = ManualIPCClient()
+        publisher = AsyncMQTTPublisher(client, max_in_flight=3)
+        publisher.start()
+
+        for i in range(10):
+            publisher.publish("t/events", {"n": i})
+        assert wait_for(lambda: len(client.pending) == 3)
+        time.sleep(0.05)
+        assert len(client.pending) == 3
+        assert publisher.get_stats()["in_flight"] == 3
+
+        while publisher.backlog:
+            client.release_all()
+            time.sleep(0.01)
+        publisher.stop()
+        assert sorted(m["n"] for _, m in client.published) == list(range(10))
+
+    def test_status_coalesced(self):
+        """같은 토픽의 상태 메시지는 최신 것만 전송"""
+        client = ManualIPCClient()
+        publisher = AsyncMQTTPublisher(client, max_in_flight=1)
+        publisher.start()
+
+        publisher.publish("t/events", {"n": 0})
+        assert wait_for(lambda: len(client.pending) == 1)
+        for i in range(5):
+            publisher.publish("t/status", {"status": i}, kind="status")
+
+        while publisher.backlog:
+            client.release_all()
+            time.sleep(0.01)
+        publisher.stop()
+
+        assert [m for t, m in client.published if t == "t/status"] == [{"status": 4}]
+        assert publisher.get_stats()["coalesced_status"] == 4
+
+    def test_alert_burst_batched(self):
+        """알림이 몰리면 하나의 페이로드로 묶음"""
+        client = ManualIPCClient()
+        publisher = AsyncMQTTPublisher(client, max_in_flight=1, batch_max=4)
+        publisher.start()
+
+        publisher.publish("t/alerts", {"device_id": "d", "n": 0}, kind="alert")
+        assert wait_for(lambda: len(client.pending) == 1)
+        for i in range(1, 6):
+            publisher.publish("t/alerts", {"device_id": "d", "n": i}, kind="alert")
+        publisher.publish("t/events", {"n": "event"})
+
+        while publisher.backlog:
+            client.release_all()
+            time.sleep(0.01)
+        publisher.stop()
+
+        payloads = [m for t, m in client.published if t == "t/alerts"]
+        assert payloads[0] == {"device_id": "d", "n": 0}
+        assert payloads[1]["event_type"] == "PPE_VIOLATION_BATCH"
+        assert [a["n"] for a in payloads[1]["alerts"]] == [1, 2, 3, 4]
+        assert payloads[2] == {"device_id": "d", "n": 5}
+        assert publisher.get_stats()["batched_alerts"] == 4
+
+    def test_failure_callback(self):
+        """발행 실패 집계 및 콜백"""
+        failures = []
+        publisher = AsyncMQTTPublisher(
+            LocalIPCClient(latency=0.0, fail=True),
+            on_failure=lambda topic, message, error: failures.append(topic)
+        )
+        publisher.start()
+        publisher.publish("t/events", {"n": 1})
+
+        assert wait_for(lambda: publisher.failed == 1)
+        publisher.stop()
+        assert failures == ["t/events"]
+
+    def test_publish_timeout(self):
+        """응답이 오지 않는 publish는 시간 초과 처리"""
+        client = ManualIPCClient()
+        publisher = AsyncMQTTPublisher(client, publish_timeout=0.1)
+        publisher.start()
+        publisher.publish("t/events", {"n": 1})
+
+        assert wait_for(lambda: publisher.failed == 1, timeout=2.0)
+        assert publisher.get_stats()["in_flight"] == 0
+        publisher.stop()
+
+    def test_queue_overflow_drops_oldest(self):
+        """큐가 가득 차면 가장 오래된 메시지를 버림"""
+        publisher = AsyncMQTTPublisher(LocalIPCClient(), queue_size=3)
+        for i in range(5):
+            publisher.publish("t/events", {"n": i})
+
+        assert publisher.get_stats()["dropped"] == 2
+        assert [m["n"] for _, _, m in publisher._messages] == [2, 3, 4]
+
+    def test_failed_batch_reports_each_alert(self):
+        """묶음 전송이 실패하면 묶인 알림마다 원래 메시지로 콜백 (스풀 재전송 시 중첩 방지)"""
+        client = ManualIPCClient()
+        failures = []
+        publisher = AsyncMQTTPublisher(
+            client, max_in_flight=1, batch_max=4,
+            on_failure=lambda topic, message, error: failures.append(message)
+        )
+        publisher.start()
+        publisher.publish("t/alerts", {"device_id": "d", "n": 0}, kind="alert")
+        assert wait_for(lambda: len(client.pending) == 1)
+        for i in range(1, 4):
+            publisher.publish("t/alerts", {"device_id": "d", "n": i}, kind="alert")
+
+        client.fail = True
+        while publisher.backlog:
+            client.release_all()
+            time.sleep(0.01)
+        publisher.stop()
+
+        assert [m["n"] for m in failures] == [0, 1, 2, 3]
+        assert all("alerts" not in m for m in failures)
+
+    def test_failure_callback_outside_lock(self):
+        """실패 콜백(스풀 기록) 중에도 다른 스레드가 발행기를 사용할 수 있음"""
+        blocked = []
+
+        def on_failure(topic, message, error):
+            reader = threading.Thread(target=publisher.get_stats, daemon=True)
+            reader.start()
+            reader.join(timeout=1.0)
+            blocked.append(reader.is_alive())
+
+        # 큐 넘침 (publish 스레드)
+        publisher = AsyncMQTTPublisher(LocalIPCClient(), queue_size=1, on_failure=on_failure)
+        publisher.publish("t/events", {"n": 0})
+        publisher.publish("t/events", {"n": 1})
+
+        # 시간 초과 (전송 스레드)
+        publisher = AsyncMQTTPublisher(ManualIPCClient(), publish_timeout=0.1, on_failure=on_failure)
+        publisher.start()
+        publisher.publish("t/events", {"n": 2})
+        assert wait_for(lambda: len(blocked) == 2, timeout=3.0)
+        publisher.stop(timeout=0.1)
+        assert blocked == [False, False]
+
+    def test_invalid_kind(self):
+        with pytest.raises(ValueError):
+            AsyncMQTTPublisher(LocalIPCClient()).publish("t", {}, kind="bulk")
+
+
+class TestSystemPublisher:
+    """PPEDetectionSystem 발행 연동 테스트"""
+
+    def test_local_ipc_publish(self, monkeypatch):
+        """로컬 IPC 대역으로 알림/상태 발행"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setattr(main, "HAS_GREENGRASS", False)
+        monkeypatch.setenv("MQTT_LOCAL_IPC", "true")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        assert isinstance(system.ipc_client, LocalIPCClient)
+
+        assert system._message_kind(system.topic_status) == "status"
+        assert system._message_kind(system._alert_topic("bay1")) == "alert"
+
+        system.camera.start()
+        system.start_time = time.time()
+        for _ in range(5):
+            frame = system.camera.get_frame(timeout=1.0)
+            if frame is not None:
+                system.process_frame(frame)
+        system.send_status_update()
+        system.cleanup()
+
+        topics = [t for t, _ in system.ipc_client.published]
+        assert system.topic_status in topics
+        status = [m for t, m in system.ipc_client.published if t == system.topic_status][-1]
+        assert "mqtt" in status
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+NPU 추론 풀 테스트
+
+가짜 런타임으로 분배 정책과 결과 순서 보장을 검증합니다.
+
+테스트 실행:
+    python -m pytest tests/test_npu_pool.py -v
+"""
+
+import sys
+import os
+import time
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from npu_pool import NPUInferencePool, SimulatedRuntime
+from ppe_detector import PPEDetector, DetectionResult
+
+
+class FakeRuntime:
+    """워커별 지연 시간을 가진 가짜 런타임"""
+
+    def __init__(self, worker_id: int, delays=None, outputs=None):
+        self.worker_id = worker_id
+        self.delays = delays or {}
+        self.outputs = outputs
+        self.calls = 0
+        self.released = False
+
+    def inference(self, inputs):
+        self.calls += 1
+        time.sleep(self.delays.get(self.worker_id, 0.001))
+        if self.outputs is not None:
+            return self.outputs
+        return ("worker", self.worker_id, inputs[0])
+
+    def release(self):
+        self.released = True
+
+
+def make_factory(runtimes, **kwargs):
+    def factory(worker_id):
+        runtime = FakeRuntime(worker_id, **kwargs)
+        runtimes.append(runtime)
+        return runtime
+    return factory
+
+
+class TestNPUInferencePool:
+    """추론 풀 스케줄링 테스트"""
+
+    def test_results_in_submit_order(self):
+        """느린 워커가 있어도 결과는 제출 순서대로 반환"""
+        runtimes = []
+        pool = NPUInferencePool(
+            make_factory(runtimes, delays={0: 0.05, 1: 0.001, 2: 0.001}),
+            num_workers=3,
+            max_in_flight=9
+        )
+
+        for i in range(9):
+            assert pool.submit(i, context=i) == i
+
+        seqs = []
+        for _ in range(9):
+            result = pool.get_result(timeout=2.0)
+            assert result is not None
+            assert result.context == result.seq
+            assert result.outputs[2] == result.seq
+            seqs.append(result.seq)
+
+        assert seqs == list(range(9))
+        assert pool.get_result(timeout=0.01) is None
+        pool.shutdown()
+        assert all(r.released for r in runtimes)
+
+    def test_round_robin_distribution(self):
+        """라운드 로빈은 워커에 균등 분배"""
+        runtimes = []
+        pool = NPUInferencePool(make_factory(runtimes), num_workers=3, max_in_flight=12)
+
+        for i in range(12):
+            pool.submit(i)
+        workers = [pool.get_result(timeout=2.0).worker_id for _ in range(12)]
+
+        assert workers == [0, 1, 2] * 4
+        pool.shutdown()
+
+    def test_least_loaded_avoids_busy_worker(self):
+        """최소 부하 정책은 느린 워커를 피함"""
+        runtimes = []
+        pool = NPUInferencePool(
+            make_factory(runtimes, delays={0: 0.2, 1: 0.001}),
+            num_workers=2,
+            policy="least_loaded",
+            max_in_flight=10
+        )
+
+        pool.submit(0)  # 워커 0 (느림)
+        time.sleep(0.02)
+        for i in range(1, 6):
+            pool.submit(i)
+            time.sleep(0.01)
+
+        results = [pool.get_result(timeout=2.0) for _ in range(6)]
+        assert [r.seq for r in results] == list(range(6))
+        assert sum(1 for r in results if r.worker_id == 1) == 5
+        pool.shutdown()
+
+    def test_runtime_error_is_reported(self):
+        """런타임 예외는 결과의 error로 전달"""
+        class FailingRuntime(FakeRuntime):
+            def inference(self, inputs):
+                raise RuntimeError("npu fault")
+
+        pool = NPUInferencePool(lambda i: FailingRuntime(i), num_workers=2)
+        pool.submit(0)
+        result = pool.get_result(timeout=1.0)
+
+        assert isinstance(result.error, RuntimeError)
+        pool.shutdown()
+
+    def test_max_in_flight_backpressure(self):
+        """처리 중 작업이 가득 차면 submit 대기"""
+        pool = NPUInferencePool(lambda i: SimulatedRuntime(0.001), num_workers=1, max_in_flight=2)
+        pool.submit(0)
+        pool.submit(1)
+
+        with pytest.raises(TimeoutError):
+            pool.submit(2, timeout=0.05)
+
+        pool.get_result(timeout=1.0)
+        assert pool.submit(2, timeout=1.0) == 2
+        pool.shutdown()
+
+    def test_invalid_policy(self):
+        """알 수 없는 정책 거부"""
+        with pytest.raises(ValueError):
+            NPUInferencePool(lambda i: SimulatedRuntime(), policy="random")
+
+
+class TestDetectorPoolMode:
+    """PPEDetector 풀 모드 테스트"""
+
+    def test_simulation_pool(self):
+        """시뮬레이션 풀 모드 감지"""
+        detector = PPEDetector(use_simulation=True, num_npu_workers=3)
+        frame = np.random.randint(0, 255, (480, 640, 3), dtype=np.uint8)
+
+        seqs = [detector.submit(frame, context=f"cam{i}") for i in range(4)]
+        results = [detector.get_result(timeout=2.0) for _ in seqs]
+
+        assert [r.seq for r in results] == seqs
+        assert all(isinstance(r, DetectionResult) for r in results)
+        assert results[2].context == "cam2"
+        assert detector.get_stats()["pool"]["num_workers"] == 3
+        assert len(detector.detect(frame)) >= 1
+        detector.release()
+
+    def test_fake_runtime_postprocess(self):
+        """가짜 런타임 출력이 실제 후처리를 거침"""
+        output = np.zeros((1, 3, 14), dtype=np.float32)
+        output[0, 0, :5] = [320, 320, 100, 200, 0.9]
+        output[0, 0, 5 + 2] = 1.0  # no_hardhat
+
+        runtimes = []
+        detector = PPEDetector(
+            num_npu_workers=2,
+            runtime_factory=make_factory(runtimes, outputs=[output])
+        )
+        frame = np.zeros((640, 640, 3), dtype=np.uint8)
+
+        detections = detector.detect(frame)
+
+        assert len(detections) == 1
+        assert detections[0].class_name == "no_hardhat"
+        assert detections[0].is_violation
+        detector.release()
+        assert all(r.released for r in runtimes)
+
+    def test_detect_with_outstanding_submissions(self):
+        """비동기 제출이 남아 있어도 detect()는 자기 프레임의 결과를 받음"""
+        box = np.zeros((1, 1, 14), dtype=np.float32)
+        box[0, 0, :5] = [320, 320, 100, 200, 0.9]
+        box[0, 0, 5 + 2] = 1.0
+
+        class BrightnessRuntime:
+            """밝은 입력에서만 박스를 출력"""
+            def inference(self, inputs):
+                time.sleep(0.01)
+                return [box if inputs[0].mean() > 128 else np.zeros((1, 1, 14), dtype=np.float32)]
+
+            def release(self):
+                pass
+
+        detector = PPEDetector(num_npu_workers=2, runtime_factory=lambda worker_id: BrightnessRuntime())
+        dark = np.zeros((640, 640, 3), dtype=np.uint8)
+        bright = np.full((640, 640, 3), 255, dtype=np.uint8)
+
+        seq = detector.submit(dark, context="dark")
+        assert len(detector.detect(bright)) == 1
+
+        result = detector.get_result(timeout=2.0)
+        assert result.seq == seq and result.context == "dark" and result.detections == []
+        assert detector.get_result(timeout=0.1) is None
+        detector.release()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+요청 시 렌더링 오버레이 테스트
+
+테스트 실행:
+    python -m pytest tests/test_overlay.py -v
+"""
+
+import sys
+import os
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import PPEDetector, Detection
+from overlay import OverlayRenderer
+
+
+DETECTIONS = [Detection(2, "no_hardhat", 0.9, (100, 100, 200, 200), True)]
+
+
+def make_frame():
+    return np.zeros((240, 320, 3), dtype=np.uint8)
+
+
+class TestOverlayRenderer:
+    """렌더링 테스트"""
+
+    def test_lazy_render(self):
+        """image에 접근하지 않으면 그리지 않음"""
+        detector = PPEDetector(use_simulation=True)
+        renderer = OverlayRenderer(detector, calibrate_every=0)
+
+        for _ in range(10):
+            annotated = renderer.annotate(make_frame(), DETECTIONS)
+            assert not annotated.rendered
+
+        stats = renderer.get_stats()
+        assert stats["rendered"] == 0 and stats["skipped"] == 10
+        assert detector.render_count == 0
+
+    def test_render_once_into_pooled_buffer(self):
+        """처음 접근 시 한 번만 렌더링, 반환한 버퍼는 재사용"""
+        detector = PPEDetector(use_simulation=True)
+        renderer = OverlayRenderer(detector, calibrate_every=0)
+        frame = make_frame()
+
+        annotated = renderer.annotate(frame, DETECTIONS)
+        image = annotated.image
+        assert annotated.image is image
+        assert image is not frame and frame.max() == 0 and image.max() > 0
+        annotated.release()
+
+        second = renderer.annotate(make_frame(), DETECTIONS)
+        assert second.image is image
+        assert renderer.rendered == 2
+        assert renderer._pools[frame.shape].allocated == 1
+
+    def test_in_place(self):
+        """in_place면 원본 프레임에 직접 그림"""
+        renderer = OverlayRenderer(PPEDetector(use_simulation=True), in_place=True)
+        frame = make_frame()
+        assert renderer.annotate(frame, DETECTIONS).image is frame
+        assert frame.max() > 0
+
+    def test_consumers_trigger_render(self):
+        """소비자가 있으면 매 프레임 렌더링 후 전달"""
+        renderer = OverlayRenderer(PPEDetector(use_simulation=True), calibrate_every=0)
+        received = []
+
+        def preview(annotated):
+            received.append(annotated.image.copy())
+
+        renderer.add_consumer(preview)
+        for _ in range(3):
+            renderer.annotate(make_frame(), DETECTIONS).release()
+        renderer.remove_consumer(preview)
+        renderer.annotate(make_frame(), DETECTIONS)
+
+        assert len(received) == 3
+        assert renderer.get_stats()["skipped"] == 1
+
+    def test_saved_time_estimated(self):
+        """렌더링이 없어도 측정용 렌더링으로 절약 시간 추정"""
+        renderer = OverlayRenderer(PPEDetector(use_simulation=True), calibrate_every=5)
+        frame = make_frame()
+        for _ in range(20):
+            renderer.annotate(frame, DETECTIONS)
+
+        stats = renderer.get_stats()
+        assert frame.max() == 0
+        assert stats["rendered"] == 0
+        assert stats["avg_render_ms"] > 0
+        assert stats["saved_ms_per_frame"] == round(stats["avg_render_ms"], 3)
+
+
+class TestSystemOverlay:
+    """PPEDetectionSystem 연동 테스트"""
+
+    def test_process_frame_is_lazy(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+
+        annotated = system.process_frame(make_frame())
+        assert not annotated.rendered
+        assert annotated.image.shape == (240, 320, 3)
+        annotated.release()
+        assert system.overlay.get_stats()["frames"] == 1
+        system.detector.release()
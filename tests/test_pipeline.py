@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+단계별 파이프라인 테스트
+
+테스트 실행:
+    python -m pytest tests/test_pipeline.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from pipeline import Pipeline, StageQueue, Stage
+
+
+class TestStageQueue:
+    """드롭 정책 큐 테스트"""
+
+    def test_drop_oldest(self):
+        """가득 차면 가장 오래된 항목 버림"""
+        q = StageQueue("q", maxsize=2, drop_policy="drop_oldest")
+        for i in range(1, 5):
+            assert q.put(i)
+
+        assert [q.get(timeout=0.1), q.get(timeout=0.1)] == [3, 4]
+        assert q.get_stats()["dropped"] == 2
+
+    def test_drop_newest(self):
+        """가득 차면 새 항목 버림"""
+        q = StageQueue("q", maxsize=2, drop_policy="drop_newest")
+        assert q.put(1) and q.put(2)
+        assert not q.put(3)
+
+        assert [q.get(timeout=0.1), q.get(timeout=0.1)] == [1, 2]
+        assert q.get_stats()["dropped"] == 1
+
+    def test_on_drop(self):
+        """버려진 항목은 on_drop으로 전달 (drop_oldest는 꺼낸 항목, drop_newest/닫힘은 새 항목)"""
+        dropped = []
+        q = StageQueue("q", maxsize=1, drop_policy="drop_oldest", on_drop=dropped.append)
+        assert q.put(1) and q.put(2)
+        assert dropped == [1]
+
+        q = StageQueue("q", maxsize=1, drop_policy="drop_newest", on_drop=dropped.append)
+        assert q.put(3) and not q.put(4)
+        q.close()
+        assert not q.put(5)
+        assert dropped == [1, 4, 5]
+
+    def test_on_drop_error_ignored(self):
+        def fail(item):
+            raise RuntimeError("boom")
+        q = StageQueue("q", maxsize=1, on_drop=fail)
+        assert q.put(1) and q.put(2)
+        assert q.get(timeout=0.1) == 2
+
+    def test_block_backpressure(self):
+        """block 정책은 공간이 생길 때까지 대기"""
+        q = StageQueue("q", maxsize=1, drop_policy="block")
+        q.put(1)
+        assert not q.put(2, timeout=0.05)
+
+        threading.Timer(0.05, q.get).start()
+        assert q.put(3, timeout=1.0)
+
+        stats = q.get_stats()
+        assert stats["dropped"] == 0
+        assert stats["blocked_ms"] > 0
+
+    def test_wait_time_recorded(self):
+        """큐 대기 시간 기록"""
+        q = StageQueue("q", maxsize=4)
+        q.put("a")
+        time.sleep(0.03)
+        q.get(timeout=0.1)
+
+        assert q.get_stats()["last_wait_ms"] >= 25
+
+    def test_close_wakes_consumer(self):
+        """close()는 대기 중인 소비자를 깨움"""
+        q = StageQueue("q", maxsize=1)
+        threading.Timer(0.05, q.close).start()
+
+        assert q.get(timeout=2.0) is None
+        assert not q.put(1)
+
+    def test_invalid_policy(self):
+        with pytest.raises(ValueError):
+            StageQueue("q", drop_policy="lifo")
+
+
+class TestPipeline:
+    """파이프라인 구성 테스트"""
+
+    def test_items_flow_through_stages(self):
+        """소스에서 마지막 단계까지 전달"""
+        source_items = iter(range(20))
+        results = []
+
+        def source():
+            try:
+                return next(source_items)
+            except StopIteration:
+                time.sleep(0.01)
+                return None
+
+        pipeline = Pipeline("test")
+        pipeline.add_stage("source", source)
+        pipeline.add_stage("double", lambda x: x * 2, queue_size=32, drop_policy="block")
+        pipeline.add_stage("sink", results.append, queue_size=32, drop_policy="block")
+        pipeline.start()
+
+        deadline = time.time() + 2.0
+        while len(results) < 20 and time.time() < deadline:
+            time.sleep(0.01)
+        pipeline.stop()
+
+        assert results == [x * 2 for x in range(20)]
+        assert pipeline.get_stats()["double"]["processed"] == 20
+
+    def test_ordered_multi_worker_stage(self):
+        """여러 워커 단계도 입력 순서대로 출력"""
+        inq = StageQueue("in", maxsize=64, drop_policy="block")
+        outq = StageQueue("out", maxsize=64, drop_policy="block")
+
+        def work(x):
+            time.sleep(0.02 if x % 3 == 0 else 0.001)
+            return x
+
+        stage = Stage("work", work, input_queue=inq, output_queue=outq, workers=3)
+        stage.start()
+        for i in range(30):
+            inq.put(i)
+
+        results = [outq.get(timeout=2.0) for _ in range(30)]
+        stage.stop()
+
+        assert results == list(range(30))
+
+    def test_blocked_output_does_not_hold_lock(self):
+        """출력 큐가 가득 차서 대기 중이어도 통계 조회/입력 가져오기는 진행"""
+        inq = StageQueue("in", maxsize=8, drop_policy="block")
+        outq = StageQueue("out", maxsize=1, drop_policy="block")
+        stage = Stage("work", lambda x: x, input_queue=inq, output_queue=outq, workers=2)
+        stage.start()
+        for i in range(3):
+            inq.put(i)
+
+        # 첫 항목만 출력 큐에 들어가고 두 워커는 각각 다음 항목을 내보내려 대기
+        deadline = time.time() + 2.0
+        while len(inq) and time.time() < deadline:
+            time.sleep(0.01)
+        assert len(inq) == 0
+
+        stats = {}
+        reader = threading.Thread(target=lambda: stats.update(stage.get_stats()), daemon=True)
+        reader.start()
+        reader.join(timeout=1.0)
+        assert not reader.is_alive() and stats["processed"] == 3
+
+        results = [outq.get(timeout=2.0) for _ in range(3)]
+        stage.stop()
+        assert results == [0, 1, 2]
+
+    def test_slow_stage_does_not_block_source(self):
+        """느린 마지막 단계가 앞 단계를 막지 않음 (drop_oldest)"""
+        counter = {"n": 0}
+
+        def source():
+            time.sleep(0.002)
+            counter["n"] += 1
+            return counter["n"]
+
+        pipeline = Pipeline("test")
+        pipeline.add_stage("source", source)
+        pipeline.add_stage("slow", lambda x: time.sleep(0.1), queue_size=2)
+        pipeline.start()
+        time.sleep(0.5)
+        pipeline.stop()
+
+        stats = pipeline.get_stats()
+        assert counter["n"] > 50
+        assert stats["slow"]["queue"]["dropped"] > 0
+        assert pipeline.bottleneck() == "slow"
+
+    def test_stage_error_counted(self):
+        """단계 예외는 집계 후 계속 진행"""
+        items = iter([1, 0, 2])
+        results = []
+
+        pipeline = Pipeline("test")
+        pipeline.add_stage("source", lambda: next(items, None))
+        pipeline.add_stage("div", lambda x: 10 // x, queue_size=8, drop_policy="block")
+        pipeline.add_stage("sink", results.append, queue_size=8, drop_policy="block")
+        pipeline.start()
+        time.sleep(0.3)
+        pipeline.stop()
+
+        assert results == [10, 5]
+        assert pipeline.get_stats()["div"]["errors"] == 1
+
+
+class TestSystemPipelineMode:
+    """PPEDetectionSystem 파이프라인 모드 테스트"""
+
+    def test_pipeline_mode_run(self, monkeypatch):
+        """시뮬레이션으로 파이프라인 실행 후 통계 확인"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        system.pipeline_mode = True
+        assert system.initialize()
+        system.s3_client = None
+        system.ipc_client = None
+
+        system.camera.start()
+        system.running = True
+        system.start_time = time.time()
+
+        runner = threading.Thread(target=system._run_pipeline, args=(60,))
+        runner.start()
+        time.sleep(1.0)
+        system.running = False
+        runner.join(timeout=5.0)
+        system.cleanup()
+
+        assert system.frame_count > 0
+        assert system.detector.total_inferences == system.frame_count
+        stats = system.pipeline.get_stats()
+        assert set(stats) == {"capture", "preprocess", "infer", "postprocess", "alert"}
+        assert "avg_wait_ms" in stats["infer"]["queue"]
+
+    def test_dropped_packets_return_input_buffers(self, monkeypatch):
+        """추론 큐에서 버려진 패킷의 입력 버퍼는 풀로 돌아가 재할당하지 않음"""
+        import numpy as np
+        import main
+        from main import PPEDetectionSystem
+        from pipeline import FramePacket
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        system.pipeline_mode = True
+        assert system.initialize()
+        system.ipc_client = None
+
+        pipeline = system._build_pipeline()
+        infer_queue = pipeline.stages[2].input_queue
+        buffers = system.detector.input_buffers
+        allocated = buffers.allocated
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        # 추론 단계가 멈춘 상태로 전처리만 계속 (과부하)
+        for seq in range(20):
+            packet = system._stage_preprocess(FramePacket(seq=seq, frame=frame, capture_time=time.time()))
+            infer_queue.put(packet)
+
+        assert infer_queue.get_stats()["dropped"] == 20 - system.pipeline_queue_size
+        assert buffers.allocated - allocated <= system.pipeline_queue_size + 1
+        system.detector.release()
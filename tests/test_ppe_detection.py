@@ -11,8 +11,10 @@ PPE Detection System 통합 테스트
 
 import sys
 import os
+import threading
 import time
 import numpy as np
+import cv2
 
 # 소스 경로 추가
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
@@ -131,6 +133,24 @@ class TestPPEDetector:
 
         detector.release()
 
+    def test_draw_detections_out_and_in_place(self):
+        """out 버퍼 / 원본에 직접 그리기"""
+        detector = PPEDetector(use_simulation=True)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        detections = [Detection(2, "no_hardhat", 0.9, (100, 100, 200, 200), True)]
+
+        out = np.empty_like(frame)
+        result = detector.draw_detections(frame, detections, out=out)
+        assert result is out
+        assert frame.max() == 0 and out.max() > 0
+
+        result = detector.draw_detections(frame, detections, in_place=True)
+        assert result is frame
+        assert np.array_equal(frame, out)
+        assert detector.get_stats()["renders"] == 2
+
+        detector.release()
+
     def test_inference_time(self):
         """추론 시간 측정 테스트"""
         detector = PPEDetector(use_simulation=True)
@@ -161,6 +181,137 @@ class TestPPEDetector:
         detector.release()
 
 
+def make_output(rows, num_classes=9):
+    """YOLOv5 형식 출력 생성: rows = [(cx, cy, w, h, obj_conf, class_id), ...]"""
+    output = np.zeros((1, 25200, 5 + num_classes), dtype=np.float32)
+    for i, (cx, cy, w, h, conf, class_id) in enumerate(rows):
+        output[0, i, :5] = [cx, cy, w, h, conf]
+        output[0, i, 5 + class_id] = 1.0
+    return [output]
+
+
+class TestPostprocess:
+    """벡터화된 후처리 테스트"""
+
+    def test_class_aware_nms(self):
+        """다른 클래스의 겹치는 박스는 서로 억제하지 않음"""
+        detector = PPEDetector(use_simulation=False)
+        outputs = make_output([
+            (320, 100, 60, 60, 0.9, 1),   # hardhat
+            (322, 102, 60, 60, 0.8, 2),   # no_hardhat (같은 위치)
+            (321, 101, 60, 60, 0.7, 1),   # hardhat 중복 → 억제
+        ])
+
+        detections = detector.postprocess(outputs, (640, 640, 3))
+
+        assert sorted(d.class_name for d in detections) == ['hardhat', 'no_hardhat']
+        hardhat = [d for d in detections if d.class_name == 'hardhat'][0]
+        assert abs(hardhat.confidence - 0.9) < 1e-6
+
+    def test_scale_and_clip(self):
+        """원본 해상도로 스케일 후 이미지 범위로 클리핑"""
+        detector = PPEDetector(use_simulation=False)
+        outputs = make_output([
+            (320, 320, 64, 64, 0.9, 0),
+            (630, 10, 40, 40, 0.9, 3),    # 오른쪽 위 경계 밖으로 나감
+        ])
+
+        detections = detector.postprocess(outputs, (1280, 1280, 3))
+        bboxes = {d.class_name: d.bbox for d in detections}
+
+        assert bboxes['person'] == (576, 576, 704, 704)
+        assert bboxes['safety_vest'] == (1220, 0, 1280, 60)
+        assert all(isinstance(v, int) for v in bboxes['person'])
+
+    def test_no_candidates(self):
+        """임계값 이상 후보가 없으면 빈 리스트"""
+        detector = PPEDetector(use_simulation=False)
+        outputs = make_output([(320, 320, 64, 64, 0.3, 0)])
+
+        assert detector.postprocess(outputs, (640, 640, 3)) == []
+
+    def test_xywh_to_xyxy(self):
+        """xywh → xyxy 변환"""
+        detector = PPEDetector(use_simulation=True)
+        boxes = np.array([[50, 60, 20, 40]], dtype=np.float32)
+
+        assert detector._xywh_to_xyxy(boxes).tolist() == [[40, 40, 60, 80]]
+
+
+class TestLetterbox:
+    """레터박스 전처리 테스트"""
+
+    def test_letterbox_1080p(self):
+        """비율 유지 리사이즈 + 위아래 패딩"""
+        detector = PPEDetector(use_simulation=True)
+        frame = np.random.randint(0, 255, (1080, 1920, 3), dtype=np.uint8)
+
+        img, info = detector.preprocess(frame, return_info=True)
+
+        assert img.shape == (1, 640, 640, 3)
+        assert info.resized == (640, 360)
+        assert (info.pad_x, info.pad_y) == (0, 140)
+        assert (img[0, :140] == PPEDetector.PAD_VALUE).all()
+        assert (img[0, 500:] == PPEDetector.PAD_VALUE).all()
+
+        expected = cv2.cvtColor(cv2.resize(frame, (640, 360)), cv2.COLOR_BGR2RGB)
+        assert np.array_equal(img[0, 140:500], expected)
+
+    def test_buffer_reused(self):
+        """같은 버퍼를 재사용하고, 해상도가 바뀌면 패딩도 갱신"""
+        detector = PPEDetector(use_simulation=True, input_size=(320, 256))
+        wide = np.full((100, 400, 3), 7, dtype=np.uint8)
+        tall = np.full((400, 100, 3), 9, dtype=np.uint8)
+
+        first = detector.preprocess(wide)
+        second, info = detector.preprocess(tall, return_info=True)
+
+        assert first is second
+        assert second.shape == (1, 256, 320, 3)
+        assert info.resized == (64, 256) and info.pad_x == 128
+        assert (second[0, :, :128] == PPEDetector.PAD_VALUE).all()
+        assert (second[0, :, 128:192] == 9).all()
+
+    def test_out_buffer(self):
+        """out 버퍼에 직접 기록"""
+        detector = PPEDetector(use_simulation=True)
+        out = detector.input_buffers.acquire()
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        assert detector.preprocess(frame, out=out) is out
+
+    def test_concurrent_preprocess(self):
+        """여러 스레드가 동시에 전처리해도 스크래치 버퍼를 공유하지 않음"""
+        detector = PPEDetector(use_simulation=True)
+        frames = [np.full((1080, 1920, 3), value, dtype=np.uint8) for value in (10, 200)]
+        errors = []
+
+        def work(frame):
+            for _ in range(50):
+                out, info = detector.preprocess(frame, out=detector.input_buffers.acquire(),
+                                                return_info=True)
+                if info.resized != (640, 360) or not (out[0, 140:500] == frame[0, 0, 0]).all():
+                    errors.append(frame[0, 0, 0])
+                detector.input_buffers.release(out)
+
+        threads = [threading.Thread(target=work, args=(frame,)) for frame in frames]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert errors == []
+
+    def test_postprocess_maps_letterbox(self):
+        """레터박스 좌표가 원본 좌표로 변환"""
+        detector = PPEDetector(use_simulation=False)
+        # 1920x1080 → scale 1/3, pad_y 140: 원본 (960, 540) 중심 300x600 박스
+        outputs = make_output([(320, 320, 100, 200, 0.9, 0)])
+
+        detections = detector.postprocess(outputs, (1080, 1920, 3))
+
+        assert detections[0].bbox == (810, 240, 1110, 840)
+
+
 class TestCameraFactory:
     """카메라 팩토리 함수 테스트"""
 
@@ -274,6 +425,8 @@ def run_all_tests():
     test_classes = [
         TestSimulatedCamera,
         TestPPEDetector,
+        TestPostprocess,
+        TestLetterbox,
         TestCameraFactory,
         TestDetectionDataclass,
         TestIntegration
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+녹화 영상 / 이미지 시퀀스 재생 카메라 테스트
+
+테스트 실행:
+    python -m pytest tests/test_replay_camera.py -v
+"""
+
+import sys
+import os
+import time
+import cv2
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from replay_camera import ReplayCamera, is_replay_source
+from rtsp_reader import create_camera
+
+
+NUM_FRAMES = 20
+
+
+def frame_index(frame):
+    """프레임 밝기로 인코딩한 번호 (JPEG 손실 고려)"""
+    return int(round(float(frame.mean()) / 10))
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    for i in range(NUM_FRAMES):
+        cv2.imwrite(str(tmp_path / f"{i:04d}.jpg"), np.full((120, 160, 3), i * 10, dtype=np.uint8))
+    (tmp_path / "notes.txt").write_text("ignored")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def video_file(tmp_path):
+    path = str(tmp_path / "clip.avi")
+    writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*"MJPG"), 25, (160, 120))
+    if not writer.isOpened():
+        pytest.skip("No video encoder available")
+    for i in range(NUM_FRAMES):
+        writer.write(np.full((120, 160, 3), i * 10, dtype=np.uint8))
+    writer.release()
+    return path
+
+
+def read_all(camera, limit=1000):
+    frames = []
+    while len(frames) < limit:
+        frame = camera.get_frame(timeout=1.0)
+        if frame is None:
+            break
+        frames.append(frame)
+    return frames
+
+
+class TestReplayCamera:
+    """재생 테스트"""
+
+    def test_image_sequence_max_speed(self, image_dir):
+        camera = ReplayCamera(image_dir, realtime=False, loop=False)
+        assert camera.start()
+        assert camera.resolution == (160, 120)
+        assert camera.fps == 15.0
+
+        frames = read_all(camera)
+        camera.stop()
+
+        assert [frame_index(f) for f in frames] == list(range(NUM_FRAMES))
+        stats = camera.get_stats()
+        assert stats["finished"] and stats["delivered"] == NUM_FRAMES
+        assert stats["decode_fps"] > 0
+
+    def test_video_file(self, video_file):
+        camera = ReplayCamera(video_file, realtime=False, loop=False)
+        assert camera.start()
+        assert camera.fps == 25.0
+        assert camera.resolution == (160, 120)
+
+        frames = read_all(camera)
+        camera.stop()
+        assert [frame_index(f) for f in frames] == list(range(NUM_FRAMES))
+
+    def test_loop(self, video_file):
+        camera = ReplayCamera(video_file, realtime=False, loop=True)
+        camera.start()
+        frames = read_all(camera, limit=NUM_FRAMES * 2 + 5)
+        camera.stop()
+
+        indices = [frame_index(f) for f in frames]
+        assert indices[:NUM_FRAMES] == indices[NUM_FRAMES:NUM_FRAMES * 2]
+        assert camera.get_stats()["loops"] >= 1
+
+    def test_seek(self, image_dir):
+        camera = ReplayCamera(image_dir, realtime=False, loop=False, read_ahead=4)
+        camera.start()
+        assert frame_index(camera.get_frame()) == 0
+
+        camera.seek(15)
+        assert frame_index(camera.get_frame()) == 15
+        camera.seek_time(5 / 15.0)
+        assert frame_index(camera.get_frame()) == 5
+
+        # 끝에 도달한 뒤에도 탐색하면 다시 재생
+        read_all(camera)
+        camera.seek(0)
+        assert frame_index(camera.get_frame()) == 0
+        camera.stop()
+
+    def test_realtime_pacing(self, image_dir):
+        """실시간 모드는 원본 FPS로 전달"""
+        camera = ReplayCamera(image_dir, fps=50, realtime=True, loop=False)
+        camera.start()
+        start = time.time()
+        frames = read_all(camera)
+        elapsed = time.time() - start
+        camera.stop()
+
+        assert len(frames) == NUM_FRAMES
+        assert elapsed >= (NUM_FRAMES - 1) / 50 * 0.9
+
+    def test_realtime_drops_for_slow_consumer(self, image_dir):
+        """처리가 늦으면 실제 카메라처럼 지난 프레임을 버림"""
+        camera = ReplayCamera(image_dir, fps=100, realtime=True, loop=False)
+        camera.start()
+        indices = []
+        while True:
+            frame = camera.get_frame(timeout=1.0)
+            if frame is None:
+                break
+            indices.append(frame_index(frame))
+            time.sleep(0.05)     # 5프레임 간격만큼 처리
+        camera.stop()
+
+        assert indices == sorted(indices)
+        assert len(indices) < NUM_FRAMES
+        assert camera.dropped > 0
+
+    def test_missing_source(self, tmp_path):
+        camera = ReplayCamera(str(tmp_path / "missing.mp4"))
+        assert not camera.start()
+
+
+class TestCreateCamera:
+    """create_camera 연동 테스트"""
+
+    def test_replay_source_detection(self, image_dir, video_file):
+        assert is_replay_source(image_dir)
+        assert is_replay_source(video_file)
+        assert is_replay_source(f"file://{video_file}")
+        assert not is_replay_source("rtsp://192.168.1.100/stream")
+        assert not is_replay_source("")
+
+    def test_create_camera_returns_replay(self, video_file):
+        camera = create_camera(video_file, use_simulation=True, realtime=False, loop=False)
+        assert isinstance(camera, ReplayCamera)
+        assert not camera.realtime and not camera.loop
+
+    def test_system_uses_replay(self, tmp_path, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        for i in range(3):
+            cv2.imwrite(str(tmp_path / f"{i:04d}.jpg"), np.full((480, 640, 3), 60, dtype=np.uint8))
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("RTSP_URL", str(tmp_path))
+        monkeypatch.setenv("REPLAY_REALTIME", "false")
+
+        system = PPEDetectionSystem()
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+
+        assert isinstance(system.camera, ReplayCamera)
+        assert system.camera.start()
+        _, frame = system._read_frame()
+        assert frame.shape == (480, 640, 3)
+        system.process_frame(frame).release()
+        system.camera.stop()
+        system.detector.release()
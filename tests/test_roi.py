@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+ROI 구역 필터 테스트
+
+테스트 실행:
+    python -m pytest tests/test_roi.py -v
+"""
+
+import sys
+import os
+import json
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import Detection
+from roi import ROIFilter, points_in_polygon
+
+
+SQUARE = [[100, 100], [300, 100], [300, 300], [100, 300]]
+
+
+def make_detection(x1, y1, x2, y2):
+    return Detection(2, "no_hardhat", 0.9, (x1, y1, x2, y2), True)
+
+
+class TestPointInPolygon:
+    """point-in-polygon 테스트"""
+
+    def test_square(self):
+        points = np.array([[200, 200], [50, 50], [299, 150], [301, 150]], dtype=float)
+        assert points_in_polygon(points, np.array(SQUARE, dtype=float)).tolist() == \
+            [True, False, True, False]
+
+    def test_concave(self):
+        """오목 다각형 (L자)"""
+        l_shape = np.array([[0, 0], [10, 0], [10, 4], [4, 4], [4, 10], [0, 10]], dtype=float)
+        points = np.array([[2, 2], [8, 2], [2, 8], [8, 8]], dtype=float)
+        assert points_in_polygon(points, l_shape).tolist() == [True, True, True, False]
+
+    def test_matches_opencv(self):
+        """cv2.pointPolygonTest와 결과 일치"""
+        import cv2
+
+        rng = np.random.default_rng(0)
+        polygon = np.array([[50, 20], [180, 60], [150, 190], [90, 120], [20, 170]], dtype=np.float32)
+        points = rng.uniform(0, 200, (500, 2))
+
+        expected = [cv2.pointPolygonTest(polygon, (float(x), float(y)), False) > 0 for x, y in points]
+        assert points_in_polygon(points, polygon.astype(float)).tolist() == expected
+
+    def test_empty(self):
+        assert points_in_polygon(np.zeros((0, 2)), np.array(SQUARE, dtype=float)).shape == (0,)
+
+
+class TestROIFilter:
+    """ROI 필터 테스트"""
+
+    def test_crop_is_view_of_zone_bounds(self):
+        roi = ROIFilter.from_config([{"name": "a", "polygon": SQUARE}], margin=0.0)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        view, rect = roi.crop(frame)
+
+        assert rect == (100, 100, 300, 300)
+        assert view.shape == (200, 200, 3)
+        assert np.shares_memory(view, frame)
+        assert roi.get_stats()["crop_area_ratio"] == round(200 * 200 / (640 * 480), 3)
+
+    def test_normalized_and_multiple_zones(self):
+        """정규화 좌표, 여러 구역의 합집합 사각형"""
+        roi = ROIFilter.from_config([
+            {"name": "left", "polygon": [[0.1, 0.1], [0.3, 0.1], [0.3, 0.5]]},
+            {"name": "right", "polygon": [[0.6, 0.4], [0.8, 0.4], [0.8, 0.6]]},
+        ], margin=0.0)
+        assert roi.crop_rect((1000, 1000, 3)) == (100, 100, 800, 600)
+
+    def test_apply_offsets_and_filters(self):
+        """잘라낸 좌표를 원본으로 되돌리고 구역 밖은 제거"""
+        roi = ROIFilter.from_config([{"name": "a", "polygon": SQUARE}], margin=0.0)
+        frame_shape = (480, 640, 3)
+        rect = roi.crop_rect(frame_shape)
+
+        inside = make_detection(50, 50, 100, 100)      # 원본 (150,150)-(200,200)
+        outside = make_detection(190, 190, 260, 260)   # 중심 원본 (325,325)
+        kept = roi.apply([inside, outside], rect, frame_shape)
+
+        assert kept == [inside]
+        assert inside.bbox == (150, 150, 200, 200)
+        assert roi.get_stats()["filtered"] == 1
+
+    def test_bottom_anchor(self):
+        """하단 기준점: 머리는 구역 밖이어도 발이 구역 안이면 포함"""
+        floor = [[0, 200], [640, 200], [640, 480], [0, 480]]
+        center = ROIFilter.from_config([{"polygon": floor}], margin=0.0)
+        bottom = ROIFilter.from_config([{"polygon": floor}], margin=0.0, anchor="bottom")
+
+        frame_shape = (480, 640, 3)
+        person = (100, 0, 160, 250)
+        assert center.apply([make_detection(*person)], (0, 0, 640, 480), frame_shape) == []
+        assert len(bottom.apply([make_detection(*person)], (0, 0, 640, 480), frame_shape)) == 1
+
+    def test_invalid_config(self):
+        with pytest.raises(ValueError):
+            ROIFilter.from_config([{"polygon": [[0, 0], [1, 1]]}])
+        with pytest.raises(ValueError):
+            ROIFilter([])
+
+
+class TestSystemROI:
+    """PPEDetectionSystem ROI 연동 테스트"""
+
+    def test_detections_limited_to_zone(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("ROI_ZONES", json.dumps([
+            {"name": "scaffold", "polygon": [[0.5, 0.5], [1.0, 0.5], [1.0, 1.0], [0.5, 1.0]]}
+        ]))
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(20):
+            for det in system._detect(frame):
+                cx = (det.bbox[0] + det.bbox[2]) / 2
+                cy = (det.bbox[1] + det.bbox[3]) / 2
+                assert cx >= 320 and cy >= 240
+
+        assert system.rois[""].get_stats()["kept"] > 0
+        system.detector.release()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+비동기 S3 업로더 테스트
+
+로컬 가짜 S3 엔드포인트(HTTP 서버)에 boto3로 실제 업로드하여 검증합니다.
+
+테스트 실행:
+    python -m pytest tests/test_s3_uploader.py -v
+"""
+
+import sys
+import os
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from s3_uploader import AsyncS3Uploader
+
+
+class FakeS3Handler(BaseHTTPRequestHandler):
+    """PUT Object만 지원하는 가짜 S3 (path-style)"""
+
+    # botocore는 PUT에 Expect: 100-continue를 보내므로 HTTP/1.1 필요
+    protocol_version = "HTTP/1.1"
+
+    def do_PUT(self):
+        server = self.server
+        length = int(self.headers.get("Content-Length", 0))
+        body = self.rfile.read(length)
+        time.sleep(server.delay)
+
+        with server.lock:
+            server.requests += 1
+            fail = server.fail_next > 0
+            if fail:
+                server.fail_next -= 1
+
+        if fail:
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        bucket, _, key = self.path.lstrip("/").split("?")[0].partition("/")
+        with server.lock:
+            server.objects[(bucket, key)] = {
+                "body": body,
+                "content_type": self.headers.get("Content-Type"),
+                "device_id": self.headers.get("x-amz-meta-device_id")
+            }
+
+        self.send_response(200)
+        self.send_header("ETag", '"fake"')
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def fake_s3():
+    """로컬 가짜 S3 서버"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeS3Handler)
+    server.objects = {}
+    server.requests = 0
+    server.fail_next = 0
+    server.delay = 0.0
+    server.lock = threading.Lock()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def s3_client(fake_s3):
+    """가짜 S3를 가리키는 boto3 클라이언트 (boto3 자체 재시도 비활성)"""
+    boto3 = pytest.importorskip("boto3")
+    from botocore.config import Config
+
+    return boto3.client(
+        "s3",
+        endpoint_url=f"http://127.0.0.1:{fake_s3.server_address[1]}",
+        region_name="us-east-1",
+        aws_access_key_id="test",
+        aws_secret_access_key="test",
+        config=Config(
+            s3={"addressing_style": "path"},
+            retries={"total_max_attempts": 1, "mode": "standard"}
+        )
+    )
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestAsyncS3Uploader:
+    """업로더 테스트"""
+
+    def test_upload_to_fake_endpoint(self, fake_s3, s3_client):
+        """JPEG 인코딩 후 업로드, URL은 즉시 반환"""
+        uploader = AsyncS3Uploader(s3_client, bucket="bucket", num_workers=2)
+        uploader.start()
+
+        frame = np.random.randint(0, 255, (120, 160, 3), dtype=np.uint8)
+        key = uploader.make_key("violations", "device-1")
+        url = uploader.submit(key, frame=frame, metadata={"device_id": "device-1"})
+
+        assert url == f"s3://bucket/{key}"
+        assert wait_for(lambda: uploader.uploaded == 1)
+        uploader.stop()
+
+        obj = fake_s3.objects[("bucket", key)]
+        assert obj["body"][:2] == b"\xff\xd8"  # JPEG SOI
+        assert obj["content_type"] == "image/jpeg"
+        assert obj["device_id"] == "device-1"
+
+        stats = uploader.get_stats()
+        assert stats["failed"] == 0
+        assert stats["latency_ms"]["max"] > 0
+
+    def test_submit_does_not_block(self, fake_s3, s3_client):
+        """느린 엔드포인트에서도 submit은 즉시 반환"""
+        fake_s3.delay = 0.2
+        uploader = AsyncS3Uploader(s3_client, bucket="bucket", num_workers=1)
+        uploader.start()
+
+        start = time.time()
+        for i in range(5):
+            uploader.submit(f"k/{i}.jpg", data=b"x")
+        assert time.time() - start < 0.1
+
+        assert uploader.backlog > 0
+        uploader.stop(timeout=5.0)
+        assert len(fake_s3.objects) == 5
+
+    def test_retry_with_backoff(self, fake_s3, s3_client):
+        """일시적 실패는 재시도 후 성공"""
+        fake_s3.fail_next = 2
+        uploader = AsyncS3Uploader(s3_client, bucket="bucket", num_workers=1,
+                                   max_retries=3, backoff_base=0.01)
+        uploader.start()
+        uploader.submit("k/retry.jpg", data=b"data")
+
+        assert wait_for(lambda: uploader.uploaded == 1)
+        uploader.stop()
+
+        assert fake_s3.requests == 3
+        assert uploader.get_stats()["retries"] == 2
+
+    def test_failure_after_retries(self, fake_s3, s3_client):
+        """재시도 초과 시 실패 집계 및 콜백"""
+        fake_s3.fail_next = 100
+        failures = []
+        uploader = AsyncS3Uploader(s3_client, bucket="bucket", num_workers=1,
+                                   max_retries=1, backoff_base=0.01,
+                                   on_failure=lambda job, e: failures.append(job.key))
+        uploader.start()
+        uploader.submit("k/fail.jpg", data=b"data")
+
+        assert wait_for(lambda: uploader.failed == 1)
+        uploader.stop()
+
+        assert failures == ["k/fail.jpg"]
+        assert uploader.get_stats()["last_error"]
+
+    def test_queue_full_drops(self):
+        """큐가 가득 차면 새 작업은 버리고 None 반환"""
+        class BlockingClient:
+            def __init__(self):
+                self.release = threading.Event()
+
+            def put_object(self, **kwargs):
+                self.release.wait(2.0)
+
+        client = BlockingClient()
+        uploader = AsyncS3Uploader(client, bucket="bucket", num_workers=1, queue_size=2)
+        uploader.start()
+
+        urls = [uploader.submit(f"k/{i}", data=b"x") for i in range(1)]
+        assert wait_for(lambda: uploader.get_stats()["in_progress"] == 1)
+        urls += [uploader.submit(f"k/{i}", data=b"x") for i in range(1, 5)]
+
+        assert urls[:3] == ["s3://bucket/k/0", "s3://bucket/k/1", "s3://bucket/k/2"]
+        assert urls[3:] == [None, None]
+        assert uploader.get_stats()["dropped"] == 2
+
+        client.release.set()
+        uploader.stop()
+        assert uploader.uploaded == 3
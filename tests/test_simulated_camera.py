@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+시뮬레이션 카메라 (정적 템플릿 + 버퍼 풀) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_simulated_camera.py -v
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from rtsp_reader import SimulatedCamera, create_camera
+
+
+def overlay_mask(camera):
+    """오버레이 영역 True 마스크"""
+    mask = np.zeros((camera.height, camera.width), dtype=bool)
+    for x1, y1, x2, y2 in camera._overlay_rects:
+        mask[y1:y2, x1:x2] = True
+    return mask
+
+
+class TestSimulatedCameraFrames:
+    """프레임 생성 테스트"""
+
+    def test_static_scene_reused(self):
+        """오버레이 영역 밖은 매 프레임 동일"""
+        camera = SimulatedCamera(fps=0)
+        camera.start()
+        first = camera.get_frame()
+        second = camera.get_frame()
+        camera.stop()
+
+        assert first is not second
+        outside = ~overlay_mask(camera)
+        assert np.array_equal(first[outside], second[outside])
+        assert not np.array_equal(first, second)       # 프레임 번호가 다름
+
+    def test_copy_mode_frames_are_independent(self):
+        """pool_size=0이면 이전 프레임이 덮어써지지 않음"""
+        camera = SimulatedCamera(fps=0)
+        camera.start()
+        first = camera.get_frame()
+        saved = first.copy()
+        for _ in range(5):
+            camera.get_frame()
+        camera.stop()
+        assert np.array_equal(first, saved)
+
+    def test_pool_reuses_buffers(self):
+        camera = SimulatedCamera(fps=0, pool_size=3)
+        camera.start()
+        frames = [camera.get_frame() for _ in range(6)]
+        camera.stop()
+
+        assert frames[0] is frames[3] and frames[1] is frames[4]
+        assert len({id(f) for f in frames}) == 3
+
+    def test_pool_matches_copy_mode(self):
+        """버퍼를 재사용해도 이전 오버레이가 남지 않음"""
+        pooled = SimulatedCamera(fps=0, pool_size=2)
+        fresh = SimulatedCamera(fps=0)
+        pooled.start()
+        fresh.start()
+        for _ in range(25):
+            a = pooled.get_frame()
+            b = fresh.get_frame()
+        assert np.array_equal(a, b)
+
+    def test_4k(self):
+        camera = SimulatedCamera(width=3840, height=2160, fps=0, pool_size=2)
+        camera.start()
+        frame = camera.get_frame()
+        assert frame.shape == (2160, 3840, 3) and frame.dtype == np.uint8
+        camera.stop()
+
+
+class TestSimulatedCameraRate:
+    """FPS 제한 테스트"""
+
+    def test_throttled(self):
+        camera = SimulatedCamera(fps=50)
+        camera.start()
+        start = time.time()
+        for _ in range(10):
+            camera.get_frame()
+        assert time.time() - start >= 9 / 50 * 0.9
+        assert camera.fps == 50
+        camera.stop()
+
+    def test_unthrottled(self):
+        camera = SimulatedCamera(width=1920, height=1080, fps=0, pool_size=4)
+        camera.start()
+        start = time.time()
+        count = 0
+        while time.time() - start < 1.1:
+            camera.get_frame()
+            count += 1
+        camera.stop()
+
+        assert count > 100
+        assert camera.fps > 100
+        stats = camera.get_stats()
+        assert stats["unthrottled"] and stats["frames"] == count
+        assert stats["avg_render_ms"] < 10
+
+    def test_create_camera_options(self):
+        camera = create_camera(None, use_simulation=True, width=320, height=240, fps=0, pool_size=2)
+        assert isinstance(camera, SimulatedCamera)
+        assert camera.resolution == (320, 240)
+        assert camera.unthrottled and camera.pool_size == 2
+
+
+class TestSystemSimulation:
+    """PPEDetectionSystem 환경 변수 테스트"""
+
+    def test_sim_env(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("SIM_RESOLUTION", "1280x720")
+        monkeypatch.setenv("SIM_FPS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+
+        assert system.camera.resolution == (1280, 720)
+        assert system.camera.unthrottled
+        assert system.camera.pool_size == 0    # 알림/업로드 큐가 프레임을 보관
+        system.camera.start()
+        _, frame = system._read_frame()
+        assert frame.shape == (720, 1280, 3)
+        system.process_frame(frame).release()
+        system.camera.stop()
+        system.detector.release()
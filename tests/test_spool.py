@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+저장 후 전달 스풀 테스트
+
+테스트 실행:
+    python -m pytest tests/test_spool.py -v
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from spool import Spool, SpoolDrainer
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.time() + timeout
+    while not predicate() and time.time() < deadline:
+        time.sleep(0.01)
+    return predicate()
+
+
+class TestSpool:
+    """스풀 로그 테스트"""
+
+    def test_append_peek_ack(self, tmp_path):
+        spool = Spool(str(tmp_path), fsync=False)
+        for i in range(5):
+            assert spool.append_message("t/alerts", {"n": i})
+
+        records = spool.peek(3)
+        assert [r.data["message"]["n"] for r in records] == [0, 1, 2]
+        assert len(spool) == 5
+
+        spool.ack(records)
+        assert len(spool) == 2
+        assert [r.data["message"]["n"] for r in spool.peek(10)] == [3, 4]
+
+    def test_survives_restart(self, tmp_path):
+        """재시작 후 체크포인트부터 이어서 전달"""
+        spool = Spool(str(tmp_path))
+        for i in range(1000):
+            spool.append_message("t/alerts", {"n": i})
+        spool.ack(spool.peek(400))
+        spool.close()
+
+        spool = Spool(str(tmp_path))
+        assert len(spool) == 600
+        assert spool.peek(1)[0].data["message"]["n"] == 400
+
+    def test_partial_tail_truncated(self, tmp_path):
+        """기록 중 중단된 마지막 줄은 재시작 시 제거"""
+        spool = Spool(str(tmp_path), fsync=False)
+        spool.append_message("t/alerts", {"n": 0})
+        spool.close()
+
+        segment = next(p for p in tmp_path.iterdir() if p.name.startswith("segment-"))
+        with open(segment, "ab") as f:
+            f.write(b"deadbeef {\"kind\": \"mess")
+
+        spool = Spool(str(tmp_path), fsync=False)
+        assert len(spool) == 1
+        spool.append_message("t/alerts", {"n": 1})
+        assert [r.data["message"]["n"] for r in spool.peek(10)] == [0, 1]
+        assert spool.get_stats()["corrupt"] == 1
+
+    def test_corrupt_record_skipped(self, tmp_path):
+        """CRC가 맞지 않는 레코드는 건너뜀"""
+        spool = Spool(str(tmp_path), fsync=False)
+        spool.append_message("t/alerts", {"n": 0})
+        spool.close()
+
+        segment = next(p for p in tmp_path.iterdir() if p.name.startswith("segment-"))
+        data = segment.read_bytes()
+        segment.write_bytes(data.replace(b'"n":0', b'"n":9'))
+
+        spool = Spool(str(tmp_path), fsync=False)
+        spool.append_message("t/alerts", {"n": 1})
+        assert [r.data["message"]["n"] for r in spool.peek(10)] == [1]
+
+    def test_size_cap_evicts_oldest(self, tmp_path):
+        """크기 상한 초과 시 오래된 세그먼트 삭제"""
+        spool = Spool(str(tmp_path), max_bytes=20000, segment_bytes=4000, fsync=False)
+        for i in range(1000):
+            spool.append_message("t/alerts", {"n": i, "pad": "x" * 40})
+
+        stats = spool.get_stats()
+        assert stats["size_bytes"] <= 20000
+        assert stats["evicted"] > 0
+        assert len(spool) + stats["evicted"] == 1000
+        assert spool.peek(1000)[-1].data["message"]["n"] == 999
+
+    def test_age_cap_evicts_expired(self, tmp_path):
+        """보관 기간이 지난 세그먼트 삭제"""
+        spool = Spool(str(tmp_path), max_age=60, segment_bytes=100, fsync=False)
+        spool.append_message("t/alerts", {"n": 0})
+        spool.append_message("t/alerts", {"n": 1})
+
+        old = time.time() - 120
+        oldest = sorted(p for p in tmp_path.iterdir() if p.name.startswith("segment-"))[0]
+        os.utime(oldest, (old, old))
+
+        spool.evict_expired()
+        assert [r.data["message"]["n"] for r in spool.peek(10)] == [1]
+        assert spool.get_stats()["evicted"] == 1
+
+    def test_image_lifecycle(self, tmp_path):
+        """이미지 스풀, 읽기, 전달 후 삭제"""
+        spool = Spool(str(tmp_path), fsync=False)
+        assert spool.append_image("violations/a.jpg", b"jpegdata", {"device_id": "d"})
+
+        record = spool.peek(1)[0]
+        assert record.kind == "image"
+        assert record.data["key"] == "violations/a.jpg"
+        assert spool.load_image(record) == b"jpegdata"
+
+        spool.ack([record])
+        assert os.listdir(tmp_path / "images") == []
+        assert spool.get_stats()["size_bytes"] == spool._segment_sizes[spool._segments[-1]]
+
+    def test_orphan_image_removed(self, tmp_path):
+        """로그에 기록되지 않은 이미지 파일은 재시작 시 정리"""
+        spool = Spool(str(tmp_path), fsync=False)
+        spool.close()
+        (tmp_path / "images" / "orphan.bin").write_bytes(b"x")
+
+        Spool(str(tmp_path), fsync=False)
+        assert os.listdir(tmp_path / "images") == []
+
+
+class TestSpoolDrainer:
+    """재전송 테스트"""
+
+    def test_rate_limited_drain(self, tmp_path):
+        """초당 전달 수 제한"""
+        spool = Spool(str(tmp_path), fsync=False)
+        for i in range(10):
+            spool.append_message("t/alerts", {"n": i})
+
+        delivered = []
+        drainer = SpoolDrainer(spool, send=lambda r: delivered.append(r) or True,
+                               rate=50, batch_size=4)
+        start = time.time()
+        drainer.start()
+        assert wait_for(lambda: len(spool) == 0)
+        elapsed = time.time() - start
+        drainer.stop()
+
+        assert [r.data["message"]["n"] for r in delivered] == list(range(10))
+        assert elapsed >= 0.15
+
+    def test_offline_holds_records(self, tmp_path):
+        """오프라인이면 전달하지 않음"""
+        spool = Spool(str(tmp_path), fsync=False)
+        spool.append_message("t/alerts", {"n": 0})
+
+        online = {"value": False}
+        delivered = []
+        drainer = SpoolDrainer(spool, send=lambda r: delivered.append(r) or True,
+                               is_online=lambda: online["value"], rate=0,
+                               retry_interval=0.05)
+        drainer.start()
+        time.sleep(0.2)
+        assert delivered == []
+
+        online["value"] = True
+        assert wait_for(lambda: len(spool) == 0)
+        drainer.stop()
+        assert len(delivered) == 1
+
+    def test_failed_send_retried(self, tmp_path):
+        """전달 실패한 레코드부터 다시 시도"""
+        spool = Spool(str(tmp_path), fsync=False)
+        for i in range(3):
+            spool.append_message("t/alerts", {"n": i})
+
+        attempts = []
+
+        def send(record):
+            attempts.append(record.data["message"]["n"])
+            return len(attempts) != 2
+
+        drainer = SpoolDrainer(spool, send=send, rate=0, retry_interval=0.05)
+        drainer.start()
+        assert wait_for(lambda: len(spool) == 0)
+        drainer.stop()
+
+        assert attempts == [0, 1, 1, 2]
+        assert drainer.get_stats()["drain_failures"] == 1
+
+
+class TestSystemSpool:
+    """PPEDetectionSystem 스풀 연동 테스트"""
+
+    def test_outage_spooled_then_drained(self, monkeypatch, tmp_path):
+        """IPC/S3 없을 때 알림과 이미지를 스풀 후 연결 복구 시 전달"""
+        import main
+        from main import PPEDetectionSystem
+        from mqtt_publisher import AsyncMQTTPublisher, LocalIPCClient
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setattr(main, "HAS_GREENGRASS", False)
+        monkeypatch.setenv("SPOOL_DIR", str(tmp_path))
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        assert system.spool is not None
+
+        assert system.publish_mqtt(system._alert_topic(), {"event_type": "PPE_VIOLATION"})
+        frame = np.zeros((120, 160, 3), dtype=np.uint8)
+        url = system.upload_image_to_s3(frame, "violations")
+        assert url.startswith(f"s3://{system.s3_bucket}/violations/")
+        assert system.publish_mqtt(system.topic_status, {"status": "running"})
+        assert len(system.spool) == 2  # 상태 메시지는 보관하지 않음
+
+        # IPC 연결 복구 (S3는 계속 사용 불가)
+        system.ipc_client = LocalIPCClient()
+        system.publisher = AsyncMQTTPublisher(system.ipc_client)
+        system.publisher.start()
+        system.spool_drainer.wake()
+
+        assert wait_for(lambda: system.ipc_client.published)
+        assert system.ipc_client.published[0] == (
+            system._alert_topic(), {"event_type": "PPE_VIOLATION"}
+        )
+        system.cleanup()
+        assert len(system.spool) == 1  # 이미지는 업로더가 없어 남아 있음
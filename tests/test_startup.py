@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+빠른 시작 (지연 import, 병렬 초기화, 워밍업, 시작 시간) 테스트
+
+테스트 실행:
+    python -m pytest tests/test_startup.py -v
+"""
+
+import sys
+import os
+import subprocess
+import threading
+import time
+import numpy as np
+import pytest
+
+# 소스 경로 추가
+SRC = os.path.join(os.path.dirname(__file__), '..', 'src')
+sys.path.insert(0, SRC)
+
+from startup import StartupTimer
+from ppe_detector import PPEDetector
+
+
+class CountingRuntime:
+    """추론 호출 수를 세는 가짜 런타임"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def inference(self, inputs):
+        self.calls += 1
+        return [np.zeros((1, 100, 14), dtype=np.float32)]
+
+    def release(self):
+        pass
+
+
+class TestStartupTimer:
+    """시작 단계/이벤트 기록 테스트"""
+
+    def test_phases_and_events(self):
+        startup = StartupTimer()
+        with startup.phase("init"):
+            time.sleep(0.02)
+        assert startup.mark("ready")
+        assert not startup.mark("ready")
+
+        stats = startup.get_stats()
+        assert stats["phases_s"]["init"] >= 0.02
+        assert stats["events_s"]["ready"] >= stats["phases_s"]["init"]
+        assert startup.elapsed("first_frame") is None
+        assert "init=" in startup.summary()
+
+    def test_origin(self):
+        startup = StartupTimer(origin=time.perf_counter() - 1.0)
+        startup.mark("first_frame")
+        assert startup.elapsed("first_frame") >= 1.0
+
+    def test_concurrent_mark_once(self):
+        startup = StartupTimer()
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(startup.mark("first_frame")))
+                   for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 1
+
+
+class TestWarmup:
+    """감지기 워밍업 테스트"""
+
+    def test_runs_inference_without_stats(self):
+        detector = PPEDetector(use_simulation=False)
+        detector.rknn = CountingRuntime()
+
+        elapsed = detector.warmup(runs=3)
+        assert detector.rknn.calls == 3
+        assert elapsed > 0 and detector.get_stats()["warmup_ms"] > 0
+        assert detector.total_inferences == 0
+        assert detector.latency.histogram("infer").count == 0
+
+    def test_batch_model(self):
+        detector = PPEDetector(use_simulation=False, batch_size=4)
+        calls = []
+        detector.rknn = CountingRuntime()
+        detector.rknn.inference = lambda inputs: calls.append(inputs[0].shape) or [np.zeros((4, 100, 14), np.float32)]
+        detector.warmup(runs=1)
+        assert calls == [(4, 640, 640, 3)]
+
+    def test_pool_warms_every_worker(self):
+        runtimes = {}
+
+        def factory(worker_id):
+            runtimes[worker_id] = CountingRuntime()
+            return runtimes[worker_id]
+
+        detector = PPEDetector(use_simulation=False, num_npu_workers=3, runtime_factory=factory)
+        detector.warmup(runs=1)
+        detector.release()
+        assert sum(r.calls for r in runtimes.values()) == 3
+        assert detector.total_inferences == 0
+
+    def test_pool_runs_beyond_in_flight_limit(self):
+        """runs × 워커 수가 max_in_flight를 넘어도 멈추지 않음"""
+        detector = PPEDetector(use_simulation=True, num_npu_workers=2)
+        assert detector.pool.max_in_flight == 4
+
+        thread = threading.Thread(target=detector.warmup, args=(3,), daemon=True)
+        thread.start()
+        thread.join(timeout=5.0)
+        assert not thread.is_alive()
+        assert detector.pool.in_flight == 0
+        assert detector.pool.get_stats()["submitted"] == 6
+        detector.release()
+
+    def test_disabled(self):
+        detector = PPEDetector(use_simulation=False)
+        detector.rknn = CountingRuntime()
+        assert detector.warmup(runs=0) == 0.0
+        assert detector.rknn.calls == 0
+
+
+class TestSystemStartup:
+    """PPEDetectionSystem 시작 테스트"""
+
+    def test_heavy_imports_deferred(self):
+        """main import만으로는 boto3/awsiot를 불러오지 않음"""
+        code = (
+            "import sys; sys.path.insert(0, %r); import main; "
+            "print(any(m == 'boto3' or m.startswith(('boto3.', 'awsiot')) for m in sys.modules))" % SRC
+        )
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip().splitlines()[-1] == "False"
+
+    @pytest.mark.parametrize("parallel", ["true", "false"])
+    def test_startup_metrics(self, monkeypatch, parallel):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("PARALLEL_INIT", parallel)
+        monkeypatch.setenv("WARMUP_RUNS", "1")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+
+        phases = system.startup.get_stats()["phases_s"]
+        assert {"imports", "camera", "detector", "greengrass", "s3", "warmup", "init"} <= set(phases)
+        assert system.startup.elapsed("ready") is not None
+        assert system.detector.warmup_time > 0
+
+        system.camera.start()
+        items = system._read_batch(timeout=1.0)
+        system.startup.mark("first_frame")
+        system.process_frame(items[0][1]).release()
+        system.camera.stop()
+
+        events = system.startup.get_stats()["events_s"]
+        assert events["ready"] <= events["first_frame"] <= events["first_detection"]
+
+        system.send_status_update()
+        assert published[-1]["startup"]["events_s"]["first_detection"] == events["first_detection"]
+
+        from metrics_server import MetricsWriter
+        writer = MetricsWriter()
+        system._collect_metrics(writer)
+        text = writer.render()
+        assert 'ppe_startup_event_seconds{event="first_detection"}' in text
+        assert 'ppe_startup_phase_seconds{phase="warmup"}' in text
+        system.detector.release()
+
+    def test_init_failure_reported(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+
+        def fail():
+            raise RuntimeError("camera unavailable")
+        system._init_camera = fail
+
+        assert not system.initialize()
+        # 다른 구성 요소 초기화는 끝까지 진행됨
+        assert system.detector is not None
+        system.detector.release()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+다중 객체 추적기 테스트
+
+테스트 실행:
+    python -m pytest tests/test_tracker.py -v
+"""
+
+import sys
+import os
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from ppe_detector import Detection
+from tracker import MultiObjectTracker, iou_matrix, greedy_assignment
+
+
+def make_detection(x, y, class_name="no_hardhat", class_id=2, w=60, h=100):
+    return Detection(class_id, class_name, 0.9, (x, y, x + w, y + h), class_name.startswith("no_"))
+
+
+class TestAssociation:
+    """IoU / 매칭 테스트"""
+
+    def test_iou_matrix(self):
+        a = np.array([[0, 0, 10, 10], [20, 20, 30, 30]], dtype=float)
+        b = np.array([[0, 0, 10, 10], [5, 0, 15, 10], [100, 100, 110, 110]], dtype=float)
+        iou = iou_matrix(a, b)
+
+        assert iou.shape == (2, 3)
+        assert iou[0, 0] == 1.0
+        assert abs(iou[0, 1] - 50 / 150) < 1e-9
+        assert iou[1].max() == 0.0
+
+    def test_iou_matrix_empty(self):
+        assert iou_matrix(np.zeros((0, 4)), np.zeros((3, 4))).shape == (0, 3)
+
+    def test_greedy_assignment(self):
+        cost = np.array([
+            [0.9, 0.8],
+            [0.85, 0.1],
+        ])
+        # 가장 큰 쌍 (0,0) 먼저, 남은 (1,1)은 임계값 미만
+        assert greedy_assignment(cost, 0.3) == [(0, 0)]
+        assert greedy_assignment(cost, 0.05) == [(0, 0), (1, 1)]
+
+
+class TestMultiObjectTracker:
+    """추적 테스트"""
+
+    def test_stable_ids_for_moving_objects(self):
+        """움직이는 두 작업자에 각각 일정한 ID"""
+        tracker = MultiObjectTracker()
+        ids = []
+        for frame in range(20):
+            dets = [make_detection(100 + frame * 4, 100), make_detection(400 - frame * 4, 120)]
+            tracker.update(dets)
+            ids.append([d.track_id for d in dets])
+
+        assert all(frame_ids == ids[0] for frame_ids in ids)
+        assert ids[0][0] != ids[0][1]
+        assert tracker.get_stats()["total_tracks"] == 2
+
+    def test_order_independent(self):
+        """감지 순서가 바뀌어도 같은 객체는 같은 ID"""
+        tracker = MultiObjectTracker()
+        a, b = make_detection(100, 100), make_detection(400, 100)
+        tracker.update([a, b])
+
+        b2, a2 = make_detection(402, 100), make_detection(102, 100)
+        tracker.update([b2, a2])
+        assert (a2.track_id, b2.track_id) == (a.track_id, b.track_id)
+
+    def test_short_gap_keeps_track(self):
+        """잠깐 감지되지 않아도 max_age 안이면 같은 ID"""
+        tracker = MultiObjectTracker(max_age=5)
+        first = make_detection(100, 100)
+        tracker.update([first])
+        for _ in range(3):
+            tracker.update([])
+
+        again = make_detection(100, 100)
+        tracker.update([again])
+        assert again.track_id == first.track_id
+
+    def test_expired_track_removed(self):
+        """max_age를 넘기면 트랙 삭제, 다시 나타나면 새 ID"""
+        tracker = MultiObjectTracker(max_age=2)
+        first = make_detection(100, 100)
+        tracker.update([first])
+        for _ in range(3):
+            tracker.update([])
+        assert tracker.active_tracks == 0
+
+        again = make_detection(100, 100)
+        tracker.update([again])
+        assert again.track_id != first.track_id
+
+    def test_class_aware(self):
+        """클래스가 다르면 겹쳐도 다른 트랙"""
+        tracker = MultiObjectTracker()
+        vest = make_detection(100, 100, "no_safety_vest", 4)
+        hat = make_detection(100, 100, "no_hardhat", 2)
+        tracker.update([vest, hat])
+        assert vest.track_id != hat.track_id
+
+        hat2 = make_detection(100, 100, "no_hardhat", 2)
+        tracker.update([hat2])
+        assert hat2.track_id == hat.track_id
+
+    def test_class_flicker_keeps_track(self):
+        """착용/미착용 판정이 오가도 같은 트랙"""
+        tracker = MultiObjectTracker()
+        ids = []
+        for frame in range(6):
+            name, class_id = ("no_hardhat", 2) if frame % 2 == 0 else ("hardhat", 1)
+            det = make_detection(100 + frame, 100, name, class_id)
+            tracker.update([det])
+            ids.append(det.track_id)
+        assert len(set(ids)) == 1
+        assert tracker.get_stats()["total_tracks"] == 1
+
+    def test_confirmation(self):
+        """min_hits번 매칭되어야 확정"""
+        tracker = MultiObjectTracker(min_hits=3)
+        for frame in range(3):
+            det = make_detection(100 + frame, 100)
+            tracker.update([det])
+            assert tracker.is_confirmed(det.track_id) == (frame == 2)
+        assert not tracker.is_confirmed(None)
+
+    def test_lost_track_reassociated(self):
+        """사라진 확정 트랙이 같은 자리에 다시 나타나면 이전 ID"""
+        tracker = MultiObjectTracker(max_age=2, min_hits=2, lost_max_age=20)
+        for frame in range(3):
+            first = make_detection(100, 100)
+            tracker.update([first])
+        for _ in range(10):
+            tracker.update([])
+        assert tracker.active_tracks == 0 and tracker.is_confirmed(first.track_id)
+
+        again = make_detection(104, 102)
+        other = make_detection(400, 100)
+        tracker.update([again, other])
+        assert again.track_id == first.track_id
+        assert other.track_id != first.track_id
+        assert tracker.is_confirmed(again.track_id) and not tracker.is_confirmed(other.track_id)
+        assert tracker.get_stats()["reassociated"] == 1
+
+        # lost_max_age를 넘기면 새 ID
+        for _ in range(30):
+            tracker.update([])
+        assert not tracker.is_confirmed(first.track_id)
+        late = make_detection(100, 100)
+        tracker.update([late])
+        assert late.track_id != first.track_id
+
+    def test_crowd(self):
+        """수십 명이 동시에 움직여도 ID 유지"""
+        rng = np.random.default_rng(0)
+        positions = np.stack([np.arange(50) % 10 * 150, np.arange(50) // 10 * 180], axis=1).astype(float)
+        velocity = rng.uniform(-3, 3, (50, 2))
+
+        tracker = MultiObjectTracker()
+        first_ids = None
+        for frame in range(30):
+            pos = positions + velocity * frame
+            dets = [make_detection(int(x), int(y)) for x, y in pos]
+            tracker.update(dets)
+            ids = [d.track_id for d in dets]
+            if first_ids is None:
+                first_ids = ids
+            assert ids == first_ids
+        assert tracker.active_tracks == 50
+
+
+class TestSystemTracking:
+    """PPEDetectionSystem 트랙 단위 알림 테스트"""
+
+    def test_alert_per_worker(self, monkeypatch):
+        """같은 위반 클래스라도 작업자마다 알림, 같은 작업자는 쿨다운"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        for step in range(5):
+            dets = system._track([make_detection(100 + step, 100), make_detection(400, 100 + step)])
+            system.send_violation_alert(dets, frame)
+
+        track_ids = [m["violation"]["track_id"] for m in published]
+        assert len(published) == 2
+        assert len(set(track_ids)) == 2
+        system.detector.release()
+
+    def test_returning_worker_not_realerted(self, monkeypatch):
+        """화면을 잠시 벗어났다 돌아온 작업자, 한 프레임 오검출은 다시 알리지 않음"""
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+        monkeypatch.setenv("TRACK_MAX_AGE", "5")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+
+        published = []
+        system.publish_mqtt = lambda topic, message: published.append(message)
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+
+        def step(dets):
+            system.send_violation_alert(system._track(dets), frame)
+
+        for _ in range(4):
+            step([make_detection(100, 100)])
+        assert len(published) == 1
+
+        # 한 프레임 오검출 → 확정 전이라 알림 없음
+        step([make_detection(100, 100), make_detection(400, 300)])
+        assert len(published) == 1
+
+        # max_age보다 오래 사라졌다가 돌아옴 → 같은 트랙, 쿨다운 유지
+        for _ in range(20):
+            step([])
+        assert system.trackers[""].active_tracks == 0
+        for _ in range(4):
+            step([make_detection(102, 101)])
+        assert len(published) == 1
+        system.detector.release()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+YOLOv5 원시 출력 시뮬레이터 테스트
+
+테스트 실행:
+    python -m pytest tests/test_yolo_simulator.py -v
+"""
+
+import sys
+import os
+import time
+import numpy as np
+
+# 소스 경로 추가
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from yolo_simulator import SceneConfig, LatencyModel, SimulatedYoloRuntime, simulated_runtime_factory
+from ppe_detector import PPEDetector
+
+
+NO_DELAY = LatencyModel(mean_ms=0.0, jitter_ms=0.0)
+
+
+class TestSimulatedYoloRuntime:
+    """출력 텐서 테스트"""
+
+    def test_output_format(self):
+        scene = SceneConfig(num_objects=4, boxes_per_object=10)
+        output = SimulatedYoloRuntime(scene, NO_DELAY).inference([None])[0]
+
+        assert output.shape == (1, 25200, 14) and output.dtype == np.float32
+        assert (output[0, :, 4] > 0.5).sum() == 40
+        assert (output[0, :, 4] <= 0.99).all()
+
+    def test_seeded(self):
+        a = SimulatedYoloRuntime(latency=NO_DELAY, seed=7)
+        b = SimulatedYoloRuntime(latency=NO_DELAY, seed=7)
+        c = SimulatedYoloRuntime(latency=NO_DELAY, seed=8)
+        for _ in range(3):
+            out_a, out_b, out_c = a.generate(), b.generate(), c.generate()
+            assert np.array_equal(out_a, out_b)
+            assert not np.array_equal(out_a, out_c)
+
+    def test_objects_move_inside_input(self):
+        runtime = SimulatedYoloRuntime(SceneConfig(num_objects=5, motion=20.0), NO_DELAY)
+        start = runtime.centers.copy()
+        for _ in range(50):
+            runtime.generate()
+        assert not np.allclose(start, runtime.centers)
+        half = runtime.sizes / 2
+        assert (runtime.centers >= half - 1e-3).all()
+        assert (runtime.centers <= 640 - half + 1e-3).all()
+
+    def test_violation_ratio(self):
+        runtime = SimulatedYoloRuntime(SceneConfig(num_objects=200, violation_ratio=1.0), NO_DELAY)
+        assert set(runtime.classes.tolist()) <= {2, 4, 6}
+        runtime = SimulatedYoloRuntime(SceneConfig(num_objects=200, violation_ratio=0.0), NO_DELAY)
+        assert not set(runtime.classes.tolist()) & {2, 4, 6}
+
+    def test_latency_model(self):
+        runtime = SimulatedYoloRuntime(latency=LatencyModel(mean_ms=30.0, jitter_ms=0.0))
+        start = time.perf_counter()
+        runtime.inference()
+        assert time.perf_counter() - start >= 0.028
+
+        spikes = LatencyModel(mean_ms=10.0, jitter_ms=0.0, spike_prob=1.0, spike_ms=40.0)
+        assert spikes.sample(np.random.default_rng(0)) == 0.05
+        assert LatencyModel(mean_ms=1.0, jitter_ms=100.0).sample(np.random.default_rng(0)) >= 0.0
+
+
+class TestDetectorIntegration:
+    """PPEDetector 실제 후처리 경로 테스트"""
+
+    def test_postprocess_runs_on_tensors(self):
+        scene = SceneConfig(num_objects=3, overlap=0.0, motion=0.0, boxes_per_object=15)
+        detector = PPEDetector(
+            use_simulation=True,
+            sim_runtime_factory=simulated_runtime_factory(scene, NO_DELAY, seed=1)
+        )
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        detections = detector.detect(frame)
+
+        # 객체당 후보 15개가 NMS로 하나씩 남음
+        assert len(detections) == 3
+        expected = {detector.CLASSES[c] for c in detector.rknn.classes.tolist()}
+        assert {d.class_name for d in detections} == expected
+        for det in detections:
+            x1, y1, x2, y2 = det.bbox
+            assert 0 <= x1 < x2 <= 640 and 0 <= y1 < y2 <= 480
+            assert det.is_violation == (det.class_name in detector.VIOLATION_CLASSES)
+
+        stats = detector.get_stats()
+        assert stats["simulation_mode"]
+        assert stats["latency"]["stages_ms"]["postprocess"]["count"] == 1
+        detector.release()
+
+    def test_pool_mode(self):
+        detector = PPEDetector(
+            use_simulation=True,
+            num_npu_workers=2,
+            sim_runtime_factory=simulated_runtime_factory(SceneConfig(num_objects=2), NO_DELAY)
+        )
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(4):
+            assert detector.detect(frame)
+        assert isinstance(detector.pool.workers[1].runtime, SimulatedYoloRuntime)
+        detector.release()
+
+    def test_default_simulation_unchanged(self):
+        """런타임을 지정하지 않으면 기존 무작위 감지 결과"""
+        detector = PPEDetector(use_simulation=True)
+        assert detector.rknn is None
+        assert detector.detect(np.zeros((480, 640, 3), dtype=np.uint8))
+
+
+class TestSystemSimDetector:
+    """SIM_DETECTOR 환경 변수 테스트"""
+
+    def test_tensor_detector(self, monkeypatch):
+        import main
+        from main import PPEDetectionSystem
+
+        monkeypatch.setattr(main, "HAS_BOTO3", False)
+        monkeypatch.setenv("SIM_DETECTOR", "tensor")
+        monkeypatch.setenv("SIM_OBJECTS", "5")
+        monkeypatch.setenv("SIM_INFER_MS", "1")
+        monkeypatch.setenv("WARMUP_RUNS", "0")
+
+        system = PPEDetectionSystem()
+        system.use_simulation = True
+        assert system.initialize()
+        system.ipc_client = None
+        system.publish_mqtt = lambda topic, message: True
+
+        assert isinstance(system.detector.rknn, SimulatedYoloRuntime)
+        assert system.detector.rknn.scene.num_objects == 5
+        frame = np.zeros((480, 640, 3), dtype=np.uint8)
+        for _ in range(3):
+            system.process_frame(frame).release()
+        assert system.detector.rknn.frames == 3
+        system.detector.release()